@@ -7,6 +7,7 @@
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import platform
+import subprocess
 
 from PyInstaller.__main__ import run as run_pyinstaller
 
@@ -33,8 +34,8 @@ def main():
     print(f'Building yt-dlp v{version} for {OS_NAME} {platform.machine()} with options {opts}')
     print('Remember to update the version using  "devscripts/update-version.py"')
     if not os.path.isfile('yt_dlp/extractor/lazy_extractors.py'):
-        print('WARNING: Building without lazy_extractors. Run  '
-              '"devscripts/make_lazy_extractors.py"  to build lazy extractors', file=sys.stderr)
+        print('Generating the lazy extractors')
+        subprocess.run([sys.executable, 'devscripts/make_lazy_extractors.py'], check=True)
     print(f'Destination: {final_file}\n')
 
     opts = [
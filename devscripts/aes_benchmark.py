@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import argparse
+import time
+
+from yt_dlp.aes import aes_cbc_decrypt, aes_cbc_decrypt_bytes_native
+from yt_dlp.dependencies import Cryptodome
+
+
+def measure(func, data, key, iv, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data, key, iv)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(data) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the throughput of the AES-CBC decryption implementations')
+    parser.add_argument(
+        '--size', type=int, default=256 * 1024, help='size of the data to decrypt in bytes (default: %(default)s)')
+    parser.add_argument(
+        '--key-size', type=int, default=16, choices=(16, 24, 32), help='key size in bytes (default: %(default)s)')
+    parser.add_argument(
+        '--repeat', type=int, default=3, help='number of measurements to take the best of (default: %(default)s)')
+    args = parser.parse_args()
+
+    data = os.urandom(args.size - args.size % 16)
+    key, iv = os.urandom(args.key_size), os.urandom(16)
+
+    implementations = {
+        'aes_cbc_decrypt (int lists)': lambda data, key, iv: bytes(aes_cbc_decrypt(*map(list, (data, key, iv)))),
+        'aes_cbc_decrypt_bytes_native': aes_cbc_decrypt_bytes_native,
+    }
+    if Cryptodome.AES:
+        implementations['pycryptodome'] = lambda data, key, iv: Cryptodome.AES.new(
+            key, Cryptodome.AES.MODE_CBC, iv).decrypt(data)
+
+    expected = aes_cbc_decrypt_bytes_native(data, key, iv)
+    for name, func in implementations.items():
+        assert func(data, key, iv) == expected, f'{name} returned wrong result'
+        print(f'{name:<30} {measure(func, data, key, iv, args.repeat) / 1024:>12.1f} KiB/s')
+
+
+if __name__ == '__main__':
+    main()
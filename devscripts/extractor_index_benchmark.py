@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import argparse
+import time
+
+from yt_dlp.extractor import gen_extractor_classes
+from yt_dlp.extractor._host_index import ExtractorHostIndex
+
+
+def linear_match(ies, url):
+    return next(key for key, ie in ies.items() if ie.suitable(url))
+
+
+def index_match(ies, index, url):
+    return next(key for key in index.candidates(url) if ies[key].suitable(url))
+
+
+def measure(func, urls, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for url in urls:
+            func(url)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(urls)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure how long it takes to find the extractor for a URL')
+    parser.add_argument(
+        '--repeat', type=int, default=3, help='number of measurements to take the best of (default: %(default)s)')
+    args = parser.parse_args()
+
+    ies = {ie.ie_key(): ie for ie in gen_extractor_classes()}
+    urls = sorted({tc['url'] for ie in ies.values() for tc in ie.get_testcases(True) if 'url' in tc})
+
+    start = time.perf_counter()
+    index = ExtractorHostIndex(ies)
+    print(f'Indexed {len(ies)} extractors in {time.perf_counter() - start:.3f}s '
+          f'({len(index._unindexed)} are tried for every URL)')
+
+    # Compile the regexes before measuring
+    for url in urls:
+        assert linear_match(ies, url) == index_match(ies, index, url), f'Different extractors for {url!r}'
+
+    print(f'Matching {len(urls)} test URLs:')
+    for name, func in {
+        'linear search': lambda url: linear_match(ies, url),
+        'host index': lambda url: index_match(ies, index, url),
+    }.items():
+        print(f'{name:<15} {measure(func, urls, args.repeat) * 1e6:>10.1f} µs/URL')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,16 @@
+import subprocess
+import sys
+
+from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+
+
+class LazyExtractorsBuildHook(BuildHookInterface):
+    """Generate the lazy extractors, so that they are always included in the sdist and the wheel"""
+
+    def initialize(self, version, build_data):
+        # The extractors of an editable install can change, so they are loaded directly
+        if version == 'editable':
+            return
+        subprocess.run(
+            [sys.executable, 'devscripts/make_lazy_extractors.py', 'yt_dlp/extractor/lazy_extractors.py'],
+            cwd=self.root, check=True, stdout=subprocess.DEVNULL)
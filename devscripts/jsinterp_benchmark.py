@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import argparse
+import copy
+import time
+import unittest
+
+from test.test_jsinterp import TestJSInterpreter
+from yt_dlp.jsinterp import JSInterpreter
+
+
+def collect_cases():
+    """ @returns the (code, function name, arguments) of the cases checked by test_jsinterp """
+    cases = []
+
+    class CaseRecorder(TestJSInterpreter):
+        def _test(self, jsi_or_code, expected, func='f', args=()):
+            code = jsi_or_code if isinstance(jsi_or_code, str) else jsi_or_code.code
+            cases.append((code, func, copy.deepcopy(args)))
+            super()._test(jsi_or_code, expected, func, args)
+
+    suite = unittest.defaultTestLoader.loadTestsFromTestCase(CaseRecorder)
+    result = unittest.TextTestRunner(stream=open(os.devnull, 'w')).run(suite)  # noqa: SIM115
+    assert result.wasSuccessful(), 'test_jsinterp is failing'
+    return cases
+
+
+def measure(func, cases, repeat):
+    best = None
+    for _ in range(repeat):
+        # The functions can modify their arguments
+        arguments = [copy.deepcopy(args) for _, _, args in cases]
+        start = time.perf_counter()
+        for case, args in zip(cases, arguments, strict=True):
+            func(case, args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(cases)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure how long JSInterpreter takes to run the cases of test_jsinterp')
+    parser.add_argument(
+        '--repeat', type=int, default=5, help='number of measurements to take the best of (default: %(default)s)')
+    args = parser.parse_args()
+
+    cases = collect_cases()
+    functions = {(code, func): JSInterpreter(code).extract_function(func) for code, func, _ in cases}
+
+    def first_run(case, args):
+        JSInterpreter._compiled_cache.clear()
+        JSInterpreter(case[0]).call_function(case[1], *args)
+
+    print(f'Running {len(cases)} test cases:')
+    for name, func in {
+        'first run': first_run,
+        'new interpreter': lambda case, args: JSInterpreter(case[0]).call_function(case[1], *args),
+        'same function': lambda case, args: functions[case[:2]](args),
+    }.items():
+        print(f'{name:<16} {measure(func, cases, args.repeat) * 1e6:>10.1f} µs/case')
+
+
+if __name__ == '__main__':
+    main()
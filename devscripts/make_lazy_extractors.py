@@ -11,6 +11,7 @@
 
 from devscripts.utils import get_filename_args, read_file, write_file
 from yt_dlp.extractor import import_extractors
+from yt_dlp.extractor._host_index import extractor_host_keys
 from yt_dlp.extractor.common import InfoExtractor, SearchInfoExtractor
 from yt_dlp.globals import extractors
 
@@ -69,13 +70,19 @@ def extra_ie_code(ie, base=None):
 
 
 def build_ies(ies, bases, attr_base):
-    names = []
     for ie in sort_ies(ies, bases):
         yield build_lazy_ie(ie, ie.__name__, attr_base)
-        if ie in ies:
-            names.append(ie.__name__)
 
-    yield '\n_CLASS_LOOKUP = {%s}' % ', '.join(f'{name!r}: {name}' for name in names)
+    # The classes are defined after their bases, but must be matched in the order they were registered in
+    yield '\n_CLASS_LOOKUP = {%s}' % ', '.join(f'{ie.__name__!r}: {ie.__name__}' for ie in ies)
+    # Used to index the extractors by host without parsing their _VALID_URL
+    yield '\n_URL_HOST_KEYS = {%s}' % ', '.join(
+        f'{ie.__name__!r}: {host_keys(ie)!r}' for ie in ies)
+
+
+def host_keys(ie):
+    keys = extractor_host_keys(ie)
+    return None if keys is None else tuple(sorted(keys))
 
 
 def sort_ies(ies, ignored_bases):
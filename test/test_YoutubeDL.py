@@ -11,17 +11,23 @@
 
 from yt_dlp.globals import all_plugins_loaded
 
+import collections
+import concurrent.futures
 import contextlib
 import copy
 import json
+import threading
+import time
 
 from test.helper import FakeYDL, assertRegexpMatches, try_rm
 from yt_dlp import YoutubeDL
 from yt_dlp.extractor.common import InfoExtractor
 from yt_dlp.postprocessor.common import PostProcessor
 from yt_dlp.utils import (
+    DownloadError,
     ExtractorError,
     LazyList,
+    MaxDownloadsReached,
     OnDemandPagedList,
     int_or_none,
     match_filter_func,
@@ -1141,6 +1147,209 @@ def _real_extract(self, url):
         self.assertEqual(downloaded['extractor'], 'testex')
         self.assertEqual(downloaded['extractor_key'], 'TestEx')
 
+    def test_race_extractor_fallbacks(self):
+        ydl = YDL({'extractor_fallback_timeout': 2})
+
+        def make_ie(name, delay, fail=False, error=None, formats=({'url': TEST_URL},)):
+            class FallbackIE(InfoExtractor):
+                IE_NAME = name
+                _VALID_URL = r'fallback:'
+
+                @classmethod
+                def ie_key(cls):
+                    return name
+
+                def _real_extract(self, url):
+                    time.sleep(delay)
+                    if error:
+                        raise error
+                    if fail:
+                        raise ExtractorError(f'{name} failed', expected=True)
+                    return _make_result(list(formats), id=name, title=name)
+
+            ydl.add_info_extractor(FallbackIE(ydl))
+
+        make_ie('Preferred', 0.5, fail=True)
+        make_ie('Slow', 1)
+        make_ie('Fast', 0)
+        make_ie('Hanging', 4)
+        make_ie('TimingOut', 0, error=concurrent.futures.TimeoutError('read timed out'))
+        make_ie('Unplayable', 0, formats=())
+
+        def race(*keys):
+            start = time.monotonic()
+            result = next(ydl._race_extractor_fallbacks([(key, key, 'fallback:') for key in keys], {}), None)
+            return result and result['id'], time.monotonic() - start
+
+        # The first fallback in priority order that succeeds wins
+        result, elapsed = race('Preferred', 'Slow', 'Fast')
+        self.assertEqual(result, 'Slow')
+        self.assertLess(elapsed, 1.4)
+        # Fallbacks that did not finish in time are skipped
+        result, elapsed = race('Hanging', 'Fast')
+        self.assertEqual(result, 'Fast')
+        self.assertLess(elapsed, 3)
+        self.assertEqual(race('Preferred')[0], None)
+
+        # A timeout raised by the extractor is a failure, not a missed deadline
+        messages = []
+        ydl.write_debug = lambda msg, *args, **kwargs: messages.append(msg)
+        self.assertEqual(race('TimingOut', 'Fast')[0], 'Fast')
+        self.assertTrue(any(msg.startswith('TimingOut extractor failed') for msg in messages), messages)
+        self.assertFalse(any('did not finish' in msg for msg in messages), messages)
+
+        # If the result of a fallback can't be processed, the next one is used
+        ydl.params['race_extractor_fallbacks'] = True
+        ydl._get_extractor_fallbacks = lambda *args, **kwargs: [
+            (key, key, 'fallback:') for key in ('Unplayable', 'Slow', 'Fast')]
+        ydl.extract_info('fallback:', ie_key='Preferred')
+        self.assertEqual([info['id'] for info in ydl.downloaded_info_dicts], ['Slow'])
+
+    def test_extractor_fallback_order(self):
+        ydl = YDL({'disable_third_api': True})
+        ydl._is_try_generic = lambda ie_key: True
+        self.assertEqual([key for _, key, _ in ydl._get_extractor_fallbacks('http://x', 'Foo')], [
+            'Generic', 'SearchForAlternative'])
+        self.assertEqual([key for _, key, _ in ydl._get_extractor_fallbacks('http://x', 'Foo', is_login_error=True)], [])
+        ydl.params['extractor_fallback_order'] = ['searchforalternative', 'Generic']
+        self.assertEqual([key for _, key, _ in ydl._get_extractor_fallbacks('http://x', 'Foo')], [
+            'SearchForAlternative', 'Generic'])
+        ydl.params['extractor_fallback_order'] = []
+        self.assertEqual(ydl._get_extractor_fallbacks('http://x', 'Foo'), [])
+
+    def test_concurrent_extractions(self):
+        lock = threading.Lock()
+        running = collections.Counter()
+        busy_instances, extracted = set(), []
+
+        class VideoIE(InfoExtractor):
+            _VALID_URL = r'video:(?P<id>\d+)'
+            _RETURN_TYPE = 'video'
+
+            def _real_extract(self, url):
+                with lock:
+                    running['now'] += 1
+                    running['max'] = max(running['max'], running['now'])
+                    running['shared'] += id(self) in busy_instances
+                    busy_instances.add(id(self))
+                    extracted.append(self._match_id(url))
+                time.sleep(0.3)
+                with lock:
+                    running['now'] -= 1
+                    busy_instances.discard(id(self))
+                return _make_result([{'url': TEST_URL}], id=self._match_id(url), title=url)
+
+        class PlaylistIE(InfoExtractor):
+            _VALID_URL = r'playlist:'
+
+            def _real_extract(self, url):
+                return self.playlist_result(
+                    self.url_result(f'video:{n}', VideoIE, str(n)) for n in range(6))
+
+        def test(params, expected_concurrency):
+            running.clear()
+            ydl = YDL(params)
+            ydl.add_info_extractor(VideoIE(ydl))
+            ydl.add_info_extractor(PlaylistIE(ydl))
+            start = time.monotonic()
+            ydl.extract_info('playlist:')
+            self.assertEqual([info['id'] for info in ydl.downloaded_info_dicts], [str(n) for n in range(6)])
+            self.assertEqual(running['max'], expected_concurrency)
+            self.assertEqual(running['shared'], 0)
+            self.assertFalse(ydl._prefetched_extractions)
+
+            ydl.downloaded_info_dicts.clear()
+            results = list(ydl.extract_many([f'video:{n}' for n in range(6)], concurrency=3))
+            self.assertEqual([info['id'] for info in results], [str(n) for n in range(6)])
+            self.assertEqual([info['id'] for info in ydl.downloaded_info_dicts], [str(n) for n in range(6)])
+            return time.monotonic() - start
+
+        self.assertLess(test({'concurrent_extractions': 3}, 3), 2.4)
+        VideoIE._MAX_CONCURRENT_EXTRACTIONS = 2
+        test({'concurrent_extractions': 3}, 2)
+        VideoIE._MAX_CONCURRENT_EXTRACTIONS = None
+        test({}, 1)
+
+        # Entries are only prefetched if they pass the filters
+        extracted.clear()
+        ydl = YDL({'concurrent_extractions': 3, 'match_filter': match_filter_func('id!=3')})
+        ydl.add_info_extractor(VideoIE(ydl))
+        ydl.add_info_extractor(PlaylistIE(ydl))
+        ydl.extract_info('playlist:')
+        self.assertEqual(sorted(extracted), ['0', '1', '2', '4', '5'])
+
+        # and only as many as can still be downloaded
+        class _YDL(YDL):
+            def process_info(self, info_dict):
+                super().process_info(info_dict)
+                self._num_downloads += 1
+                if self._num_downloads >= self.params['max_downloads']:
+                    raise MaxDownloadsReached
+
+        extracted.clear()
+        ydl = _YDL({'concurrent_extractions': 3, 'max_downloads': 2})
+        ydl.add_info_extractor(VideoIE(ydl))
+        ydl.add_info_extractor(PlaylistIE(ydl))
+        with self.assertRaisesRegex(Exception, MaxDownloadsReached.msg):
+            ydl.extract_info('playlist:')
+        self.assertEqual(sorted(extracted), ['0', '1'])
+
+    def test_concurrent_format_downloads(self):
+        lock = threading.Lock()
+        running = collections.Counter()
+
+        class _YDL(YDL):
+            def dl(self, name, info, subtitle=False, test=False, *, params=None, progress_hooks=()):
+                with lock:
+                    running['now'] += 1
+                    running['max'] = max(running['max'], running['now'])
+                    running['ratelimit'] = (params or self.params).get('ratelimit')
+                for downloaded in (0, 500, 1000):
+                    for hook in progress_hooks:
+                        hook({'status': 'downloading', 'downloaded_bytes': downloaded, 'total_bytes': 1000})
+                    time.sleep(0.1)
+                for hook in progress_hooks:
+                    hook({'status': 'finished', 'total_bytes': 1000})
+                with lock:
+                    running['now'] -= 1
+                return name != 'fail', True
+
+        def test(params, names, expected_concurrency):
+            running.clear()
+            ydl = _YDL(params)
+            result = ydl._dl_formats([(name, {'format_id': name}) for name in names], {'id': 'testid'})
+            self.assertEqual(result, [(name != 'fail', True) for name in names])
+            self.assertEqual(running['max'], expected_concurrency)
+            return running['ratelimit']
+
+        self.assertIsNone(test({}, ['a', 'b'], 1))
+        self.assertEqual(test({'concurrent_format_downloads': 2, 'ratelimit': 1000}, ['a', 'fail'], 2), 500)
+        self.assertEqual(test({'concurrent_format_downloads': 4}, ['a', 'b', 'c'], 3), None)
+
+    def test_concurrent_format_downloads_failure(self):
+        progress = collections.Counter()
+
+        class _YDL(YDL):
+            def dl(self, name, info, subtitle=False, test=False, *, params=None, progress_hooks=()):
+                if name == 'fail':
+                    time.sleep(0.1)
+                    raise DownloadError('fail')
+                for _ in range(50):
+                    for hook in progress_hooks:
+                        hook({'status': 'downloading', 'downloaded_bytes': 0, 'total_bytes': 1000})
+                    progress[name] += 1
+                    time.sleep(0.1)
+                return True, True
+
+        ydl = _YDL({'concurrent_format_downloads': 2})
+        start = time.monotonic()
+        with self.assertRaises(DownloadError):
+            ydl._dl_formats([(name, {'format_id': name}) for name in ('a', 'fail')], {'id': 'testid'})
+        self.assertLess(time.monotonic() - start, 2)
+        # The other download is stopped at its next progress update
+        time.sleep(0.3)
+        self.assertLess(progress['a'], 5)
+
     # Test case for https://github.com/ytdl-org/youtube-dl/issues/27064
     def test_ignoreerrors_for_playlist_with_url_transparent_iterable_entries(self):
 
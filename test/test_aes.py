@@ -13,6 +13,7 @@
 from yt_dlp.aes import (
     aes_cbc_decrypt,
     aes_cbc_decrypt_bytes,
+    aes_cbc_decrypt_bytes_native,
     aes_cbc_encrypt,
     aes_ctr_decrypt,
     aes_ctr_encrypt,
@@ -47,10 +48,26 @@ def test_cbc_decrypt(self):
         data = b'\x97\x92+\xe5\x0b\xc3\x18\x91ky9m&\xb3\xb5@\xe6\x27\xc2\x96.\xc8u\x88\xab9-[\x9e|\xf1\xcd'
         decrypted = bytes(aes_cbc_decrypt(list(data), self.key, self.iv))
         self.assertEqual(decrypted.rstrip(b'\x08'), self.secret_msg)
+        decrypted = aes_cbc_decrypt_bytes_native(data, bytes(self.key), bytes(self.iv))
+        self.assertEqual(decrypted.rstrip(b'\x08'), self.secret_msg)
         if Cryptodome.AES:
             decrypted = aes_cbc_decrypt_bytes(data, bytes(self.key), bytes(self.iv))
             self.assertEqual(decrypted.rstrip(b'\x08'), self.secret_msg)
 
+    def test_cbc_decrypt_native(self):
+        for key_size in (16, 24, 32):
+            key = list(range(key_size))
+            for size in (16, 24, 100, 1024):
+                data = (list(range(256)) * 4)[:size]
+                encrypted = aes_cbc_encrypt(data, key, self.iv, padding_mode='zero')
+                decrypted = aes_cbc_decrypt_bytes_native(bytes(encrypted), bytes(key), bytes(self.iv))
+                self.assertEqual(decrypted, bytes(aes_cbc_decrypt(encrypted, key, self.iv)))
+                self.assertEqual(decrypted[:size], bytes(data))
+                # Unaligned input is zero padded like in aes_cbc_decrypt
+                self.assertEqual(
+                    aes_cbc_decrypt_bytes_native(bytes(encrypted[:-3]), bytes(key), bytes(self.iv)),
+                    bytes(aes_cbc_decrypt(encrypted[:-3], key, self.iv)))
+
     def test_cbc_encrypt(self):
         data = list(self.secret_msg)
         encrypted = bytes(aes_cbc_encrypt(data, self.key, self.iv))
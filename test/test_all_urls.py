@@ -12,6 +12,12 @@
 
 from test.helper import gettestcases
 from yt_dlp.extractor import FacebookIE, YoutubeIE, gen_extractors
+from yt_dlp.extractor._host_index import (
+    ExtractorHostIndex,
+    _Unindexable,
+    url_host_keys,
+    valid_url_host_keys,
+)
 
 
 class TestAllURLsMatching(unittest.TestCase):
@@ -120,5 +126,40 @@ def test_no_duplicated_ie_names(self):
                 f'Multiple extractors with the same IE_NAME "{ie_name}" ({", ".join(ie_list)})')
 
 
+class TestExtractorHostIndex(unittest.TestCase):
+    def test_valid_url_host_keys(self):
+        self.assertEqual(valid_url_host_keys(r'https?://(?:www\.)?Example\.com/(?P<id>\d+)'), {'www.example.com', 'example.com'})
+        self.assertEqual(valid_url_host_keys(r'https?://(?:[^/]+\.)?example\.(?:com|org)/'), {'example.com', 'example.org'})
+        self.assertEqual(valid_url_host_keys(r'https?://[\w-]+\.example\.com/'), {'example.com'})
+        self.assertEqual(valid_url_host_keys(r'https?://[^/]*example\.com/'), {'example.com', 'com'})
+        self.assertEqual(valid_url_host_keys(r'https?://example\.com(?::\d+)?/'), {'example.com'})
+        for valid_url in (
+            r'https?://[^/]+/(?P<id>\d+)',  # Any host
+            r'https?://(?:www\.)?example',  # Matches e.g. example.com too
+            r'https?://.+\.example\.com/',  # The host may contain "/"
+            r'(?:https?:)?//(?:www\.)?example\.com/|example:(?P<id>\w+)',  # No host
+            r'https?://[^/]*example/',  # Not a whole suffix of the host
+            r'https?://[\w-]+\.example\.com',  # Matches e.g. example.community too
+        ):
+            with self.assertRaises(_Unindexable, msg=valid_url):
+                valid_url_host_keys(valid_url)
+
+    def test_url_host_keys(self):
+        self.assertEqual(url_host_keys('https://www.Example.com/watch'), {'www.example.com', 'example.com', 'com'})
+        self.assertEqual(url_host_keys('http://example.com:8080?x'), {
+            'example.com:8080?x', 'com:8080?x', 'example.com:8080', 'com:8080', 'example.com', 'com'})
+        self.assertEqual(url_host_keys('example:123'), set())
+
+    def test_candidates_match_linear_search(self):
+        ies = {ie.ie_key(): ie for ie in gen_extractors()}
+        index = ExtractorHostIndex(ies)
+        urls = {tc['url'] for tc in gettestcases(include_onlymatching=True) if 'url' in tc}
+        urls.update(('ytsearch:test', ':ytfav', 'BaW_jenozKc', 'https://example.com/video.mp4'))
+        for url in sorted(urls):
+            self.assertEqual(
+                [key for key in index.candidates(url) if ies[key].suitable(url)],
+                [key for key, ie in ies.items() if ie.suitable(url)], f'Different extractors for {url!r}')
+
+
 if __name__ == '__main__':
     unittest.main()
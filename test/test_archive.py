@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import shutil
+
+from test.helper import FakeYDL
+from yt_dlp.archive import (
+    SQLiteDownloadArchive,
+    TextDownloadArchive,
+    convert_download_archive,
+    open_download_archive,
+)
+from yt_dlp.dependencies import sqlite3
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestDownloadArchive(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = os.path.join(TEST_DIR, 'testdata', 'archive_test')
+        self.tearDown()
+        os.makedirs(self.test_dir)
+        self.ydl = FakeYDL()
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def _path(self, name):
+        return os.path.join(self.test_dir, name)
+
+    def test_text_archive(self):
+        fn = self._path('archive.txt')
+        with open(fn, 'w', encoding='utf-8') as f:
+            f.write('youtube a\nyoutube b\n')
+        archive = open_download_archive(self.ydl, fn)
+        self.assertIsInstance(archive, TextDownloadArchive)
+        self.assertIn('youtube a', archive)
+        self.assertNotIn('youtube c', archive)
+
+        archive.add('youtube c')
+        self.assertIn('youtube c', archive)
+
+        # Entries appended by another process are seen
+        other = open_download_archive(self.ydl, fn)
+        other.add('youtube d')
+        self.assertIn('youtube d', archive)
+        with open(fn, 'a', encoding='utf-8') as f:
+            f.write('youtube e')
+        self.assertNotIn('youtube e', archive)
+        with open(fn, 'a', encoding='utf-8') as f:
+            f.write('\n')
+        self.assertIn('youtube e', archive)
+        self.assertEqual(list(archive), ['youtube a', 'youtube b', 'youtube c', 'youtube d', 'youtube e'])
+
+    @unittest.skipUnless(sqlite3, 'sqlite3 is not available')
+    def test_sqlite_archive(self):
+        fn = self._path('archive.sqlite')
+        archive = open_download_archive(self.ydl, fn)
+        self.assertIsInstance(archive, SQLiteDownloadArchive)
+        self.assertNotIn('youtube a', archive)
+        archive.update(['youtube a', 'youtube b', 'youtube a'])
+
+        other = open_download_archive(self.ydl, fn)
+        self.assertIn('youtube a', other)
+        other.add('youtube c')
+        self.assertIn('youtube c', archive)
+        self.assertEqual(sorted(archive), ['youtube a', 'youtube b', 'youtube c'])
+        archive.close()
+        other.close()
+
+        # Detected by its content regardless of the file name
+        shutil.move(fn, self._path('archive'))
+        archive = open_download_archive(self.ydl, self._path('archive'))
+        self.assertIsInstance(archive, SQLiteDownloadArchive)
+        self.assertIn('youtube b', archive)
+        archive.close()
+
+    @unittest.skipUnless(sqlite3, 'sqlite3 is not available')
+    def test_convert_archive(self):
+        src = self._path('archive.txt')
+        with open(src, 'w', encoding='utf-8') as f:
+            f.write('youtube a\nyoutube b\n\nyoutube a\nyoutube c\n')
+
+        self.assertEqual(convert_download_archive(self.ydl, src, self._path('archive.db')), 3)
+        self.assertEqual(convert_download_archive(self.ydl, self._path('archive.db'), self._path('compact.txt')), 3)
+        with open(self._path('compact.txt'), encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'youtube a\nyoutube b\nyoutube c\n')
+
+    def test_convert_archive_existing_destination(self):
+        src, dest = self._path('archive.txt'), self._path('dest.txt')
+        with open(src, 'w', encoding='utf-8') as f:
+            f.write('youtube a\nyoutube b\n')
+        with open(dest, 'w', encoding='utf-8') as f:
+            f.write('youtube c\nyoutube a\n\nyoutube c\n')
+
+        self.assertEqual(convert_download_archive(self.ydl, src, dest), 2)
+        with open(dest, encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'youtube c\nyoutube a\nyoutube b\n')
+
+        archive = open_download_archive(self.ydl, dest)
+        archive.update(['youtube a', 'youtube d', 'youtube d'])
+        with open(dest, encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'youtube c\nyoutube a\nyoutube b\nyoutube d\n')
+
+    def test_convert_archive_in_place(self):
+        fn = self._path('archive.txt')
+        with open(fn, 'w', encoding='utf-8') as f:
+            f.write('youtube a\nyoutube b\nyoutube a\n')
+
+        self.assertEqual(convert_download_archive(self.ydl, fn, fn), 2)
+        with open(fn, encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'youtube a\nyoutube b\n')
+        self.assertEqual(os.listdir(self.test_dir), ['archive.txt'])
+
+
+if __name__ == '__main__':
+    unittest.main()
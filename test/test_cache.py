@@ -9,9 +9,11 @@
 
 
 import shutil
+import time
 
 from test.helper import FakeYDL
 from yt_dlp.cache import Cache
+from yt_dlp.dependencies import sqlite3
 
 
 def _is_empty(d):
@@ -52,6 +54,105 @@ def test_cache(self):
         self.assertFalse(os.path.exists(self.test_dir))
         self.assertEqual(c.load('test_cache', 'k.'), None)
 
+    @unittest.skipUnless(sqlite3, 'sqlite3 is not available')
+    def test_sqlite_cache(self):
+        ydl = FakeYDL({
+            'cachedir': self.test_dir,
+            'cache_backend': 'sqlite',
+        })
+        c = Cache(ydl)
+        obj = {'x': 1, 'y': ['ä', '\\a', True]}
+        self.assertEqual(c.load('test_cache', 'k.'), None)
+        c.store('test_cache', 'k.', obj)
+        c.store('test_cache', 'k2', 1)
+        c.store('test_cache2', 'k.', 2)
+        self.assertFalse([f for f in os.listdir(self.test_dir) if not f.startswith('cache.sqlite3')])
+        self.assertEqual(c.load('test_cache', 'k.'), obj)
+        self.assertEqual(Cache(ydl).load('test_cache', 'k.'), obj)
+        self.assertEqual(c.load('test_cache2', 'k.'), 2)
+        self.assertEqual(c.load('test_cache', 'y'), None)
+        self.assertEqual((c.hits, c.misses), (2, 2))
+        self.assertEqual({section: count for section, (count, _) in c.stats().items()}, {
+            'test_cache': 2,
+            'test_cache2': 1,
+        })
+        c.remove()
+        self.assertFalse(os.path.exists(self.test_dir))
+        self.assertEqual(c.load('test_cache', 'k.'), None)
+
+    @unittest.skipUnless(sqlite3, 'sqlite3 is not available')
+    def test_sqlite_cache_corrupt(self):
+        ydl = FakeYDL({
+            'cachedir': self.test_dir,
+            'cache_backend': 'sqlite',
+        })
+        warnings = []
+        ydl.report_warning = warnings.append
+        _mkdir(self.test_dir)
+        with open(os.path.join(self.test_dir, 'cache.sqlite3'), 'wb') as f:
+            f.write(b'not a database' * 100)
+        c = Cache(ydl)
+        self.assertEqual(c.load('test_cache', 'k'), None)
+        self.assertEqual(c.stats(), {})
+        c.store('test_cache', 'k', 1)
+        self.assertEqual(len(warnings), 3)
+        self.assertIn('file is not a database', warnings[0])
+        c.close()
+
+    def test_cache_ttl(self):
+        for backend in ('json', 'sqlite') if sqlite3 else ('json',):
+            ydl = FakeYDL({
+                'cachedir': self.test_dir,
+                'cache_backend': backend,
+                'cache_ttl': {'test_cache': 3600},
+            })
+            c = Cache(ydl)
+            c.store('test_cache', 'k', 1)
+            c.store('test_cache2', 'k', 2)
+            self.assertEqual(c.load('test_cache', 'k'), 1, backend)
+            ydl.params['cache_ttl'] = {'test_cache': 0, 'default': 3600}
+            time.sleep(0.01)
+            self.assertEqual(c.load('test_cache', 'k'), None, backend)
+            self.assertEqual(c.load('test_cache2', 'k'), 2, backend)
+            self.assertEqual(c.stats().get('test_cache', (0, 0)), (0, 0), backend)
+            c.remove()
+
+    @unittest.skipIf(os.name == 'nt', 'file modes are not used on Windows')
+    def test_private_entries(self):
+        def modes(path):
+            return {name: os.stat(os.path.join(path, name)).st_mode & 0o777 for name in os.listdir(path)}
+
+        old_umask = os.umask(0o022)
+        try:
+            for backend in ('json', 'sqlite') if sqlite3 else ('json',):
+                c = Cache(FakeYDL({'cachedir': self.test_dir, 'cache_backend': backend}))
+                c.store('test_cache', 'public', 1)
+                c.store('test_cache', 'private', 2, private=True)
+                self.assertEqual(c.load('test_cache', 'private'), 2, backend)
+                if backend == 'json':
+                    self.assertEqual(modes(os.path.join(self.test_dir, 'test_cache')), {
+                        'public.json': 0o644, 'private.json': 0o600})
+                else:
+                    self.assertEqual(set(modes(self.test_dir).values()), {0o600})
+                c.remove()
+        finally:
+            os.umask(old_umask)
+
+    @unittest.skipUnless(sqlite3, 'sqlite3 is not available')
+    def test_sqlite_cache_eviction(self):
+        ydl = FakeYDL({
+            'cachedir': self.test_dir,
+            'cache_backend': 'sqlite',
+            'cache_max_size': 1000,
+        })
+        c = Cache(ydl)
+        for i in range(10):
+            c.store('test_cache', f'k{i}', 'x' * 200)
+        _, size = c.stats()['test_cache']
+        self.assertLessEqual(size, 1000)
+        self.assertEqual(c.load('test_cache', 'k9'), 'x' * 200)
+        self.assertEqual(c.load('test_cache', 'k0'), None)
+
 
 if __name__ == '__main__':
     unittest.main()
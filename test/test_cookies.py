@@ -1,4 +1,8 @@
 import datetime as dt
+import json
+import os
+import sqlite3
+import tempfile
 import unittest
 
 from yt_dlp import cookies
@@ -7,8 +11,10 @@
     LinuxChromeCookieDecryptor,
     MacChromeCookieDecryptor,
     WindowsChromeCookieDecryptor,
+    _CachedCookieDecryptor,
     _get_linux_desktop_environment,
     _LinuxDesktopEnvironment,
+    extract_cookies_from_browser,
     parse_safari_cookies,
     pbkdf2_sha1,
 )
@@ -44,6 +50,19 @@ def __exit__(self, exc_type, exc_val, exc_tb):
             setattr(self._module, name, backup_value)
 
 
+class FakeStore:
+    def __init__(self):
+        self.entries = {}
+
+    def load(self, section, key):
+        data = self.entries.get((section, key))
+        return data and json.loads(data)
+
+    def store(self, section, key, data, private=False):
+        assert private, 'cookies must be stored privately'
+        self.entries[section, key] = json.dumps(data)
+
+
 class TestCookies(unittest.TestCase):
     def test_get_desktop_environment(self):
         """ based on https://chromium.googlesource.com/chromium/src/+/refs/heads/main/base/nix/xdg_util_unittest.cc """
@@ -170,6 +189,50 @@ def test_pbkdf2_sha1(self):
         key = pbkdf2_sha1(b'peanuts', b' ' * 16, 1, 16)
         self.assertEqual(key, b'g\xe1\x8e\x0fQ\x1c\x9b\xf3\xc9`!\xaa\x90\xd9\xd34')
 
+    def test_cached_cookie_decryptor(self):
+        encrypted_value = b'v10\xccW%\xcd\xe6\xe6\x9fM" \xa7\xb0\xca\xe4\x07\xd6'
+        with MonkeyPatch(cookies, {'_get_linux_keyring_password': lambda *args, **kwargs: b''}):
+            decryptor = _CachedCookieDecryptor(lambda: LinuxChromeCookieDecryptor('Chrome', Logger()))
+            self.assertEqual(decryptor.decrypt(encrypted_value), 'USD')
+            self.assertEqual(decryptor._cookie_counts, {'v10': 1, 'v11': 0, 'other': 0, 'cached': 0})
+
+        def make_decryptor():
+            raise AssertionError('the decryptor should not be needed')
+
+        decryptor = _CachedCookieDecryptor(make_decryptor, decryptor.decrypted)
+        self.assertEqual(decryptor.decrypt(encrypted_value), 'USD')
+        self.assertEqual(decryptor._cookie_counts, {'cached': 1})
+
+    def test_firefox_cookie_cache(self):
+        with tempfile.TemporaryDirectory() as profile:
+            database_path = os.path.join(profile, 'cookies.sqlite')
+
+            def add_cookies(*hosts):
+                with sqlite3.connect(database_path) as conn:
+                    conn.execute('PRAGMA user_version = 17')
+                    conn.execute(
+                        'CREATE TABLE IF NOT EXISTS moz_cookies (host TEXT, name TEXT, value TEXT, '
+                        'path TEXT, expiry INTEGER, isSecure INTEGER, originAttributes TEXT)')
+                    conn.executemany(
+                        "INSERT INTO moz_cookies VALUES (?, 'name', 'value', '/', NULL, 0, '')",
+                        [(host,) for host in hosts])
+                conn.close()
+
+            def extract():
+                jar = extract_cookies_from_browser(
+                    'firefox', profile, Logger(), cache=store, domains=['example.com'])
+                return sorted(cookie.domain for cookie in jar)
+
+            store = FakeStore()
+            add_cookies('example.com', '.sub.example.com', 'notexample.com', '.example.org')
+            self.assertEqual(extract(), ['.sub.example.com', 'example.com'])
+
+            with MonkeyPatch(cookies, {'_open_database_copy': None}):
+                self.assertEqual(extract(), ['.sub.example.com', 'example.com'])
+
+            add_cookies('new.example.com')
+            self.assertEqual(extract(), ['.sub.example.com', 'example.com', 'new.example.com'])
+
 
 class TestLenientSimpleCookie(unittest.TestCase):
     def _run_tests(self, *cases):
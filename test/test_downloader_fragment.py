@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import collections
+import http.server
+import re
+import threading
+import time
+from unittest import mock
+
+from test.helper import http_server_port, try_rm
+from yt_dlp import YoutubeDL
+from yt_dlp.downloader import get_suitable_downloader
+from yt_dlp.downloader.common import FileDownloader
+from yt_dlp.downloader.dash import DashSegmentsFD
+from yt_dlp.downloader.streammerge import StreamMergeFD
+from yt_dlp.utils._utils import _YDLLogger as FakeLogger
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+FRAGMENT_COUNT = 20
+SLOW_FRAGMENT = 12
+SLOW_FRAGMENT_DELAY = 3
+
+
+def fragment_content(index):
+    return b'%04d' % index * 256
+
+
+def big_fragment_content(index):
+    return b'%04d' % index * (512 * 1024)
+
+
+class HTTPTestRequestHandler(http.server.BaseHTTPRequestHandler):
+    requests = collections.Counter()
+    range_requests = collections.Counter()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        mobj = re.match(r'^/(slow-|big-)?frag(\d+)$', self.path)
+        if not mobj:
+            self.send_response(404)
+            self.end_headers()
+            return
+        index = int(mobj.group(2))
+        self.requests[self.path] += 1
+        if mobj.group(1) == 'slow-' and index == SLOW_FRAGMENT and self.requests[self.path] == 1:
+            time.sleep(SLOW_FRAGMENT_DELAY)
+        content = (big_fragment_content if mobj.group(1) == 'big-' else fragment_content)(index)
+        range_m = re.match(r'^bytes=(\d+)-(\d*)$', self.headers.get('Range') or '')
+        if range_m:
+            self.range_requests[self.path] += 1
+            start, end = int(range_m.group(1)), int(range_m.group(2) or len(content) - 1)
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{len(content)}')
+            content = content[start:end + 1]
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', 'video/mp4')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class TestFragmentFD(unittest.TestCase):
+    def setUp(self):
+        HTTPTestRequestHandler.requests.clear()
+        HTTPTestRequestHandler.range_requests.clear()
+        self.httpd = http.server.ThreadingHTTPServer(
+            ('127.0.0.1', 0), HTTPTestRequestHandler)
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+    def tearDown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def download(self, params, path='frag', content=fragment_content):
+        params['logger'] = FakeLogger()
+        ydl = YoutubeDL(params)
+        downloader = DashSegmentsFD(ydl, params)
+        filename = os.path.join(TEST_DIR, 'testfile_fragments.mp4')
+        try_rm(filename)
+        try:
+            self.assertTrue(downloader.real_download(filename, {
+                'url': f'http://127.0.0.1:{self.port}/',
+                'protocol': 'http_dash_segments',
+                'fragment_base_url': f'http://127.0.0.1:{self.port}/',
+                'fragments': [{'path': f'{path}{i}'} for i in range(FRAGMENT_COUNT)],
+            }))
+            with open(filename, 'rb') as f:
+                self.assertEqual(f.read(), b''.join(map(content, range(FRAGMENT_COUNT))))
+            self.assertFalse([
+                name for name in os.listdir(TEST_DIR) if name.startswith('testfile_fragments.mp4.part-Frag')])
+            self.assertFalse([name for name in os.listdir(TEST_DIR) if name.startswith('testfile_fragments.mp4.')])
+        finally:
+            try_rm(filename)
+
+    def opened_fragment_files(self, params):
+        opened, original = [], FileDownloader.sanitize_open
+
+        def sanitize_open(downloader, filename, open_mode):
+            opened.append(filename)
+            return original(downloader, filename, open_mode)
+
+        with mock.patch.object(FileDownloader, 'sanitize_open', sanitize_open):
+            self.download(params)
+        return [filename for filename in opened if '-Frag' in filename]
+
+    def test_fragments_on_disk(self):
+        self.assertEqual(len(self.opened_fragment_files({})), 2 * FRAGMENT_COUNT)
+        self.assertEqual(len(self.opened_fragment_files({'concurrent_fragment_downloads': 4})), 2 * FRAGMENT_COUNT)
+
+    def test_fragments_in_memory(self):
+        self.assertEqual(self.opened_fragment_files({'fragments_in_memory': True}), [])
+        self.assertEqual(self.opened_fragment_files({
+            'fragments_in_memory': True, 'concurrent_fragment_downloads': 4}), [])
+
+    def test_fragments_in_memory_leftover_files(self):
+        # Fragments that are on disk from a previous run are used instead of an empty buffer
+        leftovers = {
+            os.path.join(TEST_DIR, 'testfile_fragments.mp4.part-Frag3'): fragment_content(2),
+            os.path.join(TEST_DIR, 'testfile_fragments.mp4.part-Frag5.part'): fragment_content(4)[:100],
+        }
+        for leftover, content in leftovers.items():
+            with open(leftover, 'wb') as f:
+                f.write(content)
+        try:
+            self.download({'fragments_in_memory': True})
+        finally:
+            for leftover in leftovers:
+                try_rm(leftover)
+
+    def test_fragments_single_connection(self):
+        # Fragments are not split into ranges even if the server supports them
+        self.download({'http_connections': 4}, path='big-frag', content=big_fragment_content)
+        self.download({'http_connections': 4, 'fragments_in_memory': True}, path='big-frag', content=big_fragment_content)
+        self.assertEqual(HTTPTestRequestHandler.range_requests, {})
+        self.assertEqual(set(HTTPTestRequestHandler.requests.values()), {2})
+
+    def test_straggler_redispatch(self):
+        start = time.monotonic()
+        self.download({
+            'concurrent_fragment_downloads': 4,
+            'fragment_straggler_percentile': 90,
+        }, path='slow-frag')
+        # The slow attempt is not waited for
+        self.assertLess(time.monotonic() - start, SLOW_FRAGMENT_DELAY)
+        self.assertEqual(HTTPTestRequestHandler.requests[f'/slow-frag{SLOW_FRAGMENT}'], 2)
+        self.assertEqual(HTTPTestRequestHandler.requests['/slow-frag0'], 1)
+        # and its fragment is discarded once it completes
+        time.sleep(SLOW_FRAGMENT_DELAY)
+        self.assertFalse([name for name in os.listdir(TEST_DIR) if name.startswith('testfile_fragments.mp4')])
+
+    def test_dest_stream(self):
+        params = {'logger': FakeLogger()}
+        filename = os.path.join(TEST_DIR, 'testfile_fragments.mp4')
+        stream_filename = os.path.join(TEST_DIR, 'testfile_fragments.stream')
+        try_rm(stream_filename)
+        try:
+            with open(stream_filename, 'wb') as stream:
+                self.assertTrue(DashSegmentsFD(YoutubeDL(params), params).real_download(filename, {
+                    'url': f'http://127.0.0.1:{self.port}/',
+                    'protocol': 'http_dash_segments',
+                    'fragment_base_url': f'http://127.0.0.1:{self.port}/',
+                    'fragments': [{'path': f'frag{i}'} for i in range(FRAGMENT_COUNT)],
+                    '_dest_stream': stream,
+                }))
+                self.assertTrue(stream.closed)
+            with open(stream_filename, 'rb') as f:
+                self.assertEqual(f.read(), b''.join(map(fragment_content, range(FRAGMENT_COUNT))))
+            self.assertFalse([name for name in os.listdir(TEST_DIR) if name.startswith('testfile_fragments.mp4')])
+        finally:
+            try_rm(stream_filename)
+
+    def test_stream_merge(self):
+        # Stands in for ffmpeg: concatenate what is read from the pipes into the output file
+        merger = (
+            'import sys, threading\n'
+            'data = {}\n'
+            'def read(fd): data[fd] = open(int(fd), "rb").read()\n'
+            'threads = [threading.Thread(target=read, args=(fd,)) for fd in sys.argv[1:-1]]\n'
+            '[t.start() for t in threads]; [t.join() for t in threads]\n'
+            'open(sys.argv[-1], "wb").write(b"".join(data[fd] for fd in sys.argv[1:-1]))\n')
+
+        def merge_args(self, info_dict, input_fds):
+            return [sys.executable, '-c', merger, *map(str, input_fds)], mock.Mock(
+                _ffmpeg_filename_argument=lambda filename: filename)
+
+        fragments = [{'path': f'frag{i}'} for i in range(FRAGMENT_COUNT)]
+        info_dict = {
+            'id': 'test',
+            'ext': 'mp4',
+            'url': f'http://127.0.0.1:{self.port}/',
+            'protocol': 'http_dash_segments+http_dash_segments',
+            'requested_formats': [{
+                'format_id': format_id,
+                'url': f'http://127.0.0.1:{self.port}/',
+                'protocol': 'http_dash_segments',
+                'fragment_base_url': f'http://127.0.0.1:{self.port}/',
+                'fragments': fragments[start:],
+            } for format_id, start in (('video', 0), ('audio', 10))],
+        }
+        params = {'logger': FakeLogger(), 'stream_merge': True, 'concurrent_fragment_downloads': 2}
+        ydl = YoutubeDL(params)
+        filename = os.path.join(TEST_DIR, 'testfile_fragments.mp4')
+        try_rm(filename)
+        with mock.patch('yt_dlp.downloader.streammerge.FFmpegFD.available', return_value=True):
+            self.assertIs(get_suitable_downloader(info_dict, params), StreamMergeFD)
+            self.assertIsNone(get_suitable_downloader(info_dict, {**params, 'keepvideo': True}))
+        self.assertIsNone(get_suitable_downloader(info_dict, {**params, 'stream_merge': False}))
+
+        try:
+            with mock.patch.object(StreamMergeFD, '_merge_args', merge_args):
+                self.assertTrue(StreamMergeFD(ydl, params).real_download(filename, info_dict))
+            with open(filename, 'rb') as f:
+                self.assertEqual(f.read(), b''.join(map(fragment_content, [*range(FRAGMENT_COUNT), *range(10, FRAGMENT_COUNT)])))
+            self.assertFalse([
+                name for name in os.listdir(TEST_DIR) if name.startswith('testfile_fragments.') and name != 'testfile_fragments.mp4'])
+        finally:
+            try_rm(filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,6 +9,7 @@
 
 
 import http.server
+import json
 import re
 import threading
 
@@ -21,6 +22,7 @@
 
 
 TEST_SIZE = 10 * 1024
+SEGMENTED_DATA = bytes(i % 251 for i in range(64 * 1024))
 
 
 class HTTPTestRequestHandler(http.server.BaseHTTPRequestHandler):
@@ -54,8 +56,25 @@ def serve(self, range=True, content_length=True):
         self.end_headers()
         self.wfile.write(b'#' * size)
 
+    def serve_ranges(self):
+        start, end = 0, len(SEGMENTED_DATA) - 1
+        mobj = re.search(r'^bytes=(\d+)-(\d*)', self.headers.get('Range') or '')
+        if mobj:
+            start, end = int(mobj.group(1)), min(int(mobj.group(2) or end), end)
+            self.server.requested_ranges.append((start, end))
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{len(SEGMENTED_DATA)}')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', 'video/mp4')
+        self.send_header('Content-Length', end - start + 1)
+        self.end_headers()
+        self.wfile.write(SEGMENTED_DATA[start:end + 1])
+
     def do_GET(self):
-        if self.path == '/regular':
+        if self.path == '/ranges':
+            self.serve_ranges()
+        elif self.path == '/regular':
             self.serve()
         elif self.path == '/no-content-length':
             self.serve(content_length=False)
@@ -69,8 +88,9 @@ def do_GET(self):
 
 class TestHttpFD(unittest.TestCase):
     def setUp(self):
-        self.httpd = http.server.HTTPServer(
+        self.httpd = http.server.ThreadingHTTPServer(
             ('127.0.0.1', 0), HTTPTestRequestHandler)
+        self.httpd.requested_ranges = []
         self.port = http_server_port(self.httpd)
         self.server_thread = threading.Thread(target=self.httpd.serve_forever)
         self.server_thread.daemon = True
@@ -100,6 +120,54 @@ def test_chunked(self):
             'http_chunk_size': 1000,
         })
 
+    def test_multiple_connections(self):
+        self.download_all({'http_connections': 4})
+
+    def segmented_download(self, params=None):
+        ydl = YoutubeDL({'logger': FakeLogger(), 'http_connections': 4, **(params or {})})
+        downloader = HttpFD(ydl, ydl.params)
+        downloader._MIN_SEGMENT_SIZE = 4 * 1024
+        self.assertTrue(downloader.real_download('testfile.mp4', {
+            'url': f'http://127.0.0.1:{self.port}/ranges',
+        }))
+        with open('testfile.mp4', 'rb') as f:
+            self.assertEqual(f.read(), SEGMENTED_DATA)
+        self.assertFalse(os.path.exists('testfile.mp4.part'))
+        self.assertFalse(os.path.exists('testfile.mp4.ytdl'))
+
+    def test_segmented(self):
+        try_rm('testfile.mp4')
+        try:
+            self.segmented_download()
+            ranges = self.httpd.requested_ranges[1:]
+            self.assertGreaterEqual(len(ranges), 4)
+            # Ranges that were taken over are requested again, so they may overlap
+            self.assertEqual(min(start for start, _ in ranges), 0)
+            self.assertEqual(max(end for _, end in ranges), len(SEGMENTED_DATA) - 1)
+
+            try_rm('testfile.mp4')
+            self.httpd.requested_ranges.clear()
+            self.segmented_download({'http_chunk_size': 5000})
+            self.assertTrue(all(end - start < 5000 for start, end in self.httpd.requested_ranges))
+        finally:
+            try_rm('testfile.mp4')
+
+    def test_segmented_resume(self):
+        size = len(SEGMENTED_DATA)
+        try_rm('testfile.mp4')
+        with open('testfile.mp4.part', 'wb') as f:
+            f.write(SEGMENTED_DATA[:size // 2] + bytes(size - size // 2))
+        with open('testfile.mp4.ytdl', 'w') as f:
+            json.dump({'downloader': {'http_ranges': {
+                'content_len': size,
+                'ranges': [[0, size // 2, size // 2 + 99], [size // 2 + 100, size // 2 + 100, size - 1]],
+            }}}, f)
+        try:
+            self.segmented_download()
+            self.assertTrue(all(start >= size // 2 for start, _ in self.httpd.requested_ranges[1:]))
+        finally:
+            try_rm('testfile.mp4')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -10,6 +10,7 @@
 
 import contextlib
 import subprocess
+from unittest.mock import patch
 
 from yt_dlp.utils import Popen
 
@@ -43,6 +44,13 @@ def test_cmdline_umlauts(self):
         _, stderr = self.run_yt_dlp(opts=('ä', '--version'))
         self.assertFalse(stderr)
 
+    def test_profile_startup(self):
+        _, stderr = self.run_yt_dlp(opts=('--profile-startup', '--version'))
+        self.assertRegex(stderr, r'^\[debug\] Imported \d+ modules in')
+        # Which modules are the slowest depends on the environment
+        self.assertRegex(stderr, r'(?m)^Module +Self +Cumulative$')
+        self.assertRegex(stderr, r'(?m)^Package +Modules +Self$')
+
     def test_lazy_extractors(self):
         try:
             subprocess.check_call([sys.executable, 'devscripts/make_lazy_extractors.py', LAZY_EXTRACTORS],
@@ -56,6 +64,16 @@ def test_lazy_extractors(self):
             self.assertFalse(stderr)
 
             subprocess.check_call([sys.executable, 'test/test_all_urls.py'], cwd=rootDir, stdout=subprocess.DEVNULL)
+
+            # Every extractor must be included, in the same order
+            list_extractors = (
+                'from yt_dlp.extractor import gen_extractor_classes; from yt_dlp.globals import LAZY_EXTRACTORS; '
+                'ies = gen_extractor_classes(); print(LAZY_EXTRACTORS.value, *(ie.__name__ for ie in ies))')
+            lazy_ies, _ = self.run_yt_dlp(exe=(sys.executable, '-c', list_extractors))
+            with patch.dict(os.environ, {'YTDLP_NO_LAZY_EXTRACTORS': '1'}):
+                ies, _ = self.run_yt_dlp(exe=(sys.executable, '-c', list_extractors))
+            self.assertEqual(lazy_ies.split(), ['True', *ies.split()[1:]])
+            self.assertIn('SearchForAlternativeIE', lazy_ies.split())
         finally:
             with contextlib.suppress(OSError):
                 os.remove(LAZY_EXTRACTORS)
@@ -0,0 +1,128 @@
+import pytest
+
+from yt_dlp import YoutubeDL
+from yt_dlp.extractor.youtube.jsc._director import JsChallengeCache, JsChallengeRequestDirector
+from yt_dlp.extractor.youtube.jsc.provider import (
+    JsChallengeProvider,
+    JsChallengeProviderResponse,
+    JsChallengeRequest,
+    JsChallengeResponse,
+    JsChallengeType,
+    NChallengeInput,
+    NChallengeOutput,
+    SigChallengeInput,
+    SigChallengeOutput,
+)
+from yt_dlp.extractor.youtube.pot._director import YoutubeIEContentProviderLogger
+
+PLAYER_URL = 'https://www.youtube.com/s/player/0004de42/player_ias.vflset/en_US/base.js'
+OTHER_PLAYER_URL = 'https://www.youtube.com/s/player/0004de42/tv-player-ias.vflset/tv-player-ias.js'
+
+
+class ReverseJCP(JsChallengeProvider):
+    PROVIDER_NAME = 'reverse'
+    _SUPPORTED_TYPES = [JsChallengeType.N, JsChallengeType.SIG]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.solved = []
+
+    def is_available(self) -> bool:
+        return True
+
+    def _real_bulk_solve(self, requests):
+        for request in requests:
+            self.solved.extend(request.input.challenges)
+            results = {challenge: challenge[::-1] + '_' for challenge in request.input.challenges}
+            output = NChallengeOutput(results) if request.type is JsChallengeType.N else SigChallengeOutput(results)
+            yield JsChallengeProviderResponse(request, JsChallengeResponse(request.type, output))
+
+
+@pytest.fixture
+def make_director(tmp_path):
+    ydls = []
+
+    def make_director(cachedir=tmp_path, **kwargs):
+        ydl = YoutubeDL({'cachedir': cachedir})
+        ydls.append(ydl)
+        ie = ydl.get_info_extractor('Youtube')
+        logger = YoutubeIEContentProviderLogger(ie, 'jsc')
+        director = JsChallengeRequestDirector(logger, JsChallengeCache(
+            logger, ie.cache, ie._player_js_cache_key, **kwargs))
+        director.provider = ReverseJCP(ie, logger, {})
+        director.register_provider(director.provider)
+        return director
+
+    yield make_director
+    for ydl in ydls:
+        ydl.close()
+
+
+def n_request(*challenges, player_url=PLAYER_URL):
+    return JsChallengeRequest(JsChallengeType.N, NChallengeInput(player_url, list(challenges)))
+
+
+def results(responses):
+    return [(request.input.challenges, response.output.results) for request, response in responses]
+
+
+def test_cache_shared_between_directors(make_director):
+    director = make_director()
+    sig_request = JsChallengeRequest(JsChallengeType.SIG, SigChallengeInput(PLAYER_URL, ['0123']))
+    expected = [(['abc', 'def'], {'abc': 'cba_', 'def': 'fed_'}), (['0123'], {'0123': '3210_'})]
+    assert results(director.bulk_solve([n_request('abc', 'def'), sig_request])) == expected
+    assert director.cache.stats() == {'hits': 0, 'misses': 3, 'stores': 3}
+
+    other_director = make_director()
+    assert results(other_director.bulk_solve([n_request('abc', 'def'), sig_request])) == expected
+    assert other_director.provider.solved == []
+    assert other_director.cache.stats() == {'hits': 3, 'misses': 0, 'stores': 0}
+
+
+def test_cache_partial_hit(make_director):
+    make_director().bulk_solve([n_request('abc')])
+
+    director = make_director()
+    request = n_request('abc', 'def')
+    assert director.bulk_solve([request]) == [
+        (request, JsChallengeResponse(JsChallengeType.N, NChallengeOutput({'abc': 'cba_', 'def': 'fed_'})))]
+    assert director.provider.solved == ['def']
+    assert director.cache.stats() == {'hits': 1, 'misses': 1, 'stores': 1}
+
+
+def test_cache_keyed_by_player(make_director):
+    make_director().bulk_solve([n_request('abc')])
+
+    director = make_director()
+    director.bulk_solve([n_request('abc', player_url=OTHER_PLAYER_URL)])
+    assert director.provider.solved == ['abc']
+
+
+def test_cache_invalid_entry(make_director):
+    director = make_director()
+    director.bulk_solve([n_request('abc')])
+    # An n result that ends with the challenge means that solving it failed
+    key = director.cache._generate_key(n_request('abc'), 'abc')
+    entry = director.cache.cache.load(JsChallengeCache.SECTION, key)
+    director.cache.cache.store(JsChallengeCache.SECTION, key, {**entry, 'result': 'xabc'})
+
+    other_director = make_director()
+    assert results(other_director.bulk_solve([n_request('abc')])) == [(['abc'], {'abc': 'cba_'})]
+    assert other_director.provider.solved == ['abc']
+
+
+def test_cache_expired_entry(make_director):
+    make_director(ttl=-1).bulk_solve([n_request('abc')])
+
+    director = make_director()
+    director.bulk_solve([n_request('abc')])
+    assert director.provider.solved == ['abc']
+    assert director.cache.hits == 0
+
+
+def test_cache_disabled(make_director):
+    for _ in range(2):
+        director = make_director(cachedir=False)
+        assert results(director.bulk_solve([n_request('abc')])) == [(['abc'], {'abc': 'cba_'})]
+        assert director.provider.solved == ['abc']
+        assert director.cache.stats() == {'hits': 0, 'misses': 0, 'stores': 0}
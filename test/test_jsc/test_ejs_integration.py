@@ -151,3 +151,16 @@ def test_using_cached_player(jcp):
     result = json.loads(jcp._run_js_runtime(jcp._construct_stdin(preprocessed, True, first_player_requests)))
 
     assert initial == result
+
+
+@pytest.mark.download
+def test_using_worker(jcp):
+    if not jcp._worker:
+        pytest.skip(f'{jcp.PROVIDER_NAME} does not support a persistent worker')
+    try:
+        assert list(jcp.bulk_solve(requests)) == responses
+        assert list(jcp.bulk_solve(requests)) == responses
+        assert jcp._worker.starts == 1
+        assert jcp._worker.players_loaded == len({request.input.player_url for request in requests})
+    finally:
+        jcp.close()
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import shutil
+import time
+
+import pytest
+
+from yt_dlp.extractor.youtube.jsc._builtin.ejs import Script, ScriptSource, ScriptType, ScriptVariant
+from yt_dlp.extractor.youtube.jsc._builtin.node import NodeJCP
+from yt_dlp.extractor.youtube.jsc._builtin.worker import JsRuntimeWorker, JsRuntimeWorkerError, worker_program
+from yt_dlp.extractor.youtube.jsc.provider import (
+    JsChallengeProviderResponse,
+    JsChallengeRequest,
+    JsChallengeResponse,
+    JsChallengeType,
+    NChallengeInput,
+    NChallengeOutput,
+    SigChallengeInput,
+    SigChallengeOutput,
+)
+
+_node = shutil.which('node')
+pytestmark = pytest.mark.skipif(not _node, reason='node not available')
+
+# Reverses the challenges, and records how many players it has preprocessed
+FAKE_SOLVER = '''\
+let preprocessed = 0;
+function jsc(input) {
+  let player = input.preprocessed_player;
+  if (input.type === 'player') {
+    if (input.player === 'crash') {
+      process.exit(3);
+    } else if (input.player === 'invalid') {
+      throw new Error('invalid player');
+    }
+    preprocessed++;
+    player = input.player;
+  }
+  return {
+    type: 'result',
+    preprocessed_player: player,
+    responses: input.requests.map((request) => ({
+      type: 'result',
+      data: Object.fromEntries(request.challenges.map((challenge) => [
+        challenge, `${player}:${[...challenge].reverse().join('')}:${preprocessed}`])),
+    })),
+  };
+}
+'''
+
+
+def make_worker(logger, **kwargs):
+    return JsRuntimeWorker(
+        'node', worker_program('node', FAKE_SOLVER), lambda program_path: [_node, program_path], logger, **kwargs)
+
+
+class PlayerLoader:
+    def __init__(self):
+        self.loaded = []
+
+    def __call__(self, player):
+        def get_player():
+            self.loaded.append(player)
+            return player
+        return get_player
+
+
+def n_requests(*challenges):
+    return [{'type': 'n', 'challenges': list(challenges)}]
+
+
+def test_worker_keeps_players(logger):
+    worker = make_worker(logger)
+    load = PlayerLoader()
+    try:
+        assert worker.solve('a', n_requests('abc', 'def'), load('a')) == {
+            'id': 1, 'type': 'result', 'responses': [{'type': 'result', 'data': {'abc': 'a:cba:1', 'def': 'a:fed:1'}}]}
+        assert worker.has_player('a')
+        assert worker.solve('a', n_requests('ghi'), load('a'))['responses'][0]['data'] == {'ghi': 'a:ihg:1'}
+        assert worker.solve('b', n_requests('abc'), load('b'))['responses'][0]['data'] == {'abc': 'b:cba:2'}
+        assert load.loaded == ['a', 'b']
+        assert (worker.starts, worker.players_loaded, worker.solves) == (1, 2, 3)
+    finally:
+        worker.close()
+    assert not worker.alive
+
+
+def test_worker_evicts_players(logger):
+    worker = make_worker(logger)
+    worker.MAX_PLAYERS = 2
+    load = PlayerLoader()
+    try:
+        for player in ('a', 'b', 'a', 'c', 'b', 'a'):
+            worker.solve(player, n_requests('abc'), load(player))
+        assert load.loaded == ['a', 'b', 'c', 'b', 'a']
+    finally:
+        worker.close()
+
+
+def test_worker_invalid_player(logger):
+    worker = make_worker(logger)
+    load = PlayerLoader()
+    try:
+        output = worker.solve('invalid', n_requests('abc'), load('invalid'))
+        assert output['type'] == 'error'
+        assert output['error'].startswith('invalid player')
+        assert not worker.has_player('invalid')
+        assert worker.alive
+    finally:
+        worker.close()
+
+
+def test_worker_restarts(logger):
+    worker = make_worker(logger)
+    load = PlayerLoader()
+    try:
+        worker.solve('a', n_requests('abc'), load('a'))
+        worker._proc.kill()
+        worker._proc.wait()
+        assert not worker.has_player('a')
+        assert worker.solve('a', n_requests('abc'), load('a'))['responses'][0]['data'] == {'abc': 'a:cba:1'}
+        assert load.loaded == ['a', 'a']
+
+        # Only restarted once for the same request
+        with pytest.raises(JsRuntimeWorkerError, match=r'returncode: 3'):
+            worker.solve('crash', n_requests('abc'), load('crash'))
+        assert worker.starts == 3
+        assert worker.solve('b', n_requests('abc'), load('b'))['type'] == 'result'
+        assert worker.starts == 4
+    finally:
+        worker.close()
+
+
+def test_worker_start_failure(logger):
+    worker = JsRuntimeWorker(
+        'node', 'throw new Error("broken worker");', lambda program_path: [_node, program_path], logger)
+    with pytest.raises(JsRuntimeWorkerError, match=r'broken worker'):
+        worker.solve('a', n_requests('abc'), PlayerLoader()('a'))
+    assert worker.starts == 2
+    assert not worker.alive
+
+
+def test_worker_idle_shutdown(logger):
+    worker = make_worker(logger, idle_timeout=0.2)
+    load = PlayerLoader()
+    try:
+        worker.solve('a', n_requests('abc'), load('a'))
+        for _ in range(50):
+            if not worker.alive:
+                break
+            time.sleep(0.1)
+        assert not worker.alive
+        assert worker.solve('a', n_requests('abc'), load('a'))['type'] == 'result'
+        assert worker.starts == 2
+        assert load.loaded == ['a', 'a']
+    finally:
+        worker.close()
+
+
+@pytest.fixture
+def node_jcp(ie, logger):
+    jcp = NodeJCP(ie, logger, None)
+    if not jcp.is_available():
+        pytest.skip('node is not available')
+    jcp._lib_script = Script(ScriptType.LIB, ScriptVariant.UNKNOWN, ScriptSource.BUILTIN, '0', 'var lib = {};')
+    jcp._core_script = Script(ScriptType.CORE, ScriptVariant.UNKNOWN, ScriptSource.BUILTIN, '0', FAKE_SOLVER)
+    load = PlayerLoader()
+    jcp._get_player = lambda video_id, player_url: load(player_url)()
+    jcp.loaded = load.loaded
+    yield jcp
+    jcp.close()
+
+
+def test_provider_uses_worker(node_jcp):
+    requests = [
+        JsChallengeRequest(JsChallengeType.N, NChallengeInput('p1', ['abc'])),
+        JsChallengeRequest(JsChallengeType.SIG, SigChallengeInput('p1', ['def'])),
+        JsChallengeRequest(JsChallengeType.N, NChallengeInput('p2', ['ghi'])),
+    ]
+
+    def expected(p1_count, p2_count):
+        return [
+            JsChallengeProviderResponse(requests[0], JsChallengeResponse(
+                JsChallengeType.N, NChallengeOutput({'abc': f'p1:cba:{p1_count}'}))),
+            JsChallengeProviderResponse(requests[1], JsChallengeResponse(
+                JsChallengeType.SIG, SigChallengeOutput({'def': f'p1:fed:{p1_count}'}))),
+            JsChallengeProviderResponse(requests[2], JsChallengeResponse(
+                JsChallengeType.N, NChallengeOutput({'ghi': f'p2:ihg:{p2_count}'}))),
+        ]
+
+    assert list(node_jcp.bulk_solve(requests)) == expected(1, 2)
+    # The players are not preprocessed again
+    assert list(node_jcp.bulk_solve(requests)) == expected(2, 2)
+    assert node_jcp.loaded == ['p1', 'p2']
+    assert node_jcp._worker.starts == 1
+
+
+def test_provider_falls_back_to_new_process(node_jcp):
+    node_jcp._worker.make_cmd = lambda program_path: [_node, '--invalid-option', program_path]
+    request = JsChallengeRequest(JsChallengeType.N, NChallengeInput('p1', ['abc']))
+    assert list(node_jcp.bulk_solve([request])) == [
+        JsChallengeProviderResponse(request, JsChallengeResponse(JsChallengeType.N, NChallengeOutput({'abc': 'p1:cba:1'})))]
+    assert node_jcp._worker is None
+
+
+def test_provider_worker_disabled(ie, logger):
+    ie._downloader.params['extractor_args'] = {'youtube-ejs': {'worker': ['false']}}
+    assert NodeJCP(ie, logger, None)._worker is None
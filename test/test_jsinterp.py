@@ -571,6 +571,16 @@ def test_undefined_varnames(self):
         self._test(jsi, [JS_Undefined, JS_Undefined])
         self.assertEqual(jsi._undefined_varnames, {'b'})
 
+    def test_compiled_statements(self):
+        code = 'function f(n) { if (n <= 1) { return [1, 2, 3][n]; } return [4, 5, 6][f(n - 1)] + n; }'
+        self._test(code, 8, args=[2])
+        # The statements compiled by another interpreter are reused
+        self._test(code, 8, args=[2])
+        self._test('function f(a) { var b = (a).slice(0); b.push(3); return [a, b]; }', [[1], [1, 3]], args=[[1]])
+        self._test('function f(x) { switch (x) { case 1: return 10; default: return 20; } }', 10, args=[1])
+        # Statements that are never reached are not compiled
+        self._test('function f() { if (false) { return a b; } return 1; }', 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -11,6 +11,7 @@
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import concurrent.futures
 import gzip
 import http.client
 import http.cookiejar
@@ -19,6 +20,7 @@
 import logging
 import pathlib
 import random
+import socket
 import ssl
 import tempfile
 import threading
@@ -47,6 +49,7 @@
     Response,
 )
 from yt_dlp.networking._urllib import UrllibRH
+from yt_dlp.networking.cache import HTTPCache
 from yt_dlp.networking.exceptions import (
     CertificateVerifyError,
     HTTPError,
@@ -311,7 +314,7 @@ def setup_class(cls):
         cls.https_server_thread.start()
 
 
-@pytest.mark.parametrize('handler', ['Urllib', 'Requests', 'CurlCFFI'], indirect=True)
+@pytest.mark.parametrize('handler', ['Urllib', 'Requests', 'CurlCFFI', 'HTTPX'], indirect=True)
 @pytest.mark.handler_flaky('CurlCFFI', reason='segfaults')
 class TestHTTPRequestHandler(TestRequestHandlerBase):
 
@@ -767,7 +770,7 @@ def test_partial_read_greater_than_response_then_full_read(self, handler):
                 assert res.read() == b''
 
 
-@pytest.mark.parametrize('handler', ['Urllib', 'Requests', 'CurlCFFI'], indirect=True)
+@pytest.mark.parametrize('handler', ['Urllib', 'Requests', 'CurlCFFI', 'HTTPX'], indirect=True)
 @pytest.mark.handler_flaky('CurlCFFI', reason='segfaults')
 class TestClientCertificate:
     @classmethod
@@ -1098,6 +1101,47 @@ def test_http_response_auto_close(self, handler):
             assert res.fp.closed
             assert res.closed
 
+    def test_connection_metrics(self, handler):
+        with handler() as rh:
+            for _ in range(3):
+                validate_and_send(rh, Request(f'http://127.0.0.1:{self.http_port}/gen_200')).read()
+            metrics = rh.connection_metrics()
+            host_metrics = metrics['127.0.0.1']
+            assert host_metrics['requests'] == 3
+            assert host_metrics['opened'] == 1
+            assert host_metrics['reused'] == 2
+            assert host_metrics['connect_time'] > 0
+            assert 'discarded' not in host_metrics
+            assert metrics['DNS cache'] == {'hits': 0, 'misses': 1}
+
+    def test_dns_cache(self, handler):
+        with handler() as rh:
+            session = rh._get_instance(cookiejar=rh.cookiejar, legacy_ssl_support=None)
+            for _ in range(2):
+                validate_and_send(rh, Request(f'http://localhost:{self.http_port}/gen_200')).read()
+                # Force a new connection
+                session.adapters['http://'].poolmanager.clear()
+            assert rh.connection_metrics()['localhost']['opened'] == 2
+            assert rh.connection_metrics()['DNS cache'] == {'hits': 1, 'misses': 1}
+
+    def test_pool_size(self, handler):
+        with handler(pool_size=1) as rh:
+            responses = [
+                validate_and_send(rh, Request(f'http://127.0.0.1:{self.http_port}/gen_200')) for _ in range(2)]
+            for res in responses:
+                res.read()
+            assert rh.connection_metrics()['127.0.0.1']['discarded'] == 1
+
+    def test_tls_session_resumption(self, handler):
+        with handler(verify=False) as rh:
+            session = rh._get_instance(cookiejar=rh.cookiejar, legacy_ssl_support=None)
+            for _ in range(2):
+                validate_and_send(rh, Request(f'https://127.0.0.1:{self.https_port}/gen_200')).read()
+                session.adapters['https://'].poolmanager.clear()
+            host_metrics = rh.connection_metrics()['127.0.0.1']
+            assert host_metrics['opened'] == 2
+            assert host_metrics['tls_resumed'] == 1
+
 
 @pytest.mark.parametrize('handler', ['CurlCFFI'], indirect=True)
 @pytest.mark.handler_flaky('CurlCFFI', reason='segfaults')
@@ -1273,6 +1317,90 @@ def test_http_response_auto_close(self, handler):
             assert res.closed
 
 
+class H2TestServer:
+    """HTTPS server that only speaks HTTP/2 and responds with the protocol and path of each request"""
+
+    def __init__(self):
+        pytest.importorskip('h2')
+
+        self.ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.ssl_context.load_cert_chain(os.path.join(TEST_DIR, 'testcert.pem'), None)
+        self.ssl_context.set_alpn_protocols(['h2'])
+        self.socket = socket.create_server(('127.0.0.1', 0))
+        self.port = self.socket.getsockname()[1]
+        self.connections = 0
+        thread = threading.Thread(target=self._serve_forever, daemon=True)
+        thread.start()
+
+    def _serve_forever(self):
+        while True:
+            sock, _ = self.socket.accept()
+            self.connections += 1
+            threading.Thread(target=self._handle, args=(sock,), daemon=True).start()
+
+    def _handle(self, sock):
+        from h2.config import H2Configuration
+        from h2.connection import H2Connection
+        from h2.events import RequestReceived
+
+        with self.ssl_context.wrap_socket(sock, server_side=True) as tls_sock:
+            conn = H2Connection(H2Configuration(client_side=False, header_encoding='utf-8'))
+            conn.initiate_connection()
+            tls_sock.sendall(conn.data_to_send())
+            while data := tls_sock.recv(65535):
+                for event in conn.receive_data(data):
+                    if isinstance(event, RequestReceived):
+                        body = f'HTTP/2 {dict(event.headers)[":path"]}'.encode()
+                        conn.send_headers(event.stream_id, [
+                            (':status', '200'), ('content-type', 'text/plain'), ('content-length', str(len(body)))])
+                        conn.send_data(event.stream_id, body, end_stream=True)
+                tls_sock.sendall(conn.data_to_send())
+
+
+@pytest.fixture(scope='module')
+def h2_server():
+    return H2TestServer()
+
+
+@pytest.mark.parametrize('handler', ['HTTPX'], indirect=True)
+class TestHTTPXRequestHandler(TestRequestHandlerBase):
+
+    def test_http2_multiplexing(self, handler, h2_server):
+        connections = h2_server.connections
+        with handler(http2=True, verify=False) as rh:
+            def fetch(i):
+                return validate_and_send(rh, Request(f'https://127.0.0.1:{h2_server.port}/frag{i}')).read()
+
+            with concurrent.futures.ThreadPoolExecutor(8) as pool:
+                results = list(pool.map(fetch, range(32)))
+        assert results == [f'HTTP/2 /frag{i}'.encode() for i in range(32)]
+        # All the requests were made over a single connection
+        assert h2_server.connections == connections + 1
+
+    def test_http2_max_streams(self, handler, h2_server):
+        with handler(http2=True, http2_max_streams=1, verify=False) as rh:
+            res = validate_and_send(rh, Request(f'https://127.0.0.1:{h2_server.port}/first'))
+            # The stream is held until the response is closed or read
+            with pytest.raises(TransportError, match='Timed out waiting'):
+                validate_and_send(rh, Request(f'https://127.0.0.1:{h2_server.port}/second', extensions={'timeout': 0.5}))
+            assert res.read() == b'HTTP/2 /first'
+            assert validate_and_send(rh, Request(f'https://127.0.0.1:{h2_server.port}/second')).read() == b'HTTP/2 /second'
+
+    def test_preference(self, handler):
+        from yt_dlp.networking._httpx import httpx_preference
+
+        with handler(http2=True) as rh:
+            assert httpx_preference(rh, Request('https://example.com')) > 100
+            assert httpx_preference(rh, Request('http://example.com')) < 0
+        with handler() as rh:
+            assert httpx_preference(rh, Request('https://example.com')) < 0
+
+    def test_http1_fallback(self, handler):
+        with handler(http2=True, verify=False) as rh:
+            res = validate_and_send(rh, Request(f'https://127.0.0.1:{self.https_port}/gen_200'))
+            assert res.read() == b'<html></html>'
+
+
 def run_validation(handler, error, req, **handler_kwargs):
     with handler(**handler_kwargs) as rh:
         if error:
@@ -1321,6 +1449,10 @@ class HTTPSupportedRH(ValidationRH):
             ('http', False, {}),
             ('https', False, {}),
         ]),
+        ('HTTPX', [
+            ('http', False, {}),
+            ('https', False, {}),
+        ]),
         (NoCheckRH, [('http', False, {})]),
         (ValidationRH, [('http', UnsupportedRequest, {})]),
     ]
@@ -1352,6 +1484,12 @@ class HTTPSupportedRH(ValidationRH):
             ('socks5', False),
             ('socks5h', False),
         ]),
+        ('HTTPX', 'http', [
+            ('http', False),
+            ('https', False),
+            ('socks4', UnsupportedRequest),
+            ('socks5', UnsupportedRequest),
+        ]),
         ('Websockets', 'ws', [
             ('http', UnsupportedRequest),
             ('https', UnsupportedRequest),
@@ -1380,6 +1518,10 @@ class HTTPSupportedRH(ValidationRH):
             ('all', 'http', False),
             ('unrelated', 'http', False),
         ]),
+        ('HTTPX', 'http', [
+            ('all', 'http', False),
+            ('unrelated', 'http', False),
+        ]),
         ('Websockets', 'ws', [
             ('all', 'socks5', False),
             ('unrelated', 'socks5', False),
@@ -1431,6 +1573,16 @@ class HTTPSupportedRH(ValidationRH):
             ({'legacy_ssl': True}, False),
             ({'legacy_ssl': 'notabool'}, AssertionError),
         ]),
+        ('HTTPX', 'http', [
+            ({'cookiejar': 'notacookiejar'}, AssertionError),
+            ({'cookiejar': YoutubeDLCookieJar()}, False),
+            ({'timeout': 1}, False),
+            ({'timeout': 'notatimeout'}, AssertionError),
+            ({'unsupported': 'value'}, UnsupportedRequest),
+            ({'legacy_ssl': True}, False),
+            ({'keep_header_casing': True}, False),
+            ({'impersonate': ImpersonateTarget('chrome', None, None, None)}, UnsupportedRequest),
+        ]),
         (NoCheckRH, 'http', [
             ({'cookiejar': 'notacookiejar'}, False),
             ({'somerandom': 'test'}, False),  # but any extension is allowed through
@@ -1448,6 +1600,7 @@ class HTTPSupportedRH(ValidationRH):
         ('Urllib', False, 'http'),
         ('Requests', False, 'http'),
         ('CurlCFFI', False, 'http'),
+        ('HTTPX', False, 'http'),
         ('Websockets', False, 'ws'),
     ], indirect=['handler'])
     def test_no_proxy(self, handler, fail, scheme):
@@ -1670,6 +1823,117 @@ def mock_close(*args, **kwargs):
         director.close()
         assert called
 
+    def test_http_cache_extension_without_cache(self):
+        class StrictRH(RequestHandler):
+            _SUPPORTED_URL_SCHEMES = ['http']
+
+            def _send(self, request: Request):
+                return Response(fp=io.BytesIO(b'strict'), headers={}, url=request.url)
+
+        director = RequestDirector(logger=FakeLogger())
+        director.add_handler(StrictRH(logger=FakeLogger()))
+        # The extension must not reach the handlers, which would reject it
+        assert director.send(Request('http://', extensions={'http_cache': None})).read() == b'strict'
+
+
+class FakeStore:
+    def __init__(self):
+        self.data = {}
+
+    def load(self, section, key):
+        return self.data.get((section, key))
+
+    def store(self, section, key, data):
+        self.data[(section, key)] = data
+
+
+class TestHTTPCache:
+
+    @pytest.fixture
+    def server(self):
+        class CacheTestRH(RequestHandler):
+            _SUPPORTED_URL_SCHEMES = ['http']
+            requests = []
+            response_headers = {'Content-Type': 'text/html; charset=utf-8', 'Cache-Control': 'max-age=60'}
+            body = b'<html></html>'
+
+            def _send(self, request: Request):
+                self.requests.append(request)
+                if self.response_headers.get('ETag') and request.headers.get('If-None-Match') == self.response_headers['ETag']:
+                    raise HTTPError(Response(io.BytesIO(), request.url, {}, status=304))
+                return Response(io.BytesIO(self.body), request.url, self.response_headers)
+
+        return CacheTestRH
+
+    def make_director(self, server, **kwargs):
+        cache = HTTPCache(FakeStore(), **kwargs)
+        director = RequestDirector(logger=FakeLogger(), cache=cache)
+        director.add_handler(server(logger=FakeLogger()))
+        return director, cache
+
+    def test_fresh_response(self, server):
+        director, cache = self.make_director(server)
+        for _ in range(2):
+            response = director.send(Request('http://example.com/', extensions={'http_cache': None}))
+            assert response.read() == server.body
+            assert response.headers['Content-Type'] == 'text/html; charset=utf-8'
+        assert len(server.requests) == 1
+        assert (cache.hits, cache.revalidated, cache.misses) == (1, 0, 1)
+
+        # Different headers are a different entry
+        director.send(Request('http://example.com/', headers={'X-Test': '1'}, extensions={'http_cache': None}))
+        assert len(server.requests) == 2
+
+    def test_revalidation(self, server):
+        server.response_headers = {'Content-Type': 'application/json', 'Cache-Control': 'no-cache', 'ETag': '"abc"'}
+        director, cache = self.make_director(server)
+        for _ in range(2):
+            assert director.send(Request('http://example.com/', extensions={'http_cache': None})).read() == server.body
+        assert len(server.requests) == 2
+        assert 'If-None-Match' not in server.requests[0].headers
+        assert server.requests[1].headers['If-None-Match'] == '"abc"'
+        assert (cache.hits, cache.revalidated, cache.misses) == (0, 1, 1)
+
+    def test_ttl(self, server):
+        server.response_headers = {'Content-Type': 'text/html', 'Cache-Control': 'no-cache'}
+        director, _ = self.make_director(server)
+        for _ in range(2):
+            director.send(Request('http://example.com/', extensions={'http_cache': 60}))
+        assert len(server.requests) == 1
+
+        director.send(Request('http://example.com/', extensions={'http_cache': 0}))
+        assert len(server.requests) == 2
+
+    @pytest.mark.parametrize('headers', [
+        {'Content-Type': 'video/mp4', 'Cache-Control': 'max-age=60'},
+        {'Content-Type': 'text/html', 'Cache-Control': 'no-store, max-age=60'},
+        {'Content-Type': 'text/html', 'Cache-Control': 'max-age=60', 'Set-Cookie': 'a=b'},
+        {'Content-Type': 'text/html', 'Cache-Control': 'max-age=60', 'Vary': '*'},
+        {'Content-Type': 'text/html'},
+    ])
+    def test_not_stored(self, server, headers):
+        server.response_headers = headers
+        director, cache = self.make_director(server)
+        for _ in range(2):
+            assert director.send(Request('http://example.com/', extensions={'http_cache': None})).read() == server.body
+        assert len(server.requests) == 2
+        assert cache.hits == 0
+
+    def test_not_cached_requests(self, server):
+        director, cache = self.make_director(server)
+        for _ in range(2):
+            director.send(Request('http://example.com/'))
+            director.send(Request('http://example.com/', data=b'data', extensions={'http_cache': None}))
+        assert len(server.requests) == 4
+        assert (cache.hits, cache.misses) == (0, 0)
+
+    def test_large_body(self, server):
+        server.body = b'a' * 100
+        director, _ = self.make_director(server, max_body_size=10)
+        for _ in range(2):
+            assert director.send(Request('http://example.com/', extensions={'http_cache': None})).read() == server.body
+        assert len(server.requests) == 2
+
 
 # XXX: do we want to move this to test_YoutubeDL.py?
 class TestYoutubeDLNetworking:
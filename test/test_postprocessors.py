@@ -8,7 +8,12 @@
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
+import shutil
 import subprocess
+import tempfile
+import threading
+import time
+from unittest.mock import patch
 
 from yt_dlp import YoutubeDL
 from yt_dlp.utils import (
@@ -16,13 +21,21 @@
     shell_quote,
 )
 from yt_dlp.postprocessor import (
+    EmbedThumbnailPP,
     ExecPP,
+    FFmpegEmbedSubtitlePP,
+    FFmpegFixupTimestampPP,
+    FFmpegMergerPP,
+    FFmpegMetadataPP,
+    FFmpegPostProcessor,
+    FFmpegSplitChaptersPP,
     FFmpegThumbnailsConvertorPP,
     MetadataFromFieldPP,
     MetadataParserPP,
     ModifyChaptersPP,
     SponsorBlockPP,
 )
+from yt_dlp.postprocessor.ffmpeg import FFmpegFusedPP, FFmpegPostProcessorError, FFprobeCache
 
 
 class TestMetadataFromField(unittest.TestCase):
@@ -680,5 +693,268 @@ def test_quote_for_concat_QuotesAtEnd(self):
             self._pp._quote_for_ffmpeg("special ' characters ' galore'''"))
 
 
+@patch.object(FFmpegPostProcessor, 'available', True)
+class TestFFmpegFusedPP(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.ydl = YoutubeDL({'quiet': True})
+        self.calls = []
+        self.failing = ()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _path(self, name, create=True):
+        path = os.path.join(self.tmpdir, name)
+        if create:
+            with open(path, 'wb') as f:
+                f.write(b'\0')
+        return path
+
+    def _make_info(self, **kwargs):
+        video, audio = self._path('test.fv.webm'), self._path('test.fa.webm')
+        return {
+            'id': 'test',
+            'title': 'Test',
+            'ext': 'mkv',
+            'vcodec': 'vp9',
+            'acodec': 'opus',
+            'filepath': self._path('test.mkv', False),
+            'requested_formats': [
+                {'format_id': 'v', 'vcodec': 'vp9', 'acodec': 'none', 'protocol': 'https', 'filepath': video},
+                {'format_id': 'a', 'vcodec': 'none', 'acodec': 'opus', 'protocol': 'https', 'filepath': audio},
+            ],
+            '__files_to_merge': [video, audio],
+            'requested_subtitles': {'en': {'ext': 'vtt', 'filepath': self._path('test.en.vtt')}},
+            'thumbnails': [{'filepath': self._path('test.jpg')}],
+            'chapters': [{'start_time': 0, 'end_time': 5, 'title': 'Intro'}],
+            **kwargs,
+        }
+
+    def _run(self, pps, info):
+        test = self
+
+        def run_ffmpeg_multiple_files(pp, input_paths, out_path, opts, **kwargs):
+            test.calls.append((type(pp), list(input_paths), list(opts)))
+            if isinstance(pp, test.failing):
+                raise FFmpegPostProcessorError('failed')
+            with open(out_path, 'wb'):
+                pass
+
+        def get_metadata_object(pp, path, opts=[]):
+            return {'format': {'duration': '10'}, 'streams': [{'codec_type': 'video'}, {'codec_type': 'audio'}]}
+
+        with patch.object(FFmpegPostProcessor, 'run_ffmpeg_multiple_files', run_ffmpeg_multiple_files), \
+                patch.object(FFmpegPostProcessor, 'get_metadata_object', get_metadata_object):
+            files_to_delete = []
+            for pp in FFmpegFusedPP.fuse(self.ydl, pps):
+                files, info = pp.run(info)
+                files_to_delete.extend(files)
+        return files_to_delete, info
+
+    def _pps(self):
+        return [
+            FFmpegMergerPP(self.ydl), FFmpegEmbedSubtitlePP(self.ydl),
+            FFmpegMetadataPP(self.ydl), EmbedThumbnailPP(self.ydl), ExecPP(self.ydl, 'true')]
+
+    def test_fuse(self):
+        pps = self._pps()
+        fused = FFmpegFusedPP.fuse(self.ydl, pps)
+        self.assertEqual([type(pp) for pp in fused], [FFmpegFusedPP, ExecPP])
+        self.assertEqual(fused[0].pps, pps[:4])
+
+        class CustomMetadataPP(FFmpegMetadataPP):
+            pass
+
+        pps = [FFmpegMergerPP(self.ydl), FFmpegFixupTimestampPP(self.ydl), CustomMetadataPP(self.ydl), EmbedThumbnailPP(self.ydl)]
+        self.assertEqual(FFmpegFusedPP.fuse(self.ydl, pps), pps)
+
+    def test_single_invocation(self):
+        info = self._make_info()
+        files_to_delete, _ = self._run(self._pps()[:4], info)
+
+        self.assertEqual(len(self.calls), 1)
+        pp_type, inputs, opts = self.calls[0]
+        self.assertIs(pp_type, FFmpegFusedPP)
+        self.assertEqual(inputs, [
+            *info['__files_to_merge'], info['requested_subtitles']['en']['filepath'], self._path('test.meta', False)])
+        self.assertEqual(opts[:opts.index('-c') + 2], [
+            '-map', '0:v:0', '-map', '1:a:0', '-map', '2:0', '-c', 'copy'])
+        for args in (('-metadata:s:s:0', 'language=eng'), ('-map_metadata', '3'), ('-metadata', 'title=Test'),
+                     ('-attach', f'file:{self._path("test.jpg", False)}', '-metadata:s:t:0', 'mimetype=image/jpeg')):
+            self.assertIn(args, zip(*(opts[i:] for i in range(len(args))), strict=False))
+        self.assertEqual(files_to_delete, [*info['__files_to_merge'], info['requested_subtitles']['en']['filepath']])
+        self.assertTrue(os.path.exists(info['filepath']))
+        self.assertFalse(os.path.exists(self._path('test.meta', False)))
+        self.assertFalse(os.path.exists(self._path('test.jpg', False)))
+
+    def test_split_plan(self):
+        # The duration of the merged file is needed to add the chapters
+        info = self._make_info(chapters=[{'start_time': 0, 'title': 'Intro'}])
+        self._run(self._pps()[:4], info)
+        self.assertEqual([inputs for _, inputs, _ in self.calls], [
+            [*info['__files_to_merge'], info['requested_subtitles']['en']['filepath']],
+            [info['filepath'], self._path('test.meta', False)]])
+        self.assertEqual(info['chapters'][0]['end_time'], 10)
+
+        # EmbedSubtitle is in the first plan, so it's the second that copies the streams of the file
+        opts = self.calls[1][2]
+        self.assertEqual(opts[:6], ['-map', '0', '-dn', '-ignore_unknown', '-c', 'copy'])
+        self.assertIn('-metadata:s:t:0', opts)
+
+    def test_hooks(self):
+        statuses = []
+        self.ydl.add_postprocessor_hook(lambda d: statuses.append((d['postprocessor'], d['status'])))
+        self._run(self._pps()[:4], self._make_info())
+        pp_keys = ('Merger', 'EmbedSubtitle', 'Metadata', 'EmbedThumbnail')
+        self.assertEqual(statuses, [*((key, 'started') for key in pp_keys), *((key, 'finished') for key in pp_keys)])
+
+    def test_fallback(self):
+        self.failing = FFmpegFusedPP
+        info = self._make_info()
+        files_to_delete, info = self._run(self._pps()[:4], info)
+        self.assertEqual([pp_type for pp_type, _, _ in self.calls], [
+            FFmpegFusedPP, FFmpegMergerPP, FFmpegEmbedSubtitlePP, FFmpegMetadataPP, EmbedThumbnailPP])
+        # The postprocessors are run like unfused ones, so they delete their own files
+        self.assertEqual(files_to_delete, [])
+        for path in (*info['__files_to_merge'], info['requested_subtitles']['en']['filepath']):
+            self.assertFalse(os.path.exists(path))
+
+        # and their errors can be ignored without skipping the others
+        self.calls.clear()
+        self.ydl.params['ignore_postproc_errors'] = True
+        self.failing = (FFmpegFusedPP, FFmpegEmbedSubtitlePP)
+        self._run(self._pps()[:4], self._make_info())
+        self.assertEqual([pp_type for pp_type, _, _ in self.calls], [
+            FFmpegFusedPP, FFmpegMergerPP, FFmpegEmbedSubtitlePP, FFmpegMetadataPP, EmbedThumbnailPP])
+
+
+class TestFFprobeCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'test.mp4')
+        with open(self.path, 'wb') as f:
+            f.write(b'\0')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_probe_cache(self):
+        probes = []
+
+        def run_ffprobe(pp, path, opts):
+            probes.append((path, opts))
+            return {
+                'format': {'duration': '10', 'format_name': 'mov,mp4'},
+                'streams': [{'codec_type': 'video', 'codec_name': 'h264'}, {'codec_type': 'audio', 'codec_name': 'aac'}],
+                'chapters': [],
+            }
+
+        pp = FFmpegPostProcessor(YoutubeDL({'quiet': True}))
+        with patch.object(FFmpegPostProcessor, 'probe_cache', FFprobeCache()) as cache, \
+                patch.object(FFmpegPostProcessor, 'probe_basename', 'ffprobe'), \
+                patch.object(FFmpegPostProcessor, 'check_version'), \
+                patch.object(FFmpegPostProcessor, '_run_ffprobe', run_ffprobe):
+            self.assertEqual(pp.get_audio_codec(self.path), 'aac')
+            self.assertEqual(pp._get_real_video_duration(self.path), 10)
+            self.assertEqual(pp.get_stream_number(self.path, ('codec_type', ), 'audio'), (1, 2))
+            pp.get_metadata_object(self.path)['streams'].clear()
+            self.assertEqual(len(pp.get_metadata_object(self.path)['streams']), 2)
+            self.assertEqual(probes, [(self.path, ['-show_chapters'])])
+            self.assertEqual((cache.hits, cache.misses), (4, 1))
+
+            # Custom options are not cached
+            pp.get_metadata_object(self.path, ['-show_programs'])
+            self.assertEqual(len(probes), 2)
+
+            # Rewriting the file invalidates its result
+            with open(self.path, 'wb') as f:
+                f.write(b'\0\0')
+            self.assertEqual(pp.get_audio_codec(self.path), 'aac')
+            self.assertEqual(len(probes), 3)
+            cache.invalidate(self.path)
+            pp.get_audio_codec(self.path)
+            self.assertEqual(len(probes), 4)
+            self.assertEqual((cache.hits, cache.misses), (4, 3))
+
+
+class TestFFmpegJobs(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.outputs = []
+        self.failing = ()
+        self.running = self.max_running = 0
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _real_run_ffmpeg(self):
+        test = self
+
+        def real_run_ffmpeg(pp, input_path_opts, output_path_opts, **kwargs):
+            out_path = output_path_opts[0][0]
+            with test.lock:
+                test.running += 1
+                test.max_running = max(test.max_running, test.running)
+            time.sleep(0.05)
+            with test.lock:
+                test.running -= 1
+                test.outputs.append(out_path)
+            if os.path.basename(out_path) in test.failing:
+                raise FFmpegPostProcessorError('failed')
+        return patch.object(FFmpegPostProcessor, 'real_run_ffmpeg', real_run_ffmpeg)
+
+    def _split(self, jobs):
+        ydl = YoutubeDL({
+            'quiet': True,
+            'ffmpeg_jobs': jobs,
+            'outtmpl': {'chapter': os.path.join(self.tmpdir, '%(section_number)02d %(section_title)s.%(ext)s')},
+        })
+        info = {
+            'id': 'test', 'title': 'Test', 'ext': 'mp4', 'filepath': os.path.join(self.tmpdir, 'test.mp4'),
+            'chapters': [{'start_time': i * 10, 'end_time': i * 10 + 10, 'title': f'Track {i}'} for i in range(6)],
+        }
+        with self._real_run_ffmpeg(), patch.object(FFmpegPostProcessor, 'check_version'):
+            FFmpegSplitChaptersPP(ydl).run(info)
+        return info
+
+    def test_split_chapters(self):
+        info = self._split(3)
+        self.assertEqual(self.max_running, 3)
+        self.assertEqual(sorted(self.outputs), [chapter['filepath'] for chapter in info['chapters']])
+        self.assertEqual(
+            [os.path.basename(chapter['filepath']) for chapter in info['chapters']],
+            [f'{i + 1:02d} Track {i}.mp4' for i in range(6)])
+
+        self.outputs, self.max_running = [], 0
+        self._split(1)
+        self.assertEqual(self.max_running, 1)
+
+    def test_split_chapters_errors(self):
+        self.failing = ('02 Track 1.mp4', '05 Track 4.mp4')
+        with self.assertRaisesRegex(FFmpegPostProcessorError, r'2 of 6 ffmpeg jobs failed:\n.*02 Track 1\.mp4: failed\n.*05 Track 4\.mp4: failed$'):
+            self._split(4)
+        self.assertEqual(len(self.outputs), 6)
+
+    def test_convert_thumbnails(self):
+        thumbnails, files_to_move = [], {}
+        for i in range(4):
+            path = os.path.join(self.tmpdir, f'test.{i}.webp')
+            with open(path, 'wb') as f:
+                f.write(b'\0')
+            thumbnails.append({'id': str(i), 'filepath': path})
+            files_to_move[path] = f'final.{i}.webp'
+        info = {'id': 'test', 'thumbnails': thumbnails, '__files_to_move': files_to_move}
+        with self._real_run_ffmpeg(), patch.object(FFmpegPostProcessor, 'check_version'):
+            files_to_delete, info = FFmpegThumbnailsConvertorPP(
+                YoutubeDL({'quiet': True, 'ffmpeg_jobs': 4}), 'png').run(info)
+        self.assertEqual(self.max_running, 4)
+        self.assertEqual(files_to_delete, [os.path.join(self.tmpdir, f'test.{i}.webp') for i in range(4)])
+        self.assertEqual([t['filepath'] for t in info['thumbnails']], [
+            os.path.join(self.tmpdir, f'test.{i}.png') for i in range(4)])
+        self.assertEqual(info['__files_to_move'][os.path.join(self.tmpdir, 'test.3.png')], 'final.3.png')
+
+
 if __name__ == '__main__':
     unittest.main()
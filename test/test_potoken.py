@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import itertools
+import threading
+import time
+import zlib
+
+from yt_dlp.potoken import PoTokenPool, get_po_token_pool, potoken
+
+
+class TestPoTokenPool(unittest.TestCase):
+    def make_minter(self, delay=0, fail=False):
+        counter = itertools.count()
+        minted = threading.Event()
+
+        def mint():
+            time.sleep(delay)
+            minted.set()
+            if fail:
+                return None
+            return f'token{next(counter)}', 'visitor'
+        return mint, minted
+
+    def wait_for(self, pool, ready):
+        for _ in range(100):
+            if pool.stats()['ready'] >= ready:
+                return
+            time.sleep(0.05)
+        self.fail(f'pool did not reach {ready} tokens')
+
+    def test_prewarm(self):
+        mint, _ = self.make_minter(delay=0.1)
+        pool = PoTokenPool(mint, size=2)
+        pool.refill()
+        self.wait_for(pool, 2)
+        start = time.monotonic()
+        self.assertEqual(pool.get(), ('token0', 'visitor'))
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.assertEqual(pool.get(), ('token1', 'visitor'))
+        self.wait_for(pool, 2)
+        stats = pool.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['mints'], stats['failures']), (2, 0, 4, 0))
+        self.assertGreaterEqual(stats['mint_time'], 0.1)
+
+    def test_miss(self):
+        mint, _ = self.make_minter()
+        pool = PoTokenPool(mint, size=1)
+        self.assertEqual(pool.get(), ('token0', 'visitor'))
+        self.wait_for(pool, 1)
+        self.assertEqual(pool.get(), ('token1', 'visitor'))
+        self.assertEqual((pool.hits, pool.misses), (1, 1))
+
+    def test_expiry(self):
+        mint, _ = self.make_minter()
+        pool = PoTokenPool(mint, size=1, ttl=0.2)
+        pool.refill()
+        self.wait_for(pool, 1)
+        time.sleep(0.3)
+        self.assertEqual(pool.stats()['ready'], 0)
+        self.assertEqual(pool.get(), ('token1', 'visitor'))
+        self.assertEqual(pool.misses, 1)
+
+    def test_failure(self):
+        mint, minted = self.make_minter(fail=True)
+        pool = PoTokenPool(mint, size=3)
+        self.assertIsNone(pool.get())
+        minted.wait(1)
+        time.sleep(0.1)
+        self.assertEqual(pool.stats()['failures'], 2)
+
+    def test_registry(self):
+        mint, _ = self.make_minter()
+        pool = get_po_token_pool(('test', 'registry'), mint, 1)
+        self.assertIs(get_po_token_pool(('test', 'registry'), mint, 2), pool)
+        self.assertEqual(pool.size, 2)
+
+
+class TestPoTokenJS(unittest.TestCase):
+    def test_injected_js_is_cached(self):
+        files = {
+            'base.js': zlib.compress(b'(function(g){var x = 1;})(_yt_player);'),
+            'inject.js': zlib.compress(b'window.inject = "\\\\1";'),
+        }
+        potoken.get_decompress_po_token_js.cache_clear()
+        potoken._get_injected_base_js.cache_clear()
+        self.addCleanup(potoken.get_decompress_po_token_js.cache_clear)
+        self.addCleanup(potoken._get_injected_base_js.cache_clear)
+        with patch.object(potoken, '_js_files', return_value=files) as js_files:
+            po_token = potoken.PoToken(None)
+            first = po_token._gen_po_token_js('visitor1')
+            second = po_token._gen_po_token_js('visitor1')
+            other = po_token._gen_po_token_js('visitor2')
+        self.addCleanup(lambda: [os.remove(fn) for fn in {first, other}])
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertEqual(js_files.call_count, 2)
+        with open(first) as f:
+            content = f.read()
+        self.assertIn("window.visitorData = 'visitor1'", content)
+        self.assertTrue(content.endswith('(function(g){var x = 1;;window.inject = "\\\\1";;})(_yt_player);'))
+
+
+if __name__ == '__main__':
+    unittest.main()
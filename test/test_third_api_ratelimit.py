@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import contextlib
+import subprocess
+import tempfile
+import time
+from unittest import mock
+
+from test.helper import FakeYDL
+from yt_dlp.extractor.common import InfoExtractor
+from yt_dlp.third_api import allapi
+from yt_dlp.third_api.extractor import SnapMutilRapidApi, ThirdApiGuard, ZMMutilRapidApi
+from yt_dlp.third_api.extractor.ratelimit import (
+    FileRateLimitState,
+    MemoryRateLimitState,
+    RateLimiter,
+)
+from yt_dlp.utils import ExtractorError
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.filename = os.path.join(self.tempdir.name, 'limits.bin')
+
+    def make_states(self):
+        states = [MemoryRateLimitState(), FileRateLimitState(self.filename)]
+        for state in states:
+            self.addCleanup(state.close)
+        return states
+
+    def test_repeat_interval(self):
+        for state in self.make_states():
+            with self.subTest(state=state.NAME):
+                limiter = RateLimiter(state)
+                self.assertTrue(limiter.acquire('youtube', 'a', 0.5))
+                self.assertFalse(limiter.acquire('youtube', 'a', 0.5))
+                self.assertTrue(limiter.acquire('youtube', 'b', 0.5))
+                self.assertTrue(limiter.acquire('instagram', 'a', 0.5))
+                time.sleep(0.6)
+                self.assertTrue(limiter.acquire('youtube', 'a', 0.5))
+                self.assertEqual(limiter.metrics()['youtube'], {'allowed': 3, 'repeated': 1})
+
+    def test_repeat_interval_retried(self):
+        for state in self.make_states():
+            with self.subTest(state=state.NAME):
+                # New limiters do not remember the denials, like other processes sharing the state
+                self.assertTrue(RateLimiter(state).acquire('youtube', 'a', 0.5))
+                time.sleep(0.3)
+                self.assertFalse(RateLimiter(state).acquire('youtube', 'a', 0.5))
+                time.sleep(0.3)
+                self.assertTrue(RateLimiter(state).acquire('youtube', 'a', 0.5))
+                self.assertFalse(RateLimiter(state).acquire('youtube', 'a', 0.5))
+
+    def test_token_bucket(self):
+        for state in self.make_states():
+            with self.subTest(state=state.NAME):
+                limiter = RateLimiter(state)
+                self.assertEqual([limiter.acquire(state.NAME, str(i), 60, (3, 1)) for i in range(5)],
+                                 [True, True, True, False, False])
+                # Denied keys can be retried once a token is available
+                time.sleep(0.4)
+                self.assertTrue(limiter.acquire(state.NAME, '3', 60, (3, 1)))
+                self.assertEqual(limiter.metrics()[state.NAME], {'allowed': 4, 'rate_limited': 2})
+
+    def test_shared_between_processes(self):
+        limiter = RateLimiter(FileRateLimitState(self.filename))
+        self.addCleanup(limiter.close)
+        self.assertTrue(limiter.acquire('youtube', 'shared', 60))
+        script = (
+            'import sys; from yt_dlp.third_api.extractor.ratelimit import FileRateLimitState, RateLimiter; '
+            'limiter = RateLimiter(FileRateLimitState(sys.argv[1])); '
+            'print(limiter.acquire("youtube", "shared", 60), limiter.acquire("youtube", "other", 60))')
+        output = subprocess.check_output(
+            [sys.executable, '-c', script, self.filename], text=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual(output.split(), ['False', 'True'])
+        self.assertFalse(limiter.acquire('youtube', 'other', 60))
+
+    def test_file_state_eviction(self):
+        state = FileRateLimitState(self.filename)
+        self.addCleanup(state.close)
+        state._SLOTS, state._PROBES = 4, 2
+        for i in range(10):
+            state.update(f'counter{i}', lambda counter: ((0, 1), None), 60 + i)
+        self.assertEqual(state.update('counter9', lambda counter: (counter, counter), 60), (0, 1))
+        self.assertEqual(os.path.getsize(self.filename), state._HEADER.size + 4 * state._SLOT.size)
+
+    def test_guard(self):
+        ie = InfoExtractor(FakeYDL({'third_api_rate_limit_state': 'memory', 'third_api_rate_limits': {'test': (1, 60)}}))
+        ThirdApiGuard.guard(ie, f'test-{self.filename}-1')
+        with self.assertRaisesRegex(ExtractorError, 'too frequent'):
+            ThirdApiGuard.guard(ie, f'test-{self.filename}-1')
+        with self.assertRaisesRegex(ExtractorError, 'too frequent'):
+            ThirdApiGuard.guard(ie, f'test-{self.filename}-2')
+
+    def test_guard_allapi(self):
+        ie = InfoExtractor(FakeYDL({'third_api_rate_limit_state': 'memory', 'third_api_rate_limits': {
+            ZMMutilRapidApi.API_NAME: (1, 60),
+            SnapMutilRapidApi.API_NAME: (2, 60),
+        }}))
+        with contextlib.ExitStack() as stack:
+            for api_cls in (ZMMutilRapidApi, SnapMutilRapidApi):
+                stack.enter_context(mock.patch.object(api_cls, '__init__', lambda self, ie: None))
+                stack.enter_context(mock.patch.object(api_cls, 'extract_video_info', lambda self, url: {'url': url}))
+            # Each API called through allapi has its own limit
+            allapi.extract_video_info(ie, 'https://example.com/1', ZMMutilRapidApi.API_NAME)
+            allapi.extract_video_info(ie, 'https://example.com/1', SnapMutilRapidApi.API_NAME)
+            allapi.extract_video_info(ie, 'https://example.com/2', SnapMutilRapidApi.API_NAME)
+            with self.assertRaisesRegex(ExtractorError, 'too frequent'):
+                allapi.extract_video_info(ie, 'https://example.com/2', ZMMutilRapidApi.API_NAME)
+            with self.assertRaisesRegex(ExtractorError, 'too frequent'):
+                allapi.extract_video_info(ie, 'https://example.com/3', SnapMutilRapidApi.API_NAME)
+
+
+if __name__ == '__main__':
+    unittest.main()
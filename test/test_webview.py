@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+# Allow direct execution
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import concurrent.futures
+import json
+import shlex
+import time
+from unittest import mock
+
+from test.helper import FakeYDL
+from yt_dlp.extractor.common import InfoExtractor
+from yt_dlp.webview import WebviewWorker, WebviewWorkerError, WebviewWorkerPool
+
+STUB_WORKER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'testdata', 'webview', 'stub_worker.py')
+
+
+class TestWebviewWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.ydl = FakeYDL()
+
+    def make_pool(self, **kwargs):
+        pool = WebviewWorkerPool(self.ydl, [sys.executable, STUB_WORKER], **kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def request(self, pool, *args, **kwargs):
+        return json.loads(pool.request(list(args), **kwargs))
+
+    def test_persistent_worker(self):
+        pool = self.make_pool()
+        first = self.request(pool, 'https://example.com/1')
+        self.assertEqual(first['args'], ['https://example.com/1'])
+        second = self.request(pool, 'https://example.com/2')
+        self.assertEqual(second['args'], ['https://example.com/2'])
+        self.assertEqual(first['pid'], second['pid'])
+
+    def test_multiplexing(self):
+        pool = self.make_pool()
+        self.request(pool, 'start')
+        start = time.monotonic()
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(lambda i: self.request(pool, f'sleep:{0.5 * (4 - i)}', str(i)), range(4)))
+        self.assertLess(time.monotonic() - start, 4)
+        self.assertEqual([result['args'][1] for result in results], ['0', '1', '2', '3'])
+        self.assertEqual(len({result['pid'] for result in results}), 1)
+
+    def test_pool_size(self):
+        pool = self.make_pool(size=2)
+        self.request(pool, 'start')
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            results = list(executor.map(lambda i: self.request(pool, 'sleep:1'), range(2)))
+        self.assertEqual(len({result['pid'] for result in results}), 2)
+
+    def test_restart_on_crash(self):
+        pool = self.make_pool()
+        pid = self.request(pool, 'start')['pid']
+        with self.assertRaises(WebviewWorkerError):
+            pool.request(['crash'])
+        self.assertNotEqual(self.request(pool, 'restarted')['pid'], pid)
+
+    def test_max_requests(self):
+        pool = self.make_pool(max_requests=2)
+        pids = [self.request(pool, str(i))['pid'] for i in range(5)]
+        self.assertEqual(pids[0], pids[1])
+        self.assertEqual(pids[2], pids[3])
+        self.assertNotEqual(pids[1], pids[2])
+        self.assertNotEqual(pids[3], pids[4])
+
+    def test_retired_workers_closed_without_lock(self):
+        pool = self.make_pool(max_requests=1)
+        close, locked = WebviewWorker.close, []
+
+        def close_worker(worker, *args, **kwargs):
+            locked.append(pool._lock.locked())
+            return close(worker, *args, **kwargs)
+
+        with mock.patch.object(WebviewWorker, 'close', close_worker):
+            for i in range(3):
+                self.request(pool, str(i))
+            pid = self.request(pool, 'start')['pid']
+            with self.assertRaises(WebviewWorkerError):
+                pool.request(['crash'])
+            self.assertNotEqual(self.request(pool, 'restarted')['pid'], pid)
+        self.assertTrue(locked)
+        self.assertNotIn(True, locked)
+
+    def test_health_check(self):
+        pool = self.make_pool()
+        pool._HEALTH_CHECK_INTERVAL = 0
+        pool._HEALTH_CHECK_TIMEOUT = 1
+        pid = self.request(pool, 'start')['pid']
+        self.assertEqual(self.request(pool, 'hang')['pid'], pid)
+        self.assertNotEqual(self.request(pool, 'after')['pid'], pid)
+
+    def test_timeout(self):
+        pool = self.make_pool()
+        with self.assertRaises(WebviewWorkerError):
+            pool.request(['sleep:2'], timeout=0.2)
+
+
+    def test_extractor(self):
+        ydl = FakeYDL({'webview_workers': 1, 'webview_worker_params': shlex.quote(STUB_WORKER)})
+        self.addCleanup(ydl.close)
+        ie = InfoExtractor(ydl)
+        self.assertIsNone(FakeYDL()._get_webview_pool(sys.executable))
+        results = [ie._smart_call_cmd(sys.executable, '{url}', {'url': str(i)}, is_webview=True)
+                   for i in range(2)]
+        self.assertEqual([ok for ok, _ in results], [True, True])
+        self.assertEqual([result['args'] for _, result in results], [['0'], ['1']])
+        self.assertEqual(results[0][1]['pid'], results[1][1]['pid'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+A webview stub speaking the worker protocol of yt_dlp.webview
+
+The output of a request is a JSON object with the arguments and the pid of the worker.
+Special arguments: "sleep:SECONDS" delays the answer, "crash" exits immediately
+and "hang" stops answering health checks
+"""
+import json
+import os
+import sys
+import threading
+import time
+
+lock = threading.Lock()
+hung = False
+
+
+def answer(response):
+    with lock:
+        sys.stdout.write(json.dumps(response) + '\n')
+        sys.stdout.flush()
+
+
+def handle(request):
+    args = request['args']
+    for arg in args:
+        if arg.startswith('sleep:'):
+            time.sleep(float(arg[len('sleep:'):]))
+    answer({'id': request['id'], 'output': json.dumps({'args': args, 'pid': os.getpid()})})
+
+
+print('stub worker started', flush=True)
+for line in sys.stdin:
+    request = json.loads(line)
+    if request.get('ping'):
+        if not hung:
+            answer({'id': request['id'], 'pong': True})
+    elif 'crash' in request['args']:
+        os._exit(1)
+    elif 'hang' in request['args']:
+        hung = True
+        answer({'id': request['id'], 'output': json.dumps({'args': request['args'], 'pid': os.getpid()})})
+    else:
+        threading.Thread(target=handle, args=(request,)).start()
@@ -1,4 +1,5 @@
 import collections
+import concurrent.futures
 import contextlib
 import copy
 import datetime as dt
@@ -14,23 +15,28 @@
 import os
 import random
 import re
+import shlex
 import shutil
 import string
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 import tokenize
 import traceback
 import unicodedata
 
+from .archive import DownloadArchive, open_download_archive
 from .cache import Cache
 from .compat import urllib  # isort: split
 from .compat import urllib_req_to_req
 from .cookies import CookieLoadError, LenientSimpleCookie, load_cookies
-from .downloader import FFmpegFD, get_suitable_downloader, shorten_protocol_name
+from .downloader import FFmpegFD, StreamMergeFD, get_suitable_downloader, shorten_protocol_name
+from .downloader.common import FileDownloader
 from .downloader.rtmp import rtmpdump_version
 from .extractor import gen_extractor_classes, get_info_extractor, import_extractors
+from .extractor._host_index import ExtractorHostIndex
 from .extractor.common import UnsupportedURLIE
 from .extractor.openload import PhantomJSwrapper
 from .globals import (
@@ -47,6 +53,7 @@
 )
 from .minicurses import format_text
 from .networking import HEADRequest, Request, RequestDirector
+from .networking.cache import HTTPCache
 from .networking.common import _REQUEST_HANDLERS, _RH_PREFERENCES
 from .networking.exceptions import (
     HTTPError,
@@ -72,6 +79,7 @@
     MP4DecryptPP,
     get_postprocessor,
 )
+from .postprocessor.ffmpeg import FFmpegFusedPP
 from .postprocessor.ffmpeg import resolve_mapping as resolve_recode_mapping
 from .update import (
     REPOSITORY,
@@ -138,7 +146,6 @@
     iri_to_uri,
     is_path_like,
     join_nonempty,
-    locked_file,
     make_archive_id,
     make_parent_dirs,
     number_of_digits,
@@ -192,7 +199,9 @@
     std_headers,
 )
 from .third_api import MutilThirdIE
+from .third_api.extractor.ratelimit import rate_limit_metrics
 from .version import CHANNEL, ORIGIN, RELEASE_GIT_HEAD, VARIANT, __version__
+from .webview import WebviewWorkerPool
 
 if os.name == 'nt':
     import ctypes
@@ -349,6 +358,19 @@ class YoutubeDL:
     skip_download:     Skip the actual download of the video file
     cachedir:          Location of the cache files in the filesystem.
                        False to disable filesystem cache.
+    cache_backend:     How to store the cache: "json" (default) for one file per
+                       entry or "sqlite" for a single database
+    cache_ttl:         Dictionary of cache section to the number of seconds after which
+                       its entries expire. The key "default" applies to all other sections
+    cache_max_size:    Maximum size of the cache in bytes (sqlite backend only).
+                       The least recently used entries are evicted beyond it
+    http_cache:        Cache the responses to the metadata requests of the
+                       extractors in the "http" cache section, honoring
+                       Cache-Control and revalidating them with ETag/Last-Modified
+    http_cache_ttl:    Dictionary of lowercase extractor key to the number of
+                       seconds its cached responses are fresh for, overriding
+                       the response headers. The key "default" applies to all
+                       other extractors
     noplaylist:        Download single video instead of a playlist if in doubt.
     age_limit:         An integer representing the user's age in years.
                        Unsuitable videos for the given age are skipped.
@@ -363,15 +385,26 @@ class YoutubeDL:
                        downloaded. None for no limit.
     download_archive:  A set, or the name of a file where all downloads are recorded.
                        Videos already present in the file are not downloaded again.
+                       Files named *.sqlite, *.sqlite3 or *.db (or that already are
+                       SQLite databases) are used as an indexed SQLite archive
     break_on_existing: Stop the download process after attempting to download a
                        file that is in the archive.
     break_per_url:     Whether break_on_reject and break_on_existing
                        should act on each input URL as opposed to for the entire queue
     cookiefile:        File name or text stream from where cookies should be read and dumped to
+    webview_workers:   Number of persistent webview processes to keep running.
+                       The webview must support the protocol of yt_dlp.webview.WebviewWorker.
+                       Default is 0, which runs the webview once for every request
+    webview_worker_params: Params used to start the webview as a persistent worker
+    webview_worker_max_requests: Number of requests after which a webview worker is restarted
     cookiesfrombrowser:  A tuple containing the name of the browser, the profile
                        name/path from where cookies are loaded, the name of the keyring,
                        and the container name, e.g. ('chrome', ) or
                        ('vivaldi', 'default', 'BASICTEXT') or ('firefox', 'default', None, 'Meta')
+    cookiesfrombrowser_cache: Keep the cookies loaded from the browser in the cache,
+                       and only load them again when its cookie database changes
+    cookiesfrombrowser_domains: Only load the cookies of these domains and their
+                       subdomains from the browser
     legacyserverconnect: Explicitly allow HTTPS connection to servers that do not
                        support RFC 5746 secure renegotiation
     nocheckcertificate:  Do not verify SSL certificates
@@ -384,6 +417,29 @@ class YoutubeDL:
     enable_file_urls:  Enable file:// URLs. This is disabled by default for security reasons.
     http_headers:      A dictionary of custom headers to be used for all requests
     disable_third_api: Disable third-party API usage
+    third_api_rate_limits: A dictionary of the API names (or 'default') to
+                       a tuple (calls, period in seconds) limiting the calls to the API
+    third_api_repeat_interval: Minimum time in seconds between two third-party
+                       API calls with the same key. Default is 600
+    third_api_rate_limit_state: Where to keep the state of the third-party API
+                       rate limits. One of 'file' (shared with other processes,
+                       default) or 'memory'
+    extractor_fallback_order: List of the extractor keys to try, in this order,
+                       when the extractor of a URL fails. Default is
+                       ['ThirdApi', 'Generic', 'SearchForAlternative']
+    race_extractor_fallbacks: Run all applicable fallback extractors concurrently
+                       instead of one after another. The result of the first
+                       one in extractor_fallback_order that succeeds is used
+    extractor_fallback_timeout: With race_extractor_fallbacks, the time in seconds
+                       after which fallbacks that have not finished are abandoned
+    concurrent_extractions: Number of URLs or playlist entries to extract
+                       concurrently while the previous ones are processed.
+                       The results are still processed in order. See extract_many
+    concurrent_format_downloads: Number of the formats of a merged format (e.g. bv+ba)
+                       to download concurrently. They share the rate limit
+    stream_merge:      Merge the native DASH/HLS formats of a merged format with
+                       ffmpeg while they are downloaded, instead of downloading
+                       them to separate files first. Can't be resumed
     proxy:             URL of the proxy server to use
     geo_verification_proxy:  URL of the proxy to use for IP address verification
                        on geo-restricted sites.
@@ -454,9 +510,21 @@ class YoutubeDL:
                        - "warn": only emit a warning
                        - "detect_or_warn": check whether we can do anything
                                            about it, warn otherwise (default)
+    fuse_postprocessors: Run consecutive stream copy ffmpeg postprocessors
+                       with a single ffmpeg invocation (default: True)
+    ffmpeg_jobs:       Number of ffmpeg processes to run at a time when splitting
+                       chapters or converting thumbnails (default: CPU count)
     source_address:    Client-side IP address to bind to.
     impersonate:       Client to impersonate for requests.
                        An ImpersonateTarget (from yt_dlp.networking.impersonate)
+    http2:             Use HTTP/2 for https requests if the server supports it,
+                       so that requests to the same host share a connection.
+                       Requires httpx and h2
+    http2_max_streams: Maximum number of requests open at once to the same
+                       host with http2 (default: as many as the server allows)
+    http_pool_size:    Maximum number of idle connections kept open to the same
+                       host. Default is enough for the concurrent fragment,
+                       format and HTTP connection downloads
     sleep_interval_requests: Number of seconds to sleep between requests
                        during extraction
     sleep_interval:    Number of seconds to sleep before each download when
@@ -534,8 +602,9 @@ class YoutubeDL:
     the downloader (see yt_dlp/downloader/common.py):
     nopart, updatetime, buffersize, ratelimit, throttledratelimit, min_filesize,
     max_filesize, test, noresizebuffer, retries, file_access_retries, fragment_retries,
-    continuedl, hls_use_mpegts, http_chunk_size, external_downloader_args,
-    concurrent_fragment_downloads, progress_delta.
+    continuedl, hls_use_mpegts, http_chunk_size, http_connections, external_downloader_args,
+    concurrent_fragment_downloads, fragment_straggler_percentile, fragments_in_memory,
+    progress_delta.
 
     The following options are used by the post processors:
     ffmpeg_location:   Location of the ffmpeg binary; either the path
@@ -658,6 +727,7 @@ def __init__(self, params=None, auto_init=True):
         self.params = params
         self._ies = {}
         self._ies_instances = {}
+        self._extractor_lookups = 0
         self._pps = {k: [] for k in POSTPROCESS_WHEN}
         self._printed_messages = set()
         self._first_webpage_request = True
@@ -672,6 +742,11 @@ def __init__(self, params=None, auto_init=True):
         self._playlist_urls = set()
         self.cache = Cache(self)
         self.__header_cookies = []
+        self._webview_pools = {}
+        self._prefetched_extractions = {}
+        self._extraction_semaphores = {}
+        self._extractor_init_lock = threading.Lock()
+        self._webview_pools_lock = threading.Lock()
 
         # compat for API: load plugins if they have not already
         if not all_plugins_loaded.value:
@@ -881,22 +956,12 @@ def check_deprecated(param, option, suggestion):
                 raise
 
         def preload_download_archive(fn):
-            """Preload the archive, if any is specified"""
-            archive = set()
+            """Open the archive, if any is specified"""
             if fn is None:
-                return archive
+                return set()
             elif not is_path_like(fn):
                 return fn
-
-            self.write_debug(f'Loading archive file {fn!r}')
-            try:
-                with locked_file(fn, 'r', encoding='utf-8') as archive_file:
-                    for line in archive_file:
-                        archive.add(line.strip())
-            except OSError as ioe:
-                if ioe.errno != errno.ENOENT:
-                    raise
-            return archive
+            return open_download_archive(self, fn)
 
         self.archive = preload_download_archive(self.params.get('download_archive'))
 
@@ -953,6 +1018,8 @@ def warn_if_short_id(self, argv):
     def add_info_extractor(self, ie):
         """Add an InfoExtractor object to the end of the list."""
         ie_key = ie.ie_key()
+        if ie_key not in self._ies:
+            self.__dict__.pop('_extractor_host_index', None)
         self._ies[ie_key] = ie
         if not isinstance(ie, type):
             self._ies_instances[ie_key] = ie
@@ -1107,7 +1174,29 @@ def __exit__(self, *args):
 
     def close(self):
         self.save_cookies()
+        if isinstance(self.archive, DownloadArchive):
+            self.archive.close()
+        if self.cache.hits or self.cache.misses:
+            self.write_debug(f'Cache: {self.cache.hits} hits, {self.cache.misses} misses')
+        http_cache = self.__dict__.get('_http_cache')
+        if http_cache and (http_cache.hits or http_cache.revalidated or http_cache.misses):
+            self.write_debug(
+                f'HTTP cache: {http_cache.hits} hits, {http_cache.revalidated} revalidated, {http_cache.misses} misses')
+        self.cache.close()
+        probe_cache = FFmpegPostProcessor.probe_cache
+        if probe_cache.hits or probe_cache.misses:
+            self.write_debug(f'ffprobe cache: {probe_cache.hits} hits, {probe_cache.misses} misses')
+        for api, counts in rate_limit_metrics().items():
+            self.write_debug(f'Third API {api}: ' + ', '.join(f'{count} {name}' for name, count in counts.items()))
+        with self._webview_pools_lock:
+            for pool in self._webview_pools.values():
+                pool.close()
+            self._webview_pools.clear()
         if '_request_director' in self.__dict__:
+            for host, counts in self.connection_metrics().items():
+                self.write_debug(f'Connections to {host}: ' + ', '.join(
+                    f'{count:.3f}s {name}' if isinstance(count, float) else f'{count} {name}'
+                    for name, count in counts.items()))
             self._request_director.close()
             del self._request_director
 
@@ -1632,8 +1721,12 @@ def prepare_filename(self, info_dict, dir_type='', *, outtmpl=None, warn=False):
 
         return self.get_output_path(dir_type, filename)
 
-    def _match_entry(self, info_dict, incomplete=False, silent=False):
-        """Returns None if the file should be downloaded"""
+    def _match_entry(self, info_dict, incomplete=False, silent=False, dry_run=False):
+        """
+        Returns None if the file should be downloaded
+
+        @param dry_run      Don't ask the user or break on the entry. Used before it is reached
+        """
         _type = 'video' if 'playlist-match-filter' in self.params['compat_opts'] else info_dict.get('_type', 'video')
         assert incomplete or _type == 'video', 'Only video result can be considered complete'
 
@@ -1691,6 +1784,8 @@ def check_filter():
                 ret, cancelled = err.msg, err
 
             if ret is NO_DEFAULT:
+                if dry_run:
+                    return None
                 while True:
                     filename = self._format_screen(self.prepare_filename(info_dict), self.Styles.FILENAME)
                     self.to_screen(
@@ -1721,7 +1816,7 @@ def check_filter():
         if reason is not None:
             if not silent:
                 self.to_screen('[download] ' + reason)
-            if self.params.get(break_opt, False):
+            if self.params.get(break_opt, False) and not dry_run:
                 raise break_err()
         return reason
 
@@ -1754,24 +1849,9 @@ def extract_info(self, url, download=True, ie_key=None, extra_info=None,
         if extra_info is None:
             extra_info = {}
 
-        if self._is_use_webview(url):
-            force_generic_extractor = True
-
-        if not ie_key and force_generic_extractor:
-            ie_key = 'Generic'
-
-        if not ie_key and self._is_use_third_api(url):
-            ie_key = 'ThirdApi'
-
-        if ie_key:
-            ies = {ie_key: self._ies[ie_key]} if ie_key in self._ies else {}
-        else:
-            ies = self._ies
-
-        for key, ie in ies.items():
-            if len(ies) > 1 and not ie.suitable(url):
-                continue
+        ie_key, ies = self._get_extractors_for_url(url, ie_key, force_generic_extractor)
 
+        for key, ie in (self._suitable_extractors(url) if len(ies) > 1 else ies.items()):
             if not ie.working():
                 self.report_warning('The program functionality for this site has been marked as broken, '
                                     'and will probably not work.')
@@ -1786,21 +1866,22 @@ def extract_info(self, url, download=True, ie_key=None, extra_info=None,
             try:
                 return self.__extract_info(url, self.get_info_extractor(key), download, extra_info, process, raise_all_error=True)
             except Exception as e:
-                if self._is_try_third_api(key):
-                    with contextlib.suppress(Exception):
-                        self.report_msg('trying ThirdApi extractor')
-                        return self.__extract_info(smuggle_url(url, {'__third_api__': 'mutil_api'}), self.get_info_extractor('ThirdApi'), download, extra_info, process, raise_all_error=True)
-
-                is_login_error = '--cookies' in str(e)
-                if not is_login_error and self._is_try_generic(key):
-                    with contextlib.suppress(Exception):
-                        self.report_msg('trying Generic extractor')
-                        return self.__extract_info(url, self.get_info_extractor('Generic'), download, extra_info, process, raise_all_error=True)
-
-                if not is_login_error and self._test_hit_searchalter(url):
-                    with contextlib.suppress(Exception):
-                        self.report_msg('trying Searchalter extractor')
-                        return self.__extract_info(url, self.get_info_extractor('SearchForAlternative'), download, extra_info, process, raise_all_error=True)
+                fallbacks = self._get_extractor_fallbacks(url, key, is_login_error='--cookies' in str(e))
+                if self.params.get('race_extractor_fallbacks') and len(fallbacks) > 1:
+                    with contextlib.closing(self._race_extractor_fallbacks(fallbacks, extra_info)) as ie_results:
+                        for ie_result in ie_results:
+                            with contextlib.suppress(Exception):
+                                if not process:
+                                    return ie_result
+                                self._wait_for_video(ie_result)
+                                return self.process_ie_result(ie_result, download, extra_info)
+                else:
+                    for label, fallback_key, fallback_url in fallbacks:
+                        with contextlib.suppress(Exception):
+                            self.report_msg(f'trying {label} extractor')
+                            return self.__extract_info(
+                                fallback_url, self.get_info_extractor(fallback_key), download, extra_info, process,
+                                raise_all_error=True)
 
                 self.report_error(f'{e}')
                 raise e
@@ -1810,6 +1891,124 @@ def extract_info(self, url, download=True, ie_key=None, extra_info=None,
             self.report_error(f'No suitable extractor{format_field(ie_key, None, " (%s)")} found for URL {url}',
                               tb=False if extractors_restricted else None)
 
+    def _get_extractors_for_url(self, url, ie_key=None, force_generic_extractor=False):
+        """@returns (ie_key, {ie_key: ie class} of the extractors to try for the URL)"""
+        if self._is_use_webview(url):
+            force_generic_extractor = True
+
+        if not ie_key and force_generic_extractor:
+            ie_key = 'Generic'
+
+        if not ie_key and self._is_use_third_api(url):
+            ie_key = 'ThirdApi'
+
+        if ie_key:
+            return ie_key, {ie_key: self._ies[ie_key]} if ie_key in self._ies else {}
+        return ie_key, self._ies
+
+    # Building the index parses the regexes of all extractors unless the lazy extractors
+    # include their host keys, which is only worth it if many URLs are matched
+    _MIN_LOOKUPS_FOR_HOST_INDEX = 8
+
+    @functools.cached_property
+    def _extractor_host_index(self):
+        return ExtractorHostIndex(self._ies)
+
+    def _suitable_extractors(self, url):
+        """Yield the (ie_key, ie) of the extractors suitable for the URL, in order of preference"""
+        self._extractor_lookups += 1
+        if LAZY_EXTRACTORS.value or self._extractor_lookups > self._MIN_LOOKUPS_FOR_HOST_INDEX:
+            candidates = self._extractor_host_index.candidates(url)
+        else:
+            candidates = list(self._ies)
+        for ie_key in candidates:
+            ie = self._ies[ie_key]
+            if ie.suitable(url):
+                yield ie_key, ie
+
+    def extract_many(self, urls, download=True, concurrency=None, **kwargs):
+        """
+        Extract and yield the information dictionaries of several URLs
+
+        While a URL is being processed (and downloaded), the next `concurrency`
+        URLs are extracted in the background. The results are processed
+        and yielded in the order of `urls`.
+        See extract_info for the keyword arguments
+
+        @param concurrency  Number of URLs to extract concurrently.
+                            Default is the concurrent_extractions param
+        """
+        force_generic_extractor = kwargs.get('force_generic_extractor', False)
+        for url in self._prefetch_extractions(
+                urls, lambda url: (url, kwargs.get('ie_key'), force_generic_extractor), concurrency):
+            yield self.extract_info(url, download, **kwargs)
+
+    def _prefetch_extractions(self, items, get_url, concurrency=None):
+        """
+        Yield the items, extracting the URLs of the next `concurrency` items in the background.
+        The prefetched results are picked up by extract_info when it extracts the same URLs.
+        No more URLs are prefetched than can still be downloaded with max_downloads
+
+        @param get_url      Function returning (url, ie_key, force_generic_extractor) for an item,
+                            or None if the item doesn't need to be extracted
+        """
+        concurrency = concurrency or self.params.get('concurrent_extractions') or 1
+        if concurrency <= 1 or self.params.get('wait_for_video'):
+            yield from items
+            return
+
+        executor = concurrent.futures.ThreadPoolExecutor(concurrency, thread_name_prefix='extraction')
+        max_downloads = float(self.params.get('max_downloads') or 'inf')
+        prefetched, pending = [], collections.deque()  # pending: (item, key of its prefetched extraction)
+        items = iter(items)
+        try:
+            while True:
+                for item in itertools.islice(items, concurrency + 1 - len(pending)):
+                    key = None
+                    if self._num_downloads + sum(1 for _, k in pending if k) < max_downloads:
+                        key = self._prefetch_extraction(executor, concurrency, *(get_url(item) or (None,)))
+                    pending.append((item, key))
+                    if key:
+                        prefetched.append(key)
+                if not pending:
+                    break
+                yield pending.popleft()[0]
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            for key in prefetched:
+                self._prefetched_extractions.pop(key, None)
+
+    def _prefetch_extraction(self, executor, concurrency, url, ie_key=None, force_generic_extractor=False):
+        if not isinstance(url, str):
+            return None
+        _, ies = self._get_extractors_for_url(url, ie_key, force_generic_extractor)
+        ie_key = next((key for key, _ in (self._suitable_extractors(url) if len(ies) > 1 else ies.items())), None)
+        if not ie_key or (ie_key, url) in self._prefetched_extractions:
+            return None
+        ie = self.get_info_extractor(ie_key)
+        temp_id = ie.get_temp_id(url)
+        if temp_id is not None and self.in_download_archive({'id': temp_id, 'ie_key': ie_key}):
+            return None
+
+        if ie_key not in self._extraction_semaphores:
+            self._extraction_semaphores[ie_key] = threading.BoundedSemaphore(
+                min(concurrency, ie._MAX_CONCURRENT_EXTRACTIONS or concurrency))
+        semaphore = self._extraction_semaphores[ie_key]
+
+        def extract():
+            with semaphore:
+                self._apply_header_cookies(url)
+                with self._extractor_init_lock:
+                    # Log in etc. only once, on the shared instance
+                    if not ie._ready:
+                        ie.initialize()
+                # The instance keeps state of the extraction (e.g. the geo bypass IP),
+                # so each one gets a copy of its own
+                return copy.copy(ie).extract(url)
+
+        self._prefetched_extractions[ie_key, url] = executor.submit(extract)
+        return ie_key, url
+
     def _handle_extraction_exceptions(func):
         @functools.wraps(func)
         def wrapper(self, *args, **kwargs):
@@ -1958,10 +2157,12 @@ def _apply_header_cookies(self, url, cookies=None):
 
     @_handle_extraction_exceptions
     def __extract_info(self, url, ie, download, extra_info, process):
-        self._apply_header_cookies(url)
+        prefetched = self._prefetched_extractions.pop((ie.ie_key(), url), None)
+        if not prefetched:
+            self._apply_header_cookies(url)
 
         try:
-            ie_result = ie.extract(url)
+            ie_result = prefetched.result() if prefetched else ie.extract(url)
         except UserNotLive as e:
             if process:
                 if self.params.get('wait_for_video'):
@@ -2242,24 +2443,34 @@ def __process_playlist(self, ie_result, download):
         if keep_resolved_entries:
             self.write_debug('The information of all playlist entries will be held in memory')
 
+        def playlist_entry(i, playlist_index, entry):
+            if not lazy and 'playlist-index' in self.params['compat_opts']:
+                playlist_index = ie_result['requested_entries'][i]
+            return playlist_index, collections.ChainMap(entry, {
+                **common_info,
+                'n_entries': int_or_none(n_entries),
+                'playlist_index': playlist_index,
+                'playlist_autonumber': i + 1,
+            })
+
+        def get_entry_url(item):
+            i, (playlist_index, entry) = item
+            if (isinstance(entry, dict) and entry.get('_type') in ('url', 'url_transparent')
+                    and entry.get('_playlist_media_type') != 'CAROUSEL'
+                    and self._match_entry(
+                        playlist_entry(i, playlist_index, entry)[1], incomplete=True, silent=True, dry_run=True) is None):
+                return entry.get('url'), entry.get('ie_key')
+
         failures = 0
         max_failures = self.params.get('skip_playlist_after_errors') or float('inf')
-        for i, (playlist_index, entry) in enumerate(entries):
+        for i, (playlist_index, entry) in self._prefetch_extractions(enumerate(entries), get_entry_url):
             if lazy:
                 resolved_entries.append((playlist_index, entry))
             if not entry:
                 continue
 
             entry['__x_forwarded_for_ip'] = ie_result.get('__x_forwarded_for_ip')
-            if not lazy and 'playlist-index' in self.params['compat_opts']:
-                playlist_index = ie_result['requested_entries'][i]
-
-            entry_copy = collections.ChainMap(entry, {
-                **common_info,
-                'n_entries': int_or_none(n_entries),
-                'playlist_index': playlist_index,
-                'playlist_autonumber': i + 1,
-            })
+            playlist_index, entry_copy = playlist_entry(i, playlist_index, entry)
 
             if self._match_entry(entry_copy, incomplete=True) is not None:
                 # For compatabilty with youtube-dl. See https://github.com/yt-dlp/yt-dlp/issues/4369
@@ -3432,7 +3643,7 @@ def print_field(field, actual_field=None, optional=False):
         if self.params.get('forcejson'):
             self.to_stdout(json.dumps(self.sanitize_info(info_dict)))
 
-    def dl(self, name, info, subtitle=False, test=False):
+    def dl(self, name, info, subtitle=False, test=False, *, params=None, progress_hooks=()):
         if not info.get('url'):
             self.raise_no_formats(info, True)
 
@@ -3451,11 +3662,11 @@ def dl(self, name, info, subtitle=False, test=False):
                 '_no_ytdl_file': True,
             }
         else:
-            params = self.params
+            params = params or self.params
 
         fd = get_suitable_downloader(info, params, to_stdout=(name == '-'))(self, params)
         if not test:
-            for ph in self._progress_hooks:
+            for ph in (*self._progress_hooks, *progress_hooks):
                 fd.add_progress_hook(ph)
             urls = '", "'.join(
                 (f['url'].split(',')[0] + ',<data>' if f['url'].startswith('data:') else f['url'])
@@ -3469,6 +3680,79 @@ def dl(self, name, info, subtitle=False, test=False):
             new_info['http_headers'] = self._calc_headers(new_info)
         return fd.download(name, new_info, subtitle)
 
+    def _dl_formats(self, downloads, info_dict):
+        """
+        Download the formats to merge, concurrently if enabled
+
+        @param downloads    List of (filename, format info)
+        @returns            List of (success, real_download)
+        """
+        concurrency = min(self.params.get('concurrent_format_downloads') or 1, len(downloads))
+        if concurrency <= 1 or any(name == '-' for name, _ in downloads):
+            return [self.dl(name, info) for name, info in downloads]
+
+        # The downloaders would overwrite each other's progress line, so it is aggregated
+        params = {**self.params, 'noprogress': True}
+        if params.get('ratelimit'):
+            params['ratelimit'] = params['ratelimit'] / concurrency
+        printer = FileDownloader(self, self.params)
+        progress_lock = threading.Lock()
+        statuses = [{} for _ in downloads]
+        start_time = time.time()
+
+        def aggregate_progress(idx, status):
+            with progress_lock:
+                statuses[idx] = {
+                    **status,
+                    'downloaded_bytes': status.get('downloaded_bytes') or (
+                        status.get('total_bytes') if status['status'] == 'finished' else 0),
+                    'speed': status.get('speed') if status['status'] == 'downloading' else 0,
+                }
+                total_bytes = [s.get('total_bytes') or s.get('total_bytes_estimate') for s in statuses]
+                downloaded_bytes = sum(s.get('downloaded_bytes') or 0 for s in statuses)
+                speed = sum(s.get('speed') or 0 for s in statuses)
+                progress = {
+                    'status': 'downloading',
+                    'downloaded_bytes': downloaded_bytes,
+                    'speed': speed or None,
+                    'elapsed': time.time() - start_time,
+                    'ctx_id': info_dict.get('ctx_id'),
+                    'info_dict': info_dict,
+                }
+                if all(total_bytes):
+                    total = sum(total_bytes)
+                    progress['total_bytes' if all(s.get('total_bytes') for s in statuses) else 'total_bytes_estimate'] = total
+                    progress['eta'] = int((total - downloaded_bytes) / speed) if speed else None
+                printer.report_progress(progress)
+
+        # Set when a download fails or is interrupted, so that the others stop at their next progress update
+        aborted = threading.Event()
+
+        def download(idx, name, info):
+            def hook(status):
+                if aborted.is_set():
+                    raise DownloadCancelled('Another format could not be downloaded')
+                aggregate_progress(idx, status)
+            return self.dl(name, info, params=params, progress_hooks=[hook])
+
+        self.write_debug(f'Downloading {len(downloads)} formats with a concurrency of {concurrency}')
+        pool = concurrent.futures.ThreadPoolExecutor(concurrency, thread_name_prefix='format_download')
+        try:
+            futures = [pool.submit(download, idx, name, info) for idx, (name, info) in enumerate(downloads)]
+            done, _ = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_EXCEPTION)
+            for future in done:
+                # Raise the error of a failed download before waiting for the others
+                future.result()
+            results = [future.result() for future in futures]
+        except BaseException:
+            aborted.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        finally:
+            printer._finish_multiline_status()
+        pool.shutdown()
+        return results
+
     def existing_file(self, filepaths, *, default_overwrite=True):
         existing_files = list(filter(os.path.exists, orderedSet(filepaths)))
         if existing_files and not self.params.get('overwrites', default_overwrite):
@@ -3705,7 +3989,7 @@ def correct_ext(filename, ext=new_ext):
                     if dl_filename is not None:
                         self.report_file_already_downloaded(dl_filename)
                     elif fd:
-                        if fd != FFmpegFD and temp_filename != '-':
+                        if fd not in (FFmpegFD, StreamMergeFD) and temp_filename != '-':
                             for f in info_dict['requested_formats']:
                                 f['filepath'] = fname = prepend_extension(
                                     correct_ext(temp_filename, info_dict['ext']),
@@ -3735,6 +4019,7 @@ def correct_ext(filename, ext=new_ext):
                                 f'You have requested downloading multiple formats to stdout {reason}. '
                                 'The formats will be streamed one after the other')
                             fname = temp_filename
+                        format_downloads = []
                         for f in info_dict['requested_formats']:
                             new_info = dict(info_dict)
                             del new_info['requested_formats']
@@ -3747,7 +4032,8 @@ def correct_ext(filename, ext=new_ext):
                                     return
                                 f['filepath'] = fname
                                 downloaded.append(fname)
-                            partial_success, real_download = self.dl(fname, new_info)
+                            format_downloads.append((fname, new_info))
+                        for partial_success, real_download in self._dl_formats(format_downloads, info_dict):
                             info_dict['__real_download'] = info_dict['__real_download'] or real_download
                             success = success and partial_success
 
@@ -3890,9 +4176,9 @@ def download(self, url_list):
                 and self.params.get('max_downloads') != 1):
             raise SameFileError(outtmpl)
 
-        for url in url_list:
-            self.__download_wrapper(self.extract_info)(
-                url, force_generic_extractor=self.params.get('force_generic_extractor', False))
+        force_generic_extractor = self.params.get('force_generic_extractor', False)
+        for url in self._prefetch_extractions(url_list, lambda url: (url, None, force_generic_extractor)):
+            self.__download_wrapper(self.extract_info)(url, force_generic_extractor=force_generic_extractor)
 
         return self._download_retcode
 
@@ -4097,7 +4383,10 @@ def run_pp(self, pp, infodict):
     def run_all_pps(self, key, info, *, additional_pps=None):
         if key != 'video':
             self._forceprint(key, info)
-        for pp in (additional_pps or []) + self._pps[key]:
+        pps = (additional_pps or []) + self._pps[key]
+        if key == 'post_process' and self.params.get('fuse_postprocessors', True):
+            pps = FFmpegFusedPP.fuse(self, pps)
+        for pp in pps:
             info = self.run_pp(pp, info)
         return info
 
@@ -4133,11 +4422,8 @@ def _make_archive_id(self, info_dict):
             if not url:
                 return
             # Try to find matching extractor for the URL and take its ie_key
-            for ie_key, ie in self._ies.items():
-                if ie.suitable(url):
-                    extractor = ie_key
-                    break
-            else:
+            extractor = next((ie_key for ie_key, _ in self._suitable_extractors(url)), None)
+            if extractor is None:
                 return
         return make_archive_id(extractor, video_id)
 
@@ -4157,9 +4443,6 @@ def record_download_archive(self, info_dict):
         assert vid_id
 
         self.write_debug(f'Adding to archive: {vid_id}')
-        if is_path_like(fn):
-            with locked_file(fn, 'a', encoding='utf-8') as archive_file:
-                archive_file.write(vid_id + '\n')
         self.archive.add(vid_id)
 
     @staticmethod
@@ -4550,6 +4833,15 @@ def _unavailable_targets_message(requested_targets, note=None, is_error=False):
             f'  https://github.com/yt-dlp/yt-dlp#impersonation  '
             f'for information on installing the required dependencies')
 
+    def connection_metrics(self):
+        """
+        @returns A dict of the connection counters of each host so far, e.g.
+                 {'example.com': {'requests': 3, 'reused': 2, 'opened': 1, 'connect_time': 0.1, ...}}
+        """
+        if '_request_director' not in self.__dict__:
+            return {}
+        return self._request_director.connection_metrics()
+
     def urlopen(self, req):
         """ Start an HTTP download """
         if isinstance(req, str):
@@ -4621,7 +4913,12 @@ def build_request_director(self, handlers, preferences=None):
         clean_headers(headers)
         clean_proxies(proxies, headers)
 
-        director = RequestDirector(logger=logger, verbose=self.params.get('debug_printtraffic'))
+        director = RequestDirector(
+            logger=logger, verbose=self.params.get('debug_printtraffic'), cache=self._http_cache)
+        # Each concurrent download of a format can have its own connection to the host
+        concurrent_downloads = (self.params.get('concurrent_format_downloads') or 1) * max(
+            self.params.get('concurrent_fragment_downloads') or 1, self.params.get('http_connections') or 1)
+        pool_size = self.params.get('http_pool_size') or max(concurrent_downloads + 1, 10)
         for handler in handlers:
             director.add_handler(handler(
                 logger=logger,
@@ -4630,6 +4927,7 @@ def build_request_director(self, handlers, preferences=None):
                 proxies=proxies,
                 prefer_system_certs='no-certifi' in self.params['compat_opts'],
                 verify=not self.params.get('nocheckcertificate'),
+                pool_size=pool_size,
                 **traverse_obj(self.params, {
                     'verbose': 'debug_printtraffic',
                     'source_address': 'source_address',
@@ -4637,6 +4935,8 @@ def build_request_director(self, handlers, preferences=None):
                     'legacy_ssl_support': 'legacyserverconnect',
                     'enable_file_urls': 'enable_file_urls',
                     'impersonate': 'impersonate',
+                    'http2': 'http2',
+                    'http2_max_streams': 'http2_max_streams',
                     'client_cert': {
                         'client_certificate': 'client_certificate',
                         'client_certificate_key': 'client_certificate_key',
@@ -4649,6 +4949,11 @@ def build_request_director(self, handlers, preferences=None):
             director.preferences.add(lambda rh, _: 500 if rh.RH_KEY == 'Urllib' else 0)
         return director
 
+    @functools.cached_property
+    def _http_cache(self):
+        if self.params.get('http_cache') and self.cache.enabled:
+            return HTTPCache(self.cache, self.cookiejar)
+
     @functools.cached_property
     def _request_director(self):
         return self.build_request_director(_REQUEST_HANDLERS.values(), _RH_PREFERENCES)
@@ -4856,6 +5161,19 @@ def _is_use_webview(self, url):
         except Exception:
             return False
 
+    def _get_webview_pool(self, webview_location):
+        """Get the persistent workers of the webview, or None if they are disabled"""
+        size = self.params.get('webview_workers')
+        if not size:
+            return None
+        with self._webview_pools_lock:
+            pool = self._webview_pools.get(webview_location)
+            if not pool:
+                worker_params = shlex.split(self.params.get('webview_worker_params') or '--worker')
+                pool = self._webview_pools[webview_location] = WebviewWorkerPool(
+                    self, [webview_location, *worker_params], size, self.params.get('webview_worker_max_requests'))
+            return pool
+
     def _has_formats_to_download(self, info_dict):
         with contextlib.suppress(Exception):
             req_format = self._default_format_spec(info_dict) or 'bv*+ba/b'
@@ -4900,7 +5218,72 @@ def _get_max_format_wh_value(self, info_dict):
         return w * h
 
     def has_suitable_ie(self, url):
-        return any(ie.suitable(url) and key.lower() != 'generic' for key, ie in self._ies.items())
+        return any(key.lower() != 'generic' for key, _ in self._suitable_extractors(url))
+
+    _EXTRACTOR_FALLBACK_ORDER = ('ThirdApi', 'Generic', 'SearchForAlternative')
+
+    def _get_extractor_fallbacks(self, url, ie_key, is_login_error=False):
+        """
+        Get the extractors to try when extractor ie_key failed for url,
+        ordered by extractor_fallback_order
+
+        @returns    list of (label, ie_key, url)
+        """
+        fallbacks = {}
+        if self._is_try_third_api(ie_key):
+            fallbacks['ThirdApi'] = ('ThirdApi', 'ThirdApi', smuggle_url(url, {'__third_api__': 'mutil_api'}))
+        if not is_login_error and self._is_try_generic(ie_key):
+            fallbacks['Generic'] = ('Generic', 'Generic', url)
+        if not is_login_error and self._test_hit_searchalter(url):
+            fallbacks['SearchForAlternative'] = ('Searchalter', 'SearchForAlternative', url)
+
+        order = self.params.get('extractor_fallback_order')
+        order = [key.lower() for key in (self._EXTRACTOR_FALLBACK_ORDER if order is None else order)]
+        return sorted(
+            (fallback for key, fallback in fallbacks.items() if key.lower() in order),
+            key=lambda fallback: order.index(fallback[1].lower()))
+
+    def _race_extractor_fallbacks(self, fallbacks, extra_info):
+        """
+        Extract the URL with all fallbacks concurrently and yield the unprocessed ie_results
+        of those that succeed, in the order of fallbacks. A fallback is only waited for
+        until extractor_fallback_timeout has passed. The remaining extractions are
+        abandoned when the generator is closed
+
+        @param fallbacks    list of (label, ie_key, url) as returned by _get_extractor_fallbacks
+        """
+        timeout = self.params.get('extractor_fallback_timeout')
+        deadline = timeout and time.monotonic() + timeout
+        timings = {}
+
+        def extract(label, ie_key, url):
+            start = time.monotonic()
+            try:
+                return self.__extract_info(
+                    url, self.get_info_extractor(ie_key), False, extra_info, False, raise_all_error=True)
+            finally:
+                timings[label] = time.monotonic() - start
+
+        self.report_msg(f'trying {", ".join(label for label, _, _ in fallbacks)} extractors concurrently')
+        pool = concurrent.futures.ThreadPoolExecutor(len(fallbacks), thread_name_prefix='extractor_fallback')
+        futures = [(fallback[0], pool.submit(extract, *fallback)) for fallback in fallbacks]
+        try:
+            for label, future in futures:
+                # future.result(timeout) can not tell a timeout of the extractor itself apart from the deadline
+                done, _ = concurrent.futures.wait([future], timeout=deadline and max(deadline - time.monotonic(), 0))
+                if not done:
+                    self.write_debug(f'{label} extractor did not finish within {timeout}s')
+                    continue
+                try:
+                    ie_result = future.result()
+                except Exception as e:
+                    self.write_debug(f'{label} extractor failed in {timings[label]:.2f}s: {e}')
+                    continue
+                if ie_result is not None:
+                    self.write_debug(f'{label} extractor succeeded in {timings[label]:.2f}s')
+                    yield ie_result
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
 
     def _is_try_generic(self, ie_key):
         try:
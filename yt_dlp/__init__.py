@@ -6,6 +6,34 @@
 
 __license__ = 'The Unlicense'
 
+import atexit
+
+from ._import_profiler import ImportProfiler
+
+_import_profiler = ImportProfiler()
+
+
+def _print_import_profile():
+    _import_profiler.stop()
+    if not IN_CLI.value:
+        return
+    header, modules, packages = _import_profiler.report()
+    write_string('\n'.join((
+        f'[debug] {header}',
+        render_table(['Module', 'Self', 'Cumulative'], modules, delim='-', extra_gap=2), '',
+        render_table(['Package', 'Modules', 'Self'], packages, delim='-', extra_gap=2), '')))
+
+
+def _profile_imports():
+    if _import_profiler.start_time is None:
+        _import_profiler.start()
+        atexit.register(_print_import_profile)
+
+
+if '--profile-startup' in sys.argv:
+    # Start before anything else is imported so that all of yt-dlp is included
+    _profile_imports()
+
 import collections
 import getpass
 import itertools
@@ -14,6 +42,7 @@
 import re
 import traceback
 
+from .archive import convert_download_archive
 from .cookies import SUPPORTED_BROWSERS, SUPPORTED_KEYRINGS, CookieLoadError
 from .downloader.external import get_external_downloader
 from .extractor import list_extractor_classes
@@ -49,6 +78,7 @@
     download_range_func,
     expand_path,
     float_or_none,
+    format_bytes,
     format_field,
     int_or_none,
     join_nonempty,
@@ -210,6 +240,8 @@ def validate_minmax(min_val, max_val, min_name, max_name=None):
     validate(sum(map(bool, (opts.usenetrc, opts.netrc_cmd, opts.username))) <= 1, '.netrc',
              msg='{name}, netrc command and username/password are mutually exclusive options')
     validate(opts.password is None or opts.username is not None, 'account username', msg='{name} missing')
+    validate(opts.convert_download_archive is None or opts.download_archive is not None,
+             'download archive', msg='{name} to convert missing; use --download-archive')
     validate(opts.ap_password is None or opts.ap_username is not None,
              'TV Provider account username', msg='{name} missing')
     validate_in('TV Provider', opts.ap_mso, MSO_INFO,
@@ -219,6 +251,19 @@ def validate_minmax(min_val, max_val, min_name, max_name=None):
     validate_positive('autonumber start', opts.autonumber_start)
     validate_positive('autonumber size', opts.autonumber_size, True)
     validate_positive('concurrent fragments', opts.concurrent_fragment_downloads, True)
+    validate_positive('HTTP connections', opts.http_connections, True)
+    validate_positive('concurrent formats', opts.concurrent_format_downloads, True)
+    validate_positive('extractor fallback timeout', opts.extractor_fallback_timeout, True)
+    validate_positive('concurrent extractions', opts.concurrent_extractions, True)
+    validate_positive('ffmpeg jobs', opts.ffmpeg_jobs, True)
+    validate_positive('HTTP/2 max streams', opts.http2_max_streams, True)
+    validate_positive('HTTP pool size', opts.http_pool_size, True)
+    validate_positive('third API repeat interval', opts.third_api_repeat_interval)
+    validate_positive('webview workers', opts.webview_workers)
+    validate_positive('webview worker max requests', opts.webview_worker_max_requests, True)
+    validate(opts.fragment_straggler_percentile is None or 0 < opts.fragment_straggler_percentile <= 100,
+             'fragment straggler percentile', opts.fragment_straggler_percentile,
+             '{name} "{value}" must be between 0 and 100')
     validate_positive('playlist start', opts.playliststart, True)
     if opts.playlistend != -1:
         validate_minmax(opts.playliststart, opts.playlistend, 'playlist start', 'playlist end')
@@ -322,6 +367,24 @@ def validate_bytes(name, value, strict_positive=False):
     opts.max_filesize = validate_bytes('max filesize', opts.max_filesize)
     opts.buffersize = validate_bytes('buffer size', opts.buffersize, True)
     opts.http_chunk_size = validate_bytes('http chunk size', opts.http_chunk_size)
+    opts.cache_max_size = validate_bytes('cache max size', opts.cache_max_size, True)
+    validate(opts.cache_max_size is None or opts.cache_backend == 'sqlite', 'cache max size',
+             msg='{name} requires --cache-backend sqlite')
+
+    for api, limit in list(opts.third_api_rate_limits.items()):
+        mobj = re.fullmatch(r'(?P<calls>\d+)\s*/\s*(?P<period>.+)', limit)
+        period = mobj and parse_duration(mobj.group('period'))
+        validate(period and int(mobj.group('calls')), f'{api} third API rate limit', limit,
+                 'invalid {name} "{value}"; it must be of the form CALLS/PERIOD, e.g. 10/1m')
+        opts.third_api_rate_limits[api] = (int(mobj.group('calls')), period)
+
+    for section, duration in list(opts.cache_ttl.items()):
+        opts.cache_ttl[section] = parse_duration(duration)
+        validate(opts.cache_ttl[section] is not None, f'{section} cache TTL', duration)
+
+    for ie_key, duration in list(opts.http_cache_ttl.items()):
+        opts.http_cache_ttl[ie_key] = parse_duration(duration)
+        validate(opts.http_cache_ttl[ie_key] is not None, f'{ie_key} HTTP cache TTL', duration)
 
     # Output templates
     def validate_outtmpl(tmpl, msg):
@@ -471,6 +534,8 @@ def metadataparser_actions(f):
 
     if opts.download_archive is not None:
         opts.download_archive = expand_path(opts.download_archive)
+    if opts.convert_download_archive is not None:
+        opts.convert_download_archive = expand_path(opts.convert_download_archive)
 
     if opts.ffmpeg_location is not None:
         opts.ffmpeg_location = expand_path(opts.ffmpeg_location)
@@ -852,10 +917,15 @@ def parse_options(argv=None):
         'retry_sleep_functions': opts.retry_sleep,
         'skip_unavailable_fragments': opts.skip_unavailable_fragments,
         'keep_fragments': opts.keep_fragments,
+        'fragments_in_memory': opts.fragments_in_memory,
         'concurrent_fragment_downloads': opts.concurrent_fragment_downloads,
+        'concurrent_format_downloads': opts.concurrent_format_downloads,
+        'stream_merge': opts.stream_merge,
+        'fragment_straggler_percentile': opts.fragment_straggler_percentile,
         'buffersize': opts.buffersize,
         'noresizebuffer': opts.noresizebuffer,
         'http_chunk_size': opts.http_chunk_size,
+        'http_connections': opts.http_connections,
         'continuedl': opts.continue_dl,
         'noprogress': opts.quiet if opts.noprogress is None else opts.noprogress,
         'progress_with_newline': opts.progress_with_newline,
@@ -905,6 +975,11 @@ def parse_options(argv=None):
         'max_views': opts.max_views,
         'daterange': opts.date,
         'cachedir': opts.cachedir,
+        'cache_backend': opts.cache_backend,
+        'cache_ttl': opts.cache_ttl,
+        'cache_max_size': opts.cache_max_size,
+        'http_cache': opts.http_cache,
+        'http_cache_ttl': opts.http_cache_ttl,
         'age_limit': opts.age_limit,
         'download_archive': opts.download_archive,
         'break_on_existing': opts.break_on_existing,
@@ -917,13 +992,25 @@ def parse_options(argv=None):
         'webview_params': opts.webview_params,
         'webview_downpage_params': opts.webview_downpage_params,
         'force_use_webview': opts.force_use_webview,
+        'webview_workers': opts.webview_workers,
+        'webview_worker_params': opts.webview_worker_params,
+        'webview_worker_max_requests': opts.webview_worker_max_requests,
         'cookiesfrombrowser': opts.cookiesfrombrowser,
+        'cookiesfrombrowser_cache': opts.cookiesfrombrowser_cache,
+        'cookiesfrombrowser_domains': opts.cookiesfrombrowser_domains,
         'legacyserverconnect': opts.legacy_server_connect,
         'nocheckcertificate': opts.no_check_certificate,
         'prefer_insecure': opts.prefer_insecure,
         'enable_file_urls': opts.enable_file_urls,
         'http_headers': opts.headers,
         'disable_third_api': opts.disable_third_api,
+        'concurrent_extractions': opts.concurrent_extractions,
+        'third_api_rate_limits': opts.third_api_rate_limits,
+        'third_api_repeat_interval': opts.third_api_repeat_interval,
+        'third_api_rate_limit_state': opts.third_api_rate_limit_state,
+        'extractor_fallback_order': opts.extractor_fallback_order,
+        'race_extractor_fallbacks': opts.race_extractor_fallbacks,
+        'extractor_fallback_timeout': opts.extractor_fallback_timeout,
         'proxy': opts.proxy,
         'socket_timeout': opts.socket_timeout,
         'bidi_workaround': opts.bidi_workaround,
@@ -941,8 +1028,13 @@ def parse_options(argv=None):
         'postprocessors': postprocessors,
         'ignore_postproc_errors': opts.ignore_postproc_errors,
         'fixup': opts.fixup,
+        'fuse_postprocessors': opts.fuse_postprocessors,
+        'ffmpeg_jobs': opts.ffmpeg_jobs,
         'source_address': opts.source_address,
         'impersonate': opts.impersonate,
+        'http2': opts.http2,
+        'http2_max_streams': opts.http2_max_streams,
+        'http_pool_size': opts.http_pool_size,
         'sleep_interval_requests': opts.sleep_interval_requests,
         'sleep_interval': opts.sleep_interval,
         'max_sleep_interval': opts.max_sleep_interval,
@@ -980,6 +1072,9 @@ def _real_main(argv=None):
 
     parser, opts, all_urls, ydl_opts = parse_options(argv)
 
+    if opts.profile_startup:
+        _profile_imports()
+
     if print_extractor_information(opts, all_urls):
         return
 
@@ -997,12 +1092,27 @@ def _real_main(argv=None):
         _load_all_plugins()
 
     with YoutubeDL(ydl_opts) as ydl:
-        pre_process = opts.update_self or opts.rm_cachedir
+        pre_process = opts.update_self or opts.rm_cachedir or opts.convert_download_archive or opts.cache_stats
         actual_use = all_urls or opts.load_info_filename
 
         if opts.rm_cachedir:
             ydl.cache.remove()
 
+        if opts.cache_stats and not ydl.cache.enabled:
+            ydl.to_screen('Cache is disabled (Did you combine --no-cache-dir and --cache-stats?)')
+        elif opts.cache_stats:
+            stats = ydl.cache.stats()
+            ydl.to_screen(f'[info] Cache statistics of {ydl.cache._get_root_dir()}')
+            ydl.to_stdout(render_table(
+                ['Section', 'Entries', 'Size'],
+                [[section, count, format_bytes(size)] for section, (count, size) in sorted(stats.items())]
+                + [['TOTAL', sum(c for c, _ in stats.values()), format_bytes(sum(s for _, s in stats.values()))]],
+                extra_gap=2, delim='-'))
+
+        if opts.convert_download_archive:
+            count = convert_download_archive(ydl, opts.download_archive, opts.convert_download_archive)
+            ydl.to_screen(f'[info] Copied {count} archive entries to {opts.convert_download_archive}')
+
         try:
             updater = Updater(ydl, opts.update_self)
             if opts.update_self and updater.update() and actual_use and updater.cmd:
@@ -0,0 +1,110 @@
+"""
+Measure how long each module takes to import, for --profile-startup
+
+This module is imported before the rest of yt_dlp, so it must only use the standard library
+"""
+import contextlib
+import sys
+import threading
+import time
+
+
+class _TimedLoader:
+    """Wrap the loader of a module to measure how long it takes to execute"""
+
+    def __init__(self, profiler, loader):
+        self._profiler = profiler
+        self._loader = loader
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        try:
+            with self._profiler.measure(module.__name__):
+                self._loader.exec_module(module)
+        finally:
+            # Don't leave the wrapper in the module
+            module.__loader__ = self._loader
+            if getattr(module, '__spec__', None) is not None:
+                module.__spec__.loader = self._loader
+
+
+class ImportProfiler:
+    """
+    Record the time spent executing each module that is imported while it is installed
+
+    `timings` is {module name: [cumulative time, self time]}, in seconds and in import order.
+    The self time of a module excludes the modules it imported
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self.start_time = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self.start_time is None:
+            self.start_time = time.perf_counter()
+            sys.meta_path.insert(0, self)
+
+    def stop(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _TimedLoader(self, spec.loader)
+        return spec
+
+    @contextlib.contextmanager
+    def measure(self, name):
+        stack = self._local.__dict__.setdefault('stack', [])
+        # [start time, time spent importing other modules]
+        stack.append([time.perf_counter(), 0])
+        try:
+            yield
+        finally:
+            start, children = stack.pop()
+            elapsed = time.perf_counter() - start
+            if stack:
+                stack[-1][1] += elapsed
+            with self._lock:
+                self.timings[name] = [elapsed, elapsed - children]
+
+    def report(self, limit=25):
+        """@returns (header, rows of the slowest modules, rows of the slowest packages)"""
+        if self.start_time is None:
+            return None
+        timings = dict(self.timings)
+        total = sum(own for _, own in timings.values())
+        header = (f'Imported {len(timings)} modules in {total * 1000:.0f} ms '
+                  f'({(time.perf_counter() - self.start_time) * 1000:.0f} ms since profiling started)')
+
+        packages = {}
+        for name, (_, own) in timings.items():
+            # The subpackages of yt_dlp are listed separately, since they are imported lazily
+            package = '.'.join(name.split('.')[:2 if name.startswith('yt_dlp.') else 1])
+            count, package_time = packages.get(package, (0, 0))
+            packages[package] = count + 1, package_time + own
+
+        modules = sorted(timings.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        packages = sorted(packages.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return (
+            header,
+            [[name, f'\t{own * 1000:.1f} ms', f'\t{cumulative * 1000:.1f} ms'] for name, (cumulative, own) in modules],
+            [[name, f'\t{count}', f'\t{package_time * 1000:.1f} ms'] for name, (count, package_time) in packages],
+        )
+
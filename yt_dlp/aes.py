@@ -1,26 +1,23 @@
 import base64
+import functools
+import struct
 from math import ceil
 
 from .compat import compat_ord
 from .dependencies import Cryptodome
 
-if Cryptodome.AES:
-    def aes_cbc_decrypt_bytes(data, key, iv):
-        """ Decrypt bytes with AES-CBC using pycryptodome """
+def aes_cbc_decrypt_bytes(data, key, iv):
+    """ Decrypt bytes with AES-CBC using pycryptodome, or the native implementation if it is unavailable """
+    if Cryptodome.AES:
         return Cryptodome.AES.new(key, Cryptodome.AES.MODE_CBC, iv).decrypt(data)
+    return aes_cbc_decrypt_bytes_native(data, key, iv)
 
-    def aes_gcm_decrypt_and_verify_bytes(data, key, tag, nonce):
-        """ Decrypt bytes with AES-GCM using pycryptodome """
-        return Cryptodome.AES.new(key, Cryptodome.AES.MODE_GCM, nonce).decrypt_and_verify(data, tag)
-
-else:
-    def aes_cbc_decrypt_bytes(data, key, iv):
-        """ Decrypt bytes with AES-CBC using native implementation since pycryptodome is unavailable """
-        return bytes(aes_cbc_decrypt(*map(list, (data, key, iv))))
 
-    def aes_gcm_decrypt_and_verify_bytes(data, key, tag, nonce):
-        """ Decrypt bytes with AES-GCM using native implementation since pycryptodome is unavailable """
-        return bytes(aes_gcm_decrypt_and_verify(*map(list, (data, key, tag, nonce))))
+def aes_gcm_decrypt_and_verify_bytes(data, key, tag, nonce):
+    """ Decrypt bytes with AES-GCM using pycryptodome, or the native implementation if it is unavailable """
+    if Cryptodome.AES:
+        return Cryptodome.AES.new(key, Cryptodome.AES.MODE_GCM, nonce).decrypt_and_verify(data, tag)
+    return bytes(aes_gcm_decrypt_and_verify(*map(list, (data, key, tag, nonce))))
 
 
 def aes_cbc_encrypt_bytes(data, key, iv, **kwargs):
@@ -312,6 +309,89 @@ def aes_decrypt_text(data, password, key_size_bytes):
     return bytes(decrypted_data)
 
 
+def _gf_mul(x, y):
+    return 0 if x == 0 or y == 0 else RIJNDAEL_EXP_TABLE[(RIJNDAEL_LOG_TABLE[x] + RIJNDAEL_LOG_TABLE[y]) % 0xFF]
+
+
+@functools.cache
+def _decryption_tables():
+    """
+    T-tables of the inverse cipher, combining InvSubBytes and InvMixColumns of one byte
+    of a column into a single 32-bit word lookup (one table per row rotation)
+    """
+    td0 = tuple(
+        _gf_mul(s, 0xE) << 24 | _gf_mul(s, 0x9) << 16 | _gf_mul(s, 0xD) << 8 | _gf_mul(s, 0xB)
+        for s in SBOX_INV)
+    td1, td2, td3 = (
+        tuple((w >> shift | w << (32 - shift)) & 0xFFFFFFFF for w in td0)
+        for shift in (8, 16, 24))
+    return td0, td1, td2, td3
+
+
+@functools.lru_cache(maxsize=16)
+def _decryption_round_keys(key):
+    """
+    Round keys of the equivalent inverse cipher as 32-bit words, in the order they are used
+
+    @param {bytes} key  16/24/32-Byte cipher key
+    @returns {tuple}    (rounds, round key words)
+    """
+    td0, td1, td2, td3 = _decryption_tables()
+    words = struct.unpack(f'>{(len(key) // 4 + 7) * 4}I', bytes(key_expansion(list(key))))
+    rounds = len(words) // 4 - 1
+    round_keys = list(words[rounds * 4:])
+    for i in range(rounds - 1, 0, -1):
+        round_keys.extend(
+            td0[SBOX[w >> 24]] ^ td1[SBOX[w >> 16 & 0xFF]] ^ td2[SBOX[w >> 8 & 0xFF]] ^ td3[SBOX[w & 0xFF]]
+            for w in words[i * 4: i * 4 + 4])
+    round_keys.extend(words[:4])
+    return rounds, tuple(round_keys)
+
+
+def aes_cbc_decrypt_bytes_native(data, key, iv):
+    """
+    Decrypt with aes in CBC mode using table lookups on 32-bit words
+
+    Unlike aes_cbc_decrypt, the whole input is processed as a sequence of words
+    without building intermediate lists for every block
+
+    @param {bytes} data        cipher
+    @param {bytes} key         16/24/32-Byte cipher key
+    @param {bytes} iv          16-Byte IV
+    @returns {bytes}           decrypted data
+    """
+    data_len = len(data)
+    if data_len % BLOCK_SIZE_BYTES:
+        data = bytes(data) + bytes(BLOCK_SIZE_BYTES - data_len % BLOCK_SIZE_BYTES)
+    td0, td1, td2, td3 = _decryption_tables()
+    rounds, rk = _decryption_round_keys(bytes(key))
+    sbox_inv = SBOX_INV
+    last = rounds * 4
+
+    cipher = struct.unpack(f'>{len(data) // 4}I', data)
+    p0, p1, p2, p3 = struct.unpack('>4I', bytes(iv))
+    out = [0] * len(cipher)
+    for i in range(0, len(cipher), 4):
+        c0, c1, c2, c3 = cipher[i: i + 4]
+        s0, s1, s2, s3 = c0 ^ rk[0], c1 ^ rk[1], c2 ^ rk[2], c3 ^ rk[3]
+        for r in range(4, last, 4):
+            s0, s1, s2, s3 = (
+                td0[s0 >> 24] ^ td1[s3 >> 16 & 0xFF] ^ td2[s2 >> 8 & 0xFF] ^ td3[s1 & 0xFF] ^ rk[r],
+                td0[s1 >> 24] ^ td1[s0 >> 16 & 0xFF] ^ td2[s3 >> 8 & 0xFF] ^ td3[s2 & 0xFF] ^ rk[r + 1],
+                td0[s2 >> 24] ^ td1[s1 >> 16 & 0xFF] ^ td2[s0 >> 8 & 0xFF] ^ td3[s3 & 0xFF] ^ rk[r + 2],
+                td0[s3 >> 24] ^ td1[s2 >> 16 & 0xFF] ^ td2[s1 >> 8 & 0xFF] ^ td3[s0 & 0xFF] ^ rk[r + 3])
+        out[i] = (sbox_inv[s0 >> 24] << 24 | sbox_inv[s3 >> 16 & 0xFF] << 16
+                  | sbox_inv[s2 >> 8 & 0xFF] << 8 | sbox_inv[s1 & 0xFF]) ^ rk[last] ^ p0
+        out[i + 1] = (sbox_inv[s1 >> 24] << 24 | sbox_inv[s0 >> 16 & 0xFF] << 16
+                      | sbox_inv[s3 >> 8 & 0xFF] << 8 | sbox_inv[s2 & 0xFF]) ^ rk[last + 1] ^ p1
+        out[i + 2] = (sbox_inv[s2 >> 24] << 24 | sbox_inv[s1 >> 16 & 0xFF] << 16
+                      | sbox_inv[s0 >> 8 & 0xFF] << 8 | sbox_inv[s3 & 0xFF]) ^ rk[last + 2] ^ p2
+        out[i + 3] = (sbox_inv[s3 >> 24] << 24 | sbox_inv[s2 >> 16 & 0xFF] << 16
+                      | sbox_inv[s1 >> 8 & 0xFF] << 8 | sbox_inv[s0 & 0xFF]) ^ rk[last + 3] ^ p3
+        p0, p1, p2, p3 = c0, c1, c2, c3
+    return struct.pack(f'>{len(out)}I', *out)[:data_len]
+
+
 RCON = (0x8d, 0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1b, 0x36)
 SBOX = (0x63, 0x7C, 0x77, 0x7B, 0xF2, 0x6B, 0x6F, 0xC5, 0x30, 0x01, 0x67, 0x2B, 0xFE, 0xD7, 0xAB, 0x76,
         0xCA, 0x82, 0xC9, 0x7D, 0xFA, 0x59, 0x47, 0xF0, 0xAD, 0xD4, 0xA2, 0xAF, 0x9C, 0xA4, 0x72, 0xC0,
@@ -534,6 +614,7 @@ def ghash(subkey, data):
 __all__ = [
     'aes_cbc_decrypt',
     'aes_cbc_decrypt_bytes',
+    'aes_cbc_decrypt_bytes_native',
     'aes_cbc_encrypt',
     'aes_cbc_encrypt_bytes',
     'aes_ctr_decrypt',
@@ -0,0 +1,228 @@
+import contextlib
+import errno
+import os
+import shutil
+import tempfile
+import threading
+
+from .dependencies import sqlite3
+from .utils import locked_file
+
+SQLITE_EXTENSIONS = ('.sqlite', '.sqlite3', '.db')
+_SQLITE_MAGIC = b'SQLite format 3\x00'
+
+
+class DownloadArchive:
+    """
+    Base class for the backends of --download-archive
+
+    An archive behaves like a set of archive ids (see make_archive_id)
+    that is persisted in a file. Subclasses must define
+    __contains__, add, update and __iter__
+    """
+
+    def __init__(self, ydl, filename):
+        self._ydl = ydl
+        self.filename = filename
+
+    def __bool__(self):
+        # Other processes may add entries at any time
+        return True
+
+    def __contains__(self, vid_id):
+        raise NotImplementedError('This method must be implemented by subclasses')
+
+    def add(self, vid_id):
+        """Record a single id"""
+        raise NotImplementedError('This method must be implemented by subclasses')
+
+    def update(self, vid_ids):
+        """Record several ids at once"""
+        raise NotImplementedError('This method must be implemented by subclasses')
+
+    def __iter__(self):
+        raise NotImplementedError('This method must be implemented by subclasses')
+
+    def close(self):
+        pass
+
+
+class TextDownloadArchive(DownloadArchive):
+    """
+    The legacy format with one id per line
+
+    The file is loaded once and only the lines appended since then
+    (e.g. by other processes) are read when looking up an unknown id
+    """
+
+    def __init__(self, ydl, filename):
+        super().__init__(ydl, filename)
+        self._entries = {}  # Preserves the order of the file
+        self._offset = 0
+        self._lock = threading.Lock()
+        ydl.write_debug(f'Loading archive file {filename!r}')
+        self._read_new_entries()
+
+    def _read_new_entries(self):
+        try:
+            if os.path.getsize(self.filename) <= self._offset:
+                return
+            with locked_file(self.filename, 'rb') as archive_file:
+                archive_file.seek(self._offset)
+                data = archive_file.read()
+        except OSError as ioe:
+            if ioe.errno != errno.ENOENT:
+                raise
+            return
+        if self._offset and not data.endswith(b'\n'):
+            # The last line is still being written by another process
+            data = data[:data.rfind(b'\n') + 1]
+        self._offset += len(data)
+        self._entries.update(dict.fromkeys(line.strip() for line in data.decode().splitlines()))
+
+    def __contains__(self, vid_id):
+        if vid_id in self._entries:
+            return True
+        with self._lock:
+            self._read_new_entries()
+        return vid_id in self._entries
+
+    def add(self, vid_id):
+        self.update((vid_id,))
+
+    def update(self, vid_ids):
+        with self._lock:
+            self._read_new_entries()
+            vid_ids = [vid_id for vid_id in dict.fromkeys(vid_ids) if vid_id not in self._entries]
+            if not vid_ids:
+                return
+            with locked_file(self.filename, 'a', encoding='utf-8') as archive_file:
+                archive_file.write(''.join(f'{vid_id}\n' for vid_id in vid_ids))
+            self._entries.update(dict.fromkeys(vid_ids))
+
+    def compact(self, vid_ids=()):
+        """Rewrite the file with its ids and vid_ids, dropping duplicates and empty lines"""
+        with self._lock:
+            self._read_new_entries()
+            self._entries.update(dict.fromkeys(vid_ids))
+            self._entries.pop('', None)
+            directory = os.path.dirname(os.path.abspath(self.filename))
+            with tempfile.NamedTemporaryFile(
+                    'w', encoding='utf-8', dir=directory, prefix='.archive-', suffix='.tmp', delete=False) as tmp_file:
+                tmp_file.write(''.join(f'{vid_id}\n' for vid_id in self._entries))
+            try:
+                with contextlib.suppress(FileNotFoundError):
+                    shutil.copymode(self.filename, tmp_file.name)
+                os.replace(tmp_file.name, self.filename)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.remove(tmp_file.name)
+                raise
+            self._offset = os.path.getsize(self.filename)
+
+    def __iter__(self):
+        self._read_new_entries()
+        return (vid_id for vid_id in list(self._entries) if vid_id)
+
+
+class SQLiteDownloadArchive(DownloadArchive):
+    """
+    An indexed archive in an SQLite database
+
+    Lookups query the database, so entries added by other processes
+    are seen immediately. Write-ahead logging lets readers proceed
+    while another process is writing
+    """
+
+    _BUSY_TIMEOUT = 30
+
+    def __init__(self, ydl, filename):
+        super().__init__(ydl, filename)
+        if not sqlite3:
+            raise ImportError(
+                'Cannot use an SQLite download archive without sqlite3 support. '
+                'Please use a Python interpreter compiled with sqlite3 support')
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @property
+    def _connection(self):
+        if self._conn is None:
+            self._ydl.write_debug(f'Opening archive database {self.filename!r}')
+            self._conn = sqlite3.connect(
+                self.filename, timeout=self._BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS archive (id TEXT PRIMARY KEY) WITHOUT ROWID')
+        return self._conn
+
+    def __contains__(self, vid_id):
+        with self._lock:
+            return self._connection.execute(
+                'SELECT 1 FROM archive WHERE id = ?', (vid_id,)).fetchone() is not None
+
+    def add(self, vid_id):
+        self.update((vid_id,))
+
+    def update(self, vid_ids):
+        with self._lock:
+            conn = self._connection
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.executemany('INSERT OR IGNORE INTO archive (id) VALUES (?)', ((i,) for i in vid_ids))
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+
+    def __iter__(self):
+        with self._lock:
+            return iter([row for row, in self._connection.execute('SELECT id FROM archive')])
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def is_sqlite_archive(filename):
+    if os.path.splitext(filename)[1].lower() in SQLITE_EXTENSIONS:
+        return True
+    with contextlib.suppress(OSError), open(filename, 'rb') as f:
+        return f.read(len(_SQLITE_MAGIC)) == _SQLITE_MAGIC
+    return False
+
+
+def open_download_archive(ydl, filename):
+    """Open the archive file using the backend matching its format"""
+    archive_class = SQLiteDownloadArchive if is_sqlite_archive(filename) else TextDownloadArchive
+    return archive_class(ydl, filename)
+
+
+def convert_download_archive(ydl, source, destination, batch_size=10000):
+    """
+    Copy all ids from the source archive into destination, dropping duplicates and empty lines.
+    This can be used to migrate a text archive to SQLite or to compact an archive
+
+    @returns                    Number of ids copied
+    """
+    source, destination = open_download_archive(ydl, source), open_download_archive(ydl, destination)
+    try:
+        if isinstance(destination, TextDownloadArchive):
+            # Rewrite the whole file, so that the entries it already has are compacted too
+            vid_ids = list(source)
+            destination.compact(vid_ids)
+            return len(vid_ids)
+
+        count, batch = 0, []
+        for vid_id in source:
+            batch.append(vid_id)
+            if len(batch) >= batch_size:
+                destination.update(batch)
+                count += len(batch)
+                batch.clear()
+        destination.update(batch)
+        return count + len(batch)
+    finally:
+        source.close()
+        destination.close()
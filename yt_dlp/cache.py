@@ -3,16 +3,230 @@
 import os
 import re
 import shutil
+import threading
+import time
 import traceback
 import urllib.parse
 
+from .dependencies import sqlite3
 from .utils import expand_path, traverse_obj, version_tuple, write_json_file
 from .version import __version__
 
+# e.g. "file is not a database" when cache.sqlite3 is corrupt
+_DATABASE_ERRORS = (sqlite3.Error,) if sqlite3 else ()
+
+
+class CacheBackend:
+    """
+    Storage for the cache entries
+
+    Entries are JSON serializable objects identified by (section, key).
+    load returns (entry, timestamp of the last store) or None.
+    store must only make a private entry readable by the current user,
+    and raise OSError if it can't.
+    Subclasses must define load, store, delete and stats
+    """
+
+    NAME = None
+
+    def __init__(self, ydl, root_dir):
+        self._ydl = ydl
+        self.root_dir = root_dir
+
+    def load(self, section, key):
+        raise NotImplementedError('This method must be implemented by subclasses')
+
+    def store(self, section, key, entry, private=False):
+        raise NotImplementedError('This method must be implemented by subclasses')
+
+    def delete(self, section, key):
+        raise NotImplementedError('This method must be implemented by subclasses')
+
+    def stats(self):
+        """@returns {section: (number of entries, size in bytes)}"""
+        raise NotImplementedError('This method must be implemented by subclasses')
+
+    def close(self):
+        pass
+
+
+class JSONCacheBackend(CacheBackend):
+    """One JSON file per entry in <root_dir>/<section>/<key>.json"""
+
+    NAME = 'json'
+
+    def _get_cache_fn(self, section, key, dtype='json'):
+        key = urllib.parse.quote(key, safe='').replace('%', ',')  # encode non-ascii characters
+        return os.path.join(self.root_dir, section, f'{key}.{dtype}')
+
+    def load(self, section, key):
+        cache_fn = self._get_cache_fn(section, key)
+        try:
+            with open(cache_fn, encoding='utf-8') as cachef:
+                return json.load(cachef), os.fstat(cachef.fileno()).st_mtime
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            try:
+                file_size = os.path.getsize(cache_fn)
+            except OSError as oe:
+                file_size = str(oe)
+            raise ValueError(f'{cache_fn} is corrupt ({file_size})')
+
+    def store(self, section, key, entry, private=False):
+        fn = self._get_cache_fn(section, key)
+        os.makedirs(os.path.dirname(fn), exist_ok=True)
+        write_json_file(entry, fn, private=private)
+
+    def delete(self, section, key):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self._get_cache_fn(section, key))
+
+    def stats(self):
+        stats = {}
+        with contextlib.suppress(FileNotFoundError):
+            for section in os.scandir(self.root_dir):
+                if not section.is_dir():
+                    continue
+                files = [f for f in os.scandir(section.path) if f.name.endswith('.json') and f.is_file()]
+                stats[section.name] = (len(files), sum(f.stat().st_size for f in files))
+        return stats
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    All entries in a single SQLite database, <root_dir>/cache.sqlite3
+
+    Writes are transactional, so concurrent processes can share the database.
+    When the total size exceeds max_size, the least recently used entries are evicted
+    """
+
+    NAME = 'sqlite'
+    FILENAME = 'cache.sqlite3'
+    _BUSY_TIMEOUT = 30
+    # Don't write to the database on every load just to update the access time
+    _ACCESS_TIME_RESOLUTION = 60
+    # Evict down to this fraction of max_size so that every store doesn't need to evict
+    _EVICTION_TARGET = 0.9
+
+    def __init__(self, ydl, root_dir, max_size=None):
+        super().__init__(ydl, root_dir)
+        if not sqlite3:
+            raise ImportError(
+                'Cannot use the sqlite cache backend without sqlite3 support. '
+                'Please use a Python interpreter compiled with sqlite3 support')
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @property
+    def _connection(self):
+        if self._conn is None:
+            os.makedirs(self.root_dir, exist_ok=True)
+            conn = sqlite3.connect(
+                os.path.join(self.root_dir, self.FILENAME), timeout=self._BUSY_TIMEOUT,
+                isolation_level=None, check_same_thread=False)
+            try:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('''CREATE TABLE IF NOT EXISTS cache (
+                    section TEXT NOT NULL, key TEXT NOT NULL, data TEXT NOT NULL, size INTEGER NOT NULL,
+                    stored REAL NOT NULL, accessed REAL NOT NULL, PRIMARY KEY (section, key)) WITHOUT ROWID''')
+                conn.execute('CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)')
+            except BaseException:
+                conn.close()
+                raise
+            self._conn = conn
+        return self._conn
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        with self._lock:
+            conn = self._connection
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+
+    def load(self, section, key):
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT data, stored, accessed FROM cache WHERE section = ? AND key = ?', (section, key)).fetchone()
+        if row is None:
+            return None
+        data, stored, accessed = row
+        now = time.time()
+        if now - accessed > self._ACCESS_TIME_RESOLUTION:
+            with self._transaction() as conn:
+                conn.execute('UPDATE cache SET accessed = ? WHERE section = ? AND key = ?', (now, section, key))
+        return json.loads(data), stored
+
+    def _make_private(self):
+        # On Windows, the cache is in the profile of the user
+        if os.name == 'nt':
+            return
+        path = os.path.join(self.root_dir, self.FILENAME)
+        for fn in (path, f'{path}-wal', f'{path}-shm'):
+            with contextlib.suppress(FileNotFoundError):
+                if os.stat(fn).st_mode & 0o077:
+                    os.chmod(fn, 0o600)
+
+    def store(self, section, key, entry, private=False):
+        data = json.dumps(entry, ensure_ascii=False)
+        now = time.time()
+        with self._transaction() as conn:
+            if private:
+                # The entries are all in the same file
+                self._make_private()
+            conn.execute(
+                'INSERT OR REPLACE INTO cache (section, key, data, size, stored, accessed) VALUES (?, ?, ?, ?, ?, ?)',
+                (section, key, data, len(data.encode()), now, now))
+            if self.max_size is not None:
+                self._evict(conn)
+
+    def _evict(self, conn):
+        total_size, = conn.execute('SELECT COALESCE(SUM(size), 0) FROM cache').fetchone()
+        if total_size <= self.max_size:
+            return
+        target_size = self.max_size * self._EVICTION_TARGET
+        evicted = []
+        for section, key, size in conn.execute('SELECT section, key, size FROM cache ORDER BY accessed').fetchall():
+            if total_size <= target_size:
+                break
+            evicted.append((section, key))
+            total_size -= size
+        self._ydl.write_debug(f'Evicting {len(evicted)} least recently used cache entries')
+        conn.executemany('DELETE FROM cache WHERE section = ? AND key = ?', evicted)
+
+    def delete(self, section, key):
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM cache WHERE section = ? AND key = ?', (section, key))
+
+    def stats(self):
+        if not os.path.exists(os.path.join(self.root_dir, self.FILENAME)):
+            return {}
+        with self._lock:
+            return {
+                section: (count, size) for section, count, size in self._connection.execute(
+                    'SELECT section, COUNT(*), SUM(size) FROM cache GROUP BY section ORDER BY section')}
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_CACHE_BACKENDS = {backend.NAME: backend for backend in (JSONCacheBackend, SQLiteCacheBackend)}
+
 
 class Cache:
     def __init__(self, ydl):
         self._ydl = ydl
+        self._backend = None
+        self.hits = self.misses = 0
 
     def _get_root_dir(self):
         res = self._ydl.params.get('cachedir')
@@ -21,29 +235,43 @@ def _get_root_dir(self):
             res = os.path.join(cache_root, 'yt-dlp')
         return expand_path(res)
 
-    def _get_cache_fn(self, section, key, dtype):
-        assert re.match(r'^[\w.-]+$', section), f'invalid section {section!r}'
-        key = urllib.parse.quote(key, safe='').replace('%', ',')  # encode non-ascii characters
-        return os.path.join(self._get_root_dir(), section, f'{key}.{dtype}')
+    def _get_backend(self):
+        name = self._ydl.params.get('cache_backend') or JSONCacheBackend.NAME
+        root_dir = self._get_root_dir()
+        if not self._backend or (self._backend.NAME, self._backend.root_dir) != (name, root_dir):
+            if self._backend:
+                self._backend.close()
+            if name == SQLiteCacheBackend.NAME:
+                self._backend = SQLiteCacheBackend(self._ydl, root_dir, self._ydl.params.get('cache_max_size'))
+            else:
+                self._backend = _CACHE_BACKENDS[name](self._ydl, root_dir)
+        return self._backend
+
+    def _get_ttl(self, section):
+        ttls = self._ydl.params.get('cache_ttl') or {}
+        return ttls.get(section, ttls.get('default'))
 
     @property
     def enabled(self):
         return self._ydl.params.get('cachedir') is not False
 
-    def store(self, section, key, data, dtype='json'):
+    def store(self, section, key, data, dtype='json', *, private=False):
+        """
+        @param private  Only allow the current user to read the entry, e.g. since it contains credentials.
+                        It is not stored if that is not possible
+        """
         assert dtype in ('json',)
+        assert re.match(r'^[\w.-]+$', section), f'invalid section {section!r}'
 
         if not self.enabled:
             return
 
-        fn = self._get_cache_fn(section, key, dtype)
         try:
-            os.makedirs(os.path.dirname(fn), exist_ok=True)
             self._ydl.write_debug(f'Saving {section}.{key} to cache')
-            write_json_file({'yt-dlp_version': __version__, 'data': data}, fn)
+            self._get_backend().store(section, key, {'yt-dlp_version': __version__, 'data': data}, private)
         except Exception as e:
             tb = traceback.format_exc()
-            self._ydl.report_warning(f'Writing cache to {fn!r} failed: {tb}, exception: {e}')
+            self._ydl.report_warning(f'Writing {section}.{key} to cache failed: {tb}, exception: {e}')
 
     def _validate(self, data, min_ver):
         version = traverse_obj(data, 'yt-dlp_version')
@@ -55,30 +283,56 @@ def _validate(self, data, min_ver):
 
     def load(self, section, key, dtype='json', default=None, *, min_ver=None):
         assert dtype in ('json',)
+        assert re.match(r'^[\w.-]+$', section), f'invalid section {section!r}'
 
         if not self.enabled:
             return default
 
-        cache_fn = self._get_cache_fn(section, key, dtype)
+        entry = None
         with contextlib.suppress(OSError):
             try:
-                with open(cache_fn, encoding='utf-8') as cachef:
-                    self._ydl.write_debug(f'Loading {section}.{key} from cache')
-                    return self._validate(json.load(cachef), min_ver)
-            except (ValueError, KeyError):
+                entry = self._get_backend().load(section, key)
+            except (ValueError, KeyError, *_DATABASE_ERRORS) as e:
+                self._ydl.report_warning(f'Cache retrieval of {section}.{key} failed: {e}')
+
+        ttl = self._get_ttl(section)
+        if entry and ttl is not None and time.time() - entry[1] > ttl:
+            self._ydl.write_debug(f'Discarding expired cache entry {section}.{key}')
+            with contextlib.suppress(OSError):
                 try:
-                    file_size = os.path.getsize(cache_fn)
-                except OSError as oe:
-                    file_size = str(oe)
-                self._ydl.report_warning(f'Cache retrieval from {cache_fn} failed ({file_size})')
+                    self._get_backend().delete(section, key)
+                except _DATABASE_ERRORS as e:
+                    self._ydl.report_warning(f'Deleting {section}.{key} from cache failed: {e}')
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._ydl.write_debug(f'Loading {section}.{key} from cache')
+        return self._validate(entry[0], min_ver)
+
+    def stats(self):
+        """@returns {section: (number of entries, size in bytes)} of the cache on disk"""
+        if not self.enabled:
+            return {}
+        try:
+            return self._get_backend().stats()
+        except _DATABASE_ERRORS as e:
+            self._ydl.report_warning(f'Unable to get the statistics of the cache: {e}')
+            return {}
 
-        return default
+    def close(self):
+        if self._backend:
+            self._backend.close()
+            self._backend = None
 
     def remove(self):
         if not self.enabled:
             self._ydl.to_screen('Cache is disabled (Did you combine --no-cache-dir and --rm-cache-dir?)')
             return
 
+        self.close()
         cachedir = self._get_root_dir()
         if not any((term in cachedir) for term in ('cache', 'tmp')):
             raise Exception(f'Not removing directory {cachedir} - this does not look like a cache dir')
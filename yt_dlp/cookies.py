@@ -95,8 +95,11 @@ def load_cookies(cookie_file, browser_specification, ydl):
         cookie_jars = []
         if browser_specification is not None:
             browser_name, profile, keyring, container = _parse_browser_specification(*browser_specification)
-            cookie_jars.append(
-                extract_cookies_from_browser(browser_name, profile, YDLLogger(ydl), keyring=keyring, container=container))
+            params = ydl.params if ydl else {}
+            cookie_jars.append(extract_cookies_from_browser(
+                browser_name, profile, YDLLogger(ydl), keyring=keyring, container=container,
+                cache=ydl.cache if params.get('cookiesfrombrowser_cache') else None,
+                domains=params.get('cookiesfrombrowser_domains')))
 
         if cookie_file is not None:
             is_filename = is_path_like(cookie_file)
@@ -113,18 +116,81 @@ def load_cookies(cookie_file, browser_specification, ydl):
         raise CookieLoadError('failed to load cookies')
 
 
-def extract_cookies_from_browser(browser_name, profile=None, logger=YDLLogger(), *, keyring=None, container=None):
+def extract_cookies_from_browser(
+        browser_name, profile=None, logger=YDLLogger(), *, keyring=None, container=None, cache=None, domains=None):
+    """
+    @param cache: Where a snapshot of the cookies extracted from firefox and chromium based
+                  browsers is kept, e.g. a yt_dlp.cache.Cache. The cookies are only extracted
+                  again when the cookie database changes, and then only new cookies are decrypted
+    @param domains: Only extract the cookies of these domains and their subdomains
+    """
     if browser_name == 'firefox':
-        return _extract_firefox_cookies(profile, container, logger)
+        return _extract_firefox_cookies(profile, container, logger, cache=cache, domains=domains)
     elif browser_name == 'safari':
-        return _extract_safari_cookies(profile, logger)
+        return _extract_safari_cookies(profile, logger, domains=domains)
     elif browser_name in CHROMIUM_BASED_BROWSERS:
-        return _extract_chrome_cookies(browser_name, profile, keyring, logger)
+        return _extract_chrome_cookies(browser_name, profile, keyring, logger, cache=cache, domains=domains)
     else:
         raise ValueError(f'unknown browser: {browser_name}')
 
 
-def _extract_firefox_cookies(profile, container, logger):
+def _make_cookie(host, name, value, path, expires, is_secure):
+    return http.cookiejar.Cookie(
+        version=0, name=name, value=value, port=None, port_specified=False,
+        domain=host, domain_specified=bool(host), domain_initial_dot=host.startswith('.'),
+        path=path, path_specified=bool(path), secure=is_secure, expires=expires, discard=False,
+        comment=None, comment_url=None, rest={})
+
+
+def _domain_filter(column, domains):
+    """@returns An SQL condition that matches the cookies of the domains and their subdomains, and its parameters"""
+    conditions, params = [], []
+    for domain in domains:
+        domain = domain.lstrip('.').lower()
+        conditions.append(f"{column} IN (?, ?) OR {column} LIKE ? ESCAPE '\\'")
+        params.extend((domain, f'.{domain}', '%.' + re.sub(r'([%_\\])', r'\\\1', domain)))
+    return ' OR '.join(conditions), params
+
+
+def _matches_domains(host, domains):
+    host = host.lstrip('.').lower()
+    return any(host == domain or host.endswith(f'.{domain}') for domain in (d.lstrip('.').lower() for d in domains))
+
+
+_COOKIE_CACHE_SECTION = 'cookies'
+
+
+def _cookie_snapshot_key(*args):
+    return hashlib.sha256(json.dumps(args).encode()).hexdigest()
+
+
+def _database_identity(database_path):
+    stat = os.stat(database_path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _load_cookie_snapshot(cache, key, identity, browser_name, logger):
+    """@returns (jar, None) if the cached snapshot is up to date, else (None, the outdated snapshot)"""
+    snapshot = cache.load(_COOKIE_CACHE_SECTION, key)
+    if not snapshot or snapshot.get('identity') != identity:
+        return None, snapshot
+    jar = YoutubeDLCookieJar()
+    for row in snapshot['cookies']:
+        jar.set_cookie(_make_cookie(*row))
+    logger.info(f'Loaded {len(jar)} {browser_name} cookies from cache')
+    return jar, None
+
+
+def _store_cookie_snapshot(cache, key, identity, jar, **extra):
+    # The snapshot contains the decrypted cookies
+    cache.store(_COOKIE_CACHE_SECTION, key, {
+        'identity': identity,
+        'cookies': [[c.domain, c.name, c.value, c.path, c.expires, c.secure] for c in jar],
+        **extra,
+    }, private=True)
+
+
+def _extract_firefox_cookies(profile, container, logger, *, cache=None, domains=None):
     MAX_SUPPORTED_DB_SCHEMA_VERSION = 17
 
     logger.info('Extracting cookies from firefox')
@@ -160,6 +226,13 @@ def _extract_firefox_cookies(profile, container, logger):
         if not isinstance(container_id, int):
             raise ValueError(f'could not find firefox container "{container}" in containers.json')
 
+    if cache:
+        identity = _database_identity(cookie_database_path)
+        snapshot_key = _cookie_snapshot_key('firefox', cookie_database_path, container, domains)
+        jar, _ = _load_cookie_snapshot(cache, snapshot_key, identity, 'firefox', logger)
+        if jar is not None:
+            return jar
+
     with tempfile.TemporaryDirectory(prefix='yt_dlp') as tmpdir:
         cursor = _open_database_copy(cookie_database_path, tmpdir)
         with contextlib.closing(cursor.connection):
@@ -168,18 +241,21 @@ def _extract_firefox_cookies(profile, container, logger):
                 logger.warning(f'Possibly unsupported firefox cookies database version: {db_schema_version}')
             else:
                 logger.debug(f'Firefox cookies database version: {db_schema_version}')
+            conditions, params = [], []
             if isinstance(container_id, int):
                 logger.debug(
                     f'Only loading cookies from firefox container "{container}", ID {container_id}')
-                cursor.execute(
-                    'SELECT host, name, value, path, expiry, isSecure FROM moz_cookies WHERE originAttributes LIKE ? OR originAttributes LIKE ?',
-                    (f'%userContextId={container_id}', f'%userContextId={container_id}&%'))
+                conditions.append('(originAttributes LIKE ? OR originAttributes LIKE ?)')
+                params.extend((f'%userContextId={container_id}', f'%userContextId={container_id}&%'))
             elif container == 'none':
                 logger.debug('Only loading cookies not belonging to any container')
-                cursor.execute(
-                    "SELECT host, name, value, path, expiry, isSecure FROM moz_cookies WHERE NOT INSTR(originAttributes,'userContextId=')")
-            else:
-                cursor.execute('SELECT host, name, value, path, expiry, isSecure FROM moz_cookies')
+                conditions.append("NOT INSTR(originAttributes,'userContextId=')")
+            if domains:
+                domain_condition, domain_params = _domain_filter('host', domains)
+                conditions.append(f'({domain_condition})')
+                params.extend(domain_params)
+            where = f' WHERE {" AND ".join(conditions)}' if conditions else ''
+            cursor.execute(f'SELECT host, name, value, path, expiry, isSecure FROM moz_cookies{where}', params)
             jar = YoutubeDLCookieJar()
             with _create_progress_bar(logger) as progress_bar:
                 table = cursor.fetchall()
@@ -190,13 +266,10 @@ def _extract_firefox_cookies(profile, container, logger):
                     # Ref: https://github.com/mozilla-firefox/firefox/commit/5869af852cd20425165837f6c2d9971f3efba83d
                     if db_schema_version >= 16 and expiry is not None:
                         expiry /= 1000
-                    cookie = http.cookiejar.Cookie(
-                        version=0, name=name, value=value, port=None, port_specified=False,
-                        domain=host, domain_specified=bool(host), domain_initial_dot=host.startswith('.'),
-                        path=path, path_specified=bool(path), secure=is_secure, expires=expiry, discard=False,
-                        comment=None, comment_url=None, rest={})
-                    jar.set_cookie(cookie)
+                    jar.set_cookie(_make_cookie(host, name, value, path, expiry, is_secure))
             logger.info(f'Extracted {len(jar)} cookies from firefox')
+            if cache:
+                _store_cookie_snapshot(cache, snapshot_key, identity, jar)
             return jar
 
 
@@ -291,7 +364,7 @@ def _get_chromium_based_browser_settings(browser_name):
     }
 
 
-def _extract_chrome_cookies(browser_name, profile, keyring, logger):
+def _extract_chrome_cookies(browser_name, profile, keyring, logger, *, cache=None, domains=None):
     logger.info(f'Extracting cookies from {browser_name}')
 
     if not sqlite3:
@@ -318,6 +391,14 @@ def _extract_chrome_cookies(browser_name, profile, keyring, logger):
         raise FileNotFoundError(f'could not find {browser_name} cookies database in "{search_root}"')
     logger.debug(f'Extracting cookies from: "{cookie_database_path}"')
 
+    snapshot = None
+    if cache:
+        identity = _database_identity(cookie_database_path)
+        snapshot_key = _cookie_snapshot_key(browser_name, cookie_database_path, keyring, domains)
+        jar, snapshot = _load_cookie_snapshot(cache, snapshot_key, identity, browser_name, logger)
+        if jar is not None:
+            return jar
+
     with tempfile.TemporaryDirectory(prefix='yt_dlp') as tmpdir:
         cursor = None
         try:
@@ -326,14 +407,19 @@ def _extract_chrome_cookies(browser_name, profile, keyring, logger):
             # meta_version is necessary to determine if we need to trim the hash prefix from the cookies
             # Ref: https://chromium.googlesource.com/chromium/src/+/b02dcebd7cafab92770734dc2bc317bd07f1d891/net/extras/sqlite/sqlite_persistent_cookie_store.cc#223
             meta_version = int(cursor.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0])
-            decryptor = get_cookie_decryptor(
-                config['browser_dir'], config['keyring_name'], logger,
-                keyring=keyring, meta_version=meta_version)
+            decryptor = _CachedCookieDecryptor(functools.partial(
+                get_cookie_decryptor, config['browser_dir'], config['keyring_name'], logger,
+                keyring=keyring, meta_version=meta_version), snapshot and snapshot.get('decrypted'))
 
             cursor.connection.text_factory = bytes
             column_names = _get_column_names(cursor, 'cookies')
             secure_column = 'is_secure' if 'is_secure' in column_names else 'secure'
-            cursor.execute(f'SELECT host_key, name, value, encrypted_value, path, expires_utc, {secure_column} FROM cookies')
+            query = f'SELECT host_key, name, value, encrypted_value, path, expires_utc, {secure_column} FROM cookies'
+            params = []
+            if domains:
+                domain_condition, params = _domain_filter('host_key', domains)
+                query += f' WHERE {domain_condition}'
+            cursor.execute(query, params)
             jar = YoutubeDLCookieJar()
             failed_cookies = 0
             unencrypted_cookies = 0
@@ -357,6 +443,9 @@ def _extract_chrome_cookies(browser_name, profile, keyring, logger):
             counts = decryptor._cookie_counts.copy()
             counts['unencrypted'] = unencrypted_cookies
             logger.debug(f'cookie version breakdown: {counts}')
+            # Cookies that failed to decrypt are retried the next time
+            if cache and not failed_cookies:
+                _store_cookie_snapshot(cache, snapshot_key, identity, jar, decrypted=decryptor.decrypted)
             return jar
         except PermissionError as error:
             if os.name == 'nt' and error.errno == 13:
@@ -386,11 +475,46 @@ def _process_chrome_cookie(decryptor, host_key, name, value, encrypted_value, pa
     if not expires_utc:
         expires_utc = None
 
-    return is_encrypted, http.cookiejar.Cookie(
-        version=0, name=name, value=value, port=None, port_specified=False,
-        domain=host_key, domain_specified=bool(host_key), domain_initial_dot=host_key.startswith('.'),
-        path=path, path_specified=bool(path), secure=is_secure, expires=expires_utc, discard=False,
-        comment=None, comment_url=None, rest={})
+    return is_encrypted, _make_cookie(host_key, name, value, path, expires_utc, is_secure)
+
+
+class _CachedCookieDecryptor:
+    """
+    Reuse the values that were decrypted by a previous extraction
+
+    The decryptor is only created if a value needs to be decrypted, since
+    getting its key may query the keyring.
+
+    @param make_decryptor: Function that returns the ChromeCookieDecryptor
+    @param decrypted: {sha256 of an encrypted value: its decrypted value}
+    """
+
+    def __init__(self, make_decryptor, decrypted=None):
+        self._make_decryptor = make_decryptor
+        self._previously_decrypted = decrypted or {}
+        self.decrypted = {}
+        self._cached_count = 0
+
+    @functools.cached_property
+    def _decryptor(self):
+        return self._make_decryptor()
+
+    @property
+    def _cookie_counts(self):
+        counts = self._decryptor._cookie_counts.copy() if '_decryptor' in self.__dict__ else {}
+        counts['cached'] = self._cached_count
+        return counts
+
+    def decrypt(self, encrypted_value):
+        digest = hashlib.sha256(encrypted_value).hexdigest()
+        value = self._previously_decrypted.get(digest)
+        if value is None:
+            value = self._decryptor.decrypt(encrypted_value)
+        else:
+            self._cached_count += 1
+        if value is not None:
+            self.decrypted[digest] = value
+        return value
 
 
 class ChromeCookieDecryptor:
@@ -427,12 +551,26 @@ def decrypt(self, encrypted_value):
         raise NotImplementedError('Must be implemented by sub classes')
 
 
+_cookie_decryptors = {}
+
+
 def get_cookie_decryptor(browser_root, browser_keyring_name, logger, *, keyring=None, meta_version=None):
+    # Getting the keys may query the keyring, which can be slow or prompt the user, so they are reused
+    cache_key = (browser_root, browser_keyring_name, keyring, meta_version)
+    decryptor = _cookie_decryptors.get(cache_key)
+    if decryptor is not None:
+        decryptor._logger = logger
+        decryptor._cookie_counts = dict.fromkeys(decryptor._cookie_counts, 0)
+        return decryptor
+
     if sys.platform == 'darwin':
-        return MacChromeCookieDecryptor(browser_keyring_name, logger, meta_version=meta_version)
+        decryptor = MacChromeCookieDecryptor(browser_keyring_name, logger, meta_version=meta_version)
     elif sys.platform in ('win32', 'cygwin'):
-        return WindowsChromeCookieDecryptor(browser_root, logger, meta_version=meta_version)
-    return LinuxChromeCookieDecryptor(browser_keyring_name, logger, keyring=keyring, meta_version=meta_version)
+        decryptor = WindowsChromeCookieDecryptor(browser_root, logger, meta_version=meta_version)
+    else:
+        decryptor = LinuxChromeCookieDecryptor(browser_keyring_name, logger, keyring=keyring, meta_version=meta_version)
+    _cookie_decryptors[cache_key] = decryptor
+    return decryptor
 
 
 class LinuxChromeCookieDecryptor(ChromeCookieDecryptor):
@@ -565,7 +703,7 @@ def decrypt(self, encrypted_value):
             return _decrypt_windows_dpapi(encrypted_value, self._logger).decode()
 
 
-def _extract_safari_cookies(profile, logger):
+def _extract_safari_cookies(profile, logger, *, domains=None):
     if sys.platform not in ('darwin', 'ios'):
         raise ValueError(f'unsupported platform: {sys.platform}')
 
@@ -587,6 +725,9 @@ def _extract_safari_cookies(profile, logger):
         cookies_data = f.read()
 
     jar = parse_safari_cookies(cookies_data, logger=logger)
+    if domains:
+        for cookie in [cookie for cookie in jar if not _matches_domains(cookie.domain, domains)]:
+            jar.clear(cookie.domain, cookie.path, cookie.name)
     logger.info(f'Extracted {len(jar)} cookies from safari')
     return jar
 
@@ -11,28 +11,45 @@
 
 del passthrough_module
 
-__version__ = ''
-AES = PKCS1_v1_5 = Blowfish = PKCS1_OAEP = SHA1 = CMAC = RSA = None
-try:
-    if _parent.__name__ == 'Cryptodome':
-        from Cryptodome import __version__
-        from Cryptodome.Cipher import AES, PKCS1_OAEP, Blowfish, PKCS1_v1_5
-        from Cryptodome.Hash import CMAC, SHA1
-        from Cryptodome.PublicKey import RSA
-    elif _parent.__name__ == 'Crypto':
-        from Crypto import __version__
-        from Crypto.Cipher import AES, PKCS1_OAEP, Blowfish, PKCS1_v1_5  # noqa: F401
-        from Crypto.Hash import CMAC, SHA1  # noqa: F401
-        from Crypto.PublicKey import RSA  # noqa: F401
-except (ImportError, OSError):
-    __version__ = f'broken {__version__}'.strip()
-
-
-_yt_dlp__identifier = _parent.__name__
-if AES and _yt_dlp__identifier == 'Crypto':
+_LAZY_ATTRIBUTES = (
+    '__version__', '_yt_dlp__identifier', 'AES', 'PKCS1_v1_5', 'Blowfish', 'PKCS1_OAEP', 'SHA1', 'CMAC', 'RSA')
+
+
+def _load():
+    global __version__, _yt_dlp__identifier, AES, PKCS1_v1_5, Blowfish, PKCS1_OAEP, SHA1, CMAC, RSA
+
+    __version__ = ''
+    AES = PKCS1_v1_5 = Blowfish = PKCS1_OAEP = SHA1 = CMAC = RSA = None
     try:
-        # In pycrypto, mode defaults to ECB. See:
-        # https://www.pycryptodome.org/en/latest/src/vs_pycrypto.html#:~:text=not%20have%20ECB%20as%20default%20mode
-        AES.new(b'abcdefghijklmnop')
-    except TypeError:
-        _yt_dlp__identifier = 'pycrypto'
+        if _parent.__name__ == 'Cryptodome':
+            from Cryptodome import __version__
+            from Cryptodome.Cipher import AES, PKCS1_OAEP, Blowfish, PKCS1_v1_5
+            from Cryptodome.Hash import CMAC, SHA1
+            from Cryptodome.PublicKey import RSA
+        elif _parent.__name__ == 'Crypto':
+            from Crypto import __version__
+            from Crypto.Cipher import AES, PKCS1_OAEP, Blowfish, PKCS1_v1_5
+            from Crypto.Hash import CMAC, SHA1
+            from Crypto.PublicKey import RSA
+    except (ImportError, OSError):
+        __version__ = f'broken {__version__}'.strip()
+
+    _yt_dlp__identifier = _parent.__name__
+    if AES and _yt_dlp__identifier == 'Crypto':
+        try:
+            # In pycrypto, mode defaults to ECB. See:
+            # https://www.pycryptodome.org/en/latest/src/vs_pycrypto.html#:~:text=not%20have%20ECB%20as%20default%20mode
+            AES.new(b'abcdefghijklmnop')
+        except TypeError:
+            _yt_dlp__identifier = 'pycrypto'
+
+
+if _parent.__name__ in ('Cryptodome', 'Crypto'):
+    # The ciphers load native libraries, so they are only imported once one of them is used
+    def __getattr__(name):
+        if name not in _LAZY_ATTRIBUTES:
+            raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+        _load()
+        return globals()[name]
+else:
+    _load()
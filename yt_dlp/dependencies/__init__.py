@@ -66,6 +66,16 @@
 except ImportError:
     requests = None
 
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2
+except ImportError:
+    h2 = None
+
 try:
     import xattr  # xattr or pyxattr
 except ImportError:
@@ -92,7 +102,10 @@
 
 
 # Deprecated
-Cryptodome_AES = Cryptodome.AES
+def __getattr__(name):
+    if name == 'Cryptodome_AES':
+        return Cryptodome.AES
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 __all__ = [
@@ -11,6 +11,8 @@ def get_suitable_downloader(info_dict, params={}, default=NO_DEFAULT, protocol=N
 
     if set(downloaders) == {FFmpegFD} and FFmpegFD.can_merge_formats(info_copy, params):
         return FFmpegFD
+    elif StreamMergeFD.can_merge_formats(info_copy, params):
+        return StreamMergeFD
     elif (set(downloaders) == {DashSegmentsFD}
           and not (to_stdout and len(protocols) > 1)
           and set(protocols) == {'http_dash_segments_generator'}):
@@ -36,6 +38,7 @@ def get_suitable_downloader(info_dict, params={}, default=NO_DEFAULT, protocol=N
 from .youtube_live_chat import YoutubeLiveChatFD
 from .bunnycdn import BunnyCdnFD
 from .soop import SoopVodFD
+from .streammerge import StreamMergeFD
 
 PROTOCOL_MAP = {
     'rtmp': RtmpFD,
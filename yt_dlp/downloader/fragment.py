@@ -1,9 +1,12 @@
+import bisect
 import concurrent.futures
 import contextlib
+import io
 import json
 import math
 import os
 import struct
+import threading
 import time
 
 from .common import FileDownloader
@@ -11,17 +14,80 @@
 from ..aes import aes_cbc_decrypt_bytes, unpad_pkcs7
 from ..networking import Request
 from ..networking.exceptions import HTTPError, IncompleteRead
-from ..utils import DownloadError, RetryManager, traverse_obj
+from ..utils import DownloadError, RetryManager, timeconvert, traverse_obj
 from ..utils.networking import HTTPHeaderDict
 from ..utils.progress import ProgressCalculator
 
 
+class _FragmentBuffer(io.BytesIO):
+    def close(self):
+        # HttpFD closes its stream when the fragment is complete,
+        # but the content is still needed until it is appended
+        pass
+
+
 class HttpQuietDownloader(HttpFD):
+    def __init__(self, ydl, params, fragment_buffer_limit=0):
+        super().__init__(ydl, params)
+        self._fragment_buffer_limit = fragment_buffer_limit
+        self._fragment_buffers = {}
+        self._idle_fragment_buffers = []
+        self._fragment_buffers_lock = threading.Lock()
+
     def to_screen(self, *args, **kargs):
         pass
 
     to_console_title = to_screen
 
+    def acquire_fragment_buffer(self, filename):
+        """
+        Register an in-memory buffer as the download target for filename.
+        Returns False if the limit of outstanding buffers has been reached,
+        in which case the fragment is downloaded to disk instead
+        """
+        with self._fragment_buffers_lock:
+            if filename in self._fragment_buffers:
+                return True
+            if len(self._fragment_buffers) >= self._fragment_buffer_limit:
+                return False
+            self._fragment_buffers[filename] = (
+                self._idle_fragment_buffers.pop() if self._idle_fragment_buffers else _FragmentBuffer())
+            return True
+
+    def get_fragment_buffer(self, filename):
+        return self._fragment_buffers.get(filename)
+
+    def release_fragment_buffer(self, filename=None):
+        """Return the buffer of filename (or all buffers, if None) to the pool for reuse"""
+        with self._fragment_buffers_lock:
+            for name in [filename] if filename is not None else list(self._fragment_buffers):
+                buf = self._fragment_buffers.pop(name, None)
+                if buf is not None:
+                    buf.seek(0)
+                    buf.truncate()
+                    self._idle_fragment_buffers.append(buf)
+
+    def temp_name(self, filename):
+        if filename in self._fragment_buffers:
+            return filename
+        return super().temp_name(filename)
+
+    def sanitize_open(self, filename, open_mode):
+        buf = self._fragment_buffers.get(filename)
+        if buf is None:
+            return super().sanitize_open(filename, open_mode)
+        if 'a' in open_mode:
+            buf.seek(0, io.SEEK_END)
+        else:
+            buf.seek(0)
+            buf.truncate()
+        return buf, filename
+
+    def try_utime(self, filename, last_modified_hdr):
+        if filename not in self._fragment_buffers:
+            return super().try_utime(filename, last_modified_hdr)
+        return timeconvert(last_modified_hdr) if last_modified_hdr else None
+
 
 class FragmentFD(FileDownloader):
     """
@@ -36,8 +102,18 @@ class FragmentFD(FileDownloader):
     keep_fragments:     Keep downloaded fragments on disk after downloading is
                         finished
     concurrent_fragment_downloads:  The number of threads to use for native hls and dash downloads
+    fragment_straggler_percentile: When downloading fragments concurrently, download
+                        a fragment again, alongside the slow attempt, once it has taken
+                        longer than this percentile of the completed fragment download times
+    fragments_in_memory: Download fragments into reusable in-memory buffers
+                        instead of temporary files. Partially downloaded fragment
+                        files from a previous run are still resumed from disk
     _no_ytdl_file:      Don't use .ytdl file
 
+    If the info dict has a '_dest_stream', the fragments are appended to that
+    file object (e.g. a pipe to ffmpeg) instead of the file. Such downloads
+    can't be resumed, so no .ytdl file is used for them
+
     For each incomplete fragment download yt-dlp keeps on disk a special
     bookkeeping file with download state and metadata (in future such files will
     be used for any incomplete download handled by yt-dlp). This file is
@@ -73,11 +149,14 @@ def _prepare_url(self, info_dict, url):
         return Request(url, None, headers) if headers else url
 
     def _prepare_and_start_frag_download(self, ctx, info_dict):
+        if info_dict.get('_dest_stream'):
+            ctx['dest_stream'] = info_dict['_dest_stream']
         self._prepare_frag_download(ctx)
         self._start_frag_download(ctx, info_dict)
 
     def __do_ytdl_file(self, ctx):
-        return ctx['live'] is not True and ctx['tmpfilename'] != '-' and not self.params.get('_no_ytdl_file')
+        return (ctx['live'] is not True and ctx['tmpfilename'] != '-' and not ctx.get('streaming')
+                and not self.params.get('_no_ytdl_file'))
 
     def _read_ytdl_file(self, ctx):
         assert 'ytdl_corrupt' not in ctx
@@ -110,6 +189,8 @@ def _write_ytdl_file(self, ctx):
 
     def _download_fragment(self, ctx, frag_url, info_dict, headers=None, request_data=None):
         fragment_filename = '%s-Frag%d' % (ctx['tmpfilename'], ctx['fragment_index'])
+        if ctx.get('fragment_attempt'):
+            fragment_filename += '.%d' % ctx['fragment_attempt']
         fragment_info_dict = {
             'url': frag_url,
             'http_headers': headers or info_dict.get('http_headers'),
@@ -121,17 +202,30 @@ def _download_fragment(self, ctx, frag_url, info_dict, headers=None, request_dat
             frag_resume_len = self.filesize_or_none(self.temp_name(fragment_filename))
         fragment_info_dict['frag_resume_len'] = ctx['frag_resume_len'] = frag_resume_len
 
+        # HttpFD would resume a leftover fragment file, or take it as complete, instead of filling the buffer
+        if self._use_fragment_buffers(ctx) and not any(
+                os.path.isfile(fn) for fn in (fragment_filename, self.temp_name(fragment_filename))):
+            ctx['dl'].acquire_fragment_buffer(fragment_filename)
+
         success, _ = ctx['dl'].download(fragment_filename, fragment_info_dict)
         if not success:
+            ctx['dl'].release_fragment_buffer(fragment_filename)
             return False
         if fragment_info_dict.get('filetime'):
             ctx['fragment_filetime'] = fragment_info_dict.get('filetime')
         ctx['fragment_filename_sanitized'] = fragment_filename
         return True
 
+    def _use_fragment_buffers(self, ctx):
+        return (self.params.get('fragments_in_memory')
+                and not self.params.get('keep_fragments', False) and ctx['tmpfilename'] != '-')
+
     def _read_fragment(self, ctx):
         if not ctx.get('fragment_filename_sanitized'):
             return None
+        buf = ctx['dl'].get_fragment_buffer(ctx['fragment_filename_sanitized'])
+        if buf is not None:
+            return buf.getvalue()
         try:
             down, frag_sanitized = self.sanitize_open(ctx['fragment_filename_sanitized'], 'rb')
         except FileNotFoundError:
@@ -151,9 +245,27 @@ def _append_fragment(self, ctx, frag_content):
             if self.__do_ytdl_file(ctx):
                 self._write_ytdl_file(ctx)
             if not self.params.get('keep_fragments', False):
-                self.try_remove(ctx['fragment_filename_sanitized'])
+                self._discard_fragment(ctx, ctx['fragment_filename_sanitized'])
             del ctx['fragment_filename_sanitized']
 
+    def _discard_fragment(self, ctx, fragment_filename):
+        if ctx['dl'].get_fragment_buffer(fragment_filename) is not None:
+            ctx['dl'].release_fragment_buffer(fragment_filename)
+        else:
+            self.try_remove(fragment_filename)
+
+    def _fragment_downloader(self, fragment_buffer_limit=0):
+        return HttpQuietDownloader(self.ydl, {
+            **self.params,
+            'noprogress': True,
+            'test': False,
+            'sleep_interval': 0,
+            'max_sleep_interval': 0,
+            'sleep_interval_subtitles': 0,
+            # Fragments are already downloaded concurrently, and may be kept in memory
+            'http_connections': 1,
+        }, fragment_buffer_limit=fragment_buffer_limit)
+
     def _prepare_frag_download(self, ctx):
         if not ctx.setdefault('live', False):
             total_frags_str = '%d' % ctx['total_frags']
@@ -163,16 +275,20 @@ def _prepare_frag_download(self, ctx):
         else:
             total_frags_str = 'unknown (live)'
         self.to_screen(f'[{self.FD_NAME}] Total fragments: {total_frags_str}')
-        self.report_destination(ctx['filename'])
-        dl = HttpQuietDownloader(self.ydl, {
-            **self.params,
-            'noprogress': True,
-            'test': False,
-            'sleep_interval': 0,
-            'max_sleep_interval': 0,
-            'sleep_interval_subtitles': 0,
-        })
+        if not ctx.get('dest_stream'):
+            self.report_destination(ctx['filename'])
+        dl = self._fragment_downloader(fragment_buffer_limit=self._fragment_window_size(ctx))
         tmpfilename = self.temp_name(ctx['filename'])
+        if ctx.get('dest_stream'):
+            ctx.update({
+                'dl': dl,
+                'tmpfilename': tmpfilename,
+                'streaming': True,
+                'fragment_index': 0,
+                'complete_frags_downloaded_bytes': 0,
+            })
+            return
+
         open_mode = 'wb'
 
         # Establish possible resume length
@@ -222,6 +338,10 @@ def _prepare_frag_download(self, ctx):
             'complete_frags_downloaded_bytes': resume_len,
         })
 
+    def _fragment_window_size(self, ctx):
+        # Allow finished fragments to queue up behind a slow one before throttling new downloads
+        return 2 * math.ceil(self.params.get('concurrent_fragment_downloads', 1) / ctx.get('max_progress', 1))
+
     def _start_frag_download(self, ctx, info_dict):
         resume_len = ctx['complete_frags_downloaded_bytes']
         total_frags = ctx['total_frags']
@@ -284,11 +404,13 @@ def frag_progress_hook(s):
 
     def _finish_frag_download(self, ctx, info_dict):
         ctx['dest_stream'].close()
+        # Buffers of skipped fragments are never appended
+        ctx['dl'].release_fragment_buffer()
         if self.__do_ytdl_file(ctx):
             self.try_remove(self.ytdl_filename(ctx['filename']))
         elapsed = time.time() - ctx['started']
 
-        to_file = ctx['tmpfilename'] != '-'
+        to_file = ctx['tmpfilename'] != '-' and not ctx.get('streaming')
         if to_file:
             downloaded_bytes = self.filesize_or_none(ctx['tmpfilename'])
         else:
@@ -428,6 +550,104 @@ def interrupt_trigger_iter(fg):
         # so returning a intermediate result here instead of KeyboardInterrupt on live
         return result
 
+    _STRAGGLER_MIN_SAMPLES = 5
+
+    def _download_fragments_reordered(self, ctx, pool, fragments, download_func):
+        """
+        Download fragments concurrently in pool and yield (fragment, fragment_filename)
+        in the original order as soon as each of them and all preceding ones are done.
+
+        At most _fragment_window_size fragments are downloading or waiting to be appended
+        at any time. With fragment_straggler_percentile, a fragment that is taking
+        longer than that percentile of the completed downloads is submitted a second time
+        to a separate pool and whichever attempt finishes first is used.
+        The other attempt is abandoned and its fragment discarded once it completes
+        """
+        window = self._fragment_window_size(ctx)
+        percentile = self.params.get('fragment_straggler_percentile')
+        fragments = iter(fragments)
+        exhausted = False
+        submitted = next_pos = 0
+        by_pos, finished = {}, {}
+        running = {}  # future -> (pos, start time)
+        redispatched = set()
+        durations = []
+        straggler_pool = None
+
+        def submit(pos, attempt=0):
+            nonlocal straggler_pool
+            if attempt and straggler_pool is None:
+                # The slow attempts keep their slots in pool
+                straggler_pool = concurrent.futures.ThreadPoolExecutor(max(1, window // 2))
+            running[(straggler_pool if attempt else pool).submit(
+                download_func, by_pos[pos], attempt)] = (pos, time.monotonic())
+
+        def discard_result(future):
+            if not future.cancelled() and future.exception() is None and future.result():
+                self._discard_fragment(ctx, future.result())
+
+        def abandon_attempts(pos):
+            for future, (p, _) in list(running.items()):
+                if p == pos:
+                    del running[future]
+                    if not future.cancel():
+                        future.add_done_callback(discard_result)
+
+        try:
+            while True:
+                while not exhausted and submitted - next_pos < window:
+                    fragment = next(fragments, None)
+                    if fragment is None:
+                        exhausted = True
+                        break
+                    by_pos[submitted] = fragment
+                    submit(submitted)
+                    submitted += 1
+
+                while next_pos in finished:
+                    yield by_pos.pop(next_pos), finished.pop(next_pos)
+                    next_pos += 1
+                if not running:
+                    if exhausted:
+                        return
+                    continue
+
+                done, _ = concurrent.futures.wait(
+                    running, timeout=1 if percentile else None, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    if future not in running:
+                        # Abandoned since another attempt of its fragment finished in this batch
+                        discard_result(future)
+                        continue
+                    pos, started = running.pop(future)
+                    other_attempts = any(p == pos for p, _ in running.values())
+                    try:
+                        frag_filename = future.result()
+                    except Exception:
+                        if other_attempts:
+                            continue
+                        raise
+                    if frag_filename is None and other_attempts:
+                        continue
+                    bisect.insort(durations, time.monotonic() - started)
+                    finished[pos] = frag_filename
+                    abandon_attempts(pos)
+
+                if not percentile or len(durations) < self._STRAGGLER_MIN_SAMPLES:
+                    continue
+                threshold = durations[min(len(durations) - 1, int(len(durations) * percentile / 100))]
+                now = time.monotonic()
+                for pos, started in list(running.values()):
+                    if pos not in redispatched and now - started > threshold:
+                        self.write_debug(
+                            f'Fragment {by_pos[pos]["frag_index"]} is taking longer than {threshold:.2f}s; '
+                            'downloading it again')
+                        redispatched.add(pos)
+                        submit(pos, attempt=1)
+        finally:
+            if straggler_pool is not None:
+                straggler_pool.shutdown(wait=False, cancel_futures=True)
+
     def download_and_append_fragments(
             self, ctx, fragments, info_dict, *, is_fatal=(lambda idx: False),
             pack_func=(lambda content, idx: content), finish_func=None,
@@ -485,26 +705,39 @@ def append_fragment(frag_content, frag_index, ctx):
         max_workers = math.ceil(
             self.params.get('concurrent_fragment_downloads', 1) / ctx.get('max_progress', 1))
         if max_workers > 1:
-            def _download_fragment(fragment):
-                ctx_copy = ctx.copy()
+            def _download_fragment(fragment, attempt):
+                ctx_copy = {**ctx, 'fragment_attempt': attempt}
+                if attempt:
+                    # Download stragglers again with a downloader of their own, straight to disk
+                    ctx_copy['dl'] = self._fragment_downloader()
+                    for ph in ctx['dl']._progress_hooks:
+                        ctx_copy['dl'].add_progress_hook(ph)
                 download_fragment(fragment, ctx_copy)
-                return fragment, fragment['frag_index'], ctx_copy.get('fragment_filename_sanitized')
+                return ctx_copy.get('fragment_filename_sanitized')
 
-            with tpe or concurrent.futures.ThreadPoolExecutor(max_workers) as pool:
-                try:
-                    for fragment, frag_index, frag_filename in pool.map(_download_fragment, fragments):
-                        ctx.update({
-                            'fragment_filename_sanitized': frag_filename,
-                            'fragment_index': frag_index,
-                        })
-                        if not append_fragment(decrypt_fragment(fragment, self._read_fragment(ctx)), frag_index, ctx):
-                            return False
-                except KeyboardInterrupt:
-                    self._finish_multiline_status()
-                    self.report_error(
-                        'Interrupted by user. Waiting for all threads to shutdown...', is_error=False, tb=False)
-                    pool.shutdown(wait=False)
-                    raise
+            pool = tpe or concurrent.futures.ThreadPoolExecutor(max_workers)
+            appended = False
+            try:
+                for fragment, frag_filename in self._download_fragments_reordered(
+                        ctx, pool, fragments, _download_fragment):
+                    frag_index = fragment['frag_index']
+                    ctx.update({
+                        'fragment_filename_sanitized': frag_filename,
+                        'fragment_index': frag_index,
+                    })
+                    if not append_fragment(decrypt_fragment(fragment, self._read_fragment(ctx)), frag_index, ctx):
+                        return False
+                appended = True
+            except KeyboardInterrupt:
+                self._finish_multiline_status()
+                self.report_error(
+                    'Interrupted by user. Waiting for all threads to shutdown...', is_error=False, tb=False)
+                pool.shutdown(wait=False)
+                raise
+            finally:
+                if not tpe:
+                    # Once every fragment is appended, only abandoned attempts of stragglers can be left
+                    pool.shutdown(wait=not appended)
         else:
             for fragment in fragments:
                 if not interrupt_trigger[0]:
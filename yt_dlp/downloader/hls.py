@@ -128,6 +128,9 @@ def real_download(self, filename, info_dict):
                         'add --check-formats to automatically fallback to the next best format', tb=False)
                 return False
             message = message or 'Unsupported features have been detected'
+            if info_dict.get('_dest_stream'):
+                self.report_error(f'{message}; the format can not be streamed. Try again with --no-stream-merge')
+                return False
             fd = FFmpegFD(self.ydl, self.params)
             self.report_warning(f'{message}; extraction will be delegated to {fd.get_basename()}')
             return fd.real_download(filename, info_dict)
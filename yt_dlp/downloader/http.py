@@ -1,5 +1,9 @@
+import concurrent.futures
+import contextlib
+import json
 import os
 import random
+import threading
 import time
 
 from .common import FileDownloader
@@ -20,7 +24,32 @@
 from ..utils.networking import HTTPHeaderDict
 
 
+class _HttpRange:
+    """A byte range of a segmented download; the bytes before `pos` have been written"""
+
+    def __init__(self, start, pos, end):
+        self.start, self.pos, self.end = start, pos, end
+        # The bytes before `claimed` are being or have been written by the owner of the range
+        self.claimed = pos
+        self.active = False
+
+    @property
+    def done(self):
+        return self.pos > self.end
+
+
 class HttpFD(FileDownloader):
+    """
+    Available options (in addition to those of FileDownloader):
+
+    http_connections:   Number of connections to download a file with when the
+                        server supports ranges (default is 1)
+    """
+
+    _MIN_SEGMENT_SIZE = 1024 * 1024
+    _PROGRESS_INTERVAL = 0.25
+    _STATE_INTERVAL = 1
+
     def real_download(self, filename, info_dict):
         url = info_dict['url']
         request_data = info_dict.get('request_data', None)
@@ -56,6 +85,22 @@ class DownloadContext(dict):
         # parse given Range
         req_start, req_end, _ = parse_http_range(headers.get('Range'))
 
+        connections = self.params.get('http_connections') or 1
+        if (connections > 1 and not is_test and ctx.tmpfilename != '-'
+                and req_start is None and req_end is None):
+            result = self._download_ranges(
+                ctx, info_dict, Request(url, request_data, headers, extensions=request_extensions),
+                connections, chunk_size)
+            if result is not None:
+                return result
+
+        if self._read_ranges_state(ctx.filename) is not None:
+            # The file was preallocated by a segmented download, so its size is meaningless
+            if os.path.isfile(ctx.tmpfilename):
+                self.report_unable_to_resume()
+                self.try_remove(ctx.tmpfilename)
+            self.try_remove(self.ytdl_filename(ctx.filename))
+
         if self.params.get('continuedl', True):
             # Establish possible resume length
             if os.path.isfile(ctx.tmpfilename):
@@ -380,3 +425,266 @@ def retry(e):
                 close_stream()
                 raise
         return False
+
+    def _read_ranges_state(self, filename):
+        ytdl_filename = self.ytdl_filename(filename)
+        if not os.path.isfile(ytdl_filename):
+            return None
+        try:
+            with open(ytdl_filename, encoding='utf-8') as f:
+                state = json.load(f)['downloader']['http_ranges']
+            return state if isinstance(state, dict) else None
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_ranges_state(self, filename, content_len, ranges):
+        stream, _ = self.sanitize_open(self.ytdl_filename(filename), 'w')
+        try:
+            stream.write(json.dumps({'downloader': {'http_ranges': {
+                'content_len': content_len,
+                'ranges': [[r.start, r.pos, r.end] for r in ranges],
+            }}}))
+        finally:
+            stream.close()
+
+    def _probe_ranges(self, request):
+        """@returns (content length, last modified) if the server supports ranges, else None"""
+        request = request.copy()
+        request.headers['Range'] = 'bytes=0-0'
+        try:
+            response = self.ydl.urlopen(request)
+        except CertificateVerifyError:
+            raise
+        except (HTTPError, TransportError) as err:
+            self.write_debug(f'Unable to check whether the server supports ranges: {err}')
+            return None
+        with contextlib.closing(response):
+            start, _, content_len = parse_http_range(response.headers.get('Content-Range'))
+            if response.status != 206 or start != 0 or not content_len or response.headers.get('Content-Encoding'):
+                return None
+            return content_len, response.headers.get('Last-Modified')
+
+    def _split_ranges(self, content_len, connections):
+        size = max(-(-content_len // connections), self._MIN_SEGMENT_SIZE)
+        return [_HttpRange(start, start, min(start + size, content_len) - 1)
+                for start in range(0, content_len, size)]
+
+    @staticmethod
+    def _pwrite(stream, data, offset):
+        if hasattr(os, 'pwrite'):
+            view = memoryview(data)
+            while view:
+                written = os.pwrite(stream.fileno(), view, offset)
+                view, offset = view[written:], offset + written
+        else:
+            # Every connection has its own file object
+            stream.seek(offset)
+            stream.write(data)
+
+    def _download_ranges(self, ctx, info_dict, request, connections, chunk_size):
+        """
+        Download the file over several connections, each fetching a byte range
+
+        The file is preallocated and every range is written at its offset.
+        When a connection has no range left to download, it takes over the second
+        half of the range with the most remaining bytes, so that a slow connection
+        doesn't hold up the download. The progress of the ranges is kept in the
+        .ytdl file so that the download can be resumed
+
+        @returns True/False for success/failure, or None if the server doesn't
+                 support ranges and the file must be downloaded with a single connection
+        """
+        probe = self._probe_ranges(request)
+        if not probe:
+            self.write_debug('The server does not support ranges; downloading with a single connection')
+            return None
+        content_len, last_modified = probe
+        if content_len < 2 * self._MIN_SEGMENT_SIZE:
+            return None
+
+        min_data_len = self.params.get('min_filesize')
+        max_data_len = self.params.get('max_filesize')
+        if min_data_len is not None and content_len < min_data_len:
+            self.to_screen(
+                f'\r[download] File is smaller than min-filesize ({content_len} bytes < {min_data_len} bytes). Aborting.')
+            return False
+        if max_data_len is not None and content_len > max_data_len:
+            self.to_screen(
+                f'\r[download] File is larger than max-filesize ({content_len} bytes > {max_data_len} bytes). Aborting.')
+            return False
+
+        ranges = None
+        state = self._read_ranges_state(ctx.filename)
+        if (state and self.params.get('continuedl', True) and state.get('content_len') == content_len
+                and os.path.isfile(ctx.tmpfilename) and os.path.getsize(ctx.tmpfilename) == content_len):
+            with contextlib.suppress(TypeError, ValueError):
+                ranges = [_HttpRange(*map(int, r)) for r in state['ranges']]
+        if ranges is not None:
+            self.report_resuming_byte(content_len - sum(r.end - r.pos + 1 for r in ranges))
+        else:
+            if state is not None:
+                self.report_unable_to_resume()
+            ranges = self._split_ranges(content_len, connections)
+            try:
+                stream, ctx.tmpfilename = self.sanitize_open(ctx.tmpfilename, 'wb')
+                with stream:
+                    stream.truncate(content_len)
+            except OSError as err:
+                self.report_error(f'unable to open for writing: {err}')
+                return False
+            ctx.filename = self.undo_temp_name(ctx.tmpfilename)
+            self._write_ranges_state(ctx.filename, content_len, ranges)
+        self.report_destination(ctx.filename)
+        self.write_debug(f'Downloading {content_len} bytes with {connections} connections')
+
+        lock = threading.Lock()
+        abort = threading.Event()
+        block_size = self.params.get('buffersize', 1024)
+        start_time = time.time()
+        resume_len = byte_counter = content_len - sum(r.end - r.pos + 1 for r in ranges if not r.done)
+
+        def next_range():
+            with lock:
+                for r in ranges:
+                    if not r.active and not r.done:
+                        r.active = True
+                        return r
+                slowest = max((r for r in ranges if r.active), key=lambda r: r.end - r.claimed, default=None)
+                if not slowest or slowest.end - slowest.claimed + 1 < 2 * self._MIN_SEGMENT_SIZE:
+                    return None
+                middle = (slowest.claimed + slowest.end + 1) // 2
+                stolen = _HttpRange(middle, middle, slowest.end)
+                stolen.active = True
+                slowest.end = middle - 1
+                ranges.insert(ranges.index(slowest) + 1, stolen)
+                return stolen
+
+        def fetch_range(r, stream):
+            nonlocal byte_counter
+            for retry in RetryManager(self.params.get('retries'), self.report_retry):
+                try:
+                    while not r.done and not abort.is_set():
+                        range_end = r.end if not chunk_size else min(r.end, r.pos + chunk_size - 1)
+                        range_request = request.copy()
+                        range_request.headers['Range'] = f'bytes={r.pos}-{range_end}'
+                        with contextlib.closing(self.ydl.urlopen(range_request)) as response:
+                            range_start, _, range_len = parse_http_range(response.headers.get('Content-Range'))
+                            if response.status != 206 or range_start != r.pos or range_len != content_len:
+                                self.report_error(f'the server did not honor the range {r.pos}-{range_end}')
+                                return False
+                            while not abort.is_set():
+                                with lock:
+                                    size = min(block_size, r.end - r.pos + 1, range_end - r.pos + 1)
+                                if size <= 0:
+                                    break
+                                data_block = response.read(size)
+                                if not data_block:
+                                    break
+                                with lock:
+                                    # The end of the range may have been stolen while reading
+                                    data_block = data_block[:max(r.end - r.pos + 1, 0)]
+                                    offset = r.pos
+                                    r.claimed = offset + len(data_block)
+                                try:
+                                    self._pwrite(stream, data_block, offset)
+                                except OSError as err:
+                                    with lock:
+                                        r.claimed = r.pos
+                                    self.report_error(f'unable to write data: {err}')
+                                    return False
+                                with lock:
+                                    r.pos = r.claimed
+                                    byte_counter += len(data_block)
+                                self.slow_down(start_time, None, byte_counter - resume_len)
+                        if not abort.is_set() and r.pos <= min(range_end, r.end):
+                            raise ContentTooShortError(r.pos - r.start, min(range_end, r.end) + 1 - r.start)
+                except CertificateVerifyError:
+                    raise
+                except (TransportError, ContentTooShortError) as err:
+                    if isinstance(err, HTTPError) and not 500 <= err.status < 600:
+                        raise
+                    retry.error = err
+                    continue
+                return True
+            return False
+
+        def connection():
+            with open(ctx.tmpfilename, 'r+b', buffering=0) as stream:
+                while not abort.is_set():
+                    r = next_range()
+                    if r is None:
+                        return True
+                    try:
+                        if not fetch_range(r, stream):
+                            abort.set()
+                            return False
+                    finally:
+                        with lock:
+                            r.active = False
+            return False
+
+        def report_progress():
+            now = time.time()
+            speed = self.calc_speed(start_time, now, byte_counter - resume_len)
+            self._hook_progress({
+                'status': 'downloading',
+                'downloaded_bytes': byte_counter,
+                'total_bytes': content_len,
+                'tmpfilename': ctx.tmpfilename,
+                'filename': ctx.filename,
+                'eta': self.calc_eta(start_time, now, content_len - resume_len, byte_counter - resume_len),
+                'speed': speed,
+                'elapsed': now - ctx.start_time,
+                'ctx_id': info_dict.get('ctx_id'),
+            }, info_dict)
+            return speed
+
+        def save_state():
+            with lock:
+                # Only the ranges that are left to download need to be kept
+                ranges[:] = [r for r in ranges if not r.done or r.active]
+                self._write_ranges_state(ctx.filename, content_len, ranges)
+
+        throttle_start = None
+        last_saved = time.time()
+        with concurrent.futures.ThreadPoolExecutor(connections, thread_name_prefix='http_range') as pool:
+            futures = [pool.submit(connection) for _ in range(connections)]
+            try:
+                while True:
+                    done, pending = concurrent.futures.wait(futures, self._PROGRESS_INTERVAL)
+                    if not pending or any(f.exception() or not f.result() for f in done):
+                        break
+                    speed = report_progress()
+                    if time.time() - last_saved >= self._STATE_INTERVAL:
+                        save_state()
+                        last_saved = time.time()
+                    if speed and speed < (self.params.get('throttledratelimit') or 0):
+                        throttle_start = throttle_start or time.time()
+                        if time.time() - throttle_start > 3:
+                            raise ThrottledDownload
+                    elif speed:
+                        throttle_start = None
+            finally:
+                abort.set()
+                concurrent.futures.wait(futures)
+                save_state()
+
+        for future in futures:
+            if future.exception():
+                raise future.exception()
+        if not all(f.result() for f in futures) or not all(r.done for r in ranges):
+            return False
+
+        self.try_remove(self.ytdl_filename(ctx.filename))
+        self.try_rename(ctx.tmpfilename, ctx.filename)
+        if self.params.get('updatetime'):
+            info_dict['filetime'] = self.try_utime(ctx.filename, last_modified)
+        self._hook_progress({
+            'downloaded_bytes': content_len,
+            'total_bytes': content_len,
+            'filename': ctx.filename,
+            'status': 'finished',
+            'elapsed': time.time() - ctx.start_time,
+            'ctx_id': info_dict.get('ctx_id'),
+        }, info_dict)
+        return True
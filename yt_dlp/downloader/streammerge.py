@@ -0,0 +1,181 @@
+import concurrent.futures
+import contextlib
+import functools
+import os
+import subprocess
+import threading
+import time
+
+from . import get_suitable_downloader
+from .common import FileDownloader
+from .dash import DashSegmentsFD
+from .external import FFmpegFD
+from .hls import HlsFD
+from ..postprocessor.ffmpeg import EXT_TO_OUT_FORMATS, FFmpegMergerPP
+from ..utils import Popen, encodeArgument, prepend_extension, shell_quote
+
+
+class StreamMergeFD(FileDownloader):
+    """
+    Download the fragments of the requested DASH/HLS formats and merge them with
+    a single ffmpeg process, which reads each format from a pipe while its
+    fragments are still being downloaded. No intermediate file is written for
+    the formats, but such downloads can't be resumed
+    """
+
+    FD_NAME = 'streammerge'
+    _FRAGMENT_PROTOCOLS = {
+        'http_dash_segments': 'dash_frag_urls',
+        'm3u8_native': 'm3u8_frag_urls',
+    }
+
+    @classmethod
+    def can_merge_formats(cls, info_dict, params):
+        formats = info_dict.get('requested_formats') or []
+
+        def is_streamable(fmt):
+            fmt = {**info_dict, **fmt}
+            del fmt['requested_formats']
+            frag_protocol = cls._FRAGMENT_PROTOCOLS.get(fmt.get('protocol'))
+            return (
+                frag_protocol and not fmt.get('is_live')
+                and get_suitable_downloader(fmt, params) in (DashSegmentsFD, HlsFD)
+                # Fragments handed to an external downloader are written to a file
+                and not get_suitable_downloader(fmt, params, None, protocol=frag_protocol))
+
+        return (
+            params.get('stream_merge')
+            and len(formats) > 1
+            and os.name == 'posix'  # The pipes are inherited with pass_fds
+            and not info_dict.get('to_stdout')
+            and not (info_dict.get('section_start') or info_dict.get('section_end'))
+            # The formats must be kept or decrypted before they are merged
+            and not params.get('keepvideo')
+            and not params.get('allow_unplayable_formats')
+            and all(map(is_streamable, formats))
+            and FFmpegFD.available())
+
+    def _merge_args(self, info_dict, input_fds):
+        ffpp = FFmpegMergerPP(self.ydl)
+        args = [ffpp.executable, '-y', '-hide_banner', '-nostats', '-loglevel',
+                'verbose' if self.params.get('verbose') else 'quiet' if self.params.get('quiet') else 'error']
+        for fd in input_fds:
+            args += ['-i', f'pipe:{fd}']
+        args += ['-c', 'copy']
+        audio_streams = 0
+        for i, fmt in enumerate(info_dict['requested_formats']):
+            if fmt.get('acodec') != 'none':
+                args += ['-map', f'{i}:a:0']
+                # The audio can't be probed beforehand, so this relies on the reported codec
+                if (fmt.get('protocol') == 'm3u8_native'
+                        and (fmt.get('acodec') or 'aac').split('.')[0] in ('aac', 'mp4a')):
+                    args += [f'-bsf:a:{audio_streams}', 'aac_adtstoasc']
+                audio_streams += 1
+            if fmt.get('vcodec') != 'none':
+                args += ['-map', f'{i}:v:0']
+        args += ['-movflags', '+faststart', '-f', EXT_TO_OUT_FORMATS.get(info_dict['ext'], info_dict['ext'])]
+        args += ffpp._configuration_args(ffpp.basename, ['_o1', '_o', ''])
+        return [encodeArgument(arg) for arg in args], ffpp
+
+    def _download_format(self, filename, fmt, stream, params, progress_hook):
+        try:
+            fd = get_suitable_downloader(fmt, params)(self.ydl, params)
+            fd.add_progress_hook(progress_hook)
+            return fd.real_download(filename, {**fmt, '_dest_stream': stream})
+        finally:
+            # ffmpeg must get EOF even if the download failed, or it would wait for the pipe forever
+            with contextlib.suppress(OSError):
+                stream.close()
+
+    def real_download(self, filename, info_dict):
+        tmpfilename = self.temp_name(filename)
+        if tmpfilename != filename and os.path.exists(tmpfilename) and self.params.get('continuedl', True):
+            self.report_warning('Streamed merges can not be resumed; restarting the download')
+        self.to_screen(f'[{self.FD_NAME}] Merging the formats while they are downloaded; '
+                       'the download can not be resumed if it is interrupted')
+        self.report_destination(filename)
+
+        formats = []
+        for fmt in info_dict['requested_formats']:
+            fmt = {**info_dict, **fmt}
+            del fmt['requested_formats']
+            formats.append((prepend_extension(filename, 'f{}'.format(fmt['format_id']), info_dict['ext']), fmt))
+
+        pipes = [os.pipe() for _ in formats]
+        streams = [open(write_fd, 'wb') for _, write_fd in pipes]
+        read_fds = [read_fd for read_fd, _ in pipes]
+        try:
+            args, ffpp = self._merge_args(info_dict, read_fds)
+            ffpp.check_version()
+            args.append(ffpp._ffmpeg_filename_argument(tmpfilename))
+            self.write_debug(f'ffmpeg command line: {shell_quote(args)}')
+            proc = Popen(args, stdin=subprocess.DEVNULL, pass_fds=read_fds)
+        except BaseException:
+            for stream in streams:
+                stream.close()
+            raise
+        finally:
+            for read_fd in read_fds:
+                os.close(read_fd)
+
+        # The formats would overwrite each other's progress line, so it is aggregated
+        params = {**self.params, 'noprogress': True}
+        if params.get('ratelimit'):
+            params['ratelimit'] = params['ratelimit'] / len(formats)
+        progress_lock = threading.Lock()
+        statuses = [{} for _ in formats]
+        start_time = time.time()
+
+        def aggregate_progress(idx, status):
+            with progress_lock:
+                if status['status'] not in ('downloading', 'finished'):
+                    return
+                statuses[idx] = status.copy()
+                total_bytes = [s.get('total_bytes') or s.get('total_bytes_estimate') for s in statuses]
+                downloaded_bytes = sum(s.get('downloaded_bytes') or 0 for s in statuses)
+                speed = sum(s.get('speed') or 0 for s in statuses if s.get('status') == 'downloading')
+                progress = {
+                    'status': 'downloading',
+                    'downloaded_bytes': downloaded_bytes,
+                    'speed': speed or None,
+                    'elapsed': time.time() - start_time,
+                    'filename': filename,
+                    'tmpfilename': tmpfilename,
+                }
+                if all(total_bytes):
+                    progress['total_bytes_estimate'] = sum(total_bytes)
+                    progress['eta'] = int((progress['total_bytes_estimate'] - downloaded_bytes) / speed) if speed else None
+                self._hook_progress(progress, info_dict)
+
+        with proc:
+            pool = concurrent.futures.ThreadPoolExecutor(len(formats), thread_name_prefix='stream_merge')
+            try:
+                futures = [
+                    pool.submit(self._download_format, name, fmt, stream, params,
+                                functools.partial(aggregate_progress, idx))
+                    for idx, ((name, fmt), stream) in enumerate(zip(formats, streams, strict=True))]
+                results = [future.result() for future in futures]
+            except BaseException:
+                # Writing to the pipes fails once ffmpeg is gone, which stops the downloads
+                proc.kill(timeout=None)
+                raise
+            finally:
+                pool.shutdown(wait=True)
+            retval = proc.wait()
+
+        if retval:
+            self.report_error(f'ffmpeg exited with code {retval}')
+        if not all(results) or retval:
+            self.try_remove(tmpfilename)
+            return False
+
+        downloaded_bytes = os.path.getsize(tmpfilename)
+        self.try_rename(tmpfilename, filename)
+        self._hook_progress({
+            'downloaded_bytes': downloaded_bytes,
+            'total_bytes': downloaded_bytes,
+            'filename': filename,
+            'status': 'finished',
+            'elapsed': time.time() - start_time,
+        }, info_dict)
+        return True
@@ -0,0 +1,268 @@
+"""
+Index of the extractors by the hosts of the URLs they are suitable for
+
+The host keys of an extractor are derived from the parsed regexes of its _VALID_URL.
+Any URL that matches one of them has one of the keys as a dot-separated suffix of
+its host, so only the extractors indexed under the suffixes of the host of a URL
+(and the extractors that can't be indexed) need to be tried for it.
+An extractor that can't be proven to only match some hosts is never excluded
+"""
+import functools
+import heapq
+import itertools
+import re
+
+try:
+    import re._constants as sre_constants
+    import re._parser as sre_parse
+except ImportError:  # Python 3.10
+    import sre_constants
+    import sre_parse
+
+from .common import InfoExtractor
+from ..utils import variadic
+
+_MAX_ALTERNATIVES = 64
+# Characters that end the host that is matched by a regex. A URL is looked up with its
+# host cut at each of them, since a regex may match only part of what is before the path
+_HOST_TERMINATORS = ':?#\n'
+
+_END = ('end',)
+_REPEATS = tuple(filter(None, (
+    sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, getattr(sre_constants, 'POSSESSIVE_REPEAT', None))))
+_ZERO_WIDTH = tuple(filter(None, (sre_constants.ASSERT, sre_constants.ASSERT_NOT)))
+_CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: str.isdigit,
+    sre_constants.CATEGORY_NOT_DIGIT: lambda c: not c.isdigit(),
+    sre_constants.CATEGORY_SPACE: str.isspace,
+    sre_constants.CATEGORY_NOT_SPACE: lambda c: not c.isspace(),
+    sre_constants.CATEGORY_WORD: lambda c: c.isalnum() or c == '_',
+    sre_constants.CATEGORY_NOT_WORD: lambda c: not (c.isalnum() or c == '_'),
+}
+
+
+class _Unindexable(Exception):
+    pass
+
+
+def _class_matches(items, char):
+    """Whether a character class (the argument of IN) can match the character"""
+    negate = matched = False
+    for op, av in items:
+        if op is sre_constants.NEGATE:
+            negate = True
+        elif op is sre_constants.LITERAL:
+            matched |= av == ord(char)
+        elif op is sre_constants.RANGE:
+            matched |= av[0] <= ord(char) <= av[1]
+        elif op is sre_constants.CATEGORY and av in _CATEGORIES:
+            matched |= _CATEGORIES[av](char)
+        else:
+            raise _Unindexable
+    return matched != negate
+
+
+def _can_match(items, char):
+    """Whether the parsed (sub)pattern can match a string containing the character"""
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            found = av == ord(char)
+        elif op is sre_constants.NOT_LITERAL:
+            found = av != ord(char)
+        elif op is sre_constants.ANY:
+            found = True
+        elif op is sre_constants.IN:
+            found = _class_matches(av, char)
+        elif op is sre_constants.SUBPATTERN:
+            found = _can_match(av[-1], char)
+        elif op is getattr(sre_constants, 'ATOMIC_GROUP', None):
+            found = _can_match(av, char)
+        elif op is sre_constants.BRANCH:
+            found = any(_can_match(branch, char) for branch in av[1])
+        elif op in _REPEATS:
+            found = av[1] > 0 and _can_match(av[2], char)
+        elif op is sre_constants.AT or op in _ZERO_WIDTH:
+            found = False
+        else:
+            raise _Unindexable
+        if found:
+            return True
+    return False
+
+
+def _char_token(op, av):
+    items = [(op, av)]
+    terminator_only = op is sre_constants.IN and all(
+        item_op is sre_constants.LITERAL and chr(item_av) in '/' + _HOST_TERMINATORS for item_op, item_av in av)
+    return ('set', _can_match(items, '/'), terminator_only)
+
+
+_SCHEME, _SLASH = ('scheme',), ('slash',)
+
+
+def _advance(state, token):
+    """
+    Advance the state of an alternative by a token
+
+    @returns The new state, or the host key if the alternative reached the end of its host
+    @raises _Unindexable if the host of the URLs it matches can't be determined
+    """
+    if state is _SCHEME:
+        if token == ('char', '/'):
+            return _SLASH
+        # The first "//" of the URL must be the one before the host
+        if token is _END or (token[0] == 'set' and token[1]):
+            raise _Unindexable
+        return _SCHEME
+    elif state is _SLASH:
+        if token != ('char', '/'):
+            raise _Unindexable
+        return ('host', '', True)
+
+    _, literal, only_literals = state
+    if token is _END or (token[0] == 'char' and token[1] in '/' + _HOST_TERMINATORS) or (
+            token[0] == 'set' and token[2]):
+        if only_literals:
+            return literal
+        # Only what follows a dot is known to be a whole suffix of the host
+        if '.' not in literal[:-1]:
+            raise _Unindexable
+        return literal[literal.index('.') + 1:]
+    if token[0] == 'char':
+        return ('host', literal + token[1], only_literals)
+    if token[1]:
+        raise _Unindexable
+    return ('host', '', False)
+
+
+class _HostKeyFinder:
+    """Follow the alternatives of a parsed regex until the end of the host that each of them matches"""
+
+    def __init__(self):
+        self.keys = set()
+
+    def _add(self, alternatives, *tokens):
+        result = set()
+        for state in alternatives:
+            for token in tokens:
+                state = _advance(state, token)
+                if isinstance(state, str):
+                    self.keys.add(state)
+                    break
+            else:
+                result.add(state)
+        if len(result) > _MAX_ALTERNATIVES:
+            raise _Unindexable
+        return result
+
+    def expand(self, items, alternatives):
+        for op, av in items:
+            if not alternatives:
+                break
+            alternatives = self._step(op, av, alternatives)
+        return alternatives
+
+    def _step(self, op, av, alternatives):
+        if op is sre_constants.LITERAL:
+            return self._add(alternatives, *(('char', c) for c in chr(av).casefold()))
+        elif op in (sre_constants.NOT_LITERAL, sre_constants.ANY, sre_constants.IN):
+            return self._add(alternatives, _char_token(op, av))
+        elif op is sre_constants.AT:
+            if av in (sre_constants.AT_END, sre_constants.AT_END_STRING):
+                return self._add(alternatives, _END)
+            return alternatives
+        elif op in _ZERO_WIDTH:
+            return alternatives
+        elif op is sre_constants.SUBPATTERN:
+            return self.expand(av[-1], alternatives)
+        elif op is getattr(sre_constants, 'ATOMIC_GROUP', None):
+            return self.expand(av, alternatives)
+        elif op is sre_constants.BRANCH:
+            return set().union(*(self.expand(branch, alternatives) for branch in av[1]))
+        elif op in _REPEATS:
+            min_count, max_count, item = av
+            if max_count == 0:
+                return alternatives
+            result = set(alternatives) if min_count == 0 else set()
+            if min_count <= 1 and max_count == 1:
+                return result | self.expand(item, alternatives)
+            # A variable number of repetitions, e.g. [^/]+ or (?:[\w-]+\.)*
+            return result | self._add(alternatives, ('set', _can_match(item, '/'), False))
+        raise _Unindexable
+
+
+def valid_url_host_keys(valid_url):
+    """
+    @returns The set of host keys of the URLs that the regex can match
+    @raises _Unindexable if they can't be determined, e.g. if it can match any host
+    """
+    finder = _HostKeyFinder()
+    alternatives = finder.expand(sre_parse.parse(valid_url), {_SCHEME})
+    if alternatives:
+        # Some alternatives end before the end of their host
+        raise _Unindexable
+    return {key.casefold() for key in finder.keys}
+
+
+@functools.cache
+def extractor_host_keys(ie):
+    """@returns The frozenset of host keys of the extractor class, or None if it can't be indexed"""
+    if ie.__module__.endswith('.lazy_extractors'):
+        try:
+            from .lazy_extractors import _URL_HOST_KEYS
+        except ImportError:
+            return None
+        keys = _URL_HOST_KEYS.get(ie.__name__)
+        return None if keys is None else frozenset(keys)
+
+    if (ie.suitable.__func__ is not InfoExtractor.suitable.__func__
+            or ie._match_valid_url.__func__ is not InfoExtractor._match_valid_url.__func__):
+        return None
+    if ie._VALID_URL is False:
+        return frozenset()
+    try:
+        return frozenset(itertools.chain.from_iterable(map(valid_url_host_keys, variadic(ie._VALID_URL))))
+    except (_Unindexable, re.error, TypeError):
+        return None
+
+
+def url_host_keys(url):
+    """@returns The host keys that the extractors suitable for the URL can be indexed under"""
+    start = url.find('/')
+    if start == -1 or url[start + 1:start + 2] != '/':
+        return set()
+    end = url.find('/', start + 2)
+    authority = url[start + 2:end if end != -1 else None].casefold()
+    keys = set()
+    for host in {authority, *(authority[:i] for i, c in enumerate(authority) if c in _HOST_TERMINATORS)}:
+        keys.add(host)
+        keys.update(host[i + 1:] for i, c in enumerate(host) if c == '.')
+    return keys
+
+
+class ExtractorHostIndex:
+    """
+    Extractors indexed by the hosts of the URLs they are suitable for
+
+    @param ies: {ie_key: extractor class or instance}, in order of preference
+    """
+
+    def __init__(self, ies):
+        self._ie_keys = list(ies)
+        self._by_host = {}
+        self._unindexed = []
+        for position, ie in enumerate(ies.values()):
+            keys = extractor_host_keys(ie if isinstance(ie, type) else type(ie))
+            if keys is None:
+                self._unindexed.append(position)
+            for key in keys or ():
+                self._by_host.setdefault(key, []).append(position)
+
+    def candidates(self, url):
+        """Yield the keys of the extractors that may be suitable for the URL, in order of preference"""
+        positions = [self._by_host[key] for key in url_host_keys(url) if key in self._by_host]
+        last = None
+        for position in heapq.merge(self._unindexed, *positions):
+            if position != last:
+                last = position
+                yield self._ie_keys[position]
@@ -109,6 +109,7 @@
 )
 from ..utils._utils import _request_dump_filename
 from ..utils.jslib import devalue
+from ..webview import WebviewWorkerError
 
 
 class InfoExtractor:
@@ -586,6 +587,9 @@ class InfoExtractor:
 
     The _WORKING attribute should be set to False for broken IEs
     in order to warn the users and skip the tests.
+
+    The _MAX_CONCURRENT_EXTRACTIONS attribute limits the number of URLs of the IE
+    that are extracted at the same time with --concurrent-extractions.
     """
 
     _ready = False
@@ -596,6 +600,7 @@ class InfoExtractor:
     _GEO_IP_BLOCKS = None
     _WORKING = True
     _ENABLED = True
+    _MAX_CONCURRENT_EXTRACTIONS = None
     _NETRC_MACHINE = None
     IE_DESC = None
     SEARCH_KEY = None
@@ -904,6 +909,10 @@ def _request_webpage(self, url_or_request, video_id, note=None, errnote=None, fa
         if timeout:
             extensions['timeout'] = timeout
 
+        if self.get_param('http_cache'):
+            ttls = self.get_param('http_cache_ttl') or {}
+            extensions.setdefault('http_cache', ttls.get(self.ie_key().lower(), ttls.get('default')))
+
         available_target, requested_targets = self._downloader._parse_impersonate_targets(impersonate)
         if available_target:
             extensions['impersonate'] = available_target
@@ -4248,9 +4257,11 @@ def __get_playable_info_by_webview(self, web_url, out_error={}):
             return (False, None)
         if not webview_location.startswith('http'):
             args = self._webview_params_to_run_args(web_url, 'webview_params')
-            process = subprocess.run([webview_location, *args],
-                                     stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, encoding='utf-8', errors='replace')
-            input_text = process.stdout
+            try:
+                input_text = self._run_webview(webview_location, args)
+            except WebviewWorkerError as e:
+                self.report_warning(f'[webview] {e}')
+                return (True, None)
             for line in input_text.splitlines():
                 line = line.strip()
                 if not line:
@@ -4299,7 +4310,15 @@ def _correct_title_by_webview(self, title):
             return title
         return title
 
-    def _smart_call_cmd(self, cmd_location, cmd_params=None, input_params=None, main_para_name=None, main_para=None, result_is_obj=True):
+    def _run_webview(self, webview_location, args, timeout=None):
+        """Run the webview with the given arguments and return what it printed"""
+        pool = self._downloader._get_webview_pool(webview_location)
+        if pool:
+            return pool.request(args, timeout=timeout)
+        return subprocess.run([webview_location, *args],
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, encoding='utf-8', errors='replace', timeout=timeout).stdout
+
+    def _smart_call_cmd(self, cmd_location, cmd_params=None, input_params=None, main_para_name=None, main_para=None, result_is_obj=True, is_webview=False):
         try:
             if not cmd_location:
                 return (False, None)
@@ -4331,9 +4350,11 @@ def _smart_call_cmd(self, cmd_location, cmd_params=None, input_params=None, main
                 if main_para and not put_main_para:
                     args.append(main_para)
 
-                process = subprocess.run([cmd_location, *args],
-                                         stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, encoding='utf-8', errors='replace')
-                input_text = process.stdout
+                if is_webview:
+                    input_text = self._run_webview(cmd_location, args)
+                else:
+                    input_text = subprocess.run([cmd_location, *args],
+                                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, encoding='utf-8', errors='replace').stdout
                 if not result_is_obj:
                     return (True, input_text)
 
@@ -4501,8 +4522,7 @@ def _temp_file_name():
 
                 temp_name = _temp_file_name()
                 args = [arg.replace('{file}', temp_name) for arg in args]
-                subprocess.run([webview_location, *args],
-                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, encoding='utf-8', errors='replace', timeout=wvtimeout)
+                self._run_webview(webview_location, args, timeout=wvtimeout)
             else:
                 temp_name = _temp_file_name()
                 self._no_proxy_download_large_timeout(webview_location, data=json.dumps({'url': web_url, 'dump_html': temp_name}).encode())
@@ -29,10 +29,11 @@
 from .jsc._builtin.ejs import _EJS_WIKI_URL
 from .jsc._director import initialize_jsc_director
 from .jsc.provider import JsChallengeRequest, JsChallengeType, NChallengeInput, SigChallengeInput
+from .pot._builtin.webpo_cachespec import WebPoPCSP
 from .pot._director import initialize_pot_director
 from .pot.provider import PoTokenContext, PoTokenRequest
 from ...networking import HEADRequest
-from ...potoken import gen_po_token_run_params
+from ...potoken import gen_po_token_run_params, get_po_token_pool
 from ...third_api import YoutubeThirdIE
 from ...utils import (
     NO_DEFAULT,
@@ -1944,6 +1945,7 @@ def _real_initialize(self):
         super()._real_initialize()
         self._pot_director = initialize_pot_director(self)
         self._jsc_director = initialize_jsc_director(self)
+        self._prewarm_potoken_pools()
 
     def _prepare_live_from_start_formats(self, formats, video_id, live_start_time, url, webpage_url, smuggled_data, is_live):
         lock = threading.Lock()
@@ -4641,42 +4643,74 @@ def set_audio_lang_from_orig_subs_lang(lang_code):
 
         return info
 
-    def _load_potoken_from_run_js_in_webview(self):
-        try:
-            potoken_webview_location = self._configuration_arg('potoken_webview_location', ie_key='youtube', casesense=True)
-            if not potoken_webview_location:
-                return False
+    def _mint_potoken_by_webview(self, potoken_webview_location, potoken_webview_params):
+        download_webpage_func = lambda url, **kwargs: self._download_webpage(url, 'gen potoken params', **kwargs)
+        input_params = gen_po_token_run_params(download_webpage_func)
+        if not input_params:
+            return None
+        ok, result = self._smart_call_cmd(cmd_location=potoken_webview_location, cmd_params=potoken_webview_params, input_params=input_params, main_para_name='js_file', is_webview=True)
+        if not ok or not result.get('poToken') or not result.get('visitorData'):
+            return None
+        return result['poToken'], result['visitorData']
+
+    def _mint_potoken_by_cmd(self, potoken_cmd_location, potoken_cmd_params):
+        ok, result = self._smart_call_cmd(cmd_location=potoken_cmd_location, cmd_params=potoken_cmd_params)
+        if not ok or not result.get('poToken') or not result.get('visitorData'):
+            return None
+        return result['poToken'], result['visitorData']
+
+    def _get_potoken_minters(self):
+        """@returns [(pool key, function minting a (potoken, visitor_data))] in order of preference"""
+        minters = []
+        potoken_cmd_location = self._configuration_arg('potoken_cmd_location', ie_key='youtube', casesense=True)
+        if potoken_cmd_location:
+            potoken_cmd_params = self._configuration_arg('potoken_cmd_params', ie_key='youtube', casesense=True)
+            minters.append((('cmd', *potoken_cmd_location, *potoken_cmd_params), functools.partial(
+                self._mint_potoken_by_cmd, potoken_cmd_location, potoken_cmd_params)))
+        potoken_webview_location = self._configuration_arg('potoken_webview_location', ie_key='youtube', casesense=True)
+        if potoken_webview_location:
             potoken_webview_params = self._configuration_arg('potoken_webview_params', ie_key='youtube', casesense=True)
+            minters.append((('webview', *potoken_webview_location, *potoken_webview_params), functools.partial(
+                self._mint_potoken_by_webview, potoken_webview_location, potoken_webview_params)))
+        return minters
 
-            download_webpage_func = lambda url, **kwargs: self._download_webpage(url, 'gen potoken params', **kwargs)
-            input_params = gen_po_token_run_params(download_webpage_func)
-            if not input_params:
-                return False
-            ok, result = self._smart_call_cmd(cmd_location=potoken_webview_location, cmd_params=potoken_webview_params, input_params=input_params, main_para_name='js_file')
-            if not ok:
-                return False
-            potoken = result.get('poToken')
-            visitor_data = result.get('visitorData')
-            if not potoken or not visitor_data:
-                return False
-            return self._set_potoken_to_config(potoken, visitor_data)
+    def _get_potoken_pool(self, key, mint):
+        pool_size = int_or_none(self._configuration_arg('potoken_pool_size', [None], ie_key='youtube')[0])
+        if not pool_size:
+            return None
+        return get_po_token_pool(key, mint, pool_size, WebPoPCSP.DEFAULT_TTL)
+
+    def _prewarm_potoken_pools(self):
+        for key, mint in self._get_potoken_minters():
+            pool = self._get_potoken_pool(key, mint)
+            if pool:
+                pool.refill()
+
+    def _mint_potoken(self, kind):
+        for key, mint in self._get_potoken_minters():
+            if key[0] != kind:
+                continue
+            pool = self._get_potoken_pool(key, mint)
+            if not pool:
+                return mint()
+            token = pool.get()
+            stats = pool.stats()
+            self.write_debug(
+                f'PO token pool ({kind}): {stats["hits"]} hits, {stats["misses"]} misses, {stats["ready"]} ready'
+                + format_field(stats, 'mint_time', ', %.2fs per mint'))
+            return token
+
+    def _load_potoken_from_run_js_in_webview(self):
+        try:
+            token = self._mint_potoken('webview')
+            return bool(token) and self._set_potoken_to_config(*token)
         except Exception:
             return False
 
     def _load_potoen_from_cmd(self):
         try:
-            potoken_cmd_location = self._configuration_arg('potoken_cmd_location', ie_key='youtube', casesense=True)
-            if not potoken_cmd_location:
-                return False
-            potoken_cmd_params = self._configuration_arg('potoken_cmd_params', ie_key='youtube', casesense=True)
-            ok, result = self._smart_call_cmd(cmd_location=potoken_cmd_location, cmd_params=potoken_cmd_params)
-            if not ok:
-                return False
-            potoken = result.get('poToken')
-            visitor_data = result.get('visitorData')
-            if not potoken or not visitor_data:
-                return False
-            return self._set_potoken_to_config(potoken, visitor_data)
+            token = self._mint_potoken('cmd')
+            return bool(token) and self._set_potoken_to_config(*token)
         except Exception:
             return False
 
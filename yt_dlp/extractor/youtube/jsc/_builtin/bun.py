@@ -47,6 +47,7 @@ class BunJCP(EJSBaseJCP, BuiltinIEContentProvider):
     SUPPORTED_PROXY_SCHEMES = ['http', 'https']
     _BUN_MAX_SUPPORTED_VERSION = (1, 3, 14)
     _BUN_DEPRECATION_URL = 'https://github.com/yt-dlp/yt-dlp/issues/16766'
+    _WORKER_IO = 'node'
 
     def _iter_script_sources(self):
         yield from super()._iter_script_sources()
@@ -113,7 +114,8 @@ def _get_env_options(self) -> dict[str, str]:
 
         return options
 
-    def _run_js_runtime(self, stdin: str, /) -> str:
+    def _check_version(self) -> bool:
+        """@returns whether the version of bun is unsupported"""
         is_unsupported_version = self.runtime_info.version_tuple > self._BUN_MAX_SUPPORTED_VERSION
         if is_unsupported_version:
             self.logger.warning(
@@ -126,7 +128,9 @@ def _run_js_runtime(self, stdin: str, /) -> str:
             self.logger.info(
                 f'bun support has been deprecated. See  {self._BUN_DEPRECATION_URL}  for details',
                 once=True)
+        return is_unsupported_version
 
+    def _bun_options(self) -> list[str]:
         # https://bun.com/docs/cli/run
         options = ['--no-addons', '--prefer-offline']
         if self._lib_script.variant == ScriptVariant.BUN_NPM:
@@ -134,7 +138,15 @@ def _run_js_runtime(self, stdin: str, /) -> str:
             options.append('--install=fallback')
         else:
             options.append('--no-install')
-        cmd = [self.runtime_info.path, '--bun', 'run', *options, '-']
+        return options
+
+    def _worker_command(self, program_path: str, /) -> list[str]:
+        self._check_version()
+        return [self.runtime_info.path, '--bun', 'run', *self._bun_options(), program_path]
+
+    def _run_js_runtime(self, stdin: str, /) -> str:
+        is_unsupported_version = self._check_version()
+        cmd = [self.runtime_info.path, '--bun', 'run', *self._bun_options(), '-']
         self.logger.debug(f'Running bun: {shlex.join(cmd)}')
 
         with Popen(
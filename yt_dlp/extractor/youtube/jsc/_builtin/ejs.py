@@ -9,6 +9,7 @@
 
 from yt_dlp.dependencies import yt_dlp_ejs as _has_ejs
 from yt_dlp.extractor.youtube.jsc._builtin import vendor
+from yt_dlp.extractor.youtube.jsc._builtin.worker import JsRuntimeWorker, JsRuntimeWorkerError, worker_program
 from yt_dlp.extractor.youtube.jsc.provider import (
     JsChallengeProvider,
     JsChallengeProviderError,
@@ -106,6 +107,10 @@ class EJSBaseJCP(JsChallengeProvider):
     # currently disabled as files are large and we do not support rotation
     _ENABLE_PREPROCESSED_PLAYER_CACHE = False
 
+    # The kind of program the runtime runs as a persistent worker (see worker_program), if it can
+    _WORKER_IO: str | None = None
+    _WORKER_IDLE_TIMEOUT = 120
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._available = True
@@ -145,35 +150,36 @@ def _run_js_runtime(self, stdin: str, /) -> str:
         """To be implemented by subclasses"""
         raise NotImplementedError
 
+    def _worker_command(self, program_path: str, /) -> list[str]:
+        """To be implemented by subclasses that set _WORKER_IO"""
+        raise NotImplementedError
+
+    def _get_env_options(self) -> dict[str, str] | None:
+        return None
+
+    @functools.cached_property
+    def _worker(self, /) -> JsRuntimeWorker | None:
+        if not self._WORKER_IO or self.ejs_setting('worker', ['true'])[0] == 'false':
+            return None
+        return JsRuntimeWorker(
+            self.JS_RUNTIME_NAME, worker_program(self._WORKER_IO, self._solver_code()), self._worker_command,
+            self.logger, env=self._get_env_options(), idle_timeout=self._WORKER_IDLE_TIMEOUT)
+
     def _real_bulk_solve(self, /, requests: list[JsChallengeRequest]):
         grouped: dict[str, list[JsChallengeRequest]] = collections.defaultdict(list)
         for request in requests:
             grouped[request.input.player_url].append(request)
 
         for player_url, grouped_requests in grouped.items():
-            player = None
-            if self._ENABLE_PREPROCESSED_PLAYER_CACHE:
-                player = self.ie.cache.load(self._CACHE_SECTION, f'player:{player_url}')
-
-            if player:
-                cached = True
-            else:
-                cached = False
-                video_id = next((request.video_id for request in grouped_requests), None)
-                player = self._get_player(video_id, player_url)
-
-            # NB: This output belongs after the player request
-            self.logger.info(f'Solving JS challenges using {self.JS_RUNTIME_NAME}')
-
-            stdin = self._construct_stdin(player, cached, grouped_requests)
-            stdout = self._run_js_runtime(stdin)
-            output = json.loads(stdout)
+            video_id = next((request.video_id for request in grouped_requests), None)
+            output = None
+            if self._worker:
+                output = self._solve_with_worker(video_id, player_url, grouped_requests)
+            if output is None:
+                output = self._solve_with_new_process(video_id, player_url, grouped_requests)
             if output['type'] == 'error':
                 raise JsChallengeProviderError(output['error'])
 
-            if self._ENABLE_PREPROCESSED_PLAYER_CACHE and (preprocessed := output.get('preprocessed_player')):
-                self.ie.cache.store(self._CACHE_SECTION, f'player:{player_url}', preprocessed)
-
             for request, response_data in zip(grouped_requests, output['responses'], strict=True):
                 if response_data['type'] == 'error':
                     yield JsChallengeProviderResponse(request, None, response_data['error'])
@@ -182,11 +188,57 @@ def _real_bulk_solve(self, /, requests: list[JsChallengeRequest]):
                         NChallengeOutput(response_data['data']) if request.type is JsChallengeType.N
                         else SigChallengeOutput(response_data['data']))))
 
-    def _construct_stdin(self, player: str, preprocessed: bool, requests: list[JsChallengeRequest], /) -> str:
-        json_requests = [{
+    def _solve_with_worker(self, video_id, player_url, requests: list[JsChallengeRequest], /) -> dict | None:
+        player_hash = hashlib.sha256(player_url.encode()).hexdigest()
+        get_player = functools.cache(lambda: self._get_player(video_id, player_url))
+        if not self._worker.has_player(player_hash):
+            get_player()
+
+        # NB: This output belongs after the player request
+        self.logger.info(f'Solving JS challenges using {self.JS_RUNTIME_NAME}')
+
+        try:
+            return self._worker.solve(player_hash, self._json_requests(requests), get_player)
+        except JsRuntimeWorkerError as e:
+            self.logger.warning(f'{e}. Falling back to running {self.JS_RUNTIME_NAME} for each player')
+            self._worker.close()
+            self._worker = None
+            return None
+
+    def _solve_with_new_process(self, video_id, player_url, requests: list[JsChallengeRequest], /) -> dict:
+        player = None
+        if self._ENABLE_PREPROCESSED_PLAYER_CACHE:
+            player = self.ie.cache.load(self._CACHE_SECTION, f'player:{player_url}')
+
+        if player:
+            cached = True
+        else:
+            cached = False
+            player = self._get_player(video_id, player_url)
+
+        # NB: This output belongs after the player request
+        self.logger.info(f'Solving JS challenges using {self.JS_RUNTIME_NAME}')
+
+        stdin = self._construct_stdin(player, cached, requests)
+        stdout = self._run_js_runtime(stdin)
+        output = json.loads(stdout)
+
+        if self._ENABLE_PREPROCESSED_PLAYER_CACHE and (preprocessed := output.get('preprocessed_player')):
+            self.ie.cache.store(self._CACHE_SECTION, f'player:{player_url}', preprocessed)
+        return output
+
+    @staticmethod
+    def _json_requests(requests: list[JsChallengeRequest], /) -> list[dict]:
+        return [{
             'type': request.type.value,
             'challenges': request.input.challenges,
         } for request in requests]
+
+    def _solver_code(self, /) -> str:
+        return f'{self._lib_script.code}\nObject.assign(globalThis, lib);\n{self._core_script.code}'
+
+    def _construct_stdin(self, player: str, preprocessed: bool, requests: list[JsChallengeRequest], /) -> str:
+        json_requests = self._json_requests(requests)
         data = {
             'type': 'preprocessed',
             'preprocessed_player': player,
@@ -318,6 +370,11 @@ def is_available(self, /) -> bool:
             return False
         return self._available
 
+    def close(self):
+        if worker := self.__dict__.get('_worker'):
+            worker.close()
+        super().close()
+
     def _skip_component(self, component: str, /):
         return _SkippedComponent(component, self.JS_RUNTIME_NAME)
 
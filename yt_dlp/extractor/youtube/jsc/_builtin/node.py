@@ -22,8 +22,9 @@ class NodeJCP(EJSBaseJCP, BuiltinIEContentProvider):
     JS_RUNTIME_NAME = 'node'
 
     _ARGS = ['-']
+    _WORKER_IO = 'node'
 
-    def _run_js_runtime(self, stdin: str, /) -> str:
+    def _node_args(self) -> list[str]:
         args = []
 
         if self.ejs_setting('jitless', ['false']) != ['false']:
@@ -35,8 +36,13 @@ def _run_js_runtime(self, stdin: str, /) -> str:
             args.append('--no-warnings=ExperimentalWarning')
         else:
             args.append('--permission')
+        return args
+
+    def _worker_command(self, program_path: str, /) -> list[str]:
+        return [self.runtime_info.path, *self._node_args(), f'--allow-fs-read={program_path}', program_path]
 
-        cmd = [self.runtime_info.path, *args, *self._ARGS]
+    def _run_js_runtime(self, stdin: str, /) -> str:
+        cmd = [self.runtime_info.path, *self._node_args(), *self._ARGS]
         self.logger.debug(f'Running node: {shlex.join(cmd)}')
         with Popen(
             cmd,
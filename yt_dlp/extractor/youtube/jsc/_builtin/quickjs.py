@@ -28,14 +28,23 @@ class QuickJSJCP(EJSBaseJCP, BuiltinIEContentProvider):
     _QJS_WARNING_TMPL = (
         '{name} versions older than {version} are missing important optimizations '
         'and will solve the JS challenges very slowly. Consider upgrading.')
+    _WORKER_IO = 'quickjs'
 
-    def _run_js_runtime(self, stdin: str, /) -> str:
+    def _check_version(self):
         min_recommended_version = self._QJS_MIN_RECOMMENDED[self.runtime_info.name]
         if self.runtime_info.version_tuple < min_recommended_version:
             self.logger.warning(self._QJS_WARNING_TMPL.format(
                 name=self.runtime_info.name,
                 version='.'.join(map(str, min_recommended_version))))
 
+    def _worker_command(self, program_path: str, /) -> list[str]:
+        self._check_version()
+        # --std provides the std module, which the worker uses to read stdin
+        return [self.runtime_info.path, '--std', '--script', program_path]
+
+    def _run_js_runtime(self, stdin: str, /) -> str:
+        self._check_version()
+
         # QuickJS does not support reading from stdin, so we have to use a temp file
         temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False, encoding='utf-8')
         try:
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import collections
+import contextlib
+import itertools
+import json
+import os
+import shlex
+import subprocess
+import tempfile
+import threading
+import time
+
+from yt_dlp.utils import Popen
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from yt_dlp.extractor.youtube.pot._provider import IEContentProviderLogger
+
+
+class JsRuntimeWorkerError(Exception):
+    pass
+
+
+# Answers the requests read by the runtime specific code in _WORKER_IO
+_WORKER_HANDLER = '''\
+const players = new Map();
+function handle(message) {
+  const { id, player_hash: hash, player, evict = [], requests } = message;
+  for (const key of evict) {
+    players.delete(key);
+  }
+  try {
+    let output;
+    if (player !== undefined) {
+      output = jsc({ type: 'player', player, requests, output_preprocessed: true });
+      if (output.type === 'result') {
+        players.set(hash, output.preprocessed_player);
+      }
+      delete output.preprocessed_player;
+    } else if (players.has(hash)) {
+      output = jsc({ type: 'preprocessed', preprocessed_player: players.get(hash), requests });
+    } else {
+      output = { type: 'missing' };
+    }
+    return { ...output, id };
+  } catch (error) {
+    return {
+      id,
+      type: 'error',
+      error: error instanceof Error ? `${error.message}\\n${error.stack}` : `${error}`,
+    };
+  }
+}
+function handleLine(line) {
+  if (line.trim()) {
+    write(JSON.stringify(handle(JSON.parse(line))));
+  }
+}
+'''
+
+_WORKER_IO = {
+    'node': '''\
+const write = (line) => process.stdout.write(`${line}\\n`);
+let buffer = '';
+process.stdin.setEncoding('utf8');
+process.stdin.on('data', (chunk) => {
+  let start = 0;
+  let end;
+  while ((end = chunk.indexOf('\\n', start)) !== -1) {
+    handleLine(buffer + chunk.slice(start, end));
+    buffer = '';
+    start = end + 1;
+  }
+  buffer += chunk.slice(start);
+});
+process.stdin.on('end', () => process.exit(0));
+''',
+    'deno': '''\
+const encoder = new TextEncoder();
+const write = (line) => {
+  const data = encoder.encode(`${line}\\n`);
+  for (let written = 0; written < data.length;) {
+    written += Deno.stdout.writeSync(data.subarray(written));
+  }
+};
+''',
+    'quickjs': '''\
+const write = (line) => {
+  std.out.puts(`${line}\\n`);
+  std.out.flush();
+};
+''',
+}
+
+# Deno and QuickJS read stdin synchronously, so they can only do it after announcing they are ready
+_WORKER_LOOP = {
+    'deno': '''\
+const decoder = new TextDecoder();
+let buffer = '';
+for await (const chunk of Deno.stdin.readable) {
+  buffer += decoder.decode(chunk, { stream: true });
+  let end;
+  while ((end = buffer.indexOf('\\n')) !== -1) {
+    handleLine(buffer.slice(0, end));
+    buffer = buffer.slice(end + 1);
+  }
+}
+''',
+    'quickjs': '''\
+for (let line; (line = std.in.getline()) !== null;) {
+  handleLine(line);
+}
+''',
+}
+
+
+def worker_program(io: str, solver: str) -> str:
+    """
+    @param io       The kind of runtime the program is for: "node" (also used for bun), "deno" or "quickjs"
+    @param solver   The code of the challenge solver, which must define jsc
+    @returns        The code of the worker program
+    """
+    return '\n'.join((
+        solver,
+        _WORKER_HANDLER,
+        _WORKER_IO[io],
+        "write(JSON.stringify({ type: 'ready' }));",
+        _WORKER_LOOP.get(io, ''),
+    ))
+
+
+class JsRuntimeWorker:
+    """
+    A long-lived JS runtime process solving JS challenges over stdin/stdout
+
+    The process runs a program made by worker_program, which loads the challenge solver once
+    and keeps the preprocessed players it has been sent. The protocol is line-delimited JSON:
+    a request {"id": ID, "player_hash": HASH, "requests": [...]} also contains the code of the
+    player as "player" if the worker does not hold it yet, and the hashes of the players to
+    forget as "evict". It is answered by the output of the solver with the same "id", or by
+    {"id": ID, "type": "missing"} if the worker does not hold the player.
+    The process writes {"type": "ready"} once it has started and exits when its stdin is closed.
+
+    The process is started on demand with the command returned by make_cmd(program file),
+    stopped after it has been idle for `idle_timeout` seconds and restarted if it crashes
+    """
+
+    MAX_PLAYERS = 8
+    _MAX_ATTEMPTS = 2
+    _STDERR_LINES = 20
+
+    def __init__(
+        self, name: str, program: str, make_cmd: Callable[[str], list[str]], logger: IEContentProviderLogger,
+        env: dict[str, str] | None = None, idle_timeout: float = 120,
+    ):
+        self.name = name
+        self.program = program
+        self.make_cmd = make_cmd
+        self.logger = logger
+        self.env = env
+        self.idle_timeout = idle_timeout
+        self.starts = self.players_loaded = self.solves = 0
+        self.last_active = time.monotonic()
+        self._players = collections.OrderedDict()  # hashes of the players held by the process
+        self._proc = None
+        self._stderr_reader = None
+        self._stderr = collections.deque(maxlen=self._STDERR_LINES)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._idle_timer = None
+
+    @property
+    def alive(self):
+        return self._proc is not None and self._proc.poll() is None
+
+    def has_player(self, player_hash: str) -> bool:
+        return self.alive and player_hash in self._players
+
+    def _read_stderr(self, proc):
+        with proc.stderr:
+            for line in proc.stderr:
+                self._stderr.append(line.rstrip('\n'))
+
+    def _error(self, message):
+        returncode = self._proc.poll() if self._proc else None
+        if returncode is not None:
+            message = f'{message} (returncode: {returncode})'
+            # Let it read what the process printed before exiting
+            self._stderr_reader.join(1)
+        stderr = '\n'.join(self._stderr).strip()
+        return JsRuntimeWorkerError(f'{message}: {stderr}' if stderr else message)
+
+    def _start(self):
+        # The program is only read when the runtime starts, so the file can be removed right away
+        with tempfile.NamedTemporaryFile(
+                mode='w', prefix='yt-dlp-jsc-', suffix='.js', delete=False, encoding='utf-8') as program_file:
+            program_file.write(self.program)
+        try:
+            cmd = self.make_cmd(program_file.name)
+            self.logger.debug(f'Starting {self.name} worker: {shlex.join(cmd)}')
+            self._stderr.clear()
+            self._players.clear()
+            self.starts += 1
+            try:
+                self._proc = Popen(
+                    cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                    text=True, env=self.env)
+            except OSError as e:
+                raise JsRuntimeWorkerError(f'Unable to start {self.name} worker: {e}')
+            self._stderr_reader = threading.Thread(target=self._read_stderr, args=(self._proc,), daemon=True)
+            self._stderr_reader.start()
+            if self._read_message().get('type') != 'ready':
+                raise self._error(f'{self.name} worker did not start')
+        finally:
+            with contextlib.suppress(OSError):
+                os.remove(program_file.name)
+
+    def _read_message(self):
+        line = self._proc.stdout.readline()
+        if not line:
+            self._proc.wait()
+            raise self._error(f'{self.name} worker exited unexpectedly')
+        try:
+            return json.loads(line)
+        except json.JSONDecodeError:
+            raise self._error(f'Invalid output from {self.name} worker: {line.strip()[:100]!r}')
+
+    def _request(self, message):
+        request_id = next(self._ids)
+        try:
+            self._proc.stdin.write(json.dumps({'id': request_id, **message}) + '\n')
+            self._proc.stdin.flush()
+        except (OSError, ValueError) as e:
+            raise self._error(f'Unable to send request to {self.name} worker: {e}')
+        output = self._read_message()
+        if output.get('id') != request_id:
+            raise self._error(f'Unexpected response from {self.name} worker')
+        return output
+
+    def _solve(self, player_hash, requests, get_player):
+        if not self.alive:
+            self._stop()
+            self._start()
+
+        message = {'player_hash': player_hash, 'requests': requests}
+        if player_hash in self._players:
+            self._players.move_to_end(player_hash)
+            output = self._request(message)
+            if output['type'] != 'missing':
+                return output
+            del self._players[player_hash]
+
+        player = get_player()
+        evict = []
+        while len(self._players) >= self.MAX_PLAYERS:
+            evict.append(self._players.popitem(last=False)[0])
+        output = self._request({**message, 'player': player, 'evict': evict})
+        self.players_loaded += 1
+        if output['type'] == 'result':
+            self._players[player_hash] = True
+        return output
+
+    def solve(self, player_hash: str, requests: list[dict], get_player: Callable[[], str]) -> dict:
+        """
+        @param player_hash  Identifies the player the challenges are from
+        @param requests     The requests of the solver input
+        @param get_player   Returns the code of the player; only called if the worker does not hold it
+        @returns            The solver output
+        """
+        with self._lock:
+            self._cancel_idle_timer()
+            try:
+                for attempt in range(1, self._MAX_ATTEMPTS + 1):
+                    try:
+                        output = self._solve(player_hash, requests, get_player)
+                    except JsRuntimeWorkerError as e:
+                        self._stop()
+                        if attempt == self._MAX_ATTEMPTS:
+                            raise
+                        self.logger.debug(f'{e}; restarting it')
+                    else:
+                        self.solves += 1
+                        return output
+            finally:
+                self.last_active = time.monotonic()
+                if self._proc:
+                    self._schedule_idle_timer()
+
+    def _schedule_idle_timer(self):
+        self._idle_timer = threading.Timer(self.idle_timeout, self._stop_if_idle)
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _cancel_idle_timer(self):
+        if self._idle_timer:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _stop_if_idle(self):
+        with self._lock:
+            if self._proc and time.monotonic() - self.last_active >= self.idle_timeout:
+                self.logger.debug(f'Stopping {self.name} worker after {self.idle_timeout}s of inactivity')
+                self._stop()
+
+    def _stop(self, timeout=5):
+        proc, self._proc = self._proc, None
+        self._players.clear()
+        if not proc:
+            return
+        with contextlib.suppress(OSError, ValueError):
+            proc.stdin.close()
+        try:
+            proc.wait(timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        with contextlib.suppress(OSError, ValueError):
+            proc.stdout.close()
+
+    def close(self):
+        with self._lock:
+            self._cancel_idle_timer()
+            self._stop()
@@ -2,6 +2,8 @@
 
 import collections
 import dataclasses
+import hashlib
+import time
 import typing
 
 from yt_dlp.extractor.youtube.jsc._builtin.ejs import _EJS_WIKI_URL
@@ -31,17 +33,113 @@
 )
 
 if typing.TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable, Iterable
 
+    from yt_dlp.cache import Cache
     from yt_dlp.extractor.youtube.jsc._builtin.ejs import _SkippedComponent
     from yt_dlp.extractor.youtube.jsc.provider import Preference as JsChallengePreference
 
 
+class JsChallengeCache:
+    """
+    Results of solved JS challenges, shared between processes through the yt-dlp cache
+
+    Each result is a separate entry keyed by the player version, the challenge type and the challenge.
+    The result of a challenge only depends on the player, so the entries are valid for as long as the
+    player is in use; they expire after `ttl` seconds so that those of old players are not kept forever
+    """
+
+    SECTION = 'youtube-jsc'
+    DEFAULT_TTL = 7 * 24 * 60 * 60
+
+    def __init__(
+        self,
+        logger: IEContentProviderLogger,
+        cache: Cache,
+        player_key: Callable[[str], str],
+        ttl: int = DEFAULT_TTL,
+    ):
+        self.logger = logger
+        self.cache = cache
+        self.player_key = player_key
+        self.ttl = ttl
+        self.hits = self.misses = self.stores = 0
+
+    def _generate_key(self, request: JsChallengeRequest, challenge: str) -> str:
+        bindings = {
+            'player': self.player_key(request.input.player_url),
+            'type': request.type.value,
+            'challenge': challenge,
+            # Allow us to invalidate caches if such need arises
+            '_dlp_cache': 'v1',
+        }
+        return hashlib.sha256(repr(dict(sorted(bindings.items()))).encode()).hexdigest()
+
+    def _load(self, request: JsChallengeRequest, challenge: str) -> str | None:
+        key = self._generate_key(request, challenge)
+        entry = self.cache.load(self.SECTION, key)
+        if not entry:
+            return None
+        if not isinstance(entry, dict) or entry.get('challenge') != challenge:
+            self.logger.trace(f'Ignoring invalid cached JS challenge result: {entry!r}')
+            return None
+        if not isinstance(entry.get('expires_at'), (int, float)) or entry['expires_at'] < time.time():
+            self.logger.trace(f'Ignoring expired cached {request.type.value} challenge result for {challenge!r}')
+            return None
+        result = entry.get('result')
+        single_request = dataclasses.replace(
+            request, input=dataclasses.replace(request.input, challenges=[challenge]))
+        if (vr_msg := validate_response(make_response(request.type, {challenge: result}), single_request)) is not True:
+            self.logger.warning(f'Invalid JS challenge result retrieved from cache: {vr_msg or ""}; discarding it')
+            self.cache.store(self.SECTION, key, None)
+            return None
+        return result
+
+    def get(self, request: JsChallengeRequest) -> dict[str, str]:
+        """@returns {challenge: result} for the challenges of the request that are cached"""
+        if not self.cache.enabled:
+            return {}
+        results = {}
+        for challenge in request.input.challenges:
+            result = self._load(request, challenge)
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                results[challenge] = result
+        if results:
+            self.logger.trace(
+                f'Retrieved {len(results)} of {len(request.input.challenges)} {request.type.value} challenge results from cache')
+        return results
+
+    def store(self, request: JsChallengeRequest, response: JsChallengeResponse):
+        if not self.cache.enabled:
+            return
+        expires_at = int(time.time()) + self.ttl
+        for challenge, result in response.output.results.items():
+            self.cache.store(self.SECTION, self._generate_key(request, challenge), {
+                'challenge': challenge,
+                'result': result,
+                'expires_at': expires_at,
+            })
+            self.stores += 1
+
+    def stats(self) -> dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'stores': self.stores}
+
+    def close(self):
+        if lookups := self.hits + self.misses:
+            self.logger.debug(
+                f'Solved JS challenge cache: {self.hits} hits, {self.misses} misses '
+                f'({self.hits / lookups:.0%} hit rate), {self.stores} results stored')
+
+
 class JsChallengeRequestDirector:
 
-    def __init__(self, logger: IEContentProviderLogger):
+    def __init__(self, logger: IEContentProviderLogger, cache: JsChallengeCache | None = None):
         self.providers: dict[str, JsChallengeProvider] = {}
         self.preferences: list[JsChallengePreference] = []
+        self.cache = cache
         self.logger = logger
 
     def register_provider(self, provider: JsChallengeProvider):
@@ -94,6 +192,34 @@ def _handle_error(self, e: Exception, provider: JsChallengeProvider, requests: l
 
     def bulk_solve(self, requests: list[JsChallengeRequest]) -> list[tuple[JsChallengeRequest, JsChallengeResponse]]:
         """Solves multiple JS Challenges in bulk, returning a list of responses"""
+        if not self.cache:
+            return self._solve(requests)
+
+        results = []
+        # Only the challenges that are not cached are solved by the providers
+        uncached_requests = []
+        cached_results = {}
+        for request in requests:
+            cached = self.cache.get(request)
+            if len(cached) == len(request.input.challenges):
+                results.append((request, make_response(request.type, cached)))
+                continue
+            uncached_request = dataclasses.replace(request, input=dataclasses.replace(
+                request.input, challenges=[c for c in request.input.challenges if c not in cached]))
+            uncached_requests.append(uncached_request)
+            cached_results[id(uncached_request)] = request, cached
+
+        if not uncached_requests:
+            self.logger.trace(f'Retrieved all {len(requests)} requested JS Challenges from cache')
+            return results
+
+        for uncached_request, response in self._solve(uncached_requests):
+            self.cache.store(uncached_request, response)
+            request, cached = cached_results[id(uncached_request)]
+            results.append((request, make_response(request.type, {**cached, **response.output.results})))
+        return results
+
+    def _solve(self, requests: list[JsChallengeRequest]) -> list[tuple[JsChallengeRequest, JsChallengeResponse]]:
         if not self.providers:
             self.logger.trace('No JS Challenge providers registered')
             return []
@@ -126,14 +252,14 @@ def bulk_solve(self, requests: list[JsChallengeRequest]) -> list[tuple[JsChallen
                             f'         {provider_bug_report_message(provider, before="")}')
                         continue
                     try:
-                        next_requests.remove(response.request)
+                        request = next_requests.pop(next_requests.index(response.request))
                     except ValueError:
                         self.logger.warning(
                             f'JS Challenge Provider "{provider.PROVIDER_NAME}" returned a response for an unknown request:\n'
                             f'         request = {response.request}\n'
                             f'         {provider_bug_report_message(provider, before="")}')
                         continue
-                    results.append((response.request, response.response))
+                    results.append((request, response.response))
             except Exception as e:
                 if isinstance(e, JsChallengeProviderRejectedRequest) and e._skipped_components:
                     skipped_components.extend(e._skipped_components)
@@ -197,6 +323,8 @@ def join_parts(parts, joiner):
     def close(self):
         for provider in self.providers.values():
             provider.close()
+        if self.cache:
+            self.cache.close()
 
 
 EXTRACTOR_ARG_PREFIX = 'youtubejsc'
@@ -224,6 +352,11 @@ def get_provider_logger_and_settings(provider, logger_key):
 
     director = JsChallengeRequestDirector(
         logger=YoutubeIEContentProviderLogger(ie, 'jsc', log_level=log_level),
+        cache=JsChallengeCache(
+            logger=YoutubeIEContentProviderLogger(ie, 'jsc:cache', log_level=log_level),
+            cache=ie.cache,
+            player_key=ie._player_js_cache_key,
+        ),
     )
 
     ie._downloader.add_close_hook(director.close)
@@ -253,6 +386,11 @@ def validate_provider_response(response: JsChallengeProviderResponse) -> bool:
     )
 
 
+def make_response(challenge_type: JsChallengeType, results: dict[str, str]) -> JsChallengeResponse:
+    output_type = NChallengeOutput if challenge_type == JsChallengeType.N else SigChallengeOutput
+    return JsChallengeResponse(challenge_type, output_type(results))
+
+
 def validate_response(response: JsChallengeResponse, request: JsChallengeRequest) -> bool | str:
     if not isinstance(response, JsChallengeResponse):
         return 'Response is not a JsChallengeResponse'
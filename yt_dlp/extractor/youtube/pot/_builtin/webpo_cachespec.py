@@ -17,6 +17,9 @@
 @register_spec
 class WebPoPCSP(PoTokenCacheSpecProvider, BuiltinIEContentProvider):
     PROVIDER_NAME = 'webpo'
+    # Integrity token response usually states it has a ttl of 12 hours (43200 seconds).
+    # We will default to 6 hours to be safe.
+    DEFAULT_TTL = 21600
 
     def generate_cache_spec(self, request: PoTokenRequest) -> PoTokenCacheSpec | None:
         bind_to_visitor_id = self._configuration_arg(
@@ -41,8 +44,6 @@ def generate_cache_spec(self, request: PoTokenRequest) -> PoTokenCacheSpec | Non
                 'sa': request.request_source_address,
                 'px': request.request_proxy,
             },
-            # Integrity token response usually states it has a ttl of 12 hours (43200 seconds).
-            # We will default to 6 hours to be safe.
-            default_ttl=21600,
+            default_ttl=self.DEFAULT_TTL,
             write_policy=write_policy,
         )
@@ -1,5 +1,7 @@
 import collections
 import contextlib
+import functools
+import hashlib
 import itertools
 import json
 import math
@@ -270,6 +272,11 @@ def interpret_statement(self, stmt, local_vars, allow_recursion, *args, **kwargs
 
 class JSInterpreter:
     __named_object_counter = 0
+    _placeholder_counter = itertools.count(1)
+
+    # The compiled statements, expressions and extracted functions, shared by all the interpreters
+    _compiled_cache = {}
+    _COMPILED_CACHE_SIZE = 10000
 
     _RE_FLAGS = {
         # special knowledge: Python's re flags are bitmask values, current max 128
@@ -370,7 +377,8 @@ def _operator(self, op, left_val, right_expr, expr, local_vars, allow_recursion)
             if left_val not in (None, JS_Undefined):
                 return left_val
         elif op == '?':
-            right_expr = _js_ternary(left_val, *self._separate(right_expr, ':', 1))
+            right_expr = _js_ternary(left_val, *self._compiled(
+                ('ternary', right_expr), lambda: tuple(self._separate(right_expr, ':', 1))))
 
         right_val = self.interpret_expression(right_expr, local_vars, allow_recursion)
         if not _OPERATORS.get(op):
@@ -395,41 +403,117 @@ def _index(self, obj, idx, allow_undefined=False):
                 return JS_Undefined
             raise self.Exception(f'Cannot get index {idx}', repr(obj), cause=e)
 
-    def _dump(self, obj, namespace):
+    @staticmethod
+    def _copy(obj):
+        """ @returns obj as it is after a round trip through JSON """
+        if not isinstance(obj, (list, tuple, dict)):
+            return obj
         try:
-            return json.dumps(obj)
+            return json.loads(json.dumps(obj))
         except TypeError:
-            return self._named_object(namespace, obj)
+            return obj
+
+    @classmethod
+    def _placeholder(cls):
+        return f'__yt_dlp_jsinterp_tmp{next(cls._placeholder_counter)}'
+
+    @staticmethod
+    def _with_values(local_vars, values):
+        # The values are looked up last, so that assignments still go to the scopes of local_vars
+        if isinstance(local_vars, collections.ChainMap):
+            return type(local_vars)(*local_vars.maps, values)
+        return LocalNameSpace(local_vars, values)
+
+    @classmethod
+    def _compiled(cls, key, compile_func, *args):
+        compiled = cls._compiled_cache.get(key)
+        if compiled is None:
+            compiled = compile_func(*args)
+            if len(cls._compiled_cache) >= cls._COMPILED_CACHE_SIZE:
+                cls._compiled_cache.clear()
+            cls._compiled_cache[key] = compiled
+        return compiled
 
     @Debugger.wrap_interpreter
     def interpret_statement(self, stmt, local_vars, allow_recursion=100, _is_var_declaration=False):
-        if allow_recursion < 0:
-            raise self.Exception('Recursion limit reached')
-        allow_recursion -= 1
+        return self._compiled(
+            ('statement', stmt, _is_var_declaration), self._compile_statement, stmt, _is_var_declaration,
+        )(self, local_vars, allow_recursion)
 
-        should_return = False
-        sub_statements = list(self._separate(stmt, ';')) or ['']
+    @classmethod
+    def _compile_statement(cls, stmt, is_var_declaration):
+        """
+        Compile a statement into a function(interpreter, local_vars, allow_recursion) -> (ret, should_return)
+
+        The parts of the statement are only compiled once they are reached, so that code
+        which is never executed does not raise
+        """
+        should_return, is_throw = False, False
+        sub_statements = list(cls._separate(stmt, ';')) or ['']
         expr = stmt = sub_statements.pop().strip()
 
-        for sub_stmt in sub_statements:
-            ret, should_return = self.interpret_statement(sub_stmt, local_vars, allow_recursion)
-            if should_return:
-                return ret, should_return
-
         m = re.match(r'(?P<var>(?:var|const|let)\s)|return(?:\s+|(?=["\'])|$)|(?P<throw>throw\s+)', stmt)
         if m:
             expr = stmt[len(m.group(0)):].strip()
-            if m.group('throw'):
-                raise JS_Throw(self.interpret_expression(expr, local_vars, allow_recursion))
+            is_throw = bool(m.group('throw'))
             should_return = not m.group('var')
-            _is_var_declaration = _is_var_declaration or bool(m.group('var'))
-        if not expr:
-            return None, should_return
+            is_var_declaration = is_var_declaration or bool(m.group('var'))
+
+        def run(self, local_vars, allow_recursion):
+            if allow_recursion < 0:
+                raise self.Exception('Recursion limit reached')
+            allow_recursion -= 1
+
+            for sub_stmt in sub_statements:
+                ret, should_abort = self.interpret_statement(sub_stmt, local_vars, allow_recursion)
+                if should_abort:
+                    return ret, should_abort
+
+            if is_throw:
+                raise JS_Throw(self.interpret_expression(expr, local_vars, allow_recursion))
+            if not expr:
+                return None, should_return
+            return cls._compiled(
+                ('expression', expr, stmt, is_var_declaration),
+                cls._compile_expression, expr, stmt, is_var_declaration,
+            )(self, local_vars, allow_recursion, should_return)
+        return run
+
+    @classmethod
+    def _compile_expression(cls, expr, stmt, is_var_declaration):
+        """
+        Compile an expression into a function(interpreter, local_vars, allow_recursion, should_return)
+        -> (ret, should_return)
+
+        When the start of the expression is a value that has to be evaluated first, the rest of it is
+        compiled separately with a placeholder name in its place. The value of the placeholder is then
+        passed in a scope of its own, so that recursive calls can not overwrite it
+        """
+        def continuation(new_expr):
+            def run(self, local_vars, allow_recursion, should_return, values):
+                return cls._compiled(
+                    ('expression', new_expr, stmt, is_var_declaration),
+                    cls._compile_expression, new_expr, stmt, is_var_declaration,
+                )(self, self._with_values(local_vars, values), allow_recursion, should_return)
+            return run
+
+        def constant(value):
+            return lambda self, local_vars, allow_recursion, should_return: (value, should_return)
+
+        def then(rest, run_first):
+            """ Run run_first, and rest as a statement if it did not abort """
+            def run(self, local_vars, allow_recursion, should_return):
+                ret, should_abort = run_first(self, local_vars, allow_recursion)
+                if should_abort:
+                    return ret, True
+                ret, should_abort = self.interpret_statement(rest, local_vars, allow_recursion)
+                return ret, should_abort or should_return
+            return run
 
         if expr[0] in _QUOTES:
-            inner, outer = self._separate(expr, expr[0], 1)
+            inner, outer = cls._separate(expr, expr[0], 1)
             if expr[0] == '/':
-                flags, outer = self._regex_flags(outer)
+                flags, outer = cls._regex_flags(outer)
                 # We don't support regex methods yet, so no point compiling it
                 inner = f'{inner}/{flags}'
                 # Avoid https://github.com/python/cpython/issues/74534
@@ -437,58 +521,71 @@ def interpret_statement(self, stmt, local_vars, allow_recursion=100, _is_var_dec
             else:
                 inner = json.loads(js_to_json(f'{inner}{expr[0]}', strict=True))
             if not outer:
-                return inner, should_return
-            expr = self._named_object(local_vars, inner) + outer
+                return constant(inner)
+            name = cls._placeholder()
+            rest = continuation(name + outer)
+            return lambda self, local_vars, allow_recursion, should_return: rest(
+                self, local_vars, allow_recursion, should_return, {name: inner})
 
         if expr.startswith('new '):
             obj = expr[4:]
-            if obj.startswith('Date('):
-                left, right = self._separate_at_paren(obj[4:])
+            if not obj.startswith('Date('):
+                raise cls.Exception(f'Unsupported object {obj}', expr)
+            left, right = cls._separate_at_paren(obj[4:])
+            name = cls._placeholder()
+            rest = continuation(name + right)
+
+            def run_date(self, local_vars, allow_recursion, should_return):
                 date = unified_timestamp(
                     self.interpret_expression(left, local_vars, allow_recursion), False)
                 if date is None:
                     raise self.Exception(f'Failed to parse date {left!r}', expr)
-                expr = self._dump(int(date * 1000), local_vars) + right
-            else:
-                raise self.Exception(f'Unsupported object {obj}', expr)
+                return rest(self, local_vars, allow_recursion, should_return, {name: int(date * 1000)})
+            return run_date
 
         if expr.startswith('void '):
-            left = self.interpret_expression(expr[5:], local_vars, allow_recursion)
-            return None, should_return
+            operand = expr[5:]
+
+            def run_void(self, local_vars, allow_recursion, should_return):
+                self.interpret_expression(operand, local_vars, allow_recursion)
+                return None, should_return
+            return run_void
 
         if expr.startswith('{'):
-            inner, outer = self._separate_at_paren(expr)
+            inner, outer = cls._separate_at_paren(expr)
             # try for object expression (Map)
-            sub_expressions = [list(self._separate(sub_expr.strip(), ':', 1)) for sub_expr in self._separate(inner)]
+            sub_expressions = [list(cls._separate(sub_expr.strip(), ':', 1)) for sub_expr in cls._separate(inner)]
             if all(len(sub_expr) == 2 for sub_expr in sub_expressions):
-                def dict_item(key, val):
-                    val = self.interpret_expression(val, local_vars, allow_recursion)
-                    if re.match(_NAME_RE, key):
-                        return key, val
-                    return self.interpret_expression(key, local_vars, allow_recursion), val
-
-                return dict(dict_item(k, v) for k, v in sub_expressions), should_return
-
-            inner, should_abort = self.interpret_statement(inner, local_vars, allow_recursion)
-            if not outer or should_abort:
-                return inner, should_abort or should_return
-            else:
-                expr = self._dump(inner, local_vars) + outer
-
-        if expr.startswith('('):
-            inner, outer = self._separate_at_paren(expr)
-            inner, should_abort = self.interpret_statement(inner, local_vars, allow_recursion)
-            if not outer or should_abort:
-                return inner, should_abort or should_return
-            else:
-                expr = self._dump(inner, local_vars) + outer
+                def run_object(self, local_vars, allow_recursion, should_return):
+                    def dict_item(key, val):
+                        val = self.interpret_expression(val, local_vars, allow_recursion)
+                        if re.match(_NAME_RE, key):
+                            return key, val
+                        return self.interpret_expression(key, local_vars, allow_recursion), val
+
+                    return dict(dict_item(k, v) for k, v in sub_expressions), should_return
+                return run_object
+
+        if expr.startswith(('{', '(')):
+            inner, outer = cls._separate_at_paren(expr)
+            name = cls._placeholder()
+            rest = continuation(name + outer)
+
+            def run_group(self, local_vars, allow_recursion, should_return):
+                ret, should_abort = self.interpret_statement(inner, local_vars, allow_recursion)
+                if not outer or should_abort:
+                    return ret, should_abort or should_return
+                return rest(self, local_vars, allow_recursion, should_return, {name: self._copy(ret)})
+            return run_group
 
         if expr.startswith('['):
-            inner, outer = self._separate_at_paren(expr)
-            name = self._named_object(local_vars, [
-                self.interpret_expression(item, local_vars, allow_recursion)
-                for item in self._separate(inner)])
-            expr = name + outer
+            inner, outer = cls._separate_at_paren(expr)
+            items = list(cls._separate(inner))
+            name = cls._placeholder()
+            rest = continuation(name + outer)
+            return lambda self, local_vars, allow_recursion, should_return: rest(
+                self, local_vars, allow_recursion, should_return, {name: [
+                    self.interpret_expression(item, local_vars, allow_recursion) for item in items]})
 
         m = re.match(r'''(?x)
                 (?P<try>try)\s*\{|
@@ -496,122 +593,136 @@ def dict_item(key, val):
                 (?P<switch>switch)\s*\(|
                 (?P<for>for)\s*\(
                 ''', expr)
-        md = m.groupdict() if m else {}
-        if md.get('if'):
-            cndn, expr = self._separate_at_paren(expr[m.end() - 1:])
-            if_expr, expr = self._separate_at_paren(expr.lstrip())
+        if m and m.group('if'):
+            cndn, expr = cls._separate_at_paren(expr[m.end() - 1:])
+            if_expr, expr = cls._separate_at_paren(expr.lstrip())
             # TODO: "else if" is not handled
             else_expr = None
             m = re.match(r'else\s*{', expr)
             if m:
-                else_expr, expr = self._separate_at_paren(expr[m.end() - 1:])
-            cndn = _js_ternary(self.interpret_expression(cndn, local_vars, allow_recursion))
-            ret, should_abort = self.interpret_statement(
-                if_expr if cndn else else_expr, local_vars, allow_recursion)
-            if should_abort:
-                return ret, True
+                else_expr, expr = cls._separate_at_paren(expr[m.end() - 1:])
 
-        if md.get('try'):
-            try_expr, expr = self._separate_at_paren(expr[m.end() - 1:])
-            err = None
-            try:
-                ret, should_abort = self.interpret_statement(try_expr, local_vars, allow_recursion)
-                if should_abort:
-                    return ret, True
-            except Exception as e:
-                # XXX: This works for now, but makes debugging future issues very hard
-                err = e
+            def run_if(self, local_vars, allow_recursion):
+                cndn_val = _js_ternary(self.interpret_expression(cndn, local_vars, allow_recursion))
+                return self.interpret_statement(if_expr if cndn_val else else_expr, local_vars, allow_recursion)
+            return then(expr, run_if)
 
-            pending = (None, False)
+        elif m and m.group('try'):
+            try_expr, expr = cls._separate_at_paren(expr[m.end() - 1:])
+            catch_expr = catch_var = finally_expr = None
             m = re.match(fr'catch\s*(?P<err>\(\s*{_NAME_RE}\s*\))?\{{', expr)
             if m:
-                sub_expr, expr = self._separate_at_paren(expr[m.end() - 1:])
-                if err:
+                catch_expr, expr = cls._separate_at_paren(expr[m.end() - 1:])
+                catch_var = m.group('err')
+            m = re.match(r'finally\s*\{', expr)
+            if m:
+                finally_expr, expr = cls._separate_at_paren(expr[m.end() - 1:])
+
+            def run_try(self, local_vars, allow_recursion):
+                err = None
+                try:
+                    ret, should_abort = self.interpret_statement(try_expr, local_vars, allow_recursion)
+                    if should_abort:
+                        return ret, True
+                except Exception as e:
+                    # XXX: This works for now, but makes debugging future issues very hard
+                    err = e
+
+                pending = (None, False)
+                if catch_expr is not None and err:
                     catch_vars = {}
-                    if m.group('err'):
-                        catch_vars[m.group('err')] = err.error if isinstance(err, JS_Throw) else err
+                    if catch_var:
+                        catch_vars[catch_var] = err.error if isinstance(err, JS_Throw) else err
                     catch_vars = local_vars.new_child(catch_vars)
-                    err, pending = None, self.interpret_statement(sub_expr, catch_vars, allow_recursion)
+                    err, pending = None, self.interpret_statement(catch_expr, catch_vars, allow_recursion)
 
-            m = re.match(r'finally\s*\{', expr)
-            if m:
-                sub_expr, expr = self._separate_at_paren(expr[m.end() - 1:])
-                ret, should_abort = self.interpret_statement(sub_expr, local_vars, allow_recursion)
+                if finally_expr is not None:
+                    ret, should_abort = self.interpret_statement(finally_expr, local_vars, allow_recursion)
+                    if should_abort:
+                        return ret, True
+
+                ret, should_abort = pending
                 if should_abort:
                     return ret, True
 
-            ret, should_abort = pending
-            if should_abort:
-                return ret, True
-
-            if err:
-                raise err
+                if err:
+                    raise err
+                return None, False
+            return then(expr, run_try)
 
-        elif md.get('for'):
-            constructor, remaining = self._separate_at_paren(expr[m.end() - 1:])
+        elif m and m.group('for'):
+            constructor, remaining = cls._separate_at_paren(expr[m.end() - 1:])
             if remaining.startswith('{'):
-                body, expr = self._separate_at_paren(remaining)
+                body, expr = cls._separate_at_paren(remaining)
             else:
                 switch_m = re.match(r'switch\s*\(', remaining)  # FIXME: ?
                 if switch_m:
-                    switch_val, remaining = self._separate_at_paren(remaining[switch_m.end() - 1:])
-                    body, expr = self._separate_at_paren(remaining, '}')
+                    switch_val, remaining = cls._separate_at_paren(remaining[switch_m.end() - 1:])
+                    body, expr = cls._separate_at_paren(remaining, '}')
                     body = 'switch(%s){%s}' % (switch_val, body)
                 else:
                     body, expr = remaining, ''
-            start, cndn, increment = self._separate(constructor, ';')
-            self.interpret_expression(start, local_vars, allow_recursion)
-            while True:
-                if not _js_ternary(self.interpret_expression(cndn, local_vars, allow_recursion)):
-                    break
-                try:
-                    ret, should_abort = self.interpret_statement(body, local_vars, allow_recursion)
-                    if should_abort:
-                        return ret, True
-                except JS_Break:
-                    break
-                except JS_Continue:
-                    pass
-                self.interpret_expression(increment, local_vars, allow_recursion)
-
-        elif md.get('switch'):
-            switch_val, remaining = self._separate_at_paren(expr[m.end() - 1:])
-            switch_val = self.interpret_expression(switch_val, local_vars, allow_recursion)
-            body, expr = self._separate_at_paren(remaining, '}')
-            items = body.replace('default:', 'case default:').split('case ')[1:]
-            for default in (False, True):
-                matched = False
-                for item in items:
-                    case, stmt = (i.strip() for i in self._separate(item, ':', 1))
-                    if default:
-                        matched = matched or case == 'default'
-                    elif not matched:
-                        matched = (case != 'default'
-                                   and switch_val == self.interpret_expression(case, local_vars, allow_recursion))
-                    if not matched:
-                        continue
+            start, cndn, increment = cls._separate(constructor, ';')
+
+            def run_for(self, local_vars, allow_recursion):
+                self.interpret_expression(start, local_vars, allow_recursion)
+                while True:
+                    if not _js_ternary(self.interpret_expression(cndn, local_vars, allow_recursion)):
+                        break
                     try:
-                        ret, should_abort = self.interpret_statement(stmt, local_vars, allow_recursion)
+                        ret, should_abort = self.interpret_statement(body, local_vars, allow_recursion)
                         if should_abort:
-                            return ret
+                            return ret, True
                     except JS_Break:
                         break
-                if matched:
-                    break
-
-        if md:
-            ret, should_abort = self.interpret_statement(expr, local_vars, allow_recursion)
-            return ret, should_abort or should_return
+                    except JS_Continue:
+                        pass
+                    self.interpret_expression(increment, local_vars, allow_recursion)
+                return None, False
+            return then(expr, run_for)
+
+        elif m and m.group('switch'):
+            switch_expr, remaining = cls._separate_at_paren(expr[m.end() - 1:])
+            body, expr = cls._separate_at_paren(remaining, '}')
+            items = [
+                [i.strip() for i in cls._separate(item, ':', 1)]
+                for item in body.replace('default:', 'case default:').split('case ')[1:]]
+
+            def run_switch(self, local_vars, allow_recursion):
+                switch_val = self.interpret_expression(switch_expr, local_vars, allow_recursion)
+                for default in (False, True):
+                    matched = False
+                    for item in items:
+                        case, case_stmt = item
+                        if default:
+                            matched = matched or case == 'default'
+                        elif not matched:
+                            matched = (case != 'default'
+                                       and switch_val == self.interpret_expression(case, local_vars, allow_recursion))
+                        if not matched:
+                            continue
+                        try:
+                            ret, should_abort = self.interpret_statement(case_stmt, local_vars, allow_recursion)
+                            if should_abort:
+                                return ret, True
+                        except JS_Break:
+                            break
+                    if matched:
+                        break
+                return None, False
+            return then(expr, run_switch)
 
         # Comma separated statements
-        sub_expressions = list(self._separate(expr))
+        sub_expressions = list(cls._separate(expr))
         if len(sub_expressions) > 1:
-            for sub_expr in sub_expressions:
-                ret, should_abort = self.interpret_statement(
-                    sub_expr, local_vars, allow_recursion, _is_var_declaration=_is_var_declaration)
-                if should_abort:
-                    return ret, True
-            return ret, False
+            def run_comma(self, local_vars, allow_recursion, should_return):
+                for sub_expr in sub_expressions:
+                    ret, should_abort = self.interpret_statement(
+                        sub_expr, local_vars, allow_recursion, _is_var_declaration=is_var_declaration)
+                    if should_abort:
+                        return ret, True
+                return ret, False
+            return run_comma
 
         m = re.match(fr'''(?x)
                 (?P<out>{_NAME_RE})(?:\[(?P<index>{_NESTED_BRACKETS})\])?\s*
@@ -619,41 +730,52 @@ def dict_item(key, val):
                 =(?!=)(?P<expr>.*)$
             ''', expr)
         if m:  # We are assigning a value to a variable
-            left_val = local_vars.get(m.group('out'))
-
-            if not m.group('index'):
-                eval_result = self._operator(
-                    m.group('op'), left_val, m.group('expr'), expr, local_vars, allow_recursion)
-                if _is_var_declaration:
-                    local_vars.set_local(m.group('out'), eval_result)
-                else:
-                    local_vars[m.group('out')] = eval_result
-                return local_vars[m.group('out')], should_return
-            elif left_val in (None, JS_Undefined):
-                raise self.Exception(f'Cannot index undefined variable {m.group("out")}', expr)
-
-            idx = self.interpret_expression(m.group('index'), local_vars, allow_recursion)
-            if not isinstance(idx, (int, float)):
-                raise self.Exception(f'List index {idx} must be integer', expr)
-            idx = int(idx)
-            left_val[idx] = self._operator(
-                m.group('op'), self._index(left_val, idx), m.group('expr'), expr, local_vars, allow_recursion)
-            return left_val[idx], should_return
-
+            out, index, op, right_expr = m.group('out', 'index', 'op', 'expr')
+            if not index:
+                def run_assign(self, local_vars, allow_recursion, should_return):
+                    eval_result = self._operator(
+                        op, local_vars.get(out), right_expr, expr, local_vars, allow_recursion)
+                    if is_var_declaration:
+                        local_vars.set_local(out, eval_result)
+                    else:
+                        local_vars[out] = eval_result
+                    return local_vars[out], should_return
+                return run_assign
+
+            def run_assign_index(self, local_vars, allow_recursion, should_return):
+                left_val = local_vars.get(out)
+                if left_val in (None, JS_Undefined):
+                    raise self.Exception(f'Cannot index undefined variable {out}', expr)
+
+                idx = self.interpret_expression(index, local_vars, allow_recursion)
+                if not isinstance(idx, (int, float)):
+                    raise self.Exception(f'List index {idx} must be integer', expr)
+                idx = int(idx)
+                left_val[idx] = self._operator(
+                    op, self._index(left_val, idx), right_expr, expr, local_vars, allow_recursion)
+                return left_val[idx], should_return
+            return run_assign_index
+
+        increments, new_expr, end = [], '', 0
         for m in re.finditer(rf'''(?x)
                 (?P<pre_sign>\+\+|--)(?P<var1>{_NAME_RE})|
                 (?P<var2>{_NAME_RE})(?P<post_sign>\+\+|--)''', expr):
-            var = m.group('var1') or m.group('var2')
-            start, end = m.span()
+            name = cls._placeholder()
             sign = m.group('pre_sign') or m.group('post_sign')
-            ret = local_vars[var]
-            local_vars[var] += 1 if sign[0] == '+' else -1
-            if m.group('pre_sign'):
-                ret = local_vars[var]
-            expr = expr[:start] + self._dump(ret, local_vars) + expr[end:]
-
-        if not expr:
-            return None, should_return
+            increments.append((name, m.group('var1') or m.group('var2'), 1 if sign[0] == '+' else -1, m.group('pre_sign')))
+            new_expr += expr[end:m.start()] + name
+            end = m.end()
+        if increments:
+            rest = continuation(new_expr + expr[end:])
+
+            def run_increment(self, local_vars, allow_recursion, should_return):
+                values = {}
+                for name, var, delta, is_pre in increments:
+                    ret = local_vars[var]
+                    local_vars[var] += delta
+                    values[name] = local_vars[var] if is_pre else ret
+                return rest(self, local_vars, allow_recursion, should_return, values)
+            return run_increment
 
         m = re.match(fr'''(?x)
             (?P<return>
@@ -669,42 +791,55 @@ def dict_item(key, val):
                 (?P<fname>{_NAME_RE})\((?P<args>.*)\)$
             )''', expr)
         if expr.isdigit():
-            return int(expr), should_return
+            return constant(int(expr))
+
+        elif expr in ('break', 'continue'):
+            error = JS_Break if expr == 'break' else JS_Continue
 
-        elif expr == 'break':
-            raise JS_Break
-        elif expr == 'continue':
-            raise JS_Continue
+            def run_jump(self, local_vars, allow_recursion, should_return):
+                raise error
+            return run_jump
         elif expr == 'undefined':
-            return JS_Undefined, should_return
+            return constant(JS_Undefined)
         elif expr == 'NaN':
-            return float('NaN'), should_return
+            return constant(float('NaN'))
 
         elif m and m.group('return'):
             var = m.group('name')
-            # Declared variables
-            if _is_var_declaration:
-                ret = local_vars.get_local(var)
-                # Register varname in local namespace
-                # Set value as JS_Undefined or its pre-existing value
-                local_vars.set_local(var, ret)
-            else:
-                ret = local_vars.get(var, NO_DEFAULT)
-                if ret is NO_DEFAULT:
-                    ret = JS_Undefined
-                    self._undefined_varnames.add(var)
-            return ret, should_return
 
-        with contextlib.suppress(ValueError):
-            return json.loads(js_to_json(expr, strict=True)), should_return
+            def run_name(self, local_vars, allow_recursion, should_return):
+                # Declared variables
+                if is_var_declaration:
+                    ret = local_vars.get_local(var)
+                    # Register varname in local namespace
+                    # Set value as JS_Undefined or its pre-existing value
+                    local_vars.set_local(var, ret)
+                else:
+                    ret = local_vars.get(var, NO_DEFAULT)
+                    if ret is NO_DEFAULT:
+                        ret = JS_Undefined
+                        self._undefined_varnames.add(var)
+                return ret, should_return
+            return run_name
+
+        try:
+            value = json.loads(js_to_json(expr, strict=True))
+        except ValueError:
+            pass
+        else:
+            return lambda self, local_vars, allow_recursion, should_return: (self._copy(value), should_return)
 
         if m and m.group('indexing'):
-            val = local_vars[m.group('in')]
-            idx = self.interpret_expression(m.group('idx'), local_vars, allow_recursion)
-            return self._index(val, idx), should_return
+            var, idx_expr = m.group('in', 'idx')
+
+            def run_indexing(self, local_vars, allow_recursion, should_return):
+                val = local_vars[var]
+                idx = self.interpret_expression(idx_expr, local_vars, allow_recursion)
+                return self._index(val, idx), should_return
+            return run_indexing
 
         for op in _OPERATORS:
-            separated = list(self._separate(expr, op))
+            separated = list(cls._separate(expr, op))
             right_expr = separated.pop()
             while True:
                 if op in '?<>*-' and len(separated) > 1 and not separated[-1].strip():
@@ -716,175 +851,182 @@ def dict_item(key, val):
                     right_expr = f'{separated.pop()}{op}{right_expr}'
             if not separated:
                 continue
-            left_val = self.interpret_expression(op.join(separated), local_vars, allow_recursion)
-            return self._operator(op, left_val, right_expr, expr, local_vars, allow_recursion), should_return
+            left_expr = op.join(separated)
+
+            def run_operator(self, local_vars, allow_recursion, should_return, op=op, right_expr=right_expr):
+                left_val = self.interpret_expression(left_expr, local_vars, allow_recursion)
+                return self._operator(op, left_val, right_expr, expr, local_vars, allow_recursion), should_return
+            return run_operator
 
         if m and m.group('attribute'):
-            variable, member, nullish = m.group('var', 'member', 'nullish')
-            if not member:
-                member = self.interpret_expression(m.group('member2'), local_vars, allow_recursion)
+            variable, member, nullish, member_expr = m.group('var', 'member', 'nullish', 'member2')
             arg_str = expr[m.end():]
             if arg_str.startswith('('):
-                arg_str, remaining = self._separate_at_paren(arg_str)
+                arg_str, remaining = cls._separate_at_paren(arg_str)
+                args = list(cls._separate(arg_str))
             else:
-                arg_str, remaining = None, arg_str
-
-            def assertion(cndn, msg):
-                """ assert, but without risk of getting optimized out """
-                if not cndn:
-                    raise self.Exception(f'{member} {msg}', expr)
-
-            def eval_method():
-                nonlocal member
-
-                if (variable, member) == ('console', 'debug'):
-                    if Debugger.ENABLED:
-                        Debugger.write(self.interpret_expression(f'[{arg_str}]', local_vars, allow_recursion))
-                    return
-
-                types = {
-                    'String': str,
-                    'Math': float,
-                    'Array': list,
-                }
-                obj = local_vars.get(variable, types.get(variable, NO_DEFAULT))
-                if obj is NO_DEFAULT:
-                    if variable not in self._objects:
-                        try:
-                            self._objects[variable] = self.extract_object(variable, local_vars)
-                        except self.Exception:
-                            if not nullish:
-                                raise
-                    obj = self._objects.get(variable, JS_Undefined)
-
-                if nullish and obj is JS_Undefined:
-                    return JS_Undefined
-
-                # Member access
-                if arg_str is None:
-                    return self._index(obj, member, nullish)
-
-                # Function call
-                argvals = [
-                    self.interpret_expression(v, local_vars, allow_recursion)
-                    for v in self._separate(arg_str)]
-
-                # Fixup prototype call
-                if isinstance(obj, type) and member.startswith('prototype.'):
-                    new_member, _, func_prototype = member.partition('.')[2].partition('.')
-                    assertion(argvals, 'takes one or more arguments')
-                    assertion(isinstance(argvals[0], obj), f'needs binding to type {obj}')
-                    if func_prototype == 'call':
-                        obj, *argvals = argvals
-                    elif func_prototype == 'apply':
-                        assertion(len(argvals) == 2, 'takes two arguments')
-                        obj, argvals = argvals
-                        assertion(isinstance(argvals, list), 'second argument needs to be a list')
-                    else:
-                        raise self.Exception(f'Unsupported Function method {func_prototype}', expr)
-                    member = new_member
-
-                if obj is str:
-                    if member == 'fromCharCode':
-                        assertion(argvals, 'takes one or more arguments')
-                        return ''.join(map(chr, argvals))
-                    raise self.Exception(f'Unsupported String method {member}', expr)
-                elif obj is float:
-                    if member == 'pow':
-                        assertion(len(argvals) == 2, 'takes two arguments')
-                        return argvals[0] ** argvals[1]
-                    raise self.Exception(f'Unsupported Math method {member}', expr)
-
-                if member == 'split':
-                    assertion(argvals, 'takes one or more arguments')
-                    assertion(len(argvals) == 1, 'with limit argument is not implemented')
-                    return obj.split(argvals[0]) if argvals[0] else list(obj)
-                elif member == 'join':
-                    assertion(isinstance(obj, list), 'must be applied on a list')
-                    assertion(len(argvals) == 1, 'takes exactly one argument')
-                    return argvals[0].join(obj)
-                elif member == 'reverse':
-                    assertion(not argvals, 'does not take any arguments')
-                    obj.reverse()
-                    return obj
-                elif member == 'slice':
-                    assertion(isinstance(obj, (list, str)), 'must be applied on a list or string')
-                    assertion(len(argvals) <= 2, 'takes between 0 and 2 arguments')
-                    return obj[slice(*argvals, None)]
-                elif member == 'splice':
-                    assertion(isinstance(obj, list), 'must be applied on a list')
-                    assertion(argvals, 'takes one or more arguments')
-                    index, how_many = map(int, ([*argvals, len(obj)])[:2])
-                    if index < 0:
-                        index += len(obj)
-                    add_items = argvals[2:]
-                    res = []
-                    for _ in range(index, min(index + how_many, len(obj))):
-                        res.append(obj.pop(index))
-                    for i, item in enumerate(add_items):
-                        obj.insert(index + i, item)
-                    return res
-                elif member == 'unshift':
-                    assertion(isinstance(obj, list), 'must be applied on a list')
-                    assertion(argvals, 'takes one or more arguments')
-                    for item in reversed(argvals):
-                        obj.insert(0, item)
-                    return obj
-                elif member == 'pop':
-                    assertion(isinstance(obj, list), 'must be applied on a list')
-                    assertion(not argvals, 'does not take any arguments')
-                    if not obj:
-                        return
-                    return obj.pop()
-                elif member == 'push':
-                    assertion(argvals, 'takes one or more arguments')
-                    obj.extend(argvals)
-                    return obj
-                elif member == 'forEach':
-                    assertion(argvals, 'takes one or more arguments')
-                    assertion(len(argvals) <= 2, 'takes at-most 2 arguments')
-                    f, this = ([*argvals, ''])[:2]
-                    return [f((item, idx, obj), {'this': this}, allow_recursion) for idx, item in enumerate(obj)]
-                elif member == 'indexOf':
-                    assertion(argvals, 'takes one or more arguments')
-                    assertion(len(argvals) <= 2, 'takes at-most 2 arguments')
-                    idx, start = ([*argvals, 0])[:2]
-                    try:
-                        return obj.index(idx, start)
-                    except ValueError:
-                        return -1
-                elif member == 'charCodeAt':
-                    assertion(isinstance(obj, str), 'must be applied on a string')
-                    assertion(len(argvals) == 1, 'takes exactly one argument')
-                    idx = argvals[0] if isinstance(argvals[0], int) else 0
-                    if idx >= len(obj):
-                        return None
-                    return ord(obj[idx])
-
-                idx = int(member) if isinstance(obj, list) else member
-                return obj[idx](argvals, allow_recursion=allow_recursion)
-
-            if remaining:
+                arg_str, remaining, args = None, arg_str, None
+            name = cls._placeholder()
+            remaining = name + remaining if remaining else None
+
+            def run_attribute(self, local_vars, allow_recursion, should_return):
+                ret = self._eval_method(
+                    variable, member or self.interpret_expression(member_expr, local_vars, allow_recursion),
+                    nullish, arg_str, args, expr, local_vars, allow_recursion)
+                if not remaining:
+                    return ret, should_return
                 ret, should_abort = self.interpret_statement(
-                    self._named_object(local_vars, eval_method()) + remaining,
-                    local_vars, allow_recursion)
+                    remaining, self._with_values(local_vars, {name: ret}), allow_recursion)
                 return ret, should_return or should_abort
-            else:
-                return eval_method(), should_return
+            return run_attribute
 
         elif m and m.group('function'):
             fname = m.group('fname')
-            argvals = [self.interpret_expression(v, local_vars, allow_recursion)
-                       for v in self._separate(m.group('args'))]
-            if fname in local_vars:
-                return local_vars[fname](argvals, allow_recursion=allow_recursion), should_return
-            elif fname not in self._functions:
-                self._functions[fname] = self.extract_function(fname)
-            return self._functions[fname](argvals, allow_recursion=allow_recursion), should_return
-
-        raise self.Exception(
+            args = list(cls._separate(m.group('args')))
+
+            def run_function(self, local_vars, allow_recursion, should_return):
+                argvals = [self.interpret_expression(v, local_vars, allow_recursion) for v in args]
+                if fname in local_vars:
+                    return local_vars[fname](argvals, allow_recursion=allow_recursion), should_return
+                elif fname not in self._functions:
+                    self._functions[fname] = self.extract_function(fname)
+                return self._functions[fname](argvals, allow_recursion=allow_recursion), should_return
+            return run_function
+
+        raise cls.Exception(
             f'Unsupported JS expression {truncate_string(expr, 20, 20) if expr != stmt else ""}', stmt)
 
+    def _eval_method(self, variable, member, nullish, arg_str, args, expr, local_vars, allow_recursion):
+        def assertion(cndn, msg):
+            """ assert, but without risk of getting optimized out """
+            if not cndn:
+                raise self.Exception(f'{member} {msg}', expr)
+
+        if (variable, member) == ('console', 'debug'):
+            if Debugger.ENABLED:
+                Debugger.write(self.interpret_expression(f'[{arg_str}]', local_vars, allow_recursion))
+            return
+
+        types = {
+            'String': str,
+            'Math': float,
+            'Array': list,
+        }
+        obj = local_vars.get(variable, types.get(variable, NO_DEFAULT))
+        if obj is NO_DEFAULT:
+            if variable not in self._objects:
+                try:
+                    self._objects[variable] = self.extract_object(variable, local_vars)
+                except self.Exception:
+                    if not nullish:
+                        raise
+            obj = self._objects.get(variable, JS_Undefined)
+
+        if nullish and obj is JS_Undefined:
+            return JS_Undefined
+
+        # Member access
+        if arg_str is None:
+            return self._index(obj, member, nullish)
+
+        # Function call
+        argvals = [self.interpret_expression(v, local_vars, allow_recursion) for v in args]
+
+        # Fixup prototype call
+        if isinstance(obj, type) and member.startswith('prototype.'):
+            new_member, _, func_prototype = member.partition('.')[2].partition('.')
+            assertion(argvals, 'takes one or more arguments')
+            assertion(isinstance(argvals[0], obj), f'needs binding to type {obj}')
+            if func_prototype == 'call':
+                obj, *argvals = argvals
+            elif func_prototype == 'apply':
+                assertion(len(argvals) == 2, 'takes two arguments')
+                obj, argvals = argvals
+                assertion(isinstance(argvals, list), 'second argument needs to be a list')
+            else:
+                raise self.Exception(f'Unsupported Function method {func_prototype}', expr)
+            member = new_member
+
+        if obj is str:
+            if member == 'fromCharCode':
+                assertion(argvals, 'takes one or more arguments')
+                return ''.join(map(chr, argvals))
+            raise self.Exception(f'Unsupported String method {member}', expr)
+        elif obj is float:
+            if member == 'pow':
+                assertion(len(argvals) == 2, 'takes two arguments')
+                return argvals[0] ** argvals[1]
+            raise self.Exception(f'Unsupported Math method {member}', expr)
+
+        if member == 'split':
+            assertion(argvals, 'takes one or more arguments')
+            assertion(len(argvals) == 1, 'with limit argument is not implemented')
+            return obj.split(argvals[0]) if argvals[0] else list(obj)
+        elif member == 'join':
+            assertion(isinstance(obj, list), 'must be applied on a list')
+            assertion(len(argvals) == 1, 'takes exactly one argument')
+            return argvals[0].join(obj)
+        elif member == 'reverse':
+            assertion(not argvals, 'does not take any arguments')
+            obj.reverse()
+            return obj
+        elif member == 'slice':
+            assertion(isinstance(obj, (list, str)), 'must be applied on a list or string')
+            assertion(len(argvals) <= 2, 'takes between 0 and 2 arguments')
+            return obj[slice(*argvals, None)]
+        elif member == 'splice':
+            assertion(isinstance(obj, list), 'must be applied on a list')
+            assertion(argvals, 'takes one or more arguments')
+            index, how_many = map(int, ([*argvals, len(obj)])[:2])
+            if index < 0:
+                index += len(obj)
+            add_items = argvals[2:]
+            res = []
+            for _ in range(index, min(index + how_many, len(obj))):
+                res.append(obj.pop(index))
+            for i, item in enumerate(add_items):
+                obj.insert(index + i, item)
+            return res
+        elif member == 'unshift':
+            assertion(isinstance(obj, list), 'must be applied on a list')
+            assertion(argvals, 'takes one or more arguments')
+            for item in reversed(argvals):
+                obj.insert(0, item)
+            return obj
+        elif member == 'pop':
+            assertion(isinstance(obj, list), 'must be applied on a list')
+            assertion(not argvals, 'does not take any arguments')
+            if not obj:
+                return
+            return obj.pop()
+        elif member == 'push':
+            assertion(argvals, 'takes one or more arguments')
+            obj.extend(argvals)
+            return obj
+        elif member == 'forEach':
+            assertion(argvals, 'takes one or more arguments')
+            assertion(len(argvals) <= 2, 'takes at-most 2 arguments')
+            f, this = ([*argvals, ''])[:2]
+            return [f((item, idx, obj), {'this': this}, allow_recursion) for idx, item in enumerate(obj)]
+        elif member == 'indexOf':
+            assertion(argvals, 'takes one or more arguments')
+            assertion(len(argvals) <= 2, 'takes at-most 2 arguments')
+            idx, start = ([*argvals, 0])[:2]
+            try:
+                return obj.index(idx, start)
+            except ValueError:
+                return -1
+        elif member == 'charCodeAt':
+            assertion(isinstance(obj, str), 'must be applied on a string')
+            assertion(len(argvals) == 1, 'takes exactly one argument')
+            idx = argvals[0] if isinstance(argvals[0], int) else 0
+            if idx >= len(obj):
+                return None
+            return ord(obj[idx])
+
+        idx = int(member) if isinstance(obj, list) else member
+        return obj[idx](argvals, allow_recursion=allow_recursion)
+
     def interpret_expression(self, expr, local_vars, allow_recursion):
         ret, should_return = self.interpret_statement(expr, local_vars, allow_recursion)
         if should_return:
@@ -918,8 +1060,17 @@ def extract_object(self, objname, *global_stack):
 
         return obj
 
+    @functools.cached_property
+    def _code_hash(self):
+        return hashlib.sha256(self.code.encode()).hexdigest()
+
     def extract_function_code(self, funcname):
         """ @returns argnames, code """
+        argnames, code = self._compiled(
+            ('function', self._code_hash, funcname), self._extract_function_code, funcname)
+        return list(argnames), code
+
+    def _extract_function_code(self, funcname):
         func_m = re.search(
             r'''(?xs)
                 (?:
@@ -933,7 +1084,7 @@ def extract_function_code(self, funcname):
         if func_m is None:
             raise self.Exception(f'Could not find JS function "{funcname}"')
         code, _ = self._separate_at_paren(func_m.group('code'))
-        return [x.strip() for x in func_m.group('args').split(',')], code
+        return tuple(x.strip() for x in func_m.group('args').split(',')), code
 
     def extract_function(self, funcname, *global_stack):
         return function_with_repr(
@@ -960,12 +1111,13 @@ def call_function(self, funcname, *args):
     def build_function(self, argnames, code, *global_stack):
         global_stack = list(global_stack) or [{}]
         argnames = tuple(argnames)
+        code = code.replace('\n', ' ')
 
         def resf(args, kwargs={}, allow_recursion=100):
             global_stack[0].update(itertools.zip_longest(argnames, args, fillvalue=None))
             global_stack[0].update(kwargs)
             var_stack = LocalNameSpace(*global_stack)
-            ret, should_abort = self.interpret_statement(code.replace('\n', ' '), var_stack, allow_recursion - 1)
+            ret, should_abort = self.interpret_statement(code, var_stack, allow_recursion - 1)
             if should_abort:
                 return ret
         return resf
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import collections
 import contextlib
 import functools
 import os
 import socket
 import ssl
 import sys
+import threading
+import time
 import typing
 import urllib.parse
 import urllib.request
@@ -97,6 +100,44 @@ def get_redirect_method(method, status):
     return method
 
 
+class SessionSavingSSLSocket(ssl.SSLSocket):
+    def _real_close(self):
+        # TLS 1.3 servers send the session ticket after the handshake, so the session is saved when closing
+        if isinstance(self.context, SessionResumingSSLContext) and self.server_hostname:
+            with contextlib.suppress(ValueError, OSError):
+                self.context.save_session(self.server_hostname, self.session)
+        super()._real_close()
+
+
+class SessionResumingSSLContext(ssl.SSLContext):
+    """SSLContext that resumes the last TLS session with a server when connecting to it again"""
+
+    sslsocket_class = SessionSavingSSLSocket
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._sessions = {}
+        self._sessions_lock = threading.Lock()
+
+    def save_session(self, server_hostname, session):
+        if session is None:
+            return
+        with self._sessions_lock:
+            # A session without a ticket can't be resumed with TLS 1.3 servers
+            if session.has_ticket or server_hostname not in self._sessions:
+                self._sessions[server_hostname] = session
+
+    def wrap_socket(self, sock, *args, server_hostname=None, session=None, **kwargs):
+        if session is None and server_hostname:
+            with self._sessions_lock:
+                session = self._sessions.get(server_hostname)
+        ssl_sock = super().wrap_socket(sock, *args, server_hostname=server_hostname, session=session, **kwargs)
+        if server_hostname and not ssl_sock.server_side:
+            with contextlib.suppress(ValueError, OSError):
+                self.save_session(server_hostname, ssl_sock.session)
+        return ssl_sock
+
+
 def make_ssl_context(
     verify=True,
     client_certificate=None,
@@ -104,8 +145,9 @@ def make_ssl_context(
     client_certificate_password=None,
     legacy_support=False,
     use_certifi=True,
+    resume_sessions=False,
 ):
-    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context = (SessionResumingSSLContext if resume_sessions else ssl.SSLContext)(ssl.PROTOCOL_TLS_CLIENT)
     context.check_hostname = verify
     context.verify_mode = ssl.CERT_REQUIRED if verify else ssl.CERT_NONE
     # OpenSSL 1.1.1+ Python 3.8+ keylog file
@@ -238,12 +280,13 @@ def create_connection(
     source_address=None,
     *,
     _create_socket_func=_socket_connect,
+    _getaddrinfo=socket.getaddrinfo,
 ):
     # Work around socket.create_connection() which tries all addresses from getaddrinfo() including IPv6.
     # This filters the addresses based on the given source_address.
     # Based on: https://github.com/python/cpython/blob/main/Lib/socket.py#L810
     host, port = address
-    ip_addrs = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+    ip_addrs = _getaddrinfo(host, port, 0, socket.SOCK_STREAM)
     if not ip_addrs:
         raise OSError('getaddrinfo returns an empty list')
     if source_address is not None:
@@ -271,3 +314,55 @@ def create_connection(
         # Explicitly break __traceback__ reference cycle
         # https://bugs.python.org/issue36820
         err = None
+
+
+class DNSCache:
+    """
+    Cache of getaddrinfo() results, since the system resolver may not cache them
+
+    @param ttl: Number of seconds a result is used for
+    """
+
+    _TTL = 60
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl or self._TTL
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        key = (host, port, family, type, proto, flags)
+        with self._lock:
+            expires, result = self._entries.get(key, (0, None))
+            if time.monotonic() < expires:
+                self.hits += 1
+                return result
+            self.misses += 1
+        result = socket.getaddrinfo(host, port, family, type, proto, flags)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+        return result
+
+    def invalidate(self, host):
+        """Forget the addresses of the host, e.g. after failing to connect to all of them"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == host]:
+                del self._entries[key]
+
+
+class ConnectionMetrics:
+    """Thread-safe counters of the connections made by a request handler, by host"""
+
+    def __init__(self):
+        self._counts = collections.defaultdict(collections.Counter)
+        self._lock = threading.Lock()
+
+    def add(self, host, **counts):
+        with self._lock:
+            self._counts[host].update(counts)
+
+    def metrics(self):
+        """@returns The counters of each host"""
+        with self._lock:
+            return {host: dict(counts) for host, counts in self._counts.items()}
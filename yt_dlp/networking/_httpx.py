@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+import io
+import logging
+import ssl
+import threading
+import urllib.parse
+
+from ._helper import InstanceStoreMixin, add_accept_encoding_header, get_redirect_method
+from .common import (
+    Features,
+    Request,
+    RequestHandler,
+    Response,
+    register_preference,
+    register_rh,
+)
+from .exceptions import (
+    CertificateVerifyError,
+    HTTPError,
+    IncompleteRead,
+    ProxyError,
+    RequestError,
+    SSLError,
+    TransportError,
+)
+from ..dependencies import brotli, h2, httpx
+from ..utils import int_or_none
+from ..utils.networking import select_proxy
+
+if httpx is None:
+    raise ImportError('httpx module is not installed')
+
+if h2 is None:
+    raise ImportError('h2 module is not installed')
+
+httpx_version = tuple(int_or_none(x, default=0) for x in httpx.__version__.split('.'))
+
+if httpx_version < (0, 27):
+    httpx._yt_dlp__version = f'{httpx.__version__} (unsupported)'
+    raise ImportError('Only httpx >= 0.27 is supported')
+
+import httpcore
+
+SUPPORTED_ENCODINGS = [
+    'gzip', 'deflate',
+]
+
+if brotli is not None:
+    SUPPORTED_ENCODINGS.append('br')
+
+# Connection-specific headers are not allowed in HTTP/2
+# See: https://datatracker.ietf.org/doc/html/rfc9113#section-8.2.2
+_CONNECTION_HEADERS = ('Connection', 'Keep-Alive', 'Proxy-Connection', 'Transfer-Encoding', 'Upgrade')
+
+
+def _find_cause(error, error_type):
+    while error is not None:
+        if isinstance(error, error_type):
+            return error
+        error = error.__cause__ or error.__context__
+    return None
+
+
+class HTTPXResponseReader(io.IOBase):
+    def __init__(self, response: httpx.Response, release=None):
+        self._response = response
+        self._iterator = response.iter_bytes()
+        self._buffer = b''
+        self._release = release
+
+    def readable(self):
+        return True
+
+    def read(self, size=None):
+        exception_raised = True
+        try:
+            while self._iterator and (size is None or len(self._buffer) < size):
+                chunk = next(self._iterator, None)
+                if chunk is None:
+                    self._iterator = None
+                    break
+                self._buffer += chunk
+
+            if size is None:
+                size = len(self._buffer)
+            data = self._buffer[:size]
+            self._buffer = self._buffer[size:]
+
+            # Return the stream to the connection as soon as the response is fully read
+            if not self._iterator and not self._buffer:
+                self.close()
+            exception_raised = False
+            return data
+        finally:
+            if exception_raised:
+                self.close()
+
+    def close(self):
+        if not self.closed:
+            self._response.close()
+            self._buffer = b''
+            if self._release:
+                self._release()
+        super().close()
+
+
+class HTTPXResponseAdapter(Response):
+    fp: HTTPXResponseReader
+
+    def __init__(self, response: httpx.Response, release=None):
+        super().__init__(
+            fp=HTTPXResponseReader(response, release),
+            headers={},
+            url=str(response.url),
+            status=response.status_code,
+            reason=response.reason_phrase)
+        # Keep repeated headers (e.g. Set-Cookie) separate
+        for name, value in response.headers.multi_items():
+            self.headers.add_header(name, value)
+        self._httpx_response = response
+
+    def read(self, amt=None):
+        try:
+            res = self.fp.read(amt)
+            if self.fp.closed:
+                self.close()
+            return res
+        except httpx.RemoteProtocolError as e:
+            content_length = int_or_none(self._httpx_response.headers.get('Content-Length'))
+            partial = self._httpx_response.num_bytes_downloaded
+            if content_length is not None and partial < content_length:
+                raise IncompleteRead(partial=partial, expected=content_length - partial, cause=e) from e
+            raise TransportError(cause=e) from e
+        except (httpx.TransportError, httpx.DecodingError, httpx.StreamError) as e:
+            raise TransportError(cause=e) from e
+
+
+class HTTPXLoggingHandler(logging.Handler):
+    """Redirect httpx logs to our logger"""
+
+    def __init__(self, logger, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._logger = logger
+
+    def emit(self, record):
+        try:
+            msg = self.format(record)
+            if record.levelno >= logging.ERROR:
+                self._logger.error(msg)
+            else:
+                self._logger.stdout(msg)
+
+        except Exception:
+            self.handleError(record)
+
+
+class SourceAddressBackend(httpcore.SyncBackend):
+    """Bind the connections to proxies to the source address, which httpcore only does for direct connections"""
+
+    def __init__(self, source_address):
+        self._source_address = source_address
+
+    def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        return super().connect_tcp(host, port, timeout, local_address or self._source_address, socket_options)
+
+
+class HTTPXClient(httpx.Client):
+    """
+    Ensure unified redirect method handling with our urllib redirect handler.
+    """
+
+    def _redirect_method(self, request, response):
+        return get_redirect_method(request.method, response.status_code)
+
+
+@register_rh
+class HTTPXRH(RequestHandler, InstanceStoreMixin):
+
+    """HTTPX RequestHandler
+    https://github.com/encode/httpx
+
+    With http2, requests to the same host are multiplexed over a single HTTP/2
+    connection if the server supports it, instead of each taking its own connection.
+
+    @param http2: Negotiate HTTP/2 for https requests, and prefer this handler for them.
+    @param http2_max_streams: Maximum number of requests open at once to the same host.
+                              Default is as many as the server allows.
+    """
+    _SUPPORTED_URL_SCHEMES = ('http', 'https')
+    _SUPPORTED_ENCODINGS = tuple(SUPPORTED_ENCODINGS)
+    _SUPPORTED_PROXY_SCHEMES = ('http', 'https')
+    _SUPPORTED_FEATURES = (Features.NO_PROXY, Features.ALL_PROXY)
+    RH_NAME = 'httpx'
+    _MAX_REDIRECTS = 20
+
+    def __init__(self, *, http2: bool = False, http2_max_streams: int | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.http2 = http2
+        self.http2_max_streams = http2_max_streams
+        self._stream_slots = {}
+        self._stream_slots_lock = threading.Lock()
+        self._instances_lock = threading.Lock()
+
+        # httpx logs each request with its protocol version, e.g. "HTTP/2 200 OK"
+        self.__logging_handler = None
+        if self.verbose:
+            self.__logging_handler = HTTPXLoggingHandler(logger=self._logger)
+            self.__logging_handler.setFormatter(logging.Formatter('httpx: %(message)s'))
+            logger = logging.getLogger('httpx')
+            logger.addHandler(self.__logging_handler)
+            logger.setLevel(logging.INFO)
+
+    def close(self):
+        self._clear_instances()
+        if self.__logging_handler:
+            logging.getLogger('httpx').removeHandler(self.__logging_handler)
+
+    def _check_extensions(self, extensions):
+        super()._check_extensions(extensions)
+        extensions.pop('cookiejar', None)
+        extensions.pop('timeout', None)
+        extensions.pop('legacy_ssl', None)
+        extensions.pop('keep_header_casing', None)
+
+    def _get_instance(self, **kwargs):
+        # Concurrent first requests must share the client, or each would open its own connection
+        with self._instances_lock:
+            return super()._get_instance(**kwargs)
+
+    def _create_instance(self, cookiejar, proxy=None, legacy_ssl_support=None):
+        ssl_context = self._make_sslcontext(legacy_ssl_support=legacy_ssl_support)
+        transport = httpx.HTTPTransport(
+            verify=ssl_context,
+            http2=self.http2,
+            # httpcore sets the ALPN protocols of the contexts, so the proxy gets its own
+            proxy=httpx.Proxy(proxy, ssl_context=(
+                self._make_sslcontext(legacy_ssl_support=legacy_ssl_support)
+                if proxy.lower().startswith('https:') else None)) if proxy else None,
+            local_address=self.source_address,
+        )
+        if proxy and self.source_address:
+            transport._pool._network_backend = SourceAddressBackend(self.source_address)
+        return HTTPXClient(
+            transport=transport,
+            cookies=cookiejar,
+            trust_env=False,  # no need, we already load proxies from env
+        )
+
+    def _prepare_headers(self, _, headers):
+        add_accept_encoding_header(headers, SUPPORTED_ENCODINGS)
+        for name in _CONNECTION_HEADERS:
+            if name in headers:
+                del headers[name]
+
+    def _acquire_stream(self, url: httpx.URL, timeout):
+        """@returns A function that gives the stream back, or None if streams aren't limited"""
+        if not self.http2_max_streams:
+            return None
+        host = (url.scheme, url.host, url.port)
+        with self._stream_slots_lock:
+            slots = self._stream_slots.get(host)
+            if slots is None:
+                slots = self._stream_slots[host] = threading.BoundedSemaphore(self.http2_max_streams)
+        if not slots.acquire(timeout=timeout):
+            raise TransportError(f'Timed out waiting for one of the {self.http2_max_streams} streams to {url.host}')
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                slots.release()
+        return release
+
+    def _send_one(self, client: HTTPXClient, request: httpx.Request, timeout):
+        release = self._acquire_stream(request.url, timeout)
+        try:
+            return client.send(request, stream=True, follow_redirects=False), release
+        except BaseException:
+            if release:
+                release()
+            raise
+
+    def _send(self, request: Request):
+        timeout = self._calculate_timeout(request)
+        cookiejar = self._get_cookiejar(request)
+        client = self._get_instance(
+            cookiejar=cookiejar,
+            proxy=select_proxy(request.url, self._get_proxies(request)),
+            legacy_ssl_support=request.extensions.get('legacy_ssl'),
+        )
+        max_redirects_exceeded = False
+
+        try:
+            response, release = self._send_one(client, httpx.Request(
+                method=request.method,
+                url=request.url,
+                headers=self._get_headers(request),
+                content=request.data,
+                cookies=cookiejar,
+                extensions={'timeout': httpx.Timeout(timeout).as_dict()},
+            ), timeout)
+
+            # Redirects are followed here so that each request only holds a stream while it is open
+            redirects = 0
+            while response.next_request is not None:
+                if redirects >= self._MAX_REDIRECTS:
+                    max_redirects_exceeded = True
+                    break
+                redirects += 1
+                next_request = response.next_request
+                response.close()
+                if release:
+                    release()
+                response, release = self._send_one(client, next_request, timeout)
+
+        except httpx.ProxyError as e:
+            raise ProxyError(cause=e) from e
+
+        except httpx.ConnectError as e:
+            if _find_cause(e, ssl.SSLCertVerificationError):
+                raise CertificateVerifyError(cause=e) from e
+            if _find_cause(e, ssl.SSLError):
+                raise SSLError(cause=e) from e
+            raise TransportError(cause=e) from e
+
+        except httpx.TransportError as e:
+            # Includes timeouts and protocol errors
+            raise TransportError(cause=e) from e
+
+        except httpx.HTTPError as e:
+            # Miscellaneous httpx exceptions. May not necessary be network related e.g. InvalidURL
+            raise RequestError(cause=e) from e
+
+        res = HTTPXResponseAdapter(response, release)
+
+        if not 200 <= res.status < 300:
+            raise HTTPError(res, redirect_loop=max_redirects_exceeded)
+
+        return res
+
+
+@register_preference(HTTPXRH)
+def httpx_preference(rh, request):
+    if rh.http2 and urllib.parse.urlparse(request.url).scheme.lower() == 'https':
+        return 200
+    return -50
@@ -4,6 +4,8 @@
 import http.client
 import logging
 import re
+import socket
+import time
 import warnings
 
 from ..dependencies import brotli, requests, urllib3
@@ -33,6 +35,8 @@
 import urllib3.util
 
 from ._helper import (
+    ConnectionMetrics,
+    DNSCache,
     InstanceStoreMixin,
     add_accept_encoding_header,
     create_connection,
@@ -157,8 +161,96 @@ def read(self, amt: int | None = None):
             raise TransportError(cause=e) from e
 
 
+class ConnectionMetricsMixin:
+    """Time the connections and resolve hosts with the DNS cache of the pool they belong to"""
+    _yt_dlp_metrics: ConnectionMetrics | None = None
+    _yt_dlp_metrics_host = None
+    _yt_dlp_dns_cache: DNSCache | None = None
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        if self._yt_dlp_metrics:
+            self._yt_dlp_metrics.add(
+                self._yt_dlp_metrics_host, opened=1, connect_time=time.perf_counter() - start,
+                tls_resumed=int(bool(getattr(self.sock, 'session_reused', False))))
+
+    def _new_conn(self):
+        if not self._yt_dlp_dns_cache:
+            return super()._new_conn()
+        try:
+            sock = create_connection(
+                (self._dns_host, self.port), self.timeout, self.source_address,
+                _getaddrinfo=self._yt_dlp_dns_cache.getaddrinfo)
+        except socket.gaierror as e:
+            raise urllib3.exceptions.NameResolutionError(self.host, self, e) from e
+        except TimeoutError as e:
+            raise urllib3.exceptions.ConnectTimeoutError(
+                self, f'Connection to {self.host} timed out. (connect timeout={self.timeout})') from e
+        except OSError as e:
+            # The cached addresses may be outdated
+            self._yt_dlp_dns_cache.invalidate(self._dns_host)
+            raise urllib3.exceptions.NewConnectionError(
+                self, f'Failed to establish a new connection: {e}') from e
+        for option in self.socket_options or []:
+            sock.setsockopt(*option)
+        return sock
+
+
+class MetricsHTTPConnection(ConnectionMetricsMixin, urllib3.connection.HTTPConnection):
+    pass
+
+
+class MetricsHTTPSConnection(ConnectionMetricsMixin, urllib3.connection.HTTPSConnection):
+    pass
+
+
+class ConnectionMetricsPoolMixin:
+    """Count how the connections of the pool are used"""
+    _yt_dlp_metrics: ConnectionMetrics | None = None
+    _yt_dlp_dns_cache: DNSCache | None = None
+
+    def _new_conn(self):
+        conn = super()._new_conn()
+        conn._yt_dlp_metrics = self._yt_dlp_metrics
+        conn._yt_dlp_metrics_host = self.host
+        conn._yt_dlp_dns_cache = self._yt_dlp_dns_cache
+        return conn
+
+    def _get_conn(self, timeout=None):
+        start = time.perf_counter()
+        conn = super()._get_conn(timeout)
+        if self._yt_dlp_metrics:
+            self._yt_dlp_metrics.add(
+                self.host, requests=1, reused=int(not conn.is_closed), pool_wait=time.perf_counter() - start)
+        return conn
+
+    def _put_conn(self, conn):
+        if conn and self._yt_dlp_metrics and self.pool is not None and self.pool.full():
+            # The pool is too small for the number of concurrent requests
+            self._yt_dlp_metrics.add(self.host, discarded=1)
+        super()._put_conn(conn)
+
+
+class MetricsHTTPConnectionPool(ConnectionMetricsPoolMixin, urllib3.HTTPConnectionPool):
+    ConnectionCls = MetricsHTTPConnection
+
+
+class MetricsHTTPSConnectionPool(ConnectionMetricsPoolMixin, urllib3.HTTPSConnectionPool):
+    ConnectionCls = MetricsHTTPSConnection
+
+
+METRICS_POOL_CLASSES = {
+    'http': MetricsHTTPConnectionPool,
+    'https': MetricsHTTPSConnectionPool,
+}
+
+
 class RequestsHTTPAdapter(requests.adapters.HTTPAdapter):
-    def __init__(self, ssl_context=None, proxy_ssl_context=None, source_address=None, **kwargs):
+    def __init__(self, ssl_context=None, proxy_ssl_context=None, source_address=None,
+                 connection_metrics=None, dns_cache=None, **kwargs):
+        self._connection_metrics = connection_metrics
+        self._dns_cache = dns_cache
         self._pm_args = {}
         if ssl_context:
             self._pm_args['ssl_context'] = ssl_context
@@ -168,13 +260,18 @@ def __init__(self, ssl_context=None, proxy_ssl_context=None, source_address=None
         super().__init__(**kwargs)
 
     def init_poolmanager(self, *args, **kwargs):
-        return super().init_poolmanager(*args, **kwargs, **self._pm_args)
+        super().init_poolmanager(*args, **kwargs, **self._pm_args)
+        self.poolmanager.pool_classes_by_scheme = METRICS_POOL_CLASSES
 
     def proxy_manager_for(self, proxy, **proxy_kwargs):
         extra_kwargs = {}
-        if not proxy.lower().startswith('socks') and self._proxy_ssl_context:
+        is_socks = proxy.lower().startswith('socks')
+        if not is_socks and self._proxy_ssl_context:
             extra_kwargs['proxy_ssl_context'] = self._proxy_ssl_context
-        return super().proxy_manager_for(proxy, **proxy_kwargs, **self._pm_args, **extra_kwargs)
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs, **self._pm_args, **extra_kwargs)
+        if not is_socks:
+            manager.pool_classes_by_scheme = METRICS_POOL_CLASSES
+        return manager
 
     # Skip `requests` internal verification; we use our own SSLContext
     def cert_verify(*args, **kwargs):
@@ -188,7 +285,12 @@ def get_connection_with_tls_context(self, request, verify, proxies=None, cert=No
         if proxy := select_proxy(url, proxies):
             manager = self.proxy_manager_for(proxy)
 
-        return manager.connection_from_url(url)
+        pool = manager.connection_from_url(url)
+        pool._yt_dlp_metrics = self._connection_metrics
+        # Hosts are resolved by the proxy
+        if not proxy:
+            pool._yt_dlp_dns_cache = self._dns_cache
+        return pool
 
 
 class RequestsSession(requests.sessions.Session):
@@ -250,15 +352,27 @@ class RequestsRH(RequestHandler, InstanceStoreMixin):
 
     """Requests RequestHandler
     https://github.com/psf/requests
+
+    Host names are resolved through a DNS cache and TLS sessions are resumed when
+    reconnecting to a server. How the connections are used is counted by host,
+    see connection_metrics().
+
+    @param pool_size: Maximum number of idle connections kept open to the same host.
+                      Should be at least the number of concurrent requests to a host,
+                      otherwise connections are discarded instead of being reused.
     """
     _SUPPORTED_URL_SCHEMES = ('http', 'https')
     _SUPPORTED_ENCODINGS = tuple(SUPPORTED_ENCODINGS)
     _SUPPORTED_PROXY_SCHEMES = ('http', 'https', 'socks4', 'socks4a', 'socks5', 'socks5h')
     _SUPPORTED_FEATURES = (Features.NO_PROXY, Features.ALL_PROXY)
     RH_NAME = 'requests'
+    _DEFAULT_POOL_SIZE = 10
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, pool_size: int | None = None, **kwargs):
         super().__init__(*args, **kwargs)
+        self.pool_size = pool_size or self._DEFAULT_POOL_SIZE
+        self._connection_metrics = ConnectionMetrics()
+        self._dns_cache = DNSCache()
 
         # Forward urllib3 debug messages to our logger
         logger = logging.getLogger('urllib3')
@@ -291,11 +405,20 @@ def _check_extensions(self, extensions):
         extensions.pop('legacy_ssl', None)
         extensions.pop('keep_header_casing', None)
 
+    def connection_metrics(self):
+        metrics = self._connection_metrics.metrics()
+        if self._dns_cache.hits or self._dns_cache.misses:
+            metrics['DNS cache'] = {'hits': self._dns_cache.hits, 'misses': self._dns_cache.misses}
+        return metrics
+
     def _create_instance(self, cookiejar, legacy_ssl_support=None):
         session = RequestsSession()
         http_adapter = RequestsHTTPAdapter(
-            ssl_context=self._make_sslcontext(legacy_ssl_support=legacy_ssl_support),
+            ssl_context=self._make_sslcontext(legacy_ssl_support=legacy_ssl_support, resume_sessions=True),
             source_address=self.source_address,
+            connection_metrics=self._connection_metrics,
+            dns_cache=self._dns_cache,
+            pool_maxsize=self.pool_size,
             max_retries=urllib3.util.retry.Retry(False),
         )
         session.adapters.clear()
@@ -369,7 +492,7 @@ def requests_preference(rh, request):
 
 
 # Use our socks proxy implementation with requests to avoid an extra dependency.
-class SocksHTTPConnection(urllib3.connection.HTTPConnection):
+class SocksHTTPConnection(MetricsHTTPConnection):
     def __init__(self, _socks_options, *args, **kwargs):  # must use _socks_options to pass PoolKey checks
         self._proxy_args = _socks_options
         super().__init__(*args, **kwargs)
@@ -392,15 +515,15 @@ def _new_conn(self):
                 self, f'Failed to establish a new connection: {e}') from e
 
 
-class SocksHTTPSConnection(SocksHTTPConnection, urllib3.connection.HTTPSConnection):
+class SocksHTTPSConnection(SocksHTTPConnection, MetricsHTTPSConnection):
     pass
 
 
-class SocksHTTPConnectionPool(urllib3.HTTPConnectionPool):
+class SocksHTTPConnectionPool(MetricsHTTPConnectionPool):
     ConnectionCls = SocksHTTPConnection
 
 
-class SocksHTTPSConnectionPool(urllib3.HTTPSConnectionPool):
+class SocksHTTPSConnectionPool(MetricsHTTPSConnectionPool):
     ConnectionCls = SocksHTTPSConnection
 
 
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import base64
+import email.utils
+import hashlib
+import io
+import json
+import re
+import threading
+import time
+import typing
+
+from .common import Request, Response
+from .exceptions import HTTPError
+
+if typing.TYPE_CHECKING:
+    from ..cookies import YoutubeDLCookieJar
+
+
+class _PrefixedReader(io.RawIOBase):
+    """The bytes that were already read from a response, followed by the rest of it"""
+
+    def __init__(self, prefix: bytes, response: Response):
+        self._prefix = io.BytesIO(prefix)
+        self._response = response
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        return super().read(-1 if size is None else size)
+
+    def readinto(self, buffer):
+        size = self._prefix.readinto(buffer)
+        if size:
+            return size
+        data = self._response.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        self._response.close()
+        super().close()
+
+
+class HTTPCache:
+    """
+    Cache of the responses to GET requests with the 'http_cache' extension
+
+    The value of the extension is the number of seconds a response is fresh for,
+    or None to use the freshness given by its Cache-Control or Expires headers.
+    A stale response is revalidated with its ETag or Last-Modified header.
+
+    Only complete 200 responses with a textual content type (webpages, JSON,
+    JavaScript, manifests, ...) of up to max_body_size bytes are stored, so that
+    media is never cached. Responses that set cookies, vary on anything or have
+    "Cache-Control: no-store" aren't stored either.
+
+    @param store: Where the entries are stored, e.g. a yt_dlp.cache.Cache.
+                  It must have the methods load(section, key) and store(section, key, data)
+    @param cookiejar: The cookies sent with a request are part of its cache key
+    """
+
+    SECTION = 'http'
+    _MAX_BODY_SIZE = 8 * 1024 * 1024
+    _CACHEABLE_TYPE_RE = re.compile(
+        r'(?i)\s*(?:text/[\w.+-]+|application/(?:[\w.-]+\+)?(?:json|xml)|application/(?:x-)?javascript'
+        r'|application/(?:vnd\.apple\.|x-)mpegurl)\s*(?:;|$)')
+
+    def __init__(self, store, cookiejar: YoutubeDLCookieJar | None = None, max_body_size=None):
+        self._store = store
+        self.cookiejar = cookiejar
+        self.max_body_size = max_body_size or self._MAX_BODY_SIZE
+        self._lock = threading.Lock()
+        self.hits = self.revalidated = self.misses = 0
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _key(self, request: Request):
+        cookies = self.cookiejar.get_cookie_header(request.url) if self.cookiejar else None
+        return hashlib.sha256(json.dumps([
+            request.method, request.url, sorted((k.lower(), v) for k, v in request.headers.items()), cookies,
+        ]).encode()).hexdigest()
+
+    @staticmethod
+    def _lifetime(headers, ttl):
+        """@returns The number of seconds the response is fresh for, or None if it must not be stored"""
+        directives = {}
+        for directive in (headers.get('Cache-Control') or '').split(','):
+            name, _, value = directive.partition('=')
+            directives[name.strip().lower()] = value.strip().strip('"')
+        if 'no-store' in directives:
+            return None
+        if ttl is not None:
+            return ttl
+        if 'no-cache' in directives:
+            return 0
+        if directives.get('max-age', '').isdecimal():
+            age = headers.get('Age') or ''
+            return max(int(directives['max-age']) - (int(age) if age.isdecimal() else 0), 0)
+        try:
+            expires = email.utils.parsedate_to_datetime(headers['Expires']).timestamp()
+            date = email.utils.parsedate_to_datetime(headers['Date']).timestamp() if headers.get('Date') else time.time()
+        except (KeyError, TypeError, ValueError):
+            return 0
+        return max(expires - date, 0)
+
+    def _is_storable(self, response: Response):
+        length = response.headers.get('Content-Length') or ''
+        return (
+            response.status == 200
+            and self._CACHEABLE_TYPE_RE.match(response.headers.get('Content-Type') or '')
+            and not (length.isdecimal() and int(length) > self.max_body_size)
+            and not response.headers.get('Set-Cookie')
+            and response.headers.get('Vary', '').strip() != '*')
+
+    def _read_body(self, response: Response):
+        """@returns (body, None), or (None, what was read) if the body is larger than max_body_size"""
+        chunks, size = [], 0
+        while size <= self.max_body_size:
+            chunk = response.read(self.max_body_size + 1 - size)
+            if not chunk:
+                return b''.join(chunks), None
+            chunks.append(chunk)
+            size += len(chunk)
+        return None, b''.join(chunks)
+
+    @staticmethod
+    def _make_response(entry):
+        body = base64.b64decode(entry['body'])
+        response = Response(io.BytesIO(body), entry['url'], {}, status=entry['status'], reason=entry['reason'])
+        # The body was stored decoded
+        for name, value in entry['headers']:
+            if name.lower() not in ('content-encoding', 'content-length'):
+                response.headers.add_header(name, value)
+        response.headers['Content-Length'] = str(len(body))
+        return response
+
+    def _save(self, key, entry):
+        self._store.store(self.SECTION, key, entry)
+
+    def send(self, request: Request, ttl, send: typing.Callable[[Request], Response]) -> Response:
+        """Send the request with send(), unless its response is cached"""
+        if request.method != 'GET' or request.data is not None:
+            return send(request)
+
+        key = self._key(request)
+        entry = self._store.load(self.SECTION, key)
+        now = time.time()
+        if entry:
+            if now < (entry['expires'] if ttl is None else entry['stored'] + ttl):
+                self._count('hits')
+                return self._make_response(entry)
+            if entry.get('etag'):
+                request.headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request.headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            response = send(request)
+        except HTTPError as e:
+            if not (entry and e.status == 304):
+                raise
+            response = e.response
+        if entry and response.status == 304:
+            response.close()
+            self._count('revalidated')
+            lifetime = self._lifetime(response.headers, ttl)
+            if lifetime is not None:
+                entry.update({'stored': now, 'expires': now + lifetime})
+                self._save(key, entry)
+            return self._make_response(entry)
+
+        self._count('misses')
+        lifetime = self._lifetime(response.headers, ttl)
+        etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+        if lifetime is None or not (lifetime or etag or last_modified) or not self._is_storable(response):
+            return response
+
+        body, prefix = self._read_body(response)
+        if body is None:
+            return Response(
+                _PrefixedReader(prefix, response), response.url, response.headers,
+                status=response.status, reason=response.reason, extensions=response.extensions)
+        response.close()
+        entry = {
+            'url': response.url,
+            'status': response.status,
+            'reason': response.reason,
+            'headers': list(response.headers.items()),
+            'body': base64.b64encode(body).decode(),
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored': now,
+            'expires': now + lifetime,
+        }
+        self._save(key, entry)
+        return self._make_response(entry)
@@ -57,21 +57,36 @@ class RequestDirector:
     can be registered into the `preferences` set. These are used to sort handlers
     in order of preference.
 
+    Requests with the 'http_cache' extension are sent through the cache, if any.
+    The extension is removed before the request is passed to a RequestHandler.
+
     @param logger: Logger instance.
     @param verbose: Print debug request information to stdout.
+    @param cache: yt_dlp.networking.cache.HTTPCache instance.
     """
 
-    def __init__(self, logger, verbose=False):
+    def __init__(self, logger, verbose=False, cache=None):
         self.handlers: dict[str, RequestHandler] = {}
         self.preferences: set[Preference] = set()
         self.logger = logger  # TODO(Grub4k): default logger
         self.verbose = verbose
+        self.cache = cache
 
     def close(self):
         for handler in self.handlers.values():
             handler.close()
         self.handlers.clear()
 
+    def connection_metrics(self):
+        """@returns The connection counters of all handlers, summed by host"""
+        metrics = {}
+        for handler in self.handlers.values():
+            for host, counts in handler.connection_metrics().items():
+                host_metrics = metrics.setdefault(host, {})
+                for name, count in counts.items():
+                    host_metrics[name] = host_metrics.get(name, 0) + count
+        return metrics
+
     def add_handler(self, handler: RequestHandler):
         """Add a handler. If a handler of the same RH_KEY exists, it will overwrite it"""
         assert isinstance(handler, RequestHandler), 'handler must be a RequestHandler'
@@ -100,6 +115,14 @@ def send(self, request: Request) -> Response:
 
         assert isinstance(request, Request)
 
+        if 'http_cache' in request.extensions:
+            request = request.copy()
+            ttl = request.extensions.pop('http_cache')
+            if self.cache is not None:
+                return self.cache.send(request, ttl, self._send)
+        return self._send(request)
+
+    def _send(self, request: Request) -> Response:
         unexpected_errors = []
         unsupported_errors = []
         for handler in self._get_handlers(request):
@@ -249,12 +272,13 @@ def __init__(
         self.legacy_ssl_support = legacy_ssl_support
         super().__init__()
 
-    def _make_sslcontext(self, legacy_ssl_support=None):
+    def _make_sslcontext(self, legacy_ssl_support=None, **kwargs):
         return make_ssl_context(
             verify=self.verify,
             legacy_support=legacy_ssl_support if legacy_ssl_support is not None else self.legacy_ssl_support,
             use_certifi=not self.prefer_system_certs,
             **self._client_cert,
+            **kwargs,
         )
 
     def _merge_headers(self, request_headers):
@@ -366,6 +390,10 @@ def _send(self, request: Request):
     def close(self):  # noqa: B027
         pass
 
+    def connection_metrics(self) -> dict[str, dict[str, int | float]]:
+        """@returns Counters of how the connections to each host were used. Redefine in subclasses."""
+        return {}
+
     @classproperty
     def RH_NAME(cls):
         return cls.__name__[:-2]
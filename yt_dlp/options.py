@@ -607,6 +607,57 @@ def _preset_alias_callback(option, opt_str, value, parser):
         '--disable-third-api',
         action='store_true', dest='disable_third_api', default=False,
         help='Disable third-party API usage')
+    general.add_option(
+        '--concurrent-extractions',
+        metavar='N', dest='concurrent_extractions', default=1, type=int,
+        help=(
+            'Number of URLs or playlist items to extract concurrently while the previous ones are downloaded (default is %default). '
+            'Items are still processed and downloaded in order'))
+    general.add_option(
+        '--third-api-rate-limit',
+        metavar='[API:]CALLS/PERIOD', dest='third_api_rate_limits', default={}, type='str',
+        action='callback', callback=_dict_from_options_callback,
+        callback_kwargs={
+            'allowed_keys': r'[\w-]+',
+            'default_key': 'default',
+        }, help=(
+            'Limit the calls to a third-party API, e.g. youtube:10/1m. '
+            'The APIs are youtube, instagram, mutil and those that are chosen with __third_api__ (e.g. zm_rapidapi). '
+            'Without the API prefix, the limit applies to every API. '
+            'The limits are shared by all the yt-dlp processes on this machine. '
+            'This option can be used multiple times'))
+    general.add_option(
+        '--third-api-repeat-interval',
+        metavar='SECONDS', dest='third_api_repeat_interval', default=None, type=float,
+        help='Minimum time between two third-party API calls for the same video (default is 600)')
+    general.add_option(
+        '--third-api-rate-limit-state',
+        metavar='STATE', dest='third_api_rate_limit_state', default=None, choices=('file', 'memory'),
+        help=(
+            'Where to keep the third-party API rate limits. "file" shares them with the other processes '
+            'through a memory mapped file in the temporary directory (default). "memory" only applies them to this process'))
+    general.add_option(
+        '--extractor-fallback-order',
+        metavar='IE_KEYS', dest='extractor_fallback_order', default=None,
+        type='str', action='callback', callback=_list_from_options_callback,
+        callback_kwargs={'append': False},
+        help=(
+            'Comma separated extractor keys to try, in this order, when the extractor of a URL fails. '
+            'Extractors not listed are not tried (default: ThirdApi,Generic,SearchForAlternative)'))
+    general.add_option(
+        '--race-extractor-fallbacks',
+        action='store_true', dest='race_extractor_fallbacks', default=False,
+        help=(
+            'When the extractor of a URL fails, run the fallback extractors concurrently instead of one after '
+            'another, using the result of the first one in --extractor-fallback-order that succeeds'))
+    general.add_option(
+        '--no-race-extractor-fallbacks',
+        action='store_false', dest='race_extractor_fallbacks',
+        help='Try the fallback extractors one after another (default)')
+    general.add_option(
+        '--extractor-fallback-timeout',
+        metavar='SECONDS', dest='extractor_fallback_timeout', default=None, type=float,
+        help='With --race-extractor-fallbacks, abandon fallbacks that have not finished after this many seconds')
 
     network = optparse.OptionGroup(parser, 'Network Options')
     network.add_option(
@@ -637,6 +688,26 @@ def _preset_alias_callback(option, opt_str, value, parser):
         dest='list_impersonate_targets', default=False, action='store_true',
         help='List available clients to impersonate.',
     )
+    network.add_option(
+        '--http2',
+        action='store_true', dest='http2', default=False,
+        help=(
+            'Use HTTP/2 for HTTPS requests if the server supports it, so that concurrent '
+            'requests to the same host (e.g. fragments) share a connection. Requires httpx and h2'))
+    network.add_option(
+        '--no-http2',
+        action='store_false', dest='http2',
+        help='Use HTTP/1.1 for all requests (default)')
+    network.add_option(
+        '--http2-max-streams',
+        metavar='NUMBER', dest='http2_max_streams', default=None, type=int,
+        help='Maximum number of requests open at once to the same host with --http2 (default: as many as the server allows)')
+    network.add_option(
+        '--http-pool-size',
+        metavar='NUMBER', dest='http_pool_size', default=None, type=int,
+        help=(
+            'Maximum number of idle connections kept open to the same host. '
+            'Default is enough for the concurrent fragment, format and HTTP connection downloads'))
     network.add_option(
         '-4', '--force-ipv4',
         action='store_const', const='0.0.0.0', dest='source_address',
@@ -789,6 +860,13 @@ def _preset_alias_callback(option, opt_str, value, parser):
         '--no-download-archive',
         dest='download_archive', action='store_const', const=None,
         help='Do not use archive file (default)')
+    selection.add_option(
+        '--convert-download-archive', metavar='FILE',
+        dest='convert_download_archive', default=None,
+        help=(
+            'Copy the IDs in the --download-archive file to FILE, dropping duplicates, and exit. '
+            'FILE is created as an SQLite archive if its extension is .sqlite, .sqlite3 or .db, '
+            'otherwise as a text archive. Use this to migrate or compact an archive'))
     selection.add_option(
         '--max-downloads',
         dest='max_downloads', metavar='NUMBER', type=int, default=None,
@@ -1016,6 +1094,29 @@ def _preset_alias_callback(option, opt_str, value, parser):
         '-N', '--concurrent-fragments',
         dest='concurrent_fragment_downloads', metavar='N', default=1, type=int,
         help='Number of fragments of a dash/hlsnative video that should be downloaded concurrently (default is %default)')
+    downloader.add_option(
+        '--concurrent-formats',
+        dest='concurrent_format_downloads', metavar='N', default=1, type=int,
+        help=(
+            'Number of the formats of a merged format (e.g. bv+ba) that should be downloaded concurrently. '
+            'They share the --limit-rate (default is %default)'))
+    downloader.add_option(
+        '--stream-merge',
+        action='store_true', dest='stream_merge', default=False,
+        help=(
+            'Merge the DASH/HLS formats of a merged format with ffmpeg while their fragments are being downloaded, '
+            'without writing the formats to disk. Such downloads can not be resumed. '
+            'Only available on POSIX systems when the formats are downloaded by the native downloaders'))
+    downloader.add_option(
+        '--no-stream-merge',
+        action='store_false', dest='stream_merge',
+        help='Download the formats to separate files and merge them afterwards (default)')
+    downloader.add_option(
+        '--fragment-straggler-percentile',
+        dest='fragment_straggler_percentile', metavar='PERCENTILE', default=None, type=float,
+        help=(
+            'When downloading fragments concurrently, start downloading a fragment again alongside the slow attempt '
+            'if it takes longer than this percentile of the completed fragment downloads, e.g. 95 (default is disabled)'))
     downloader.add_option(
         '-r', '--limit-rate', '--rate-limit',
         dest='ratelimit', metavar='RATE',
@@ -1065,6 +1166,16 @@ def _preset_alias_callback(option, opt_str, value, parser):
         '--no-keep-fragments',
         action='store_false', dest='keep_fragments',
         help='Delete downloaded fragments after downloading is finished (default)')
+    downloader.add_option(
+        '--fragments-in-memory',
+        action='store_true', dest='fragments_in_memory', default=False,
+        help=(
+            'Keep fragments of DASH/hlsnative downloads in memory until they are appended '
+            'instead of writing each of them to a temporary file. Has no effect with --keep-fragments'))
+    downloader.add_option(
+        '--no-fragments-in-memory',
+        action='store_false', dest='fragments_in_memory',
+        help='Write each fragment to a temporary file before appending it (default)')
     downloader.add_option(
         '--buffer-size',
         dest='buffersize', metavar='SIZE', default='1024',
@@ -1083,6 +1194,12 @@ def _preset_alias_callback(option, opt_str, value, parser):
         help=(
             'Size of a chunk for chunk-based HTTP downloading, e.g. 10485760 or 10M (default is disabled). '
             'May be useful for bypassing bandwidth throttling imposed by a webserver (experimental)'))
+    downloader.add_option(
+        '--http-connections',
+        dest='http_connections', metavar='N', default=1, type=int,
+        help=(
+            'Number of connections to download a file over HTTP with, each fetching a part of the file, '
+            'when the server supports ranges (default is %default)'))
     downloader.add_option(
         '--test',
         action='store_true', dest='test', default=False,
@@ -1390,6 +1507,13 @@ def _preset_alias_callback(option, opt_str, value, parser):
         '--print-traffic',
         dest='debug_printtraffic', action='store_true', default=False,
         help='Display sent and read HTTP traffic')
+    verbosity.add_option(
+        '--profile-startup',
+        dest='profile_startup', action='store_true', default=False,
+        help=(
+            'Display how long the slowest modules took to import when exiting. '
+            'Only the modules imported after the configuration files are read are included '
+            'unless this option is given on the command line'))
 
     filesystem = optparse.OptionGroup(parser, 'Filesystem Options')
     filesystem.add_option(
@@ -1567,6 +1691,20 @@ def _preset_alias_callback(option, opt_str, value, parser):
         '--webview-downpage-params',
         dest='webview_downpage_params', default=None,
         help='Params of the webview to download the webpage')
+    filesystem.add_option(
+        '--webview-workers',
+        dest='webview_workers', metavar='N', default=0, type=int,
+        help=(
+            'Number of persistent webview processes to run instead of starting the webview for every URL. '
+            'The webview must support the line-delimited JSON worker protocol (default is 0, disabled)'))
+    filesystem.add_option(
+        '--webview-worker-params',
+        dest='webview_worker_params', default=None,
+        help='Params used to start the webview as a persistent worker (default is "--worker")')
+    filesystem.add_option(
+        '--webview-worker-max-requests',
+        dest='webview_worker_max_requests', metavar='N', default=None, type=int,
+        help='Restart a webview worker after it has served this many requests (default is unlimited)')
     filesystem.add_option(
         '--force-use-webview',
         action='store_true', dest='force_use_webview', default=False,
@@ -1591,6 +1729,24 @@ def _preset_alias_callback(option, opt_str, value, parser):
         '--no-cookies-from-browser',
         action='store_const', const=None, dest='cookiesfrombrowser',
         help='Do not load cookies from browser (default)')
+    filesystem.add_option(
+        '--cookies-from-browser-cache',
+        action='store_true', dest='cookiesfrombrowser_cache', default=False,
+        help=(
+            'Keep the cookies loaded with --cookies-from-browser in the cache directory, '
+            'so that they are only loaded again when the browser\'s cookie database changes. '
+            'Note that the cookies are stored unencrypted'))
+    filesystem.add_option(
+        '--no-cookies-from-browser-cache',
+        action='store_false', dest='cookiesfrombrowser_cache',
+        help='Load the cookies from the browser every time (default)')
+    filesystem.add_option(
+        '--cookies-from-browser-domains',
+        action='callback', dest='cookiesfrombrowser_domains', metavar='DOMAINS', type='str',
+        default=[], callback=_list_from_options_callback,
+        help=(
+            'Only load the cookies of these domains and their subdomains with --cookies-from-browser, '
+            'separated by commas, e.g. "youtube.com,google.com"'))
     filesystem.add_option(
         '--cache-dir', dest='cachedir', default=None, metavar='DIR',
         help=(
@@ -1603,6 +1759,50 @@ def _preset_alias_callback(option, opt_str, value, parser):
         '--rm-cache-dir',
         action='store_true', dest='rm_cachedir',
         help='Delete all filesystem cache files')
+    filesystem.add_option(
+        '--cache-backend',
+        dest='cache_backend', metavar='BACKEND', default=None, choices=('json', 'sqlite'),
+        help=(
+            'How to store the cache; one of "json" (one file per entry, default) or '
+            '"sqlite" (a single database that can be shared by concurrent processes)'))
+    filesystem.add_option(
+        '--cache-ttl',
+        dest='cache_ttl', metavar='[SECTION:]SECONDS', default={}, type='str',
+        action='callback', callback=_dict_from_options_callback,
+        callback_kwargs={
+            'allowed_keys': r'[\w.-]+',
+            'default_key': 'default',
+            'process_key': None,
+        }, help=(
+            'Discard cache entries older than this, optionally prefixed by the cache SECTION to apply it to. '
+            'This option can be used multiple times, e.g. --cache-ttl 1d --cache-ttl youtube-nsig:1h'))
+    filesystem.add_option(
+        '--cache-max-size',
+        dest='cache_max_size', metavar='SIZE', default=None,
+        help='Evict the least recently used cache entries when the cache exceeds SIZE, e.g. 50M. Only with --cache-backend sqlite')
+    filesystem.add_option(
+        '--http-cache',
+        action='store_true', dest='http_cache', default=False,
+        help=(
+            'Cache the responses to the webpage, API and manifest requests of the extractors in the "http" cache '
+            'section, honoring their Cache-Control headers and revalidating them with ETag/Last-Modified. '
+            'Media is never cached. Use --cache-max-size to bound its size'))
+    filesystem.add_option(
+        '--no-http-cache',
+        action='store_false', dest='http_cache',
+        help='Do not cache HTTP responses (default)')
+    filesystem.add_option(
+        '--http-cache-ttl',
+        dest='http_cache_ttl', metavar='[EXTRACTOR:]SECONDS', default={}, type='str',
+        action='callback', callback=_dict_from_options_callback,
+        callback_kwargs={'default_key': 'default'}, help=(
+            'Consider the cached responses fresh for this long regardless of their headers, optionally prefixed by '
+            'the key of the EXTRACTOR to apply it to. This option can be used multiple times, '
+            'e.g. --http-cache-ttl 1h --http-cache-ttl youtubetab:10m'))
+    filesystem.add_option(
+        '--cache-stats',
+        action='store_true', dest='cache_stats', default=False,
+        help='Print the number of entries and size of each cache section')
 
     thumbnail = optparse.OptionGroup(parser, 'Thumbnail Options')
     thumbnail.add_option(
@@ -1792,6 +1992,22 @@ def _preset_alias_callback(option, opt_str, value, parser):
             'One of never (do nothing), warn (only emit a warning), '
             'detect_or_warn (the default; fix the file if we can, warn otherwise), '
             'force (try fixing even if the file already exists)'))
+    postproc.add_option(
+        '--fuse-postprocessors',
+        action='store_true', dest='fuse_postprocessors', default=True,
+        help=(
+            'Run consecutive ffmpeg postprocessors that only copy streams (merging, fixups, embedding '
+            'metadata, subtitles and mkv thumbnails) with a single ffmpeg invocation (default)'))
+    postproc.add_option(
+        '--no-fuse-postprocessors',
+        action='store_false', dest='fuse_postprocessors',
+        help='Run every ffmpeg postprocessor separately, rewriting the file each time')
+    postproc.add_option(
+        '--ffmpeg-jobs',
+        metavar='N', dest='ffmpeg_jobs', default=None, type=int,
+        help=(
+            'Number of ffmpeg processes to run at a time when splitting chapters '
+            'or converting thumbnails (default is the number of CPUs)'))
     postproc.add_option(
         '--ffmpeg-location', metavar='PATH',
         dest='ffmpeg_location',
@@ -28,6 +28,7 @@ class EmbedThumbnailPPError(PostProcessingError):
 
 
 class EmbedThumbnailPP(FFmpegPostProcessor):
+    _FUSABLE = True
 
     def __init__(self, downloader=None, already_have_thumbnail=False):
         FFmpegPostProcessor.__init__(self, downloader)
@@ -53,6 +54,10 @@ def guess():
     def _report_run(self, exe, filename):
         self.to_screen(f'{exe}: Adding thumbnail to "{filename}"')
 
+    def _can_fuse(self, info, plan):
+        # Other containers are not rewritten by ffmpeg, unless the other methods fail
+        return info['ext'] in ('mkv', 'mka')
+
     @PostProcessor._restrict_to(images=False)
     def run(self, info):
         filename = info['filepath']
@@ -84,6 +89,16 @@ def run(self, info):
             thumbnail_filename = convertor.convert_thumbnail(thumbnail_filename, 'png')
             thumbnail_ext = 'png'
 
+        if self._fusion_plan:
+            mimetype = f'image/{thumbnail_ext.replace("jpg", "jpeg")}'
+            self._report_run('ffmpeg', filename)
+            self._fusion_plan.add_options(*self._fusion_plan.attach(
+                thumbnail_filename, {'mimetype': mimetype, 'filename': f'cover.{thumbnail_ext}'},
+                replace=(('tags', 'mimetype'), mimetype)))
+            self._fusion_plan.add_step(self, lambda: self._delete_downloaded_files(
+                thumbnail_filename if not self._already_have_thumbnail else None, info=info))
+            return [], info
+
         mtime = os.stat(filename).st_mtime
 
         success = True
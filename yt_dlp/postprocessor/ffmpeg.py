@@ -1,11 +1,14 @@
 import collections
+import concurrent.futures
 import contextvars
+import copy
 import functools
 import itertools
 import json
 import os
 import re
 import subprocess
+import threading
 import time
 
 from .common import PostProcessor
@@ -83,8 +86,63 @@ class FFmpegPostProcessorError(PostProcessingError):
     pass
 
 
+class FFprobeCache:
+    """
+    Results of probing files, shared by all the postprocessors of the process
+
+    A result is only used while its path still refers to the same file,
+    identified by its size, mtime and inode, so a file is probed again
+    once a postprocessor has rewritten it
+    """
+
+    _MAX_ENTRIES = 256
+
+    def __init__(self):
+        self._entries = {}  # path -> (executable, identity, result)
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def _identity(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+    def get(self, path, probe, executable=None):
+        """Get the result of probe() for the file at path, only calling it if it is not cached"""
+        key, identity = os.path.abspath(path), self._identity(path)
+        if identity is not None:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry and entry[:2] == (executable, identity):
+                    self.hits += 1
+                    return copy.deepcopy(entry[2])
+                self.misses += 1
+
+        result = probe()
+        if identity is not None:
+            with self._lock:
+                self._entries.pop(key, None)
+                self._entries[key] = (executable, identity, copy.deepcopy(result))
+                while len(self._entries) > self._MAX_ENTRIES:
+                    del self._entries[next(iter(self._entries))]
+        return result
+
+    def invalidate(self, path):
+        with self._lock:
+            self._entries.pop(os.path.abspath(path), None)
+
+
 class FFmpegPostProcessor(PostProcessor):
+    # Whether the operations of the postprocessor can be fused with others by FFmpegFusedPP.
+    # This is not inherited, so that subclasses that change the operations are not fused
+    _FUSABLE = False
+    # The plan to add the operations to instead of running ffmpeg, see FFmpegFusedPP
+    _fusion_plan = None
     _ffmpeg_location = contextvars.ContextVar('ffmpeg_location', default=None)
+    probe_cache = FFprobeCache()
 
     def __init__(self, downloader=None):
         PostProcessor.__init__(self, downloader)
@@ -209,6 +267,19 @@ def probe_available(self):
     def probe_executable(self):
         return self._paths.get(self.probe_basename)
 
+    @property
+    def fusable(self):
+        return bool(vars(type(self)).get('_FUSABLE')) and self.available
+
+    def _hook_progress(self, status, info_dict):
+        # While the operations are only added to a plan, FFmpegFusedPP reports the progress
+        if not self._fusion_plan:
+            super()._hook_progress(status, info_dict)
+
+    def _can_fuse(self, info, plan):
+        """Whether the operations for info can be added to the plan"""
+        return True
+
     @staticmethod
     def stream_copy_opts(copy=True, *, ext=None):
         yield from ('-map', '0')
@@ -232,45 +303,35 @@ def check_version(self):
     def get_audio_codec(self, path):
         if not self.probe_available and not self.available:
             raise PostProcessingError('ffprobe and ffmpeg not found. Please install or provide the path using --ffmpeg-location')
+        if self.probe_available:
+            try:
+                streams = self._probe(path).get('streams') or []
+            except (OSError, ValueError):
+                return None
+            return next((stream.get('codec_name') for stream in streams if stream.get('codec_type') == 'audio'), None)
         try:
-            if self.probe_available:
-                cmd = [
-                    self.probe_executable,
-                    encodeArgument('-show_streams')]
-            else:
-                cmd = [
-                    self.executable,
-                    encodeArgument('-i')]
-            cmd.append(self._ffmpeg_filename_argument(path))
+            cmd = [self.executable, encodeArgument('-i'), self._ffmpeg_filename_argument(path)]
             self.write_debug(f'{self.basename} command line: {shell_quote(cmd)}')
-            stdout, stderr, returncode = Popen.run(
+            _, stderr, returncode = Popen.run(
                 cmd, text=True, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            if returncode != (0 if self.probe_available else 1):
+            if returncode != 1:
                 return None
         except OSError:
             return None
-        output = stdout if self.probe_available else stderr
-        if self.probe_available:
-            audio_codec = None
-            for line in output.split('\n'):
-                if line.startswith('codec_name='):
-                    audio_codec = line.split('=')[1].strip()
-                elif line.strip() == 'codec_type=audio' and audio_codec is not None:
-                    return audio_codec
-        else:
-            # Stream #FILE_INDEX:STREAM_INDEX[STREAM_ID](LANGUAGE): CODEC_TYPE: CODEC_NAME
-            mobj = re.search(
-                r'Stream\s*#\d+:\d+(?:\[0x[0-9a-f]+\])?(?:\([a-z]{3}\))?:\s*Audio:\s*([0-9a-z]+)',
-                output)
-            if mobj:
-                return mobj.group(1)
+        # Stream #FILE_INDEX:STREAM_INDEX[STREAM_ID](LANGUAGE): CODEC_TYPE: CODEC_NAME
+        mobj = re.search(
+            r'Stream\s*#\d+:\d+(?:\[0x[0-9a-f]+\])?(?:\([a-z]{3}\))?:\s*Audio:\s*([0-9a-z]+)',
+            stderr)
+        if mobj:
+            return mobj.group(1)
         return None
 
     def get_metadata_object(self, path, opts=[]):
         if self.probe_basename != 'ffprobe':
             if self.available:
                 try:
-                    return self._get_metadata_object_by_ffmpeg(path)
+                    return self.probe_cache.get(
+                        path, functools.partial(self._get_metadata_object_by_ffmpeg, path), self.executable)
                 except Exception as e:
                     self.report_warning(f'{e}')
 
@@ -278,7 +339,16 @@ def get_metadata_object(self, path, opts=[]):
                 self.report_warning('Only ffprobe is supported for metadata extraction')
             raise PostProcessingError('ffprobe not found. Please install or provide the path using --ffmpeg-location')
         self.check_version()
+        if opts:
+            return self._run_ffprobe(path, opts)
+        return self._probe(path)
 
+    def _probe(self, path):
+        """Get the streams, format and chapters of the file with ffprobe, using the probe_cache"""
+        return self.probe_cache.get(
+            path, functools.partial(self._run_ffprobe, path, ['-show_chapters']), self.probe_executable)
+
+    def _run_ffprobe(self, path, opts):
         cmd = [
             self.probe_executable,
             encodeArgument('-hide_banner'),
@@ -366,12 +436,43 @@ def make_args(file, args, name, number):
             raise FFmpegPostProcessorError(stderr.strip().splitlines()[-1])
         for out_path, _ in output_path_opts:
             if out_path:
+                self.probe_cache.invalidate(out_path)
                 self.try_utime(out_path, oldest_mtime, oldest_mtime)
         return stderr
 
     def run_ffmpeg(self, path, out_path, opts, **kwargs):
         return self.run_ffmpeg_multiple_files([path], out_path, opts, **kwargs)
 
+    def _run_ffmpeg_jobs(self, jobs):
+        """
+        Run real_run_ffmpeg for every (input_path_opts, output_path_opts) in jobs,
+        with up to the ffmpeg_jobs param ffmpeg processes at a time
+
+        All the jobs are run even if some of them fail, and then a single
+        FFmpegPostProcessorError with the errors of all the failed jobs is raised
+        """
+        workers = min(self.get_param('ffmpeg_jobs') or os.cpu_count() or 1, len(jobs))
+        if workers <= 1:
+            for job in jobs:
+                self.real_run_ffmpeg(*job)
+            return
+
+        self.check_version()
+        self.write_debug(f'Running {len(jobs)} ffmpeg jobs with {workers} processes')
+        with concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix='ffmpeg') as pool:
+            futures = [pool.submit(self.real_run_ffmpeg, *job) for job in jobs]
+        errors = []
+        for (_, output_path_opts), future in zip(jobs, futures, strict=True):
+            try:
+                future.result()
+            except FFmpegPostProcessorError as e:
+                errors.append(f'{output_path_opts[0][0]}: {e.msg}')
+        if len(errors) == 1:
+            raise FFmpegPostProcessorError(errors[0])
+        elif errors:
+            raise FFmpegPostProcessorError(
+                f'{len(errors)} of {len(jobs)} ffmpeg jobs failed:\n' + '\n'.join(errors))
+
     @staticmethod
     def _ffmpeg_filename_argument(fn):
         # Always use 'file:' because the filename may contain ':' (ffmpeg
@@ -675,6 +776,7 @@ def _options(target_ext):
 
 class FFmpegEmbedSubtitlePP(FFmpegPostProcessor):
     SUPPORTED_EXTS = ('mp4', 'mov', 'm4a', 'webm', 'mkv', 'mka')
+    _FUSABLE = True
 
     def __init__(self, downloader=None, already_have_subtitle=False):
         super().__init__(downloader)
@@ -729,6 +831,22 @@ def run(self, info):
         if not sub_langs:
             return [], info
 
+        sub_metadata = []
+        for lang, name in zip(sub_langs, sub_names, strict=True):
+            metadata = {'language': ISO639Utils.short2long(lang) or lang}
+            if name:
+                metadata.update(handler_name=name, title=name)
+            sub_metadata.append(metadata)
+
+        files_to_delete = [] if self._already_have_subtitle else sub_filenames
+        self.to_screen(f'Embedding subtitles in "{filename}"')
+        if self._fusion_plan:
+            self._fusion_plan.drop_source_streams('s')
+            for sub_filename, metadata in zip(sub_filenames, sub_metadata, strict=True):
+                self._fusion_plan.add_subtitle(sub_filename, metadata)
+            self._fusion_plan.add_step(self)
+            return files_to_delete, info
+
         input_files = [filename, *sub_filenames]
 
         opts = [
@@ -737,24 +855,20 @@ def run(self, info):
             # postprocessor a second time
             '-map', '-0:s',
         ]
-        for i, (lang, name) in enumerate(zip(sub_langs, sub_names, strict=True)):
+        for i, metadata in enumerate(sub_metadata):
             opts.extend(['-map', f'{i + 1}:0'])
-            lang_code = ISO639Utils.short2long(lang) or lang
-            opts.extend([f'-metadata:s:s:{i}', f'language={lang_code}'])
-            if name:
-                opts.extend([f'-metadata:s:s:{i}', f'handler_name={name}',
-                             f'-metadata:s:s:{i}', f'title={name}'])
+            for key, value in metadata.items():
+                opts.extend([f'-metadata:s:s:{i}', f'{key}={value}'])
 
         temp_filename = prepend_extension(filename, 'temp')
-        self.to_screen(f'Embedding subtitles in "{filename}"')
         self.run_ffmpeg_multiple_files(input_files, temp_filename, opts)
         os.replace(temp_filename, filename)
 
-        files_to_delete = [] if self._already_have_subtitle else sub_filenames
         return files_to_delete, info
 
 
 class FFmpegMetadataPP(FFmpegPostProcessor):
+    _FUSABLE = True
 
     def __init__(self, downloader, add_metadata=True, add_chapters=True, add_infojson='if_exists'):
         FFmpegPostProcessor.__init__(self, downloader)
@@ -769,14 +883,20 @@ def _options(target_ext):
         if audio_only:
             yield from ('-vn', '-acodec', 'copy')
 
+    def _can_fuse(self, info, plan):
+        # The duration of the last chapter is taken from the file, which doesn't exist until it is merged
+        return plan.source is not None or not traverse_obj(info, ('chapters', -1)) or info['chapters'][-1].get('end_time')
+
     @PostProcessor._restrict_to(images=False)
     def run(self, info):
         self._fixup_chapters(info)
+        plan = self._fusion_plan
         filename, metadata_filename = info['filepath'], None
         files_to_delete, options = [], []
         if self._add_chapters and info.get('chapters'):
             metadata_filename = replace_extension(filename, 'meta')
-            options.extend(self._get_chapter_opts(info['chapters'], metadata_filename))
+            options.extend(self._get_chapter_opts(
+                info['chapters'], metadata_filename, plan.add_input(metadata_filename) if plan else 1))
             files_to_delete.append(metadata_filename)
         if self._add_metadata:
             options.extend(self._get_metadata_opts(info))
@@ -794,8 +914,15 @@ def run(self, info):
             self.to_screen('There isn\'t any metadata to add')
             return [], info
 
-        temp_filename = prepend_extension(filename, 'temp')
         self.to_screen(f'Adding metadata to "{filename}"')
+        if plan:
+            plan.add_options(*itertools.chain(*options))
+            if info['ext'] == 'm4a':
+                plan.add_options('-vn')
+            plan.add_step(self, lambda: self._delete_downloaded_files(*files_to_delete))
+            return [], info
+
+        temp_filename = prepend_extension(filename, 'temp')
         self.run_ffmpeg_multiple_files(
             (filename, metadata_filename), temp_filename,
             itertools.chain(self._options(info['ext']), *options))
@@ -804,7 +931,7 @@ def run(self, info):
         return [], info
 
     @staticmethod
-    def _get_chapter_opts(chapters, metadata_filename):
+    def _get_chapter_opts(chapters, metadata_filename, input_index=1):
         with open(metadata_filename, 'w', encoding='utf-8') as f:
             def ffmpeg_escape(text):
                 return re.sub(r'([\\=;#\n])', r'\\\1', text)
@@ -818,7 +945,7 @@ def ffmpeg_escape(text):
                 if chapter_title:
                     metadata_file_content += f'title={ffmpeg_escape(chapter_title)}\n'
             f.write(metadata_file_content)
-        yield ('-map_metadata', '1')
+        yield ('-map_metadata', str(input_index))
 
     def _get_metadata_opts(self, info):
         meta_prefix = 'meta'
@@ -902,6 +1029,12 @@ def _get_infojson_opts(self, info, infofn):
             write_json_file(self._downloader.sanitize_info(info, self.get_param('clean_infojson', True)), infofn)
             info['infojson_filename'] = infofn
 
+        if self._fusion_plan:
+            yield self._fusion_plan.attach(
+                infofn, {'mimetype': 'application/json', 'filename': 'info.json'},
+                replace=(('tags', 'mimetype'), 'application/json'))
+            return
+
         old_stream, new_stream = self.get_stream_number(info['filepath'], ('tags', 'mimetype'), 'application/json')
         if old_stream is not None:
             yield ('-map', f'-0:{old_stream}')
@@ -916,12 +1049,16 @@ def _get_infojson_opts(self, info, infofn):
 
 class FFmpegMergerPP(FFmpegPostProcessor):
     SUPPORTED_EXTS = MEDIA_EXTENSIONS.common_video
+    _FUSABLE = True
+
+    def _can_fuse(self, info, plan):
+        return not plan.steps
 
     @PostProcessor._restrict_to(images=False)
     def run(self, info):
         filename = info['filepath']
         temp_filename = prepend_extension(filename, 'temp')
-        args = ['-c', 'copy']
+        args = []
         audio_streams = 0
         for (i, fmt) in enumerate(info['requested_formats']):
             if fmt.get('acodec') != 'none':
@@ -933,7 +1070,11 @@ def run(self, info):
             if fmt.get('vcodec') != 'none':
                 args.extend(['-map', f'{i}:v:0'])
         self.to_screen(f'Merging formats into "{filename}"')
-        self.run_ffmpeg_multiple_files(info['__files_to_merge'], temp_filename, args)
+        if self._fusion_plan:
+            self._fusion_plan.merge(info['__files_to_merge'], args)
+            self._fusion_plan.add_step(self)
+            return info['__files_to_merge'], info
+        self.run_ffmpeg_multiple_files(info['__files_to_merge'], temp_filename, ['-c', 'copy', *args])
         os.rename(temp_filename, filename)
         return info['__files_to_merge'], info
 
@@ -951,26 +1092,44 @@ def _fixup(self, msg, filename, options):
 
         os.replace(temp_filename, filename)
 
+    def _stream_copy_fixup(self, msg, filename, options=()):
+        """Fix the file by copying all its streams with the given output options"""
+        if self._fusion_plan:
+            self.to_screen(f'{msg} of "{filename}"')
+            self._fusion_plan.add_options(*options)
+            self._fusion_plan.add_step(self)
+            return
+        self._fixup(msg, filename, [*self.stream_copy_opts(), *options])
+
 
 class FFmpegFixupStretchedPP(FFmpegFixupPostProcessor):
+    _FUSABLE = True
+
     @PostProcessor._restrict_to(images=False, audio=False)
     def run(self, info):
         stretched_ratio = info.get('stretched_ratio')
         if stretched_ratio not in (None, 1):
-            self._fixup('Fixing aspect ratio', info['filepath'], [
-                *self.stream_copy_opts(), '-aspect', f'{stretched_ratio:f}'])
+            self._stream_copy_fixup('Fixing aspect ratio', info['filepath'], ['-aspect', f'{stretched_ratio:f}'])
         return [], info
 
 
 class FFmpegFixupM4aPP(FFmpegFixupPostProcessor):
+    _FUSABLE = True
+
     @PostProcessor._restrict_to(images=False, video=False)
     def run(self, info):
         if info.get('container') == 'm4a_dash':
-            self._fixup('Correcting container', info['filepath'], [*self.stream_copy_opts(), '-f', 'mp4'])
+            self._stream_copy_fixup('Correcting container', info['filepath'], ['-f', 'mp4'])
         return [], info
 
 
 class FFmpegFixupM3u8PP(FFmpegFixupPostProcessor):
+    _FUSABLE = True
+
+    def _can_fuse(self, info, plan):
+        # The container of the downloaded file is checked
+        return plan.source is not None
+
     def _needs_fixup(self, info):
         yield info['ext'] in ('mp4', 'm4a')
         yield info['protocol'].startswith('m3u8')
@@ -988,8 +1147,7 @@ def run(self, info):
             args = ['-f', 'mp4']
             if self.get_audio_codec(info['filepath']) == 'aac':
                 args.extend(['-bsf:a', 'aac_adtstoasc'])
-            self._fixup('Fixing MPEG-TS in MP4 container', info['filepath'], [
-                *self.stream_copy_opts(), *args])
+            self._stream_copy_fixup('Fixing MPEG-TS in MP4 container', info['filepath'], args)
         return [], info
 
 
@@ -1016,19 +1174,22 @@ def run(self, info):
 
 class FFmpegCopyStreamPP(FFmpegFixupPostProcessor):
     MESSAGE = 'Copying stream'
+    _FUSABLE = True
 
     @PostProcessor._restrict_to(images=False)
     def run(self, info):
-        self._fixup(self.MESSAGE, info['filepath'], self.stream_copy_opts())
+        self._stream_copy_fixup(self.MESSAGE, info['filepath'])
         return [], info
 
 
 class FFmpegFixupDurationPP(FFmpegCopyStreamPP):
     MESSAGE = 'Fixing video duration'
+    _FUSABLE = True
 
 
 class FFmpegFixupDuplicateMoovPP(FFmpegCopyStreamPP):
     MESSAGE = 'Fixing duplicate MOOV atoms'
+    _FUSABLE = True
 
 
 class FFmpegSubtitlesConvertorPP(FFmpegPostProcessor):
@@ -1146,9 +1307,11 @@ def run(self, info):
         if self._force_keyframes and len(chapters) > 1:
             in_file = self.force_keyframes(in_file, (c['start_time'] for c in chapters))
         self.to_screen(f'Splitting video by chapters; {len(chapters)} chapters found')
+        jobs = []
         for idx, chapter in enumerate(chapters):
             destination, opts = self._ffmpeg_args_for_chapter(idx + 1, chapter, info)
-            self.real_run_ffmpeg([(in_file, opts)], [(destination, self.stream_copy_opts())])
+            jobs.append(([(in_file, opts)], [(destination, list(self.stream_copy_opts()))]))
+        self._run_ffmpeg_jobs(jobs)
         if in_file != info['filepath']:
             self._delete_downloaded_files(in_file, msg=None)
         return [], info
@@ -1185,18 +1348,22 @@ def _options(target_ext):
         if target_ext == 'jpg':
             yield from ('-bsf:v', 'mjpeg2jpeg')
 
-    def convert_thumbnail(self, thumbnail_filename, target_ext):
+    def _convert_thumbnail_job(self, thumbnail_filename, target_ext):
         thumbnail_conv_filename = replace_extension(thumbnail_filename, target_ext)
 
         self.to_screen(f'Converting thumbnail "{thumbnail_filename}" to {target_ext}')
         _, source_ext = os.path.splitext(thumbnail_filename)
-        self.real_run_ffmpeg(
+        return thumbnail_conv_filename, (
             [(thumbnail_filename, [] if source_ext == '.gif' else ['-f', 'image2', '-pattern_type', 'none'])],
-            [(thumbnail_conv_filename, self._options(target_ext))])
+            [(thumbnail_conv_filename, list(self._options(target_ext)))])
+
+    def convert_thumbnail(self, thumbnail_filename, target_ext):
+        thumbnail_conv_filename, job = self._convert_thumbnail_job(thumbnail_filename, target_ext)
+        self.real_run_ffmpeg(*job)
         return thumbnail_conv_filename
 
     def run(self, info):
-        files_to_delete = []
+        files_to_delete, conversions = [], []
         has_thumbnail = False
 
         for idx, thumbnail_dict in enumerate(info.get('thumbnails') or []):
@@ -1213,9 +1380,14 @@ def run(self, info):
             if _skip_msg:
                 self.to_screen(f'Not converting thumbnail "{original_thumbnail}"; {_skip_msg}')
                 continue
-            thumbnail_dict['filepath'] = self.convert_thumbnail(original_thumbnail, target_ext)
+            conversions.append((thumbnail_dict, target_ext, *self._convert_thumbnail_job(original_thumbnail, target_ext)))
+
+        self._run_ffmpeg_jobs([job for *_, job in conversions])
+        for thumbnail_dict, target_ext, thumbnail_conv_filename, _ in conversions:
+            original_thumbnail = thumbnail_dict['filepath']
+            thumbnail_dict['filepath'] = thumbnail_conv_filename
             files_to_delete.append(original_thumbnail)
-            info['__files_to_move'][thumbnail_dict['filepath']] = replace_extension(
+            info['__files_to_move'][thumbnail_conv_filename] = replace_extension(
                 info['__files_to_move'][original_thumbnail], target_ext)
 
         if not has_thumbnail:
@@ -1275,3 +1447,177 @@ def run(self, info):
             'ext': ie_copy['ext'],
         }]
         return files_to_delete, info
+
+
+class FFmpegPostProcessingPlan:
+    """
+    Stream copy operations on a file, to be done with a single ffmpeg invocation
+
+    All the streams of the file (or the streams of the formats being merged into it)
+    are copied, and the postprocessors add inputs, streams, attachments and output options
+    """
+
+    def __init__(self, pp, info):
+        self._pp = pp
+        self.filepath = info['filepath']
+        self.ext = info['ext']
+        # The file whose streams are copied, or None if the formats are being merged
+        self.source = self.filepath
+        self.inputs = [self.filepath]
+        self.maps = list(FFmpegPostProcessor.stream_copy_opts(False))
+        self.options = []
+        self.steps = []
+        self.files_to_delete = []
+        self._callbacks = []
+        self._subtitles = self._attachments = 0
+        self._dropped_streams = set()
+        self._source_streams = None
+
+    @property
+    def source_streams(self):
+        if self._source_streams is None:
+            self._source_streams = self._pp.get_metadata_object(self.source)['streams'] if self.source else []
+        return self._source_streams
+
+    def add_step(self, pp, callback=None):
+        """Record that pp added its operations; callback is called once they are done"""
+        self.steps.append(pp)
+        if callback:
+            self._callbacks.append(callback)
+
+    def merge(self, files, maps):
+        self.source, self.inputs, self.maps = None, list(files), list(maps)
+
+    def add_input(self, path):
+        self.inputs.append(path)
+        return len(self.inputs) - 1
+
+    def add_options(self, *options):
+        self.options.extend(options)
+
+    def drop_source_streams(self, spec):
+        if self.source:
+            self.maps.extend(['-map', f'-0:{spec}'])
+
+    def add_subtitle(self, path, metadata):
+        self.maps.extend(['-map', f'{self.add_input(path)}:0'])
+        for key, value in metadata.items():
+            self.options.extend([f'-metadata:s:s:{self._subtitles}', f'{key}={value}'])
+        self._subtitles += 1
+
+    def attach(self, path, metadata, replace=None):
+        """
+        @param replace  (keys, value) identifying a stream of the source that the attachment replaces
+        @returns        The output options to add the attachment
+        """
+        if replace:
+            old_stream = next((
+                i for i, stream in enumerate(self.source_streams)
+                if i not in self._dropped_streams and traverse_obj(stream, replace[0], casesense=False) == replace[1]), None)
+            if old_stream is not None:
+                self._dropped_streams.add(old_stream)
+                self.maps.extend(['-map', f'-0:{old_stream}'])
+        # The attachments are added after those of the source
+        index = self._attachments + sum(
+            1 for i, stream in enumerate(self.source_streams)
+            if i not in self._dropped_streams and stream.get('codec_type') == 'attachment')
+        self._attachments += 1
+        return ('-attach', self._pp._ffmpeg_filename_argument(path), *itertools.chain.from_iterable(
+            (f'-metadata:s:t:{index}', f'{key}={value}') for key, value in metadata.items()))
+
+    def run(self):
+        opts = [*self.maps, '-c', 'copy']
+        if self._subtitles and self.ext in ('mp4', 'mov', 'm4a'):
+            opts.extend(['-c:s', 'mov_text'])
+        temp_filename = prepend_extension(self.filepath, 'temp')
+        self._pp.run_ffmpeg_multiple_files(self.inputs, temp_filename, [*opts, *self.options])
+        os.replace(temp_filename, self.filepath)
+        for callback in self._callbacks:
+            callback()
+
+
+class FFmpegFusedPP(FFmpegPostProcessor):
+    """
+    Consecutive stream copy postprocessors run with a single ffmpeg invocation
+
+    Instead of rewriting the file, every postprocessor adds its operations to a
+    FFmpegPostProcessingPlan, which is run when a postprocessor can't be added to
+    it or after the last one. If the combined invocation fails, the postprocessors
+    of the plan are run one after the other
+
+    The postprocessor hooks are called for each of the fused postprocessors
+    around the invocation that runs their operations, not for FFmpegFusedPP itself
+    """
+
+    def __init__(self, downloader, pps):
+        super().__init__(downloader)
+        self.pps = pps
+        self._steps = []
+
+    @classmethod
+    def fuse(cls, downloader, pps):
+        """Replace the runs of postprocessors that can be fused"""
+        fused, run = [], []
+        for pp in [*pps, None]:
+            if isinstance(pp, FFmpegPostProcessor) and pp.fusable:
+                run.append(pp)
+                continue
+            fused.extend([cls(downloader, run)] if len(run) > 1 else run)
+            fused.append(pp)
+            run = []
+        return fused[:-1]
+
+    def _configuration_args(self, exe, *args, **kwargs):
+        # The arguments of the fused postprocessors are all used, but only once if they are shared
+        return list(itertools.chain.from_iterable(dict.fromkeys(
+            tuple(pp._configuration_args(exe, *args, **kwargs)) for pp in self._steps)))
+
+    def _run_plan(self, plan, info):
+        if not plan.steps:
+            return [], info
+        self.write_debug(f'Running {", ".join(pp.pp_key() for pp in plan.steps)} with a single ffmpeg invocation')
+        self._steps = plan.steps
+        info_copy = self._copy_infodict(info)
+        for pp in plan.steps:
+            pp._hook_progress({'status': 'started'}, info_copy)
+        try:
+            plan.run()
+        except PostProcessingError as err:
+            if len(plan.steps) == 1:
+                raise
+            self.report_warning(f'Unable to run the postprocessors together, running them one by one: {err}')
+        else:
+            for pp in plan.steps:
+                pp._hook_progress({'status': 'finished'}, info_copy)
+            return plan.files_to_delete, info
+        finally:
+            self._steps = []
+
+        # Each postprocessor deletes its own files and may fail without stopping the others
+        for pp in plan.steps:
+            info = self._downloader.run_pp(pp, info)
+        return [], info
+
+    def _hook_progress(self, status, info_dict):
+        pass
+
+    def run(self, info):
+        files_to_delete = []
+        plan = FFmpegPostProcessingPlan(self, info)
+        for pp in self.pps:
+            if plan.steps and not pp._can_fuse(info, plan):
+                files, info = self._run_plan(plan, info)
+                files_to_delete.extend(files)
+                plan = FFmpegPostProcessingPlan(self, info)
+            if not pp._can_fuse(info, plan):
+                info = self._downloader.run_pp(pp, info)
+                plan = FFmpegPostProcessingPlan(self, info)
+                continue
+            pp._fusion_plan = plan
+            try:
+                files, info = pp.run(info)
+            finally:
+                pp._fusion_plan = None
+            plan.files_to_delete.extend(files)
+        files, info = self._run_plan(plan, info)
+        return [*files_to_delete, *files], info
@@ -1 +1,2 @@
 from .potoken import gen_po_token_run_params  # noqa: F401
+from .pool import PoTokenPool, get_po_token_pool  # noqa: F401
@@ -0,0 +1,116 @@
+import collections
+import threading
+import time
+
+
+class PoTokenPool:
+    """
+    PO tokens minted ahead of time
+
+    `mint` is called in a background thread until `size` unexpired tokens are
+    ready, so that getting a token doesn't have to wait for it to be generated.
+    It must return (po_token, visitor_data), or None if it failed.
+    Tokens are discarded `ttl` seconds after they were minted
+    """
+
+    def __init__(self, mint, size=1, ttl=21600):
+        self.mint = mint
+        self.size = size
+        self.ttl = ttl
+        self._tokens = collections.deque()  # (expires_at, po_token, visitor_data)
+        self._lock = threading.Lock()
+        self._refill_thread = None
+        self._closed = False
+        self.hits = self.misses = self.mints = self.failures = 0
+        self.mint_time = 0.0
+
+    def _mint(self):
+        start = time.monotonic()
+        try:
+            token = self.mint()
+        except Exception:
+            token = None
+        with self._lock:
+            self.mint_time += time.monotonic() - start
+            if token:
+                self.mints += 1
+            else:
+                self.failures += 1
+        return token
+
+    def _prune(self):
+        now = time.time()
+        while self._tokens and self._tokens[0][0] <= now:
+            self._tokens.popleft()
+
+    def _refill(self):
+        try:
+            while True:
+                with self._lock:
+                    self._prune()
+                    if self._closed or len(self._tokens) >= self.size:
+                        return
+                token = self._mint()
+                if not token:
+                    # Don't keep retrying; the next get will try again
+                    return
+                with self._lock:
+                    self._tokens.append((time.time() + self.ttl, *token))
+        finally:
+            with self._lock:
+                self._refill_thread = None
+
+    def refill(self):
+        """Mint tokens in the background until the pool is full"""
+        with self._lock:
+            if self._refill_thread or self._closed or self.size <= 0:
+                return
+            self._refill_thread = threading.Thread(target=self._refill, name='potoken_pool', daemon=True)
+            self._refill_thread.start()
+
+    def get(self):
+        """@returns (po_token, visitor_data), minting it now if none is ready, or None if minting failed"""
+        with self._lock:
+            self._prune()
+            token = self._tokens.popleft()[1:] if self._tokens else None
+            if token:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if not token:
+            token = self._mint()
+        self.refill()
+        return token
+
+    def stats(self):
+        with self._lock:
+            self._prune()
+            attempts = self.mints + self.failures
+            return {
+                'ready': len(self._tokens),
+                'hits': self.hits,
+                'misses': self.misses,
+                'mints': self.mints,
+                'failures': self.failures,
+                'mint_time': self.mint_time / attempts if attempts else None,
+            }
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._tokens.clear()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_po_token_pool(key, mint, size=1, ttl=21600):
+    """Get the pool of this process for key, creating it if needed"""
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = PoTokenPool(mint, size, ttl)
+        else:
+            pool.mint, pool.size, pool.ttl = mint, size, ttl
+        return pool
@@ -1,20 +1,45 @@
+import functools
+import glob
+import hashlib
 import re
 import os
 import tempfile
+import threading
+import time
 import zlib
-from ._compressed_potoken_js_files import js_files
 
+_VISITOR_DATA_TTL = 3600
+_visitor_data = {}
+_visitor_data_lock = threading.Lock()
 
+
+def _js_files():
+    # The compressed files are several MB, so they are only loaded once a PO token is generated
+    from ._compressed_potoken_js_files import js_files
+    return js_files()
+
+
+@functools.cache
 def get_decompress_po_token_js(name):
     try:
-        compressed = js_files()[name]
+        compressed = _js_files()[name]
         return zlib.decompress(compressed).decode('utf-8')
     except Exception:
         return None
 
 
+@functools.cache
+def _get_injected_base_js():
+    inject_js = get_decompress_po_token_js('inject.js')
+    base_js = get_decompress_po_token_js('base.js')
+    if not inject_js or not base_js:
+        return None
+    pattern = r'}\s*\)\(_yt_player\);\s*$'
+    return re.sub(pattern, lambda m: f';{inject_js};{m.group(0)}', base_js)
+
+
 def has_compressed_potoken_js():
-    return bool(js_files())
+    return bool(_js_files())
 
 
 class PoToken:
@@ -31,6 +56,10 @@ def __init__(self, download_webpage_func):
         self._download_webpage_func = download_webpage_func
 
     def _get_visitor_data(self):
+        with _visitor_data_lock:
+            if _visitor_data and time.time() - _visitor_data['timestamp'] < _VISITOR_DATA_TTL:
+                return _visitor_data['value']
+
         if not self._download_webpage_func:
             raise ValueError('Download function not provided')
         response = self._download_webpage_func(PoToken.PAGE_URL, headers=PoToken.HEADERS)
@@ -38,6 +67,8 @@ def _get_visitor_data(self):
         pattern = r'"visitorData"\s*:\s*"([^"]+)'
         match = re.search(pattern, response)
         if match:
+            with _visitor_data_lock:
+                _visitor_data.update(value=match.group(1), timestamp=time.time())
             return match.group(1)
         raise ValueError('No visitor data found')
 
@@ -56,17 +87,25 @@ def _gen_po_token_js(self, visitor_data):
                 }};
             '''
 
-            inject_js = get_decompress_po_token_js('inject.js')
-            base_js = get_decompress_po_token_js('base.js')
-            if not inject_js or not base_js:
+            base_js = _get_injected_base_js()
+            if not base_js:
                 raise ValueError('Failed to get inject.js or base.js')
 
-            pattern = r'}\s*\)\(_yt_player\);\s*$'
-            base_js = re.sub(pattern, f';{inject_js};\\g<0>', base_js)
-
-            temp_file = os.path.join(tempfile.gettempdir(), 'temp_inject.js')
-            with open(temp_file, 'w') as f:
-                f.write(js_prefix + base_js)
+            # The file only depends on the visitor data, so it is written once and shared by all processes
+            content = js_prefix + base_js
+            temp_file = os.path.join(
+                tempfile.gettempdir(), f'potoken_inject_{hashlib.sha256(content.encode()).hexdigest()[:16]}.js')
+            if not os.path.exists(temp_file):
+                for old_file in glob.glob(os.path.join(tempfile.gettempdir(), 'potoken_inject_*.js')):
+                    try:
+                        if time.time() - os.path.getmtime(old_file) > _VISITOR_DATA_TTL * 2:
+                            os.remove(old_file)
+                    except OSError:
+                        pass
+                part_file = f'{temp_file}.{os.getpid()}-{threading.get_ident()}.part'
+                with open(part_file, 'w') as f:
+                    f.write(content)
+                os.replace(part_file, temp_file)
 
             return temp_file
 
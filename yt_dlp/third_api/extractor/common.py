@@ -1,10 +1,8 @@
 import urllib.parse
 from ...utils import remove_query_params, ExtractorError
-from ...utils._utils import locked_file
+from .ratelimit import FileRateLimitState, get_rate_limiter
 import os
 import tempfile
-import json
-import time
 
 
 class RetryError(Exception):
@@ -75,18 +73,22 @@ def check_fmt_url_valid(ie, url):
 class ThirdApiGuard:
 
     @staticmethod
-    def guard(ie, url=None):
+    def guard(ie, url=None, api=None):
+        """
+        @param url  The key of the call, for third_api_repeat_interval
+        @param api  The name of the API, for third_api_rate_limits. Default is the first part of url
+        """
         if not url:
             return
-        guard_instance = ThirdApiGuard(ie, url)
+        guard_instance = ThirdApiGuard(ie, url, api)
         try:
             guard_instance.check_and_save_frequency(url)
         except Exception:
             ie.report_msg(f'guard file: {guard_instance.data_file}')
             raise
 
-    def __init__(self, ie, key=None):
-        self.data_file = os.path.join(tempfile.gettempdir(), 'third_api_guard.json')
+    def __init__(self, ie, key=None, api=None):
+        self.data_file = os.path.join(tempfile.gettempdir(), FileRateLimitState.FILENAME)
         self.disable_third_api = ie._downloader.params.get('disable_third_api', False)
         self.always_allow = os.getenv('API_FREQUENCY_GUARD_ALWAYS_ALLOW', '0').lower() in ['true', '1']
         if not self.disable_third_api:
@@ -94,6 +96,7 @@ def __init__(self, ie, key=None):
             if env_disable_third_api and (env_disable_third_api.lower() == 'true' or env_disable_third_api.lower() == '1'):
                 self.disable_third_api = True
         self.key = key
+        self.api = api
         self.ie = ie
 
     def check_and_save_frequency(self, key=None):
@@ -113,28 +116,13 @@ def _check_and_save_frequency_safely(self, key=None):
             if not key:
                 return False
 
-            existing_data = {}
-            try:
-                os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
-                with locked_file(self.data_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    if content:
-                        existing_data = json.loads(content)
-            except Exception:
-                pass
-
-            now_time = int(time.time())
-            last_time = existing_data.get(key)
-            if last_time:
-                time_diff = now_time - last_time
-                if time_diff < 60 * 10:
-                    return False
-
-            if not existing_data or len(existing_data) >= 30:
-                existing_data = {}
-            existing_data[key] = now_time
-            with locked_file(self.data_file, 'w', encoding='utf-8') as f:
-                f.write(json.dumps(existing_data))
-            return True
+            params = self.ie._downloader.params
+            api = self.api or key.split('-')[0]
+            rate_limits = params.get('third_api_rate_limits') or {}
+            repeat_interval = params.get('third_api_repeat_interval')
+            if repeat_interval is None:
+                repeat_interval = 60 * 10
+            rate_limiter = get_rate_limiter(params.get('third_api_rate_limit_state') or FileRateLimitState.NAME)
+            return rate_limiter.acquire(api, key, repeat_interval, rate_limits.get(api, rate_limits.get('default')))
         except Exception:
             return True
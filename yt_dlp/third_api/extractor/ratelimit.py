@@ -0,0 +1,269 @@
+import collections
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+
+from ...utils._utils import _lock_file, _unlock_file
+
+
+class RateLimitState:
+    """
+    Storage of the rate limiter counters
+
+    A counter is a (timestamp, value) pair identified by its name.
+    Every counter is stored with a TTL, after which it is considered
+    to be empty and its storage can be reused
+    """
+
+    NAME = None
+
+    def update(self, name, func, ttl):
+        """
+        Atomically replace a counter
+
+        @param func     Called with the current counter, or None if there is none.
+                        Returns (new counter or None to delete it, result).
+                        Returning the current counter itself leaves it and its TTL unchanged
+        @returns        The result of func
+        """
+        raise NotImplementedError('This method must be implemented by subclasses')
+
+    def close(self):
+        pass
+
+
+class MemoryRateLimitState(RateLimitState):
+    """Counters that are only shared by the threads of this process"""
+
+    NAME = 'memory'
+    _PRUNE_SIZE = 1024
+
+    def __init__(self):
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def update(self, name, func, ttl):
+        now = time.time()
+        with self._lock:
+            counter, expires = self._counters.get(name, (None, 0))
+            counter = counter if expires > now else None
+            new_counter, result = func(counter)
+            if new_counter is None:
+                self._counters.pop(name, None)
+            elif new_counter is not counter:
+                self._counters[name] = (new_counter, now + ttl)
+            if len(self._counters) > self._PRUNE_SIZE:
+                self._counters = {k: v for k, v in self._counters.items() if v[1] > now}
+            return result
+
+
+class FileRateLimitState(RateLimitState):
+    """
+    Counters shared by all processes through a memory mapped file
+
+    The file is a fixed size open addressing hash table, so that an update
+    only touches a few slots under a short lock instead of rewriting the
+    whole history. Slots of expired counters are reused and, when all the
+    probed slots are in use, the counter closest to expiry is evicted
+    """
+
+    NAME = 'file'
+    FILENAME = 'third_api_rate_limits.bin'
+    _MAGIC = b'YTDLRL01'
+    _HEADER = struct.Struct('<8sI4x')
+    _SLOT = struct.Struct('<Qddd')  # name hash, expiry, timestamp, value
+    _SLOTS = 4096
+    _PROBES = 8
+
+    def __init__(self, filename=None):
+        self.filename = filename or os.path.join(tempfile.gettempdir(), self.FILENAME)
+        self._lock = threading.Lock()
+        self._file = self._mmap = None
+
+    def _open(self):
+        size = self._HEADER.size + self._SLOTS * self._SLOT.size
+        header = self._HEADER.pack(self._MAGIC, self._SLOTS)
+        os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+        f = open(os.open(self.filename, os.O_RDWR | os.O_CREAT, 0o666), 'r+b')
+        try:
+            _lock_file(f, True, True)
+            try:
+                if f.read(self._HEADER.size) != header or os.fstat(f.fileno()).st_size != size:
+                    f.seek(0)
+                    f.truncate()
+                    f.write(header + bytes(size - len(header)))
+                    f.flush()
+            finally:
+                _unlock_file(f)
+            self._mmap = mmap.mmap(f.fileno(), size)
+        except BaseException:
+            f.close()
+            raise
+        self._file = f
+
+    @staticmethod
+    def _hash(name):
+        return int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), 'little') or 1
+
+    def update(self, name, func, ttl):
+        name_hash = self._hash(name)
+        with self._lock:
+            if self._mmap is None:
+                self._open()
+            _lock_file(self._file, True, True)
+            try:
+                now = time.time()
+                start = name_hash % self._SLOTS
+                offset = counter = free = None
+                for i in range(self._PROBES):
+                    slot_offset = self._HEADER.size + (start + i) % self._SLOTS * self._SLOT.size
+                    slot_hash, expires, timestamp, value = self._SLOT.unpack_from(self._mmap, slot_offset)
+                    if slot_hash == name_hash:
+                        offset = slot_offset
+                        counter = (timestamp, value) if expires > now else None
+                        break
+                    if not slot_hash:
+                        expires = 0
+                    if free is None or expires < free[1]:
+                        free = (slot_offset, expires)
+                found = offset is not None
+                if not found:
+                    offset = free[0]
+
+                new_counter, result = func(counter)
+                if new_counter is None:
+                    if found:
+                        self._SLOT.pack_into(self._mmap, offset, 0, 0, 0, 0)
+                elif new_counter is not counter:
+                    self._SLOT.pack_into(self._mmap, offset, name_hash, now + ttl, *new_counter)
+                return result
+            finally:
+                _unlock_file(self._file)
+
+    def close(self):
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._file.close()
+                self._file = self._mmap = None
+
+
+_RATE_LIMIT_STATES = {state.NAME: state for state in (MemoryRateLimitState, FileRateLimitState)}
+
+
+class RateLimiter:
+    """
+    Rate limits of the third party APIs
+
+    Every call is identified by the name of the API and a key.
+    A key can only be used once every `repeat_interval` seconds, and the
+    calls to an API can be limited to `calls` every `period` seconds by
+    a token bucket. Denials are remembered in the process, so that retries
+    are rejected without touching the shared state
+    """
+
+    _PRUNE_SIZE = 1024
+
+    def __init__(self, state):
+        self._state = state
+        self._fallback_state = None
+        self._lock = threading.Lock()
+        self._denied_until = {}
+        self._metrics = collections.defaultdict(collections.Counter)
+
+    def _update(self, name, func, ttl):
+        if not self._fallback_state:
+            try:
+                return self._state.update(name, func, ttl)
+            except Exception:
+                # e.g. locking is not supported on this platform
+                self._fallback_state = MemoryRateLimitState()
+        return self._fallback_state.update(name, func, ttl)
+
+    def _deny(self, api, reason, name, until):
+        with self._lock:
+            self._metrics[api][reason] += 1
+            self._denied_until[name] = until
+            if len(self._denied_until) > self._PRUNE_SIZE:
+                now = time.time()
+                self._denied_until = {k: v for k, v in self._denied_until.items() if v > now}
+        return False
+
+    def acquire(self, api, key, repeat_interval=None, rate=None):
+        """
+        @param rate     (calls, period) or None for no limit
+        @returns        Whether the call is allowed
+        """
+        now = time.time()
+        key_name, api_name = f'key:{api}:{key}', f'api:{api}'
+        for name, reason in ((key_name, 'repeated'), (api_name, 'rate_limited')):
+            if self._denied_until.get(name, 0) > now:
+                with self._lock:
+                    self._metrics[api][reason] += 1
+                return False
+
+        if repeat_interval:
+            def use_key(counter):
+                # A denied call does not extend the interval, so retrying does not keep the key blocked
+                if counter and counter[0] + repeat_interval > now:
+                    return counter, counter[0] + repeat_interval
+                return (now, 1), None
+
+            denied_until = self._update(key_name, use_key, repeat_interval)
+            if denied_until:
+                return self._deny(api, 'repeated', key_name, denied_until)
+
+        if rate:
+            calls, period = rate
+
+            def take_token(counter):
+                tokens = calls if counter is None else min(calls, counter[1] + (now - counter[0]) * calls / period)
+                if tokens >= 1:
+                    return (now, tokens - 1), None
+                return (now, tokens), now + (1 - tokens) * period / calls
+
+            denied_until = self._update(api_name, take_token, period)
+            if denied_until:
+                if repeat_interval:
+                    # The call was not made, so the key can be used again
+                    self._update(key_name, lambda counter: (None, None), repeat_interval)
+                return self._deny(api, 'rate_limited', api_name, denied_until)
+
+        with self._lock:
+            self._metrics[api]['allowed'] += 1
+        return True
+
+    def metrics(self):
+        """@returns {api: {'allowed': count, 'repeated': count, 'rate_limited': count}}"""
+        with self._lock:
+            return {api: dict(counts) for api, counts in self._metrics.items()}
+
+    def close(self):
+        self._state.close()
+
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(state=FileRateLimitState.NAME):
+    """Get the rate limiter of this process using the given kind of state"""
+    with _rate_limiters_lock:
+        if state not in _rate_limiters:
+            _rate_limiters[state] = RateLimiter(_RATE_LIMIT_STATES[state]())
+        return _rate_limiters[state]
+
+
+def rate_limit_metrics():
+    """@returns The metrics of all the rate limiters, merged by API"""
+    metrics = collections.defaultdict(collections.Counter)
+    with _rate_limiters_lock:
+        limiters = list(_rate_limiters.values())
+    for limiter in limiters:
+        for api, counts in limiter.metrics().items():
+            metrics[api].update(counts)
+    return {api: dict(counts) for api, counts in metrics.items()}
@@ -23,7 +23,7 @@ def extract_video_info(self, video_url, video_id=None):
         ies = [ie_cls(self.ie) for ie_cls in self.cls_ies if ie_cls.is_supported_site(video_url)]
         if not ies:
             raise ExtractorError('MutilThirdIE: No supported')
-        ThirdApiGuard.guard(self.ie, f'mutil-{video_id}-{video_url}')
+        ThirdApiGuard.guard(self.ie, f'mutil-{video_id}-{video_url}', api='mutil')
         first_exception = None
         for ie in ies:
             try:
@@ -8,7 +8,7 @@ def __init__(self, ie):
         self.ie = ie
 
     def extract_video_info(self, video_id, url, prefer_downloaded=True):
-        ThirdApiGuard.guard(self.ie, f'youtube-{video_id}')
+        ThirdApiGuard.guard(self.ie, f'youtube-{video_id}', api='youtube')
         return extract_youtube_video_info(self.ie, video_id, url, prefer_downloaded)
 
 
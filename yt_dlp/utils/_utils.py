@@ -188,8 +188,9 @@ def preferredencoding():
     return pref
 
 
-def write_json_file(obj, fn):
-    """ Encode obj as JSON and write it to fn, atomically if possible """
+def write_json_file(obj, fn, *, private=False):
+    """ Encode obj as JSON and write it to fn, atomically if possible.
+    If private, the file can only be accessed by the current user """
 
     tf = tempfile.NamedTemporaryFile(
         prefix=f'{os.path.basename(fn)}.', dir=os.path.dirname(fn),
@@ -203,10 +204,12 @@ def write_json_file(obj, fn):
             # WindowsError or FileExistsError.
             with contextlib.suppress(OSError):
                 os.unlink(fn)
-        with contextlib.suppress(OSError):
-            mask = os.umask(0)
-            os.umask(mask)
-            os.chmod(tf.name, 0o666 & ~mask)
+        # The temporary file is only accessible by the current user
+        if not private:
+            with contextlib.suppress(OSError):
+                mask = os.umask(0)
+                os.umask(mask)
+                os.chmod(tf.name, 0o666 & ~mask)
         os.rename(tf.name, fn)
     except Exception:
         with contextlib.suppress(OSError):
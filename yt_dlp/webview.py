@@ -0,0 +1,220 @@
+import contextlib
+import itertools
+import json
+import subprocess
+import threading
+import time
+
+from .utils import Popen
+
+
+class WebviewWorkerError(Exception):
+    pass
+
+
+class WebviewWorker:
+    """
+    A long-lived webview process answering requests over stdin/stdout
+
+    The protocol is line-delimited JSON. A request {"id": ID, "args": [...]} must be
+    answered by {"id": ID, "output": TEXT}, where TEXT is what the webview would have
+    printed if it had been run with these arguments, or by {"id": ID, "error": MESSAGE}.
+    A health check {"id": ID, "ping": true} must be answered by {"id": ID, "pong": true}.
+    Requests may be answered in any order; any other output is logged.
+    The worker must exit when its stdin is closed
+    """
+
+    def __init__(self, ydl, cmd):
+        self._ydl = ydl
+        self.cmd = cmd
+        self.requests = 0
+        self.last_active = time.monotonic()
+        self._pending = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._proc = Popen(
+            cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, encoding='utf-8', errors='replace', bufsize=1)
+        self._ydl.write_debug(f'[webview] Started worker {self.pid}')
+        self._reader = threading.Thread(target=self._read_responses, daemon=True)
+        self._reader.start()
+
+    @property
+    def pid(self):
+        return self._proc.pid
+
+    @property
+    def alive(self):
+        return not self._closed and self._proc.poll() is None
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def _read_responses(self):
+        for line in self._proc.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            response = None
+            if line.startswith('{'):
+                with contextlib.suppress(ValueError):
+                    response = json.loads(line)
+            with self._lock:
+                waiter = isinstance(response, dict) and self._pending.pop(response.get('id'), None)
+            if not waiter:
+                self._ydl.to_screen(f'[webview] {line}')
+                continue
+            self.last_active = time.monotonic()
+            waiter[1] = response
+            waiter[0].set()
+
+        with self._lock:
+            self._closed = True
+            pending, self._pending = self._pending, {}
+        for event, _ in pending.values():
+            event.set()
+
+    def request(self, timeout=None, **request):
+        waiter = [threading.Event(), None]
+        with self._lock:
+            if self._closed:
+                raise WebviewWorkerError(f'Worker {self.pid} has exited')
+            request_id = next(self._ids)
+            self._pending[request_id] = waiter
+            self.requests += 1
+            try:
+                self._proc.stdin.write(json.dumps({'id': request_id, **request}) + '\n')
+                self._proc.stdin.flush()
+            except (OSError, ValueError) as e:
+                self._pending.pop(request_id, None)
+                raise WebviewWorkerError(f'Unable to send request to worker {self.pid}: {e}')
+
+        if not waiter[0].wait(timeout):
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise WebviewWorkerError(f'Worker {self.pid} did not answer within {timeout} seconds')
+        response = waiter[1]
+        if response is None:
+            raise WebviewWorkerError(f'Worker {self.pid} exited with code {self._proc.wait()}')
+        if response.get('error') is not None:
+            raise WebviewWorkerError(str(response['error']))
+        return response
+
+    def ping(self, timeout):
+        try:
+            return bool(self.request(timeout, ping=True).get('pong'))
+        except WebviewWorkerError:
+            return False
+
+    def close(self, timeout=5):
+        with self._lock:
+            self._closed = True
+            with contextlib.suppress(OSError, ValueError):
+                self._proc.stdin.close()
+        try:
+            self._proc.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.wait()
+        self._ydl.write_debug(f'[webview] Stopped worker {self.pid}')
+
+
+class WebviewWorkerPool:
+    """
+    Persistent workers running a single webview command
+
+    Requests are multiplexed over up to `size` workers: a new worker is only
+    started when all the others are busy. Workers that crash are restarted,
+    workers that have been idle for a while are health checked before they are
+    used again, and workers are recycled after serving `max_requests` requests
+    """
+
+    _HEALTH_CHECK_INTERVAL = 60
+    _HEALTH_CHECK_TIMEOUT = 10
+    _MAX_ATTEMPTS = 2
+
+    def __init__(self, ydl, cmd, size=1, max_requests=None):
+        self._ydl = ydl
+        self.cmd = cmd
+        self.size = max(size, 1)
+        self.max_requests = max_requests
+        self._workers = []
+        self._retiring = []
+        self._lock = threading.Lock()
+
+    def _retire(self, worker):
+        """@returns Whether the worker must be closed once the lock is released"""
+        self._workers.remove(worker)
+        if worker.pending:
+            # Let it answer the requests it has already accepted
+            self._retiring.append(worker)
+            return False
+        return True
+
+    def _acquire(self):
+        # Closing a worker can take a while, so it is not done while holding the lock
+        to_close = []
+        try:
+            with self._lock:
+                for worker in self._workers[:]:
+                    if not worker.alive:
+                        self._ydl.report_warning(f'[webview] Worker {worker.pid} has exited; restarting it')
+                    elif self.max_requests and worker.requests >= self.max_requests:
+                        self._ydl.write_debug(
+                            f'[webview] Recycling worker {worker.pid} after {worker.requests} requests')
+                    else:
+                        continue
+                    if self._retire(worker):
+                        to_close.append(worker)
+
+                idle = [worker for worker in self._workers if not worker.pending]
+                if idle:
+                    return idle[0]
+                if len(self._workers) < self.size:
+                    worker = WebviewWorker(self._ydl, self.cmd)
+                    self._workers.append(worker)
+                    return worker
+                return min(self._workers, key=lambda w: w.pending)
+        finally:
+            for worker in to_close:
+                worker.close()
+
+    def _is_healthy(self, worker):
+        if worker.pending or time.monotonic() - worker.last_active < self._HEALTH_CHECK_INTERVAL:
+            return True
+        if worker.ping(self._HEALTH_CHECK_TIMEOUT):
+            return True
+        self._ydl.report_warning(f'[webview] Worker {worker.pid} failed the health check; restarting it')
+        worker.close(0)
+        return False
+
+    def _release(self, worker):
+        with self._lock:
+            if worker not in self._retiring or worker.pending:
+                return
+            self._retiring.remove(worker)
+        worker.close()
+
+    def request(self, args, timeout=None):
+        """Run the command with the given arguments and return its output"""
+        for attempt in range(1, self._MAX_ATTEMPTS + 1):
+            worker = self._acquire()
+            if not self._is_healthy(worker):
+                worker = self._acquire()
+            try:
+                return worker.request(timeout, args=args).get('output') or ''
+            except WebviewWorkerError:
+                if worker.alive or attempt == self._MAX_ATTEMPTS:
+                    raise
+                self._ydl.report_warning(f'[webview] Worker {worker.pid} crashed; retrying')
+            finally:
+                self._release(worker)
+
+    def close(self):
+        with self._lock:
+            workers, self._workers = self._workers + self._retiring, []
+            self._retiring = []
+        for worker in workers:
+            worker.close()